@@ -0,0 +1,71 @@
+/*
+ * Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+ * The Universal Permissive License (UPL), Version 1.0
+ */
+package oracle.weblogic.deploy.util;
+
+/**
+ * The outcome of extracting one archive path as part of a bulk extraction.
+ */
+public final class ArchiveExtractResult {
+    private final String path;
+    private String extractedFileName;
+    private WLSDeployArchiveIOException error;
+
+    ArchiveExtractResult(String path) {
+        this.path = path;
+    }
+
+    /**
+     * Get the path into the archive that was requested.
+     *
+     * @return the archive path
+     */
+    public String getPath() {
+        return path;
+    }
+
+    /**
+     * Get the canonical name of the extracted file or directory.
+     *
+     * @return the extracted file name, or null if the path was not into the archive or the extraction failed
+     */
+    public String getExtractedFileName() {
+        return extractedFileName;
+    }
+
+    /**
+     * Get the error that prevented the path from being extracted.
+     *
+     * @return the error, or null if the extraction succeeded
+     */
+    public WLSDeployArchiveIOException getError() {
+        return error;
+    }
+
+    /**
+     * Whether or not the path was extracted without error.
+     *
+     * @return true if the extraction succeeded, false otherwise
+     */
+    public boolean isSuccessful() {
+        return error == null;
+    }
+
+    void setExtractedFileName(String extractedFileName) {
+        this.extractedFileName = extractedFileName;
+    }
+
+    synchronized void setError(WLSDeployArchiveIOException error) {
+        // keep the first failure for paths that cover several entries
+        if (this.error == null) {
+            this.error = error;
+            this.extractedFileName = null;
+        }
+    }
+
+    @Override
+    public String toString() {
+        return path + (isSuccessful() ? " -> " + extractedFileName : ": " + error.getLocalizedMessage());
+    }
+}
@@ -0,0 +1,406 @@
+/*
+ * Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+ * The Universal Permissive License (UPL), Version 1.0
+ */
+package oracle.weblogic.deploy.util;
+
+import java.io.File;
+import java.io.FileInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.LinkedHashSet;
+import java.util.List;
+import java.util.Map;
+import java.util.Properties;
+import java.util.Set;
+import java.util.zip.CRC32;
+import java.util.zip.ZipEntry;
+
+import javax.xml.bind.DatatypeConverter;
+
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_APPS_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_COHERENCE_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_CPLIB_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_DOMLIB_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_NODE_MANAGER_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_SCRIPTS_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_SERVER_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ARCHIVE_SHLIBS_TARGET_DIR;
+import static oracle.weblogic.deploy.util.WLSDeployArchive.ZIP_SEP;
+
+/**
+ * The manifest stored inside the archive that records the digest, size, CRC and type of each file
+ * entry at the time it was added.  The size and CRC let a reader check a record against the zip
+ * central directory so that the digest can be trusted without reading the entry content.  The records are
+ * also indexed by digest so that a file whose content is already in the archive can be found quickly.
+ */
+final class ArchiveManifest {
+    static final String TYPE_APPLICATION = "application";
+    static final String TYPE_SHARED_LIBRARY = "sharedLibrary";
+    static final String TYPE_CLASSPATH_LIBRARY = "classpathLibrary";
+    static final String TYPE_DOMAIN_LIBRARY = "domainLibrary";
+    static final String TYPE_DEPLOYMENT_PLAN = "deploymentPlan";
+    static final String TYPE_KEYSTORE = "keystore";
+    static final String TYPE_COHERENCE_CONFIG = "coherenceConfig";
+    static final String TYPE_SCRIPT = "script";
+    static final String TYPE_FILE = "file";
+
+    private static final String[][] TYPES_BY_DIR = {
+        { ARCHIVE_APPS_TARGET_DIR, TYPE_APPLICATION },
+        { ARCHIVE_SHLIBS_TARGET_DIR, TYPE_SHARED_LIBRARY },
+        { ARCHIVE_CPLIB_TARGET_DIR, TYPE_CLASSPATH_LIBRARY },
+        { ARCHIVE_DOMLIB_TARGET_DIR, TYPE_DOMAIN_LIBRARY },
+        { ARCHIVE_SERVER_TARGET_DIR, TYPE_KEYSTORE },
+        { ARCHIVE_NODE_MANAGER_TARGET_DIR, TYPE_KEYSTORE },
+        { ARCHIVE_COHERENCE_TARGET_DIR, TYPE_COHERENCE_CONFIG },
+        { ARCHIVE_SCRIPTS_DIR, TYPE_SCRIPT }
+    };
+
+    private static final String HASH_ALGORITHM = "MD5";
+    private static final int READ_BUFFER_SIZE = 64 * 1024;
+    private static final String FIELD_SEP = "|";
+    private static final int FIELD_COUNT = 4;
+
+    private final Map<String, Record> records = new LinkedHashMap<>();
+    private final Set<String> verifiedEntries = new HashSet<>();
+    private final Map<String, Set<String>> entriesByDigest = new HashMap<>();
+
+    /**
+     * Get the manifest type for an archive entry based on the archive directory it lives in.
+     *
+     * @param entryName the entry name
+     * @return the entry type
+     */
+    static String getEntryType(String entryName) {
+        for (String[] typeByDir : TYPES_BY_DIR) {
+            if (entryName.startsWith(typeByDir[0] + ZIP_SEP)) {
+                return typeByDir[1];
+            }
+        }
+        return TYPE_FILE;
+    }
+
+    /**
+     * Read a manifest previously written by store().  Malformed records are skipped.
+     *
+     * @param input the manifest content
+     * @return the manifest
+     * @throws IOException if an error occurs reading the input
+     */
+    static ArchiveManifest load(InputStream input) throws IOException {
+        Properties props = new Properties();
+        props.load(input);
+
+        ArchiveManifest manifest = new ArchiveManifest();
+        for (String entryName : props.stringPropertyNames()) {
+            Record record = Record.parse(props.getProperty(entryName));
+            if (record != null) {
+                manifest.putRecord(entryName, record);
+            }
+        }
+        return manifest;
+    }
+
+    /**
+     * Write the manifest.
+     *
+     * @param output the stream to write to
+     * @throws IOException if an error occurs writing the output
+     */
+    void store(OutputStream output) throws IOException {
+        Properties props = new Properties();
+        for (Map.Entry<String, Record> entry : records.entrySet()) {
+            props.setProperty(entry.getKey(), entry.getValue().toString());
+        }
+        props.store(output, null);
+    }
+
+    boolean isEmpty() {
+        return records.isEmpty();
+    }
+
+    /**
+     * Describe a file the way the manifest would record it, without adding it to the manifest.  This reads
+     * the whole file, so it is only used when the record is needed before the file is copied into the archive.
+     *
+     * @param type the entry type
+     * @param file the file
+     * @return the record for the file
+     * @throws IOException if an error occurs reading the file
+     * @throws NoSuchAlgorithmException if an error occurs obtaining the hashing algorithm
+     */
+    static Record describeFile(String type, File file) throws IOException, NoSuchAlgorithmException {
+        try (RecordingInputStream input = new RecordingInputStream(type, file)) {
+            byte[] readBuffer = new byte[READ_BUFFER_SIZE];
+            while (input.read(readBuffer) >= 0) {
+                // the stream records what is read
+            }
+            return input.getRecord();
+        }
+    }
+
+    /**
+     * Record an entry using a record returned by describeFile() or by a RecordingInputStream.
+     *
+     * @param entryName the entry name
+     * @param record the record
+     */
+    void addRecord(String entryName, Record record) {
+        removeRecord(entryName);
+        putRecord(entryName, record);
+    }
+
+    /**
+     * Drop the records for all entries whose names start with the specified prefix.
+     *
+     * @param prefix the entry name prefix
+     */
+    void removeEntries(String prefix) {
+        List<String> removedEntries = new ArrayList<>();
+        for (String entryName : records.keySet()) {
+            if (entryName.startsWith(prefix)) {
+                removedEntries.add(entryName);
+            }
+        }
+        for (String entryName : removedEntries) {
+            removeRecord(entryName);
+        }
+    }
+
+    /**
+     * Get the recorded type of an entry.
+     *
+     * @param entryName the entry name
+     * @return the type, or null if the entry is not in the manifest
+     */
+    String getType(String entryName) {
+        Record record = records.get(entryName);
+        return record == null ? null : record.type;
+    }
+
+    /**
+     * Get the recorded digest of an entry without checking it against the zip central directory.  This is
+     * only safe for entries whose content has not been written to the zip file yet.
+     *
+     * @param entryName the entry name
+     * @return the digest, or null if the entry is not in the manifest
+     */
+    String getDigest(String entryName) {
+        Record record = records.get(entryName);
+        return record == null ? null : record.digest;
+    }
+
+    /**
+     * Find the entries of the same type whose recorded size, CRC and digest match the specified record.
+     *
+     * @param record the record describing the content to look for
+     * @return the matching entry names, in the order they were recorded
+     */
+    List<String> findEntries(Record record) {
+        List<String> result = new ArrayList<>();
+        for (String entryName : findEntries(record.type, record.size, record.digest)) {
+            if (record.crc == records.get(entryName).crc) {
+                result.add(entryName);
+            }
+        }
+        return result;
+    }
+
+    /**
+     * Find the entries of the specified type whose recorded size and digest match.
+     *
+     * @param type the entry type
+     * @param size the content size
+     * @param digest the content digest
+     * @return the matching entry names, in the order they were recorded
+     */
+    List<String> findEntries(String type, long size, String digest) {
+        Set<String> candidates = entriesByDigest.get(digest);
+        if (candidates == null) {
+            return Collections.emptyList();
+        }
+        List<String> result = new ArrayList<>();
+        for (String entryName : candidates) {
+            Record candidate = records.get(entryName);
+            if (type.equals(candidate.type) && size == candidate.size) {
+                result.add(entryName);
+            }
+        }
+        return result;
+    }
+
+    /**
+     * Get the record of an entry.
+     *
+     * @param entryName the entry name
+     * @return the record, or null if the entry is not in the manifest
+     */
+    Record getRecord(String entryName) {
+        return records.get(entryName);
+    }
+
+    /**
+     * Get the recorded digest of an entry, provided that the record still describes the entry in the zip
+     * central directory.  A record that does not match is dropped so it is not checked again.
+     *
+     * @param entryName the entry name
+     * @param zipEntry the central directory metadata for the entry, or null if there is no such entry
+     * @return the digest, or null if the manifest cannot answer for this entry
+     */
+    String getVerifiedDigest(String entryName, ZipEntry zipEntry) {
+        Record record = records.get(entryName);
+        if (record == null) {
+            return null;
+        }
+        if (!verifiedEntries.contains(entryName)) {
+            if (zipEntry == null || zipEntry.getSize() != record.size || zipEntry.getCrc() != record.crc) {
+                removeRecord(entryName);
+                return null;
+            }
+            verifiedEntries.add(entryName);
+        }
+        return record.digest;
+    }
+
+    private void putRecord(String entryName, Record record) {
+        records.put(entryName, record);
+        Set<String> entryNames = entriesByDigest.get(record.digest);
+        if (entryNames == null) {
+            entryNames = new LinkedHashSet<>();
+            entriesByDigest.put(record.digest, entryNames);
+        }
+        entryNames.add(entryName);
+    }
+
+    private void removeRecord(String entryName) {
+        Record record = records.remove(entryName);
+        verifiedEntries.remove(entryName);
+        if (record != null) {
+            Set<String> entryNames = entriesByDigest.get(record.digest);
+            if (entryNames != null) {
+                entryNames.remove(entryName);
+                if (entryNames.isEmpty()) {
+                    entriesByDigest.remove(record.digest);
+                }
+            }
+        }
+    }
+
+    /**
+     * A file input stream that computes the manifest record of the file while the file is copied into the
+     * archive, so that the file does not need to be read a second time to record it.  The stream stays a
+     * FileInputStream so that the zip file can still find the size of the content from its channel.
+     */
+    static final class RecordingInputStream extends FileInputStream {
+        private final String type;
+        private final MessageDigest messageDigest;
+        private final CRC32 crc = new CRC32();
+        private long size;
+        private boolean complete;
+        private Record record;
+
+        RecordingInputStream(String type, File file) throws IOException, NoSuchAlgorithmException {
+            super(file);
+            this.type = type;
+            this.messageDigest = MessageDigest.getInstance(HASH_ALGORITHM);
+        }
+
+        @Override
+        public int read() throws IOException {
+            int result = super.read();
+            if (result < 0) {
+                complete = true;
+            } else {
+                messageDigest.update((byte) result);
+                crc.update(result);
+                size++;
+            }
+            return result;
+        }
+
+        @Override
+        public int read(byte[] buffer) throws IOException {
+            return read(buffer, 0, buffer.length);
+        }
+
+        @Override
+        public int read(byte[] buffer, int offset, int length) throws IOException {
+            int result = super.read(buffer, offset, length);
+            if (result < 0) {
+                complete = true;
+            } else {
+                messageDigest.update(buffer, offset, result);
+                crc.update(buffer, offset, result);
+                size += result;
+            }
+            return result;
+        }
+
+        /**
+         * Get the record for the file content that was read.
+         *
+         * @return the record, or null if the stream was not read to the end
+         */
+        Record getRecord() {
+            if (complete && record == null) {
+                String digest = DatatypeConverter.printBase64Binary(messageDigest.digest());
+                record = new Record(type, size, crc.getValue(), digest);
+            }
+            return record;
+        }
+    }
+
+    /**
+     * The recorded type, size, CRC and digest of one entry.
+     */
+    static final class Record {
+        private final String type;
+        private final long size;
+        private final long crc;
+        private final String digest;
+
+        private Record(String type, long size, long crc, String digest) {
+            this.type = type;
+            this.size = size;
+            this.crc = crc;
+            this.digest = digest;
+        }
+
+        long getSize() {
+            return size;
+        }
+
+        long getCrc() {
+            return crc;
+        }
+
+        String getDigest() {
+            return digest;
+        }
+
+        private static Record parse(String value) {
+            String[] fields = value.split("\\" + FIELD_SEP, FIELD_COUNT);
+            if (fields.length != FIELD_COUNT) {
+                return null;
+            }
+            try {
+                return new Record(fields[0], Long.parseLong(fields[1]), Long.parseLong(fields[2]), fields[3]);
+            } catch (NumberFormatException nfe) {
+                return null;
+            }
+        }
+
+        @Override
+        public String toString() {
+            return type + FIELD_SEP + size + FIELD_SEP + crc + FIELD_SEP + digest;
+        }
+    }
+}
@@ -0,0 +1,242 @@
+/*
+ * Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+ * The Universal Permissive License (UPL), Version 1.0
+ */
+package oracle.weblogic.deploy.util;
+
+import java.io.File;
+import java.io.FileInputStream;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.Properties;
+
+import oracle.weblogic.deploy.logging.PlatformLogger;
+import oracle.weblogic.deploy.logging.WLSDeployLogFactory;
+
+/**
+ * A persistent cache of content hashes so that binaries that have not changed since they were last
+ * hashed do not need to be read again.  File hashes are keyed by the canonical path, size and last
+ * modified time of the file.  Archive entry hashes are keyed by the canonical path, size and last modified
+ * time of the archive, and by the entry name, CRC and size recorded in the zip central directory, so that a
+ * CRC collision in another archive, or in a later version of the same archive, never reuses a hash.
+ *
+ * The cache is stored in a properties file, which defaults to cache/hash-cache.properties in the
+ * WebLogic Deploy Tooling installation directory named by the WLSDEPLOY_HOME environment variable and
+ * can be changed using the wlsdeploy.hash.cache.file system property.  If WLSDEPLOY_HOME is not set,
+ * or the system property is set to an empty value, the cache is kept in memory only.
+ *
+ * New hashes are only recorded in memory.  The cache file is written once, when the cache is flushed
+ * by the tool exit path or, failing that, by a shutdown hook registered with the first new hash.
+ */
+final class FileHashCache {
+    private static final PlatformLogger LOGGER = WLSDeployLogFactory.getLogger("wlsdeploy.util");
+
+    static final String CACHE_FILE_PROP = "wlsdeploy.hash.cache.file";
+    private static final String WLSDEPLOY_HOME_ENV_VARIABLE = "WLSDEPLOY_HOME";
+    private static final String DEFAULT_CACHE_DIR = "cache";
+    private static final String DEFAULT_CACHE_FILE = "hash-cache.properties";
+    private static final int MAX_CACHE_ENTRIES = 2048;
+
+    private static final String FILE_KEY_PREFIX = "file:";
+    private static final String ENTRY_KEY_PREFIX = "entry:";
+    private static final String KEY_SEP = "|";
+
+    private static Map<String, String> cache;
+    private static File cacheFile;
+    private static boolean dirty;
+    private static boolean shutdownHookRegistered;
+
+    private FileHashCache() {
+        // hide the constructor for this utility class
+    }
+
+    /**
+     * Get the cached hash for the specified file.
+     *
+     * @param file the canonical file
+     * @return the cached hash, or null if the file was not hashed at its current size and modification time
+     */
+    static synchronized String getFileHash(File file) {
+        return getCache().get(getFileKey(file));
+    }
+
+    /**
+     * Record the hash for the specified file at its current size and modification time.
+     *
+     * @param file the canonical file
+     * @param hash the Base64-encoded hash
+     */
+    static synchronized void putFileHash(File file, String hash) {
+        putHash(getFileKey(file), hash);
+    }
+
+    /**
+     * Get the cached hash for the specified archive entry.
+     *
+     * @param archiveFile the canonical archive file
+     * @param entryName the name of the entry in the archive
+     * @param crc the CRC-32 of the entry content
+     * @param size the uncompressed size of the entry
+     * @return the cached hash, or null if an entry with this name, CRC and size was not hashed in the archive
+     *         at its current size and modification time
+     */
+    static synchronized String getEntryHash(File archiveFile, String entryName, long crc, long size) {
+        return getCache().get(getEntryKey(archiveFile, entryName, crc, size));
+    }
+
+    /**
+     * Record the hash for the specified archive entry.
+     *
+     * @param archiveFile the canonical archive file
+     * @param entryName the name of the entry in the archive
+     * @param crc the CRC-32 of the entry content
+     * @param size the uncompressed size of the entry
+     * @param hash the Base64-encoded hash
+     */
+    static synchronized void putEntryHash(File archiveFile, String entryName, long crc, long size, String hash) {
+        putHash(getEntryKey(archiveFile, entryName, crc, size), hash);
+    }
+
+    /**
+     * Write the cache file if any hashes were recorded since it was last written.
+     */
+    static synchronized void flush() {
+        if (dirty) {
+            saveCache();
+            dirty = false;
+        }
+    }
+
+    /**
+     * Drop the in-memory copy of the cache so that it is reloaded from the cache file on next use.
+     * Hashes that were not flushed are discarded.
+     */
+    static synchronized void reset() {
+        cache = null;
+        cacheFile = null;
+        dirty = false;
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // Private helper methods                                                //
+    ///////////////////////////////////////////////////////////////////////////
+
+    private static String getFileKey(File file) {
+        return FILE_KEY_PREFIX + file.getPath() + KEY_SEP + file.length() + KEY_SEP + file.lastModified();
+    }
+
+    private static String getEntryKey(File archiveFile, String entryName, long crc, long size) {
+        return ENTRY_KEY_PREFIX + archiveFile.getPath() + KEY_SEP + archiveFile.length() + KEY_SEP +
+            archiveFile.lastModified() + KEY_SEP + entryName + KEY_SEP + crc + KEY_SEP + size;
+    }
+
+    private static void putHash(String key, String hash) {
+        String previous = getCache().put(key, hash);
+        if (!hash.equals(previous) && cacheFile != null) {
+            dirty = true;
+            registerShutdownHook();
+        }
+    }
+
+    private static void registerShutdownHook() {
+        if (shutdownHookRegistered) {
+            return;
+        }
+        Thread hook = new Thread(new Runnable() {
+            @Override
+            public void run() {
+                flush();
+            }
+        }, "wlsdeploy-hash-cache");
+        try {
+            Runtime.getRuntime().addShutdownHook(hook);
+        } catch (IllegalStateException ise) {
+            // the JVM is already shutting down so the tool exit path is responsible for the flush
+            return;
+        }
+        shutdownHookRegistered = true;
+    }
+
+    private static Map<String, String> getCache() {
+        if (cache == null) {
+            cache = new LinkedHashMap<String, String>(16, 0.75f, true) {
+                private static final long serialVersionUID = 1L;
+
+                @Override
+                protected boolean removeEldestEntry(Map.Entry<String, String> eldest) {
+                    return size() > MAX_CACHE_ENTRIES;
+                }
+            };
+            cacheFile = getCacheFile();
+            loadCache();
+        }
+        return cache;
+    }
+
+    private static File getCacheFile() {
+        String fileName = System.getProperty(CACHE_FILE_PROP);
+        File result;
+        if (fileName == null) {
+            String wlsDeployHome = System.getenv(WLSDEPLOY_HOME_ENV_VARIABLE);
+            if (StringUtils.isEmpty(wlsDeployHome)) {
+                result = null;
+            } else {
+                result = new File(new File(wlsDeployHome, DEFAULT_CACHE_DIR), DEFAULT_CACHE_FILE);
+            }
+        } else if (StringUtils.isEmpty(fileName)) {
+            result = null;
+        } else {
+            result = new File(fileName);
+        }
+        return result;
+    }
+
+    private static void loadCache() {
+        if (cacheFile == null || !cacheFile.isFile()) {
+            return;
+        }
+        Properties props = new Properties();
+        try (FileInputStream fis = new FileInputStream(cacheFile)) {
+            props.load(fis);
+        } catch (IOException ioe) {
+            LOGGER.fine("WLSDPLY-01118", cacheFile, ioe.getLocalizedMessage());
+            return;
+        }
+        for (String key : props.stringPropertyNames()) {
+            cache.put(key, props.getProperty(key));
+        }
+        LOGGER.finer("WLSDPLY-01119", cache.size(), cacheFile);
+    }
+
+    private static void saveCache() {
+        if (cacheFile == null) {
+            return;
+        }
+        Properties props = new Properties();
+        props.putAll(cache);
+
+        File cacheDir = cacheFile.getAbsoluteFile().getParentFile();
+        File tmpFile = null;
+        try {
+            if (!cacheDir.isDirectory() && !cacheDir.mkdirs()) {
+                throw new IOException(cacheDir.getPath());
+            }
+            tmpFile = File.createTempFile(DEFAULT_CACHE_FILE, null, cacheDir);
+            try (FileOutputStream fos = new FileOutputStream(tmpFile)) {
+                props.store(fos, null);
+            }
+            if (!tmpFile.renameTo(cacheFile) && !(cacheFile.delete() && tmpFile.renameTo(cacheFile))) {
+                throw new IOException(tmpFile.getPath());
+            }
+        } catch (IOException ioe) {
+            LOGGER.fine("WLSDPLY-01120", cacheFile, ioe.getLocalizedMessage());
+            if (tmpFile != null && tmpFile.exists() && !tmpFile.delete()) {
+                tmpFile.deleteOnExit();
+            }
+            // keep going with the in-memory cache only
+            cacheFile = null;
+        }
+    }
+}
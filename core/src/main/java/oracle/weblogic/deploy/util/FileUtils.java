@@ -12,6 +12,7 @@ import java.io.FilenameFilter;
 import java.io.IOException;
 import java.io.InputStream;
 import java.nio.file.Files;
+import java.security.DigestInputStream;
 import java.security.MessageDigest;
 import java.security.NoSuchAlgorithmException;
 import java.util.ArrayList;
@@ -37,6 +38,16 @@ public final class FileUtils {
     private static final int FILE_NAME_POS = 0;
     private static final int FILE_EXT_POS = 1;
     private static final int READ_BUFFER_SIZE = 4096;
+    private static final int HASH_BUFFER_SIZE = 1024 * 1024;
+    private static final String HASH_ALGORITHM = "MD5";
+
+    // reused across calls so hashing large binaries does not churn the heap
+    private static final ThreadLocal<byte[]> HASH_BUFFER = new ThreadLocal<byte[]>() {
+        @Override
+        protected byte[] initialValue() {
+            return new byte[HASH_BUFFER_SIZE];
+        }
+    };
 
     private FileUtils() {
         // hide the constructor for this utility class
@@ -555,12 +566,40 @@ public final class FileUtils {
         LOGGER.entering(CLASS, METHOD, file);
         validateExistingFile(file);
 
-        byte[] fileBytes = readFileToByteArray(file);
-        String result = computeHash(fileBytes);
+        File canonicalFile = getCanonicalFile(file);
+        String result = FileHashCache.getFileHash(canonicalFile);
+        if (result == null) {
+            try (FileInputStream fis = new FileInputStream(canonicalFile)) {
+                result = computeHash(fis);
+            }
+            FileHashCache.putFileHash(canonicalFile, result);
+        } else {
+            LOGGER.finer("WLSDPLY-01121", canonicalFile);
+        }
         LOGGER.exiting(CLASS, METHOD, result);
         return result;
     }
 
+    /**
+     * Compute the Base64-encoded hash for the contents of the specified input stream.  The stream is
+     * read through to the end in fixed-size chunks so the content is never held in memory.  The caller
+     * remains responsible for closing the stream.
+     *
+     * @param input the input stream to use
+     * @return the Base64-encoded hash
+     * @throws IOException if an error occurs reading the input stream
+     * @throws NoSuchAlgorithmException if an error occurs obtaining the hashing algorithm
+     */
+    public static String computeHash(InputStream input) throws IOException, NoSuchAlgorithmException {
+        MessageDigest messageDigest = MessageDigest.getInstance(HASH_ALGORITHM);
+        DigestInputStream digestStream = new DigestInputStream(input, messageDigest);
+        byte[] readBuffer = HASH_BUFFER.get();
+        while (digestStream.read(readBuffer) >= 0) {
+            // the digest is updated as the stream is read
+        }
+        return DatatypeConverter.printBase64Binary(messageDigest.digest());
+    }
+
     /**
      * Compute the Base64-encoded hash for the specified bytes.
      *
@@ -569,7 +608,7 @@ public final class FileUtils {
      * @throws NoSuchAlgorithmException if an error occurs obtaining the hashing algorithm
      */
     public static String computeHash(byte[] bytes) throws NoSuchAlgorithmException {
-        MessageDigest messageDigest = MessageDigest.getInstance("MD5");
+        MessageDigest messageDigest = MessageDigest.getInstance(HASH_ALGORITHM);
         byte[] hash = messageDigest.digest(bytes);
         return DatatypeConverter.printBase64Binary(hash);
     }
@@ -4,6 +4,8 @@
  */
 package oracle.weblogic.deploy.util;
 
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
 import java.io.File;
 import java.io.FileInputStream;
 import java.io.FileOutputStream;
@@ -11,13 +13,32 @@ import java.io.IOException;
 import java.io.InputStream;
 import java.net.HttpURLConnection;
 import java.net.URL;
+import java.nio.file.Files;
+import java.nio.file.StandardCopyOption;
+import java.security.DigestInputStream;
+import java.security.MessageDigest;
 import java.security.NoSuchAlgorithmException;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
+import java.util.concurrent.Callable;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.ThreadFactory;
+import java.util.regex.Pattern;
+import java.util.zip.ZipEntry;
+import java.util.zip.ZipFile;
+
+import javax.xml.bind.DatatypeConverter;
 
 import oracle.weblogic.deploy.exception.ExceptionHelper;
 import oracle.weblogic.deploy.logging.PlatformLogger;
 import oracle.weblogic.deploy.logging.WLSDeployLogFactory;
+import oracle.weblogic.deploy.util.ZipEntryCompressor.CompressedEntry;
 
 /**
  * The purpose of this class is to hide the organizational details of the WLS Deploy archive.  This class is
@@ -84,6 +105,11 @@ public class WLSDeployArchive {
      */
     public static final String ARCHIVE_SCRIPTS_DIR = WLSDPLY_ARCHIVE_BINARY_DIR + "/scripts";
 
+    /**
+     * The archive entry that records the digest, size and type of the binaries in the archive.
+     */
+    public static final String ARCHIVE_MANIFEST_ENTRY = WLSDPLY_ARCHIVE_BINARY_DIR + "/manifest.properties";
+
     // Used by the unit tests so it requires package level scoping...
     //
     /* package */
@@ -91,13 +117,34 @@ public class WLSDeployArchive {
 
     private static final String SEP = File.separator;
     private static final int READ_BUFFER_SIZE = 4096;
+    private static final int EXTRACT_BUFFER_SIZE = 1024 * 1024;
+    private static final String HASH_ALGORITHM = "MD5";
+
+    private static final ThreadLocal<byte[]> EXTRACT_BUFFER = new ThreadLocal<byte[]>() {
+        @Override
+        protected byte[] initialValue() {
+            return new byte[EXTRACT_BUFFER_SIZE];
+        }
+    };
     private static final String COHERENCE_CONFIG_FILE_EXTENSION = ".xml";
     private static final int HTTP_OK = 200;
     private static final int HTTP_CREATED = 201;
+    private static final int MAX_EXTRACT_THREADS = 8;
+    // matches the names given to renamed copies, like myapp(1).ear, capturing the name without the number
+    private static final Pattern RENAMED_FILE_PATTERN = Pattern.compile("^(.*)\\([0-9]+\\)(\\.[^.]*)?$");
 
     private static final PlatformLogger LOGGER = WLSDeployLogFactory.getLogger("wlsdeploy.archive");
 
     private WLSDeployZipFile zipFile;
+    private ArchiveManifest manifest;
+    private boolean manifestChanged;
+    private boolean deduplicateBinaries;
+
+    // A previous version of the archive whose binaries can be copied without being compressed again.
+    //
+    private ArchiveManifest previousManifest;
+    private ZipFileAppender previousArchive;
+    private File previousArchiveCopy;
 
     /**
      * Constructor for a JCSLifecycleArchive, which hides the details of the bundle generated by export domain.
@@ -408,6 +455,72 @@ public class WLSDeployArchive {
         return result;
     }
 
+    /**
+     * Extract the specified files to the specified location, inflating the entries concurrently.  Each path
+     * is validated, and has its leading directories stripped, exactly as extractFile() would.  A path that
+     * names a directory entry extracts all of the entries under it.
+     *
+     * @param paths the paths into the archive file to extract
+     * @param extractToLocation the base directory to which to write the extracted files or directories
+     * @param stripLeadingPathDirectories whether or not to strip the leading directories
+     *                                    when writing to the target location
+     * @return the result for each path, in the order given
+     * @throws WLSDeployArchiveIOException if an error occurs reading the archive
+     * @throws IllegalArgumentException if a path is null or empty or the extractToLocation
+     *                                  was not a valid, existing directory
+     */
+    public List<ArchiveExtractResult> extractFiles(List<String> paths, File extractToLocation,
+        boolean stripLeadingPathDirectories) throws WLSDeployArchiveIOException {
+        return extractFiles(paths, extractToLocation, stripLeadingPathDirectories, getDefaultExtractThreads());
+    }
+
+    /**
+     * Extract the specified files to the specified location using at most the specified number of threads.
+     *
+     * @param paths the paths into the archive file to extract
+     * @param extractToLocation the base directory to which to write the extracted files or directories
+     * @param stripLeadingPathDirectories whether or not to strip the leading directories
+     *                                    when writing to the target location
+     * @param maxThreads the maximum number of entries to inflate at the same time
+     * @return the result for each path, in the order given
+     * @throws WLSDeployArchiveIOException if an error occurs reading the archive
+     * @throws IllegalArgumentException if a path is null or empty or the extractToLocation
+     *                                  was not a valid, existing directory
+     */
+    public List<ArchiveExtractResult> extractFiles(List<String> paths, File extractToLocation,
+        boolean stripLeadingPathDirectories, int maxThreads) throws WLSDeployArchiveIOException {
+        final String METHOD = "extractFiles";
+
+        LOGGER.entering(CLASS, METHOD, paths, extractToLocation, stripLeadingPathDirectories, maxThreads);
+        validateNonNullObject(paths, "paths", METHOD);
+        for (String path : paths) {
+            validateNonEmptyString(path, "path", METHOD);
+        }
+        validateExistingDirectory(extractToLocation, "extractToLocation", getArchiveFileName(), METHOD);
+
+        List<ArchiveExtractResult> results = new ArrayList<>(paths.size());
+        List<ExtractTask> tasks = new ArrayList<>();
+        for (String path : paths) {
+            ArchiveExtractResult result = new ArchiveExtractResult(path);
+            results.add(result);
+            if (!isPathIntoArchive(path)) {
+                LOGGER.warning("WLSDPLY-01404", path);
+            } else if (getZipFile().getZipEntryMetadata(path) == null) {
+                result.setError(new WLSDeployArchiveIOException("WLSDPLY-01403", path, getArchiveFileName()));
+            } else {
+                addExtractTasks(tasks, result, extractToLocation, stripLeadingPathDirectories);
+            }
+        }
+
+        try {
+            runExtractTasks(tasks, maxThreads);
+        } finally {
+            getZipFile().close();
+        }
+        LOGGER.exiting(CLASS, METHOD, results);
+        return results;
+    }
+
     /**
      * Get the Base64-encoded hash for the specified archive file entry.
      *
@@ -428,39 +541,51 @@ public class WLSDeployArchive {
             throw aioe;
         }
 
-        Map<String, InputStream> zipEntries = getZipFile().getZipEntries(path);
-        if (zipEntries.isEmpty() || !zipEntries.containsKey(path)) {
-            WLSDeployArchiveIOException aioe =
-                new WLSDeployArchiveIOException("WLSDPLY-01406", getArchiveFileName(), path);
-            LOGGER.throwing(CLASS, METHOD, aioe);
-            closeMapInputStreams(zipEntries);
-            getZipFile().close();
-            throw aioe;
+        // The central directory CRC and size identify the content well enough to reuse an earlier hash.
+        //
+        ZipEntry entry = getZipFile().getZipEntryMetadata(path);
+        boolean cacheable = entry != null && entry.getCrc() != -1 && entry.getSize() != -1;
+        String result = getManifest().getVerifiedDigest(path, entry);
+        if (result != null) {
+            LOGGER.finer("WLSDPLY-01429", getArchiveFileName(), path);
+        } else if (cacheable) {
+            result = FileHashCache.getEntryHash(getCanonicalArchiveFile(), path, entry.getCrc(), entry.getSize());
+            if (result != null) {
+                LOGGER.finer("WLSDPLY-01122", getArchiveFileName(), path);
+            }
         }
 
-        byte[] fileBytes;
-        try {
-            fileBytes = FileUtils.readInputStreamToByteArray(zipEntries.get(path));
-        } catch (IOException ioe) {
-            WLSDeployArchiveIOException aioe =
-                new WLSDeployArchiveIOException("WLSDPLY-01407", ioe, getArchiveFileName(),
-                                                path, ioe.getLocalizedMessage());
-            LOGGER.throwing(CLASS, METHOD, aioe);
-            throw aioe;
-        } finally {
-            closeMapInputStreams(zipEntries);
-            getZipFile().close();
-        }
+        if (result == null) {
+            InputStream entryStream = null;
+            if (entry != null) {
+                entryStream = getZipFile().getZipEntry(path);
+            }
+            if (entryStream == null) {
+                WLSDeployArchiveIOException aioe =
+                    new WLSDeployArchiveIOException("WLSDPLY-01406", getArchiveFileName(), path);
+                LOGGER.throwing(CLASS, METHOD, aioe);
+                throw aioe;
+            }
 
-        String result;
-        try {
-            result = FileUtils.computeHash(fileBytes);
-        } catch (NoSuchAlgorithmException e) {
-            WLSDeployArchiveIOException aioe =
-                new WLSDeployArchiveIOException("WLSDPLY-01407", e, getArchiveFileName(),
-                                                path, e.getLocalizedMessage());
-            LOGGER.throwing(CLASS, METHOD, aioe);
-            throw aioe;
+            try {
+                result = FileUtils.computeHash(entryStream);
+            } catch (IOException | NoSuchAlgorithmException e) {
+                WLSDeployArchiveIOException aioe =
+                    new WLSDeployArchiveIOException("WLSDPLY-01407", e, getArchiveFileName(),
+                                                    path, e.getLocalizedMessage());
+                LOGGER.throwing(CLASS, METHOD, aioe);
+                throw aioe;
+            } finally {
+                try {
+                    entryStream.close();
+                } catch (IOException ignore) {
+                    // we are just trying to cleanup so ignore this error
+                    LOGGER.warning("WLSDPLY-01417", ignore, path, ignore.getLocalizedMessage());
+                }
+            }
+            if (cacheable) {
+                FileHashCache.putEntryHash(getCanonicalArchiveFile(), path, entry.getCrc(), entry.getSize(), result);
+            }
         }
         LOGGER.exiting(CLASS, METHOD, result);
         return result;
@@ -702,7 +827,23 @@ public class WLSDeployArchive {
         LOGGER.entering(CLASS, METHOD, domainHome);
         validateExistingDirectory(domainHome, "domainHome", getArchiveFileName(), METHOD);
 
-        extractDirectoryFromZip(ARCHIVE_CPLIB_TARGET_DIR, domainHome);
+        List<ExtractTask> tasks = new ArrayList<>();
+        for (String entryName : getZipFile().listZipEntries(ARCHIVE_CPLIB_TARGET_DIR + ZIP_SEP)) {
+            ArchiveExtractResult result = new ArchiveExtractResult(entryName);
+            tasks.add(new ExtractTask(entryName, new File(domainHome, entryName), result));
+        }
+        try {
+            runExtractTasks(tasks, getDefaultExtractThreads());
+        } finally {
+            getZipFile().close();
+        }
+        for (ExtractTask task : tasks) {
+            if (!task.result.isSuccessful()) {
+                WLSDeployArchiveIOException aioe = task.result.getError();
+                LOGGER.throwing(CLASS, METHOD, aioe);
+                throw aioe;
+            }
+        }
         LOGGER.exiting(CLASS, METHOD);
     }
 
@@ -899,14 +1040,194 @@ public class WLSDeployArchive {
      * @throws WLSDeployArchiveIOException if an error is encountered removing the binaries
      */
     public void removeAllBinaries() throws WLSDeployArchiveIOException {
+        getManifest().removeEntries(WLSDPLY_ARCHIVE_BINARY_DIR + ZIP_SEP);
         getZipFile().removeZipEntries(WLSDPLY_ARCHIVE_BINARY_DIR + ZIP_SEP);
+        manifestChanged = true;
+    }
+
+    /**
+     * Get the type recorded in the archive manifest for the specified entry (e.g., application,
+     * sharedLibrary, classpathLibrary, domainLibrary or keystore).
+     *
+     * @param path the path into the archive file
+     * @return the entry type, or null if the archive manifest does not list the entry
+     * @throws WLSDeployArchiveIOException if an error occurs reading the archive
+     */
+    public String getManifestEntryType(String path) throws WLSDeployArchiveIOException {
+        return getManifest().getType(path);
+    }
+
+    /**
+     * Write the archive manifest if binaries were added or removed since it was last written.  This is done
+     * automatically by commit() and close(), so it only needs to be called directly by callers that add
+     * binaries outside of a batch and want the manifest written before the archive is closed.
+     *
+     * @throws WLSDeployArchiveIOException if an error occurs while writing the archive file
+     */
+    public void writeManifest() throws WLSDeployArchiveIOException {
+        final String METHOD = "writeManifest";
+
+        if (!manifestChanged) {
+            return;
+        }
+        LOGGER.entering(CLASS, METHOD);
+        if (getManifest().isEmpty()) {
+            getZipFile().removeZipEntry(ARCHIVE_MANIFEST_ENTRY);
+        } else {
+            ByteArrayOutputStream output = new ByteArrayOutputStream();
+            try {
+                getManifest().store(output);
+            } catch (IOException ioe) {
+                WLSDeployArchiveIOException aioe = new WLSDeployArchiveIOException("WLSDPLY-01428", ioe,
+                    getArchiveFileName(), ioe.getLocalizedMessage());
+                LOGGER.throwing(CLASS, METHOD, aioe);
+                throw aioe;
+            }
+            getZipFile().putZipEntry(ARCHIVE_MANIFEST_ENTRY, new ByteArrayInputStream(output.toByteArray()));
+        }
+        manifestChanged = false;
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    /**
+     * Start staging changes to the archive so that all additions and removals up to the matching
+     * commit() are written to the archive file at once.  Batches may be nested.
+     */
+    public void beginBatch() {
+        getZipFile().beginBatch();
+    }
+
+    /**
+     * Write the changes staged since the matching beginBatch() to the archive file.  Nothing is
+     * written until the outermost batch is committed.
+     *
+     * @throws WLSDeployArchiveIOException if an error occurs while writing the archive file
+     * @throws IllegalStateException if no batch is in progress
+     */
+    public void commit() throws WLSDeployArchiveIOException {
+        if (getZipFile().isBatchInProgress()) {
+            writeManifest();
+        }
+        getZipFile().commit();
+    }
+
+    /**
+     * Discard all changes staged since the outermost beginBatch(), leaving the archive file unchanged.
+     */
+    public void rollback() {
+        getZipFile().rollback();
+        manifest = null;
+        manifestChanged = false;
+    }
+
+    /**
+     * Rewrite the archive file to reclaim the space left behind by entries that were replaced or removed
+     * in place.  If a batch is in progress, the archive file is rewritten when the batch is committed.
+     *
+     * @throws WLSDeployArchiveIOException if an error occurs while rewriting the archive file
+     */
+    public void compact() throws WLSDeployArchiveIOException {
+        getZipFile().compact();
+    }
+
+    /**
+     * Set whether or not binaries added to the archive are compressed ahead of writing the archive file.
+     * Binaries that are already compressed, like jar, war and ear files, are then stored as is and the
+     * rest are compressed in parallel.  The archive file remains a standard zip file.
+     *
+     * @param compressAhead true to compress binaries ahead of writing the archive file, false otherwise
+     */
+    public void setCompressAhead(boolean compressAhead) {
+        getZipFile().setCompressAhead(compressAhead);
+    }
+
+    /**
+     * Set whether or not a file whose content is already in the archive is stored again.  When deduplication
+     * is on, adding a file with the same name, type and content as a file added earlier returns the archive
+     * path of the earlier file instead of storing a renamed copy (e.g., myapp(1).ear).  Directories are always
+     * stored.  Deduplication is off by default.
+     *
+     * @param deduplicateBinaries true to resolve identical files to the existing archive path, false otherwise
+     */
+    public void setDeduplicateBinaries(boolean deduplicateBinaries) {
+        this.deduplicateBinaries = deduplicateBinaries;
+    }
+
+    /**
+     * Use a previous version of this archive as a source of binaries.  A file added afterwards whose size,
+     * modification time and hash match a binary recorded in the manifest of the previous archive is copied
+     * from the previous archive as compressed bytes, so it is neither read nor compressed again.  Other files
+     * are added as usual.  The previous archive is used until this archive is closed.
+     *
+     * @param previousArchiveFileName the name of the previous archive file, which may be this archive file
+     * @throws WLSDeployArchiveIOException if an error occurs reading the previous archive file
+     * @throws IllegalArgumentException if the previous archive file does not exist
+     */
+    public void setPreviousArchive(String previousArchiveFileName) throws WLSDeployArchiveIOException {
+        final String METHOD = "setPreviousArchive";
+
+        LOGGER.entering(CLASS, METHOD, previousArchiveFileName);
+        validateNonEmptyString(previousArchiveFileName, "previousArchiveFileName", METHOD);
+        File previousFile = FileUtils.getCanonicalFile(previousArchiveFileName);
+        validateExistingFile(previousFile, "previousArchiveFileName", getArchiveFileName(), METHOD);
+
+        closePreviousArchive();
+        try {
+            // This archive file is rewritten when the changes are committed, so read the binaries from a copy.
+            //
+            if (previousFile.equals(FileUtils.getCanonicalFile(getArchiveFileName()))) {
+                previousArchiveCopy = File.createTempFile("wdt-previous-", ".zip", previousFile.getParentFile());
+                previousArchiveCopy.deleteOnExit();
+                Files.copy(previousFile.toPath(), previousArchiveCopy.toPath(), StandardCopyOption.REPLACE_EXISTING);
+                previousFile = previousArchiveCopy;
+            }
+
+            ArchiveManifest previous = null;
+            try (ZipFile previousZipFile = new ZipFile(previousFile)) {
+                ZipEntry manifestEntry = previousZipFile.getEntry(ARCHIVE_MANIFEST_ENTRY);
+                if (manifestEntry != null) {
+                    try (InputStream input = previousZipFile.getInputStream(manifestEntry)) {
+                        previous = ArchiveManifest.load(input);
+                    }
+                }
+            }
+            ZipFileAppender reader = new ZipFileAppender(previousFile);
+            if (previous == null || previous.isEmpty()) {
+                LOGGER.info("WLSDPLY-01434", previousArchiveFileName, getArchiveFileName());
+            } else if (!reader.load()) {
+                LOGGER.info("WLSDPLY-01435", previousArchiveFileName, getArchiveFileName());
+            } else {
+                previousManifest = previous;
+                previousArchive = reader;
+            }
+        } catch (IOException | IllegalArgumentException e) {
+            closePreviousArchive();
+            WLSDeployArchiveIOException aioe = new WLSDeployArchiveIOException("WLSDPLY-01436", e,
+                previousArchiveFileName, e.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, aioe);
+            throw aioe;
+        }
+        if (previousArchive == null) {
+            closePreviousArchive();
+        }
+        LOGGER.exiting(CLASS, METHOD);
     }
 
     /**
      * Closes the underlying zip file and any open streams.
      */
     public void close() {
+        if (getZipFile() == null || !getZipFile().isBatchInProgress()) {
+            closePreviousArchive();
+        }
         if (getZipFile() != null) {
+            if (manifestChanged && !getZipFile().isBatchInProgress()) {
+                try {
+                    writeManifest();
+                } catch (WLSDeployArchiveIOException aioe) {
+                    LOGGER.warning("WLSDPLY-01428", aioe, getArchiveFileName(), aioe.getLocalizedMessage());
+                }
+            }
             getZipFile().close();
         }
     }
@@ -919,6 +1240,12 @@ public class WLSDeployArchive {
         return zipFile;
     }
 
+    // The archive's canonical path, size and modification time are part of the hash cache key of its entries.
+    //
+    private File getCanonicalArchiveFile() {
+        return FileUtils.getCanonicalFile(getArchiveFileName());
+    }
+
     protected void setZipFile(WLSDeployZipFile zipFile) {
         this.zipFile = zipFile;
     }
@@ -960,10 +1287,18 @@ public class WLSDeployArchive {
                 newName += ZIP_SEP;
             }
             LOGGER.finer("WLSDPLY-01408", newName, itemToAdd);
-            newName = getZipFile().addDirectoryZipEntries(newName, itemToAdd);
+            Map<String, ArchiveManifest.Record> records = new LinkedHashMap<>();
+            newName = getZipFile().addDirectoryZipEntries(newName, itemToAdd, ArchiveManifest.getEntryType(newName),
+                records);
             LOGGER.finer("WLSDPLY-01409", newName, itemToAdd);
+            if (newName != null) {
+                for (Map.Entry<String, ArchiveManifest.Record> record : records.entrySet()) {
+                    getManifest().addRecord(record.getKey(), record.getValue());
+                }
+                manifestChanged = true;
+            }
         } else {
-            newName = addSingleFileToZip(itemToAdd, newName, METHOD);
+            newName = addSingleFileToZip(itemToAdd, newName, ArchiveManifest.getEntryType(newName), METHOD);
         }
         LOGGER.exiting(CLASS, METHOD, newName);
         return newName;
@@ -979,7 +1314,7 @@ public class WLSDeployArchive {
             newName += ZIP_SEP;
         }
         newName += preferredFileName;
-        newName = addSingleFileToZip(itemToAdd, newName, METHOD);
+        newName = addSingleFileToZip(itemToAdd, newName, ArchiveManifest.TYPE_DEPLOYMENT_PLAN, METHOD);
         LOGGER.exiting(CLASS, METHOD, newName);
         return newName;
     }
@@ -1018,7 +1353,7 @@ public class WLSDeployArchive {
 
             fos = new FileOutputStream(tmpFile);
             copyFile(is, fos);
-            newName = addSingleFileToZip(tmpFile, newName, METHOD);
+            newName = addSingleFileToZip(tmpFile, newName, ArchiveManifest.getEntryType(newName), METHOD);
         } catch (IOException ioe) {
             WLSDeployArchiveIOException aioe =
                 new WLSDeployArchiveIOException("WLSDPLY-01410", ioe, url, ioe.getLocalizedMessage());
@@ -1069,46 +1404,35 @@ public class WLSDeployArchive {
         if (!dirName.endsWith(ZIP_SEP)) {
             dirName += ZIP_SEP;
         }
-        Map<String, InputStream> zipEntries = getZipFile().getZipEntries(dirName);
-        FileOutputStream outputStream;
-        File targetFile = null;
         try {
-            if (zipEntries != null && !zipEntries.isEmpty()) {
-                for (Map.Entry<String, InputStream> zipEntry : zipEntries.entrySet()) {
-                    String entryName = zipEntry.getKey();
-                    String targetFileName = entryName.replace(fromDirectoryName + ZIP_SEP, toDirectoryName + SEP);
-                    targetFile = new File(extractToLocation, targetFileName);
-                    File targetDirectory;
-                    if (entryName.endsWith(ZIP_SEP)) {
-                        targetDirectory = targetFile;
-                    } else {
-                        targetDirectory = targetFile.getParentFile();
-                    }
-                    if (!targetDirectory.exists() && !targetDirectory.mkdirs()) {
-                        WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01414",
-                            getArchiveFileName(), targetDirectory.getAbsolutePath());
-                        LOGGER.throwing(CLASS, METHOD, wdaioe);
-                        throw wdaioe;
-                    }
+            // each file is streamed straight into the target directory tree, one entry at a time
+            //
+            for (String entryName : getZipFile().listZipEntries(dirName)) {
+                String targetFileName = entryName.replace(fromDirectoryName + ZIP_SEP, toDirectoryName + SEP);
+                File targetFile = new File(extractToLocation, targetFileName);
+                File targetDirectory;
+                if (entryName.endsWith(ZIP_SEP)) {
+                    targetDirectory = targetFile;
+                } else {
+                    targetDirectory = targetFile.getParentFile();
+                }
+                if (!targetDirectory.exists() && !targetDirectory.mkdirs()) {
+                    WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01414",
+                        getArchiveFileName(), targetDirectory.getAbsolutePath());
+                    LOGGER.throwing(CLASS, METHOD, wdaioe);
+                    throw wdaioe;
+                }
 
-                    // no need to copy a directory entry
-                    //
-                    if (!entryName.endsWith(ZIP_SEP)) {
-                        InputStream inputStream = zipEntry.getValue();
-                        // overwrite any existing file
-                        outputStream = new FileOutputStream(targetFile, false);
-                        copyFile(inputStream, outputStream);
-                        outputStream.close();
-                    }
+                // no need to copy a directory entry
+                //
+                if (!entryName.endsWith(ZIP_SEP)) {
+                    extractEntry(entryName, targetFile, false);
                 }
             }
-        } catch (IOException ioe) {
-            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01415", ioe,
-                getArchiveFileName(), targetFile.getAbsolutePath(), ioe.getLocalizedMessage());
-            LOGGER.throwing(CLASS, METHOD, wdaioe);
-            throw wdaioe;
+        } catch (WLSDeployArchiveIOException aioe) {
+            LOGGER.throwing(CLASS, METHOD, aioe);
+            throw aioe;
         } finally {
-            closeMapInputStreams(zipEntries);
             getZipFile().close();
         }
         LOGGER.exiting(CLASS, METHOD);
@@ -1124,14 +1448,6 @@ public class WLSDeployArchive {
         final String METHOD = "extractFileFromZip";
 
         LOGGER.entering(CLASS, METHOD, itemToExtract, fromDir, toDir, extractToLocation);
-        InputStream inputStream = getZipFile().getZipEntry(itemToExtract);
-        if (inputStream == null) {
-            WLSDeployArchiveIOException wdaioe =
-                new WLSDeployArchiveIOException("WLSDPLY-01416", getArchiveFileName(), itemToExtract);
-            LOGGER.throwing(CLASS, METHOD, wdaioe);
-            throw wdaioe;
-        }
-
         String targetFileName = itemToExtract.replace(fromDir + ZIP_SEP, toDir + SEP);
         File targetFile = new File(extractToLocation, targetFileName);
         File targetDirectory = targetFile.getParentFile();
@@ -1141,20 +1457,12 @@ public class WLSDeployArchive {
             LOGGER.throwing(CLASS, METHOD, wdaioe);
             throw wdaioe;
         }
-        // overwrite any existing file
-        try (FileOutputStream outputStream = new FileOutputStream(targetFile, false)) {
-            copyFile(inputStream, outputStream);
-        } catch (IOException ioe) {
-            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01415", ioe,
-                getArchiveFileName(), targetFile.getAbsolutePath(), ioe.getLocalizedMessage());
-            LOGGER.throwing(CLASS, METHOD, wdaioe);
-            throw wdaioe;
+        try {
+            extractEntry(itemToExtract, targetFile, true);
+        } catch (WLSDeployArchiveIOException aioe) {
+            LOGGER.throwing(CLASS, METHOD, aioe);
+            throw aioe;
         } finally {
-            try {
-                inputStream.close();
-            } catch (IOException ignore) {
-                LOGGER.warning("WLSDPLY-01417", ignore, itemToExtract, ignore.getLocalizedMessage());
-            }
             getZipFile().close();
         }
         LOGGER.exiting(CLASS, METHOD);
@@ -1190,32 +1498,300 @@ public class WLSDeployArchive {
         }
     }
 
-    private static void closeMapInputStreams(Map<String, InputStream> map) {
-        if (map != null) {
-            for (Map.Entry<String, InputStream> entry : map.entrySet()) {
-                InputStream stream = entry.getValue();
+    // Extracted binaries can be very large, so they are copied through a reused buffer much larger than
+    // the one used for other copies.
+    //
+    private static void copyEntry(InputStream input, FileOutputStream output) throws IOException {
+        byte[] readBuffer = EXTRACT_BUFFER.get();
+
+        int bytesRead;
+        while ((bytesRead = input.read(readBuffer)) >= 0) {
+            output.write(readBuffer, 0, bytesRead);
+        }
+    }
+
+    private static int getDefaultExtractThreads() {
+        return Math.min(Runtime.getRuntime().availableProcessors(), MAX_EXTRACT_THREADS);
+    }
+
+    // Maps the archive path to the entries to write, applying the same leading directory stripping
+    // as extractFile().
+    //
+    private void addExtractTasks(List<ExtractTask> tasks, ArchiveExtractResult result, File extractToLocation,
+        boolean stripLeadingPathDirectories) throws WLSDeployArchiveIOException {
+        String path = result.getPath();
+        String targetName = path;
+        String dirToStrip = null;
+        if (stripLeadingPathDirectories) {
+            String tmp = path;
+            if (path.endsWith(ZIP_SEP)) {
+                tmp = path.substring(0, path.length() - 1);
+            }
+            int lastSlash = tmp.lastIndexOf('/');
+            if (lastSlash == -1) {
+                result.setError(new WLSDeployArchiveIOException("WLSDPLY-01402", path, getArchiveFileName()));
+                return;
+            }
+            dirToStrip = tmp.substring(0, lastSlash + 1);
+            targetName = path.substring(lastSlash + 1);
+        }
+        result.setExtractedFileName(
+            FileUtils.getCanonicalFile(new File(extractToLocation, targetName)).getAbsolutePath());
+
+        List<String> entryNames;
+        if (path.endsWith(ZIP_SEP)) {
+            entryNames = getZipFile().listZipEntries(path);
+        } else {
+            entryNames = Collections.singletonList(path);
+        }
+        for (String entryName : entryNames) {
+            String entryTargetName = entryName;
+            if (dirToStrip != null) {
+                entryTargetName = entryName.substring(dirToStrip.length());
+            }
+            tasks.add(new ExtractTask(entryName, new File(extractToLocation, entryTargetName), result));
+        }
+    }
+
+    // Entries are inflated on a bounded pool.  The streams all come from the one open ZipFile, which
+    // serializes the raw reads but lets the inflation and file writes run in parallel.
+    //
+    private void runExtractTasks(List<ExtractTask> tasks, int maxThreads) {
+        int threads = Math.max(1, Math.min(maxThreads, tasks.size()));
+        LOGGER.fine("WLSDPLY-01430", getArchiveFileName(), tasks.size(), threads);
+        if (threads == 1) {
+            for (ExtractTask task : tasks) {
+                task.call();
+            }
+            return;
+        }
+
+        ExecutorService executor = Executors.newFixedThreadPool(threads, new ThreadFactory() {
+            @Override
+            public Thread newThread(Runnable runnable) {
+                Thread thread = new Thread(runnable, "wlsdeploy-archive-extract");
+                thread.setDaemon(true);
+                return thread;
+            }
+        });
+        try {
+            for (Future<Void> future : executor.invokeAll(tasks)) {
+                future.get();
+            }
+        } catch (InterruptedException ie) {
+            Thread.currentThread().interrupt();
+            for (ExtractTask task : tasks) {
+                task.result.setError(new WLSDeployArchiveIOException("WLSDPLY-01431", ie, getArchiveFileName(),
+                    ie.getLocalizedMessage()));
+            }
+        } catch (ExecutionException ee) {
+            // ExtractTask records its own failures so this is not expected
+            LOGGER.warning("WLSDPLY-01432", ee.getCause(), getArchiveFileName(), ee.getCause().getLocalizedMessage());
+        } finally {
+            executor.shutdownNow();
+        }
+    }
+
+    private final class ExtractTask implements Callable<Void> {
+        private final String entryName;
+        private final File targetFile;
+        private final ArchiveExtractResult result;
+
+        private ExtractTask(String entryName, File targetFile, ArchiveExtractResult result) {
+            this.entryName = entryName;
+            this.targetFile = targetFile;
+            this.result = result;
+        }
+
+        @Override
+        public Void call() {
+            try {
+                extract();
+            } catch (WLSDeployArchiveIOException aioe) {
+                result.setError(aioe);
+            } catch (RuntimeException re) {
+                result.setError(new WLSDeployArchiveIOException("WLSDPLY-01432", re, getArchiveFileName(),
+                    re.getLocalizedMessage()));
+            }
+            return null;
+        }
+
+        private void extract() throws WLSDeployArchiveIOException {
+            boolean isDirectory = entryName.endsWith(ZIP_SEP);
+            File targetDirectory = isDirectory ? targetFile : targetFile.getParentFile();
+            // another task may create the same directory at the same time
+            if (!targetDirectory.mkdirs() && !targetDirectory.isDirectory()) {
+                throw new WLSDeployArchiveIOException("WLSDPLY-01414", getArchiveFileName(),
+                    targetDirectory.getAbsolutePath());
+            }
+            if (!isDirectory) {
+                // only a single file is worth caching, not each file of an exploded directory
+                extractEntry(entryName, targetFile, !result.getPath().endsWith(ZIP_SEP));
+            }
+        }
+    }
+
+    // Writes the entry straight to its final location, overwriting any existing file, unless the file already
+    // holds the content recorded for the entry.  When cacheHash is set, the hash of the file is cached so that
+    // deployment does not read it again to decide whether the binary changed.  The files of an exploded
+    // directory are not cached, since deployment never hashes them and they would only evict useful entries.
+    // The zip file is shared by the extract tasks, so it is only used while holding its lock.
+    //
+    private void extractEntry(String entryName, File targetFile, boolean cacheHash)
+        throws WLSDeployArchiveIOException {
+        final String METHOD = "extractEntry";
+
+        String expectedHash = null;
+        synchronized (getZipFile()) {
+            ZipEntry entry = getZipFile().getZipEntryMetadata(entryName);
+            if (entry != null && targetFile.isFile() && targetFile.length() == entry.getSize()) {
+                expectedHash = getManifest().getVerifiedDigest(entryName, entry);
+                if (expectedHash == null && entry.getCrc() != -1) {
+                    expectedHash = FileHashCache.getEntryHash(getCanonicalArchiveFile(), entryName, entry.getCrc(),
+                        entry.getSize());
+                }
+            }
+        }
+        if (expectedHash != null) {
+            try {
+                if (expectedHash.equals(computeTargetHash(targetFile, cacheHash))) {
+                    LOGGER.fine("WLSDPLY-01439", entryName, getArchiveFileName(), targetFile.getAbsolutePath());
+                    return;
+                }
+            } catch (IOException | NoSuchAlgorithmException e) {
+                LOGGER.fine("WLSDPLY-01440", targetFile.getAbsolutePath(), entryName, e.getLocalizedMessage());
+            }
+        }
+
+        InputStream inputStream;
+        synchronized (getZipFile()) {
+            inputStream = getZipFile().getZipEntry(entryName);
+        }
+        if (inputStream == null) {
+            WLSDeployArchiveIOException aioe =
+                new WLSDeployArchiveIOException("WLSDPLY-01416", getArchiveFileName(), entryName);
+            LOGGER.throwing(CLASS, METHOD, aioe);
+            throw aioe;
+        }
+        try {
+            MessageDigest messageDigest = MessageDigest.getInstance(HASH_ALGORITHM);
+            try (FileOutputStream outputStream = new FileOutputStream(targetFile, false)) {
+                copyEntry(new DigestInputStream(inputStream, messageDigest), outputStream);
+            }
+            if (cacheHash) {
+                FileHashCache.putFileHash(FileUtils.getCanonicalFile(targetFile),
+                    DatatypeConverter.printBase64Binary(messageDigest.digest()));
+            }
+        } catch (IOException | NoSuchAlgorithmException e) {
+            WLSDeployArchiveIOException aioe = new WLSDeployArchiveIOException("WLSDPLY-01415", e,
+                getArchiveFileName(), targetFile.getAbsolutePath(), e.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, aioe);
+            throw aioe;
+        } finally {
+            try {
+                inputStream.close();
+            } catch (IOException ignore) {
+                LOGGER.warning("WLSDPLY-01417", ignore, entryName, ignore.getLocalizedMessage());
+            }
+        }
+    }
+
+    private static String computeTargetHash(File targetFile, boolean cacheHash)
+        throws IOException, NoSuchAlgorithmException {
+        if (cacheHash) {
+            return FileUtils.computeHash(targetFile);
+        }
+        try (FileInputStream inputStream = new FileInputStream(targetFile)) {
+            return FileUtils.computeHash(inputStream);
+        }
+    }
+
+    private ArchiveManifest getManifest() throws WLSDeployArchiveIOException {
+        if (manifest == null) {
+            InputStream input = getZipFile().getZipEntry(ARCHIVE_MANIFEST_ENTRY);
+            if (input != null) {
                 try {
-                    if (stream != null) {
-                        stream.close();
+                    manifest = ArchiveManifest.load(input);
+                } catch (IOException | IllegalArgumentException e) {
+                    LOGGER.warning("WLSDPLY-01426", e, getArchiveFileName(), e.getLocalizedMessage());
+                } finally {
+                    try {
+                        input.close();
+                    } catch (IOException ignore) {
+                        LOGGER.warning("WLSDPLY-01417", ignore, ARCHIVE_MANIFEST_ENTRY, ignore.getLocalizedMessage());
                     }
-                } catch (IOException ignore) {
-                    // we are just trying to cleanup so ignore this error
-                    LOGGER.warning("WLSDPLY-01417", ignore, entry.getKey(), ignore.getLocalizedMessage());
                 }
             }
+            if (manifest == null) {
+                manifest = new ArchiveManifest();
+            }
         }
+        return manifest;
     }
 
-    private String addSingleFileToZip(File itemToAdd, String preferredName, String callingMethod)
+    private String addSingleFileToZip(File itemToAdd, String preferredName, String entryType, String callingMethod)
         throws WLSDeployArchiveIOException {
 
+        // The previous archive lookup and the duplicate check need the digest before the file is added, so
+        // only then is the file read up front, and that digest also serves the manifest.  A file that was hashed
+        // at its current size and modification time and is in the previous archive is not read at all.  In all
+        // other cases, the manifest record is computed while the file is copied into the archive.
+        //
+        ArchiveManifest.Record record = null;
+        String previousName = null;
+        File canonicalItem = FileUtils.getCanonicalFile(itemToAdd);
+        if (previousManifest != null) {
+            String cachedHash = FileHashCache.getFileHash(canonicalItem);
+            if (cachedHash != null) {
+                previousName = findPreviousEntry(preferredName,
+                    previousManifest.findEntries(entryType, canonicalItem.length(), cachedHash));
+                if (previousName != null) {
+                    record = previousManifest.getRecord(previousName);
+                }
+            }
+        }
+        if (record == null && (previousManifest != null || deduplicateBinaries)) {
+            try {
+                record = ArchiveManifest.describeFile(entryType, itemToAdd);
+                if (previousManifest != null) {
+                    // only the hash of a single file is cached, never those of an exploded directory, and it
+                    // is saved along with the rest of the cache when the tool exits
+                    FileHashCache.putFileHash(canonicalItem, record.getDigest());
+                    previousName = findPreviousEntry(preferredName, previousManifest.findEntries(record));
+                }
+            } catch (IOException | NoSuchAlgorithmException e) {
+                LOGGER.warning("WLSDPLY-01427", e, getArchiveFileName(), preferredName, e.getLocalizedMessage());
+            }
+        }
+        if (deduplicateBinaries && record != null) {
+            String existingName = findDuplicateEntry(preferredName, record);
+            if (existingName != null) {
+                LOGGER.fine("WLSDPLY-01433", itemToAdd, existingName, getArchiveFileName());
+                return existingName;
+            }
+        }
+
+        CompressedEntry previousEntry = getPreviousEntry(previousName, preferredName, record);
         String newName = null;
         FileInputStream inputStream = null;
         try {
-            inputStream = getFileInputStream(itemToAdd, preferredName, getArchiveFileName(), callingMethod);
-            LOGGER.finer("WLSDPLY-01418", preferredName, itemToAdd);
-            newName = getZipFile().addZipEntry(preferredName, inputStream, true);
+            if (previousEntry != null) {
+                LOGGER.finer("WLSDPLY-01437", itemToAdd, previousName, preferredName);
+                newName = getZipFile().addCompressedZipEntry(preferredName, previousEntry, true);
+            } else {
+                inputStream = getFileInputStream(itemToAdd, preferredName, getArchiveFileName(), callingMethod,
+                    record == null ? entryType : null);
+                LOGGER.finer("WLSDPLY-01418", preferredName, itemToAdd);
+                newName = getZipFile().addZipEntry(preferredName, inputStream, true);
+                if (inputStream instanceof ArchiveManifest.RecordingInputStream) {
+                    record = ((ArchiveManifest.RecordingInputStream) inputStream).getRecord();
+                }
+            }
             LOGGER.finer("WLSDPLY-01419", newName, itemToAdd);
+            if (newName != null && record != null) {
+                getManifest().addRecord(newName, record);
+                manifestChanged = true;
+            }
         } finally {
             if (inputStream != null) {
                 try {
@@ -1228,6 +1804,65 @@ public class WLSDeployArchive {
         return newName;
     }
 
+    private static String findPreviousEntry(String preferredName, List<String> candidates) {
+        String fileName = getOriginalFileName(preferredName);
+        for (String entryName : candidates) {
+            if (fileName.equals(getOriginalFileName(entryName))) {
+                return entryName;
+            }
+        }
+        return null;
+    }
+
+    // The bytes in the previous archive must still match its manifest record, or the file is added as usual.
+    //
+    private CompressedEntry getPreviousEntry(String previousName, String preferredName,
+        ArchiveManifest.Record record) {
+        if (previousName == null || record == null) {
+            return null;
+        }
+        CompressedEntry result = null;
+        try {
+            result = previousArchive.getCompressedEntry(previousName, preferredName);
+        } catch (IOException ioe) {
+            LOGGER.fine("WLSDPLY-01438", previousName, ioe.getLocalizedMessage());
+        }
+        if (result != null && (result.getCrc() != record.getCrc() || result.getSize() != record.getSize())) {
+            result = null;
+        }
+        return result;
+    }
+
+    private void closePreviousArchive() {
+        previousManifest = null;
+        previousArchive = null;
+        if (previousArchiveCopy != null) {
+            if (!previousArchiveCopy.delete()) {
+                LOGGER.finest("WLSDPLY-01557", previousArchiveCopy.getAbsolutePath());
+            }
+            previousArchiveCopy = null;
+        }
+    }
+
+    // Only an entry with the same file name, or a renamed copy of it, is reused so that the file keeps its
+    // name when it is extracted.  The entry must still hold the recorded content: staged entries were written
+    // from the recorded file in this batch, and the others are checked against the central directory.
+    //
+    private String findDuplicateEntry(String preferredName, ArchiveManifest.Record record)
+        throws WLSDeployArchiveIOException {
+        String fileName = getOriginalFileName(preferredName);
+        for (String entryName : getManifest().findEntries(record)) {
+            if (!fileName.equals(getOriginalFileName(entryName))) {
+                continue;
+            }
+            if (getZipFile().isStagedEntry(entryName) ||
+                getManifest().getVerifiedDigest(entryName, getZipFile().getZipEntryMetadata(entryName)) != null) {
+                return entryName;
+            }
+        }
+        return null;
+    }
+
     ///////////////////////////////////////////////////////////////////////////
     // Private Static Helper Methods                                         //
     ///////////////////////////////////////////////////////////////////////////
@@ -1236,6 +1871,11 @@ public class WLSDeployArchive {
         validateExistingFile(file, argName, fileName, callingMethod, false);
     }
 
+    private static String getOriginalFileName(String entryName) {
+        String fileName = entryName.substring(entryName.lastIndexOf(ZIP_SEP) + 1);
+        return RENAMED_FILE_PATTERN.matcher(fileName).replaceFirst("$1$2");
+    }
+
     private static void validateExistingFile(File file, String argName, String fileName, String callingMethod,
         boolean allowDirectories) {
         final String METHOD = "validateExistingFile";
@@ -1310,11 +1950,23 @@ public class WLSDeployArchive {
         LOGGER.exiting(CLASS, METHOD);
     }
 
-    private static FileInputStream getFileInputStream(File f, String itemName, String archiveName, String callingMethod)
-        throws WLSDeployArchiveIOException {
-        FileInputStream inputStream;
+    // With an entry type, the stream also computes the manifest record of the file as it is read.  Without the
+    // hashing algorithm the file is still added, it just has no record.
+    //
+    private static FileInputStream getFileInputStream(File f, String itemName, String archiveName, String callingMethod,
+        String entryType) throws WLSDeployArchiveIOException {
+        FileInputStream inputStream = null;
         try {
-            inputStream = new FileInputStream(f);
+            if (entryType != null) {
+                try {
+                    inputStream = new ArchiveManifest.RecordingInputStream(entryType, f);
+                } catch (NoSuchAlgorithmException nsae) {
+                    LOGGER.warning("WLSDPLY-01427", nsae, archiveName, itemName, nsae.getLocalizedMessage());
+                }
+            }
+            if (inputStream == null) {
+                inputStream = new FileInputStream(f);
+            }
         } catch (IOException ioe) {
             WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01425", ioe, archiveName,
                 f.getAbsolutePath(), itemName, ioe.getLocalizedMessage());
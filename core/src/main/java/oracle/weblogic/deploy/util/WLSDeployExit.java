@@ -35,6 +35,7 @@ public class WLSDeployExit {
         String METHOD = "exit";
         LOGGER.entering(errorCode, CLASS, METHOD);
         logCleanup(deployContext);
+        FileHashCache.flush();
         LOGGER.exiting(CLASS, METHOD);
         exit(errorCode);
     }
@@ -9,15 +9,21 @@ import java.io.FileInputStream;
 import java.io.FileOutputStream;
 import java.io.IOException;
 import java.io.InputStream;
+import java.nio.channels.FileChannel;
 import java.nio.file.Files;
 import java.nio.file.Path;
+import java.security.NoSuchAlgorithmException;
 import java.util.ArrayList;
+import java.util.Collection;
+import java.util.Collections;
 import java.util.Enumeration;
 import java.util.Iterator;
 import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
+import java.util.TreeMap;
 import java.util.regex.Pattern;
+import java.util.zip.Deflater;
 import java.util.zip.ZipEntry;
 import java.util.zip.ZipFile;
 import java.util.zip.ZipOutputStream;
@@ -25,6 +31,7 @@ import java.util.zip.ZipOutputStream;
 import oracle.weblogic.deploy.exception.ExceptionHelper;
 import oracle.weblogic.deploy.logging.PlatformLogger;
 import oracle.weblogic.deploy.logging.WLSDeployLogFactory;
+import oracle.weblogic.deploy.util.ZipEntryCompressor.CompressedEntry;
 
 /**
  * The internal class that does the heavy-lifting with zip files for the WLSDeployArchive class.
@@ -52,6 +59,33 @@ public class WLSDeployZipFile {
     private ZipFile openZipFile;
     private boolean newFile;
 
+    // In-memory index of the central directory, built once from the open read handle and
+    // discarded only when this class writes the zip file (or the file changes on disk).
+    //
+    private LinkedHashMap<String, ZipEntry> entryIndex;
+    private List<String> entryIndexNames;
+    private TreeMap<String, Integer> sortedEntryIndex;
+    private long entryIndexFileLength;
+    private long entryIndexFileModified;
+
+    // Batch state.  While a batch is in progress, changes are applied to the entry index only and the
+    // content of new entries is spooled to a scratch zip file until commit() writes the zip file once.
+    //
+    private int batchDepth;
+    private boolean batchChanged;
+    private boolean batchCompact;
+    private LinkedHashMap<String, String> batchStagedEntries;
+    private LinkedHashMap<String, CompressedEntry> batchCopiedEntries;
+    private File batchSpoolFile;
+    private ZipOutputStream batchSpoolStream;
+    private int batchSpoolCount;
+
+    // When set, new entries are compressed in parallel before the zip file is written, including the entries
+    // spooled during a batch when it is committed, and entries that are already compressed are stored rather
+    // than deflated again.
+    //
+    private boolean compressAhead;
+
     //////////////////////////////////////////////////////////////////////////////////////////////////
     // Public APIs                                                                                  //
     //////////////////////////////////////////////////////////////////////////////////////////////////
@@ -101,37 +135,53 @@ public class WLSDeployZipFile {
         final String METHOD = "getZipEntry";
 
         LOGGER.entering(CLASS, METHOD, key);
-        closeOpenZipFile();
 
-        LinkedHashMap<String, ZipEntry> map = getZipFileEntries(getFile());
+        Map<String, ZipEntry> map = getEntryIndex();
         InputStream stream = null;
-        boolean leaveOpen = false;
         try {
-            if (map.containsKey(key)) {
+            if (isStagedEntry(key)) {
+                LOGGER.finer("WLSDPLY-01549", getFileName(), key);
+            } else if (map.containsKey(key)) {
                 LOGGER.finer("WLSDPLY-01500", getFileName(), key);
-                openZipFile = new ZipFile(getFile(), ZIP_FILE_OPEN_MODE);
                 ZipEntry ze = new ZipEntry(key);
                 sanitizeZipEntry(ze);
-                stream = openZipFile.getInputStream(ze);
-                leaveOpen = true;
+                stream = getReadZipFile().getInputStream(ze);
                 LOGGER.finer("WLSDPLY-01501", getFileName(), ze.getName(), stream.toString());
             } else {
                 LOGGER.finer("WLSDPLY-01502", getFileName(), key);
             }
         } catch (IOException ioe) {
+            closeOpenZipFile();
             WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01503", ioe,
                 getFileName(), ioe.getLocalizedMessage());
             LOGGER.throwing(CLASS, METHOD, wdaioe);
             throw wdaioe;
-        } finally {
-            if (!leaveOpen && openZipFile != null) {
-                closeOpenZipFile();
-            }
         }
         LOGGER.exiting(CLASS, METHOD, stream);
         return stream;
     }
 
+    /**
+     * Get the central directory metadata (size, CRC, and so on) for an entry without opening its content.
+     *
+     * @param key entry name
+     * @return the entry metadata, or null if the entry does not exist or cannot be read yet
+     * @throws WLSDeployArchiveIOException if an error occurs while reading the zip file
+     */
+    public ZipEntry getZipEntryMetadata(String key) throws WLSDeployArchiveIOException {
+        final String METHOD = "getZipEntryMetadata";
+
+        LOGGER.entering(CLASS, METHOD, key);
+
+        ZipEntry result = null;
+        Map<String, ZipEntry> map = getEntryIndex();
+        if (!isStagedEntry(key)) {
+            result = map.get(key);
+        }
+        LOGGER.exiting(CLASS, METHOD, result);
+        return result;
+    }
+
     /**
      * Get the list of entries in the zip file.
      *
@@ -142,16 +192,15 @@ public class WLSDeployZipFile {
         final String METHOD = "listZipEntries";
 
         LOGGER.entering(CLASS, METHOD);
-        closeOpenZipFile();
 
-        Map<String, ZipEntry> zipEntries = getZipFileEntries(file);
-        List<String> result = new ArrayList<>(zipEntries.keySet());
+        List<String> result = new ArrayList<>(getEntryIndex().keySet());
         LOGGER.exiting(CLASS, METHOD, result);
         return result;
     }
 
     /**
-     * Get the list of entries in the zip file that start with the specified prefix.
+     * Get the list of entries in the zip file that start with the specified prefix.  The lookup is
+     * a range query on the sorted entry index so only the matching entries are visited.
      *
      * @param prefix the prefix to use as a filter
      * @return the list of zip file entries that match the prefix
@@ -161,15 +210,8 @@ public class WLSDeployZipFile {
         final String METHOD = "listZipEntries";
 
         LOGGER.entering(CLASS, METHOD, prefix);
-        closeOpenZipFile();
 
-        Map<String, ZipEntry> zipEntries = getZipFileEntries(file);
-        List<String> result = new ArrayList<>();
-        for (String name : zipEntries.keySet()) {
-            if (name.startsWith(prefix)) {
-                result.add(name);
-            }
-        }
+        List<String> result = getEntryNamesWithPrefix(prefix);
         LOGGER.exiting(CLASS, METHOD, result);
         return result;
     }
@@ -185,29 +227,22 @@ public class WLSDeployZipFile {
         final String METHOD = "getZipEntries";
 
         LOGGER.entering(CLASS, METHOD);
-        closeOpenZipFile();
 
-        LinkedHashMap<String, ZipEntry> map = getZipFileEntries(getFile());
+        Map<String, ZipEntry> map = getEntryIndex();
         LinkedHashMap<String, InputStream> zipEntries = new LinkedHashMap<>();
-        boolean leaveOpen = false;
         try {
             if (!map.isEmpty()) {
                 LOGGER.finer("WLSDPLY-01504", getFileName(), map.size());
-                openZipFile = new ZipFile(getFile(), ZIP_FILE_OPEN_MODE);
                 for (String key : map.keySet()) {
                     addEntryToMap(map, zipEntries, key);
                 }
-                leaveOpen = true;
             }
         } catch (IOException ioe) {
+            closeOpenZipFile();
             WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01503", ioe,
                 getFileName(), ioe.getLocalizedMessage());
             LOGGER.throwing(CLASS, METHOD, wdaioe);
             throw wdaioe;
-        } finally {
-            if (!leaveOpen && openZipFile != null) {
-                closeOpenZipFile();
-            }
         }
         LOGGER.exiting(CLASS, METHOD, zipEntries);
         return zipEntries;
@@ -226,33 +261,22 @@ public class WLSDeployZipFile {
         final String METHOD = "getZipEntries";
 
         LOGGER.entering(CLASS, METHOD, key);
-        closeOpenZipFile();
 
-        LinkedHashMap<String, ZipEntry> map = getZipFileEntries(getFile());
+        Map<String, ZipEntry> map = getEntryIndex();
         LinkedHashMap<String, InputStream> zipEntries = new LinkedHashMap<>();
-        boolean leaveOpen = false;
         try {
             if (!map.isEmpty()) {
                 LOGGER.finer("WLSDPLY-01504", getFileName(), map.size());
-                openZipFile = new ZipFile(getFile(), ZIP_FILE_OPEN_MODE);
-                Iterator<String> savedKeys = map.keySet().iterator();
-                while (savedKeys.hasNext()) {
-                    String savedKey = savedKeys.next();
-                    if (savedKey.startsWith(key)) {
-                        addEntryToMap(map, zipEntries, savedKey);
-                    }
+                for (String savedKey : getEntryNamesWithPrefix(key)) {
+                    addEntryToMap(map, zipEntries, savedKey);
                 }
-                leaveOpen = true;
             }
         } catch (IOException ioe) {
+            closeOpenZipFile();
             WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01503", ioe,
                 getFileName(), ioe.getLocalizedMessage());
             LOGGER.throwing(CLASS, METHOD, wdaioe);
             throw wdaioe;
-        } finally {
-            if (!leaveOpen && openZipFile != null) {
-                closeOpenZipFile();
-            }
         }
         LOGGER.exiting(CLASS, METHOD, zipEntries);
         return zipEntries;
@@ -269,10 +293,10 @@ public class WLSDeployZipFile {
         final String METHOD = "removeZipEntry";
 
         LOGGER.entering(CLASS, METHOD, key);
-        closeOpenZipFile();
+        prepareForUpdate();
 
         boolean removedEntry = false;
-        LinkedHashMap<String, ZipEntry> map = getZipFileEntries(getFile());
+        LinkedHashMap<String, ZipEntry> map = getZipFileEntries();
         if (map.containsKey(key)) {
             LOGGER.finer("WLSDPLY-01500", getFileName(), key);
             map.remove(key);
@@ -298,10 +322,10 @@ public class WLSDeployZipFile {
         final String METHOD = "removeZipEntries";
 
         LOGGER.entering(CLASS, METHOD, key);
-        closeOpenZipFile();
+        prepareForUpdate();
 
         boolean removedEntry = false;
-        LinkedHashMap<String, ZipEntry> entriesMap = getZipFileEntries(getFile());
+        LinkedHashMap<String, ZipEntry> entriesMap = getZipFileEntries();
         if (!entriesMap.isEmpty()) {
             ArrayList<String> matchingKeys = getMatchingKeysFromMap(entriesMap, key);
             if (!matchingKeys.isEmpty()) {
@@ -334,7 +358,7 @@ public class WLSDeployZipFile {
         final String METHOD = "addZipEntry";
 
         LOGGER.entering(CLASS, METHOD, entryName, inputStream, rename);
-        closeOpenZipFile();
+        prepareForUpdate();
 
         String newEntryName = entryName;
         if (rename && isRenameNecessary(newEntryName)) {
@@ -363,10 +387,10 @@ public class WLSDeployZipFile {
         final String METHOD = "addZipEntry";
 
         LOGGER.entering(CLASS, METHOD, key, inputStream);
-        closeOpenZipFile();
+        prepareForUpdate();
 
         boolean addedEntry = true;
-        LinkedHashMap<String, ZipEntry> zipEntriesMap = getZipFileEntries(getFile());
+        LinkedHashMap<String, ZipEntry> zipEntriesMap = getZipFileEntries();
         if (zipEntriesMap.containsKey(key)) {
             LOGGER.finer("WLSDPLY-01509", getFileName(), key);
             addedEntry = false;
@@ -383,6 +407,49 @@ public class WLSDeployZipFile {
         return addedEntry;
     }
 
+    /**
+     * Add an entry whose compressed bytes are copied as they are, optionally renaming it to prevent conflicts.
+     * The bytes are only read when the changes are written, so their source must not change until then.
+     *
+     * @param entryName the name of the entry to add
+     * @param entry     the compressed entry to copy
+     * @param rename    whether or not to rename the entry if it conflicts with an existing entry
+     * @return the entry name used to store the entry or null if the add failed due to an entry name conflict
+     * @throws WLSDeployArchiveIOException if an error occurred while adding the entry
+     */
+    String addCompressedZipEntry(String entryName, CompressedEntry entry, boolean rename)
+        throws WLSDeployArchiveIOException {
+        final String METHOD = "addCompressedZipEntry";
+
+        LOGGER.entering(CLASS, METHOD, entryName, rename);
+        prepareForUpdate();
+
+        String newEntryName = entryName;
+        if (rename && isRenameNecessary(newEntryName)) {
+            LOGGER.finer("WLSDPLY-01507", entryName);
+            newEntryName = getNextUniqueEntryName(entryName);
+            LOGGER.finer("WLSDPLY-01508", entryName, newEntryName);
+        }
+
+        LinkedHashMap<String, ZipEntry> stagedIndex = getZipFileEntries();
+        if (stagedIndex.containsKey(newEntryName)) {
+            LOGGER.finer("WLSDPLY-01509", getFileName(), newEntryName);
+            LOGGER.exiting(CLASS, METHOD, null);
+            return null;
+        }
+
+        // the copy is always staged, and written right away unless the caller has a batch in progress
+        LOGGER.finer("WLSDPLY-01510", getFileName(), newEntryName);
+        beginBatch();
+        stagedIndex.put(newEntryName, new ZipEntry(newEntryName));
+        batchCopiedEntries.put(newEntryName, entry.withName(newEntryName));
+        batchChanged = true;
+        setEntryIndex(stagedIndex);
+        commit();
+        LOGGER.exiting(CLASS, METHOD, newEntryName);
+        return newEntryName;
+    }
+
     /**
      * Add the provided directory entry to the unsaved changes list, optionally renaming it to prevent conflicts.
      *
@@ -395,7 +462,7 @@ public class WLSDeployZipFile {
         final String METHOD = "addZipDirectoryEntry";
 
         LOGGER.entering(CLASS, METHOD, entryName, rename);
-        closeOpenZipFile();
+        prepareForUpdate();
 
         String newEntryName = entryName;
         if (!entryName.endsWith("/")) {
@@ -430,10 +497,10 @@ public class WLSDeployZipFile {
         final String METHOD = "addZipDirectoryEntry";
 
         LOGGER.entering(CLASS, METHOD, key);
-        closeOpenZipFile();
+        prepareForUpdate();
 
         boolean addedEntry = true;
-        LinkedHashMap<String, ZipEntry> zipEntriesMap = getZipFileEntries(getFile());
+        LinkedHashMap<String, ZipEntry> zipEntriesMap = getZipFileEntries();
         if (zipEntriesMap.containsKey(key)) {
             LOGGER.finer("WLSDPLY-01509", getFileName(), key);
             addedEntry = false;
@@ -461,10 +528,27 @@ public class WLSDeployZipFile {
      * @throws IllegalArgumentException if the file provided is not a valid directory
      */
     public String addDirectoryZipEntries(String entryName, File directory) throws WLSDeployArchiveIOException {
+        return addDirectoryZipEntries(entryName, directory, null, null);
+    }
+
+    /**
+     * Add the provided directory entry and all of its contents to the zip file, renaming the directory
+     * entry name to prevent conflicts, and collect the archive manifest records of the files as they are copied.
+     *
+     * @param entryName the name of the directory entry to add
+     * @param directory the directory to add including all of its content, recursively
+     * @param entryType the manifest type of the entries, or null to skip collecting the records
+     * @param records   the map to add the manifest record of each file entry to, keyed by entry name
+     * @return the entry name used to store the directory or null if the add failed
+     * @throws WLSDeployArchiveIOException if an IOException occurred while adding the entry
+     * @throws IllegalArgumentException if the file provided is not a valid directory
+     */
+    String addDirectoryZipEntries(String entryName, File directory, String entryType,
+        Map<String, ArchiveManifest.Record> records) throws WLSDeployArchiveIOException {
         final String METHOD = "addDirectoryZipEntries";
 
-        LOGGER.entering(CLASS, METHOD, entryName, directory);
-        closeOpenZipFile();
+        LOGGER.entering(CLASS, METHOD, entryName, directory, entryType);
+        prepareForUpdate();
 
         if (!directory.exists()) {
             String message = ExceptionHelper.getMessage("WLSDPLY-01423", directory.getAbsolutePath());
@@ -495,11 +579,14 @@ public class WLSDeployZipFile {
         if (!rootEntryName.endsWith(ZIP_SEP)) {
             rootEntryName += ZIP_SEP;
         }
-        LinkedHashMap<String, ZipEntry> existingEntries = getZipFileEntries(getFile());
+        LinkedHashMap<String, ZipEntry> existingEntries = getZipFileEntries();
         LinkedHashMap<String, InputStream> newEntries = new LinkedHashMap<>();
         try {
-            addDirectoryToUnsavedMap(newEntries, directory, rootEntryName);
+            addDirectoryToUnsavedMap(newEntries, directory, rootEntryName, entryType);
             saveChangesToZip(existingEntries, newEntries);
+            if (records != null) {
+                collectRecords(newEntries, records);
+            }
         } finally {
             cleanupUnsavedEntries(newEntries);
         }
@@ -518,9 +605,9 @@ public class WLSDeployZipFile {
         final String METHOD = "putZipEntry";
 
         LOGGER.entering(CLASS, METHOD, key, inputStream);
-        closeOpenZipFile();
+        prepareForUpdate();
 
-        LinkedHashMap<String, ZipEntry> zipEntriesMap = getZipFileEntries(getFile());
+        LinkedHashMap<String, ZipEntry> zipEntriesMap = getZipFileEntries();
         if (zipEntriesMap.containsKey(key)) {
             zipEntriesMap.remove(key);
         }
@@ -538,7 +625,126 @@ public class WLSDeployZipFile {
     }
 
     /**
-     * Closes the open zip file from the last call, if any, which in turn closes all open input streams into the zip.
+     * Start a batch of changes.  Until the matching commit(), additions and removals are staged and the
+     * zip file is left untouched, so that a series of changes costs a single rewrite of the zip file.
+     * Batches may be nested; only the outermost commit() writes the zip file.  The content of entries
+     * added during the batch cannot be read back until the batch is committed.
+     */
+    public void beginBatch() {
+        final String METHOD = "beginBatch";
+
+        LOGGER.entering(CLASS, METHOD, batchDepth);
+        if (batchDepth == 0) {
+            LOGGER.fine("WLSDPLY-01542", getFileName());
+            prepareForUpdate();
+            batchChanged = false;
+            batchCompact = false;
+            batchStagedEntries = new LinkedHashMap<>();
+            batchCopiedEntries = new LinkedHashMap<>();
+            batchSpoolCount = 0;
+        }
+        batchDepth++;
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    /**
+     * Whether or not a batch of changes is in progress.
+     *
+     * @return true if beginBatch() was called without a matching commit() or rollback()
+     */
+    public boolean isBatchInProgress() {
+        return batchDepth > 0;
+    }
+
+    /**
+     * End a batch of changes.  If this ends the outermost batch, all staged changes are written to the zip file.
+     *
+     * @throws WLSDeployArchiveIOException if an error occurs while writing the zip file
+     * @throws IllegalStateException if no batch is in progress
+     */
+    public void commit() throws WLSDeployArchiveIOException {
+        final String METHOD = "commit";
+
+        LOGGER.entering(CLASS, METHOD, batchDepth);
+        if (!isBatchInProgress()) {
+            String message = ExceptionHelper.getMessage("WLSDPLY-01547", getFileName());
+            IllegalStateException ise = new IllegalStateException(message);
+            LOGGER.throwing(CLASS, METHOD, ise);
+            throw ise;
+        }
+
+        batchDepth--;
+        if (batchDepth == 0) {
+            try {
+                if (batchChanged || batchCompact) {
+                    writeBatch();
+                }
+            } finally {
+                discardBatch();
+            }
+        }
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    /**
+     * Abandon the batch in progress, if any, including any enclosing batches, leaving the zip file unchanged.
+     */
+    public void rollback() {
+        final String METHOD = "rollback";
+
+        LOGGER.entering(CLASS, METHOD, batchDepth);
+        if (isBatchInProgress()) {
+            LOGGER.fine("WLSDPLY-01545", getFileName());
+            batchDepth = 0;
+            discardBatch();
+        }
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    /**
+     * Rewrite the zip file to reclaim the space left behind by entries that in-place updates replaced or removed.
+     * If a batch is in progress, the zip file is rewritten when the batch is committed.
+     *
+     * @throws WLSDeployArchiveIOException if an error occurs while reading or writing the zip file
+     */
+    public void compact() throws WLSDeployArchiveIOException {
+        final String METHOD = "compact";
+
+        LOGGER.entering(CLASS, METHOD);
+        if (isBatchInProgress()) {
+            batchCompact = true;
+        } else if (zipFileIsNotEmpty()) {
+            prepareForUpdate();
+            LOGGER.fine("WLSDPLY-01554", getFileName());
+            saveChangesToZip(getZipFileEntries(), null, -1);
+        }
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    /**
+     * Set whether or not new entries are compressed ahead of writing the zip file.  In this mode, entries whose
+     * content is already compressed, such as jar files, are stored without compression and the remaining entries
+     * are deflated in parallel.  Existing entries are copied without being recompressed when the zip file has to
+     * be rewritten.  The result is a standard zip file either way.
+     *
+     * @param compressAhead true to compress new entries ahead of writing the zip file, false to use the default
+     */
+    public void setCompressAhead(boolean compressAhead) {
+        this.compressAhead = compressAhead;
+    }
+
+    /**
+     * Whether or not new entries are compressed ahead of writing the zip file.
+     *
+     * @return true if new entries are compressed ahead of writing the zip file
+     */
+    public boolean isCompressAhead() {
+        return compressAhead;
+    }
+
+    /**
+     * Closes the open zip file handle, if any, which in turn closes all open input streams into the zip.
+     * The entry index is kept since closing the handle does not change the zip file.
      */
     public void close() {
         final String METHOD = "close";
@@ -614,6 +820,29 @@ public class WLSDeployZipFile {
         LOGGER.exiting(CLASS, METHOD);
     }
 
+    // Closes the read handle before the entries are changed.  Outside of a batch, this also restores the zip file
+    // if an in-place update by an earlier process did not complete.  Readers never call this, so opening or
+    // reading an archive never changes it.
+    //
+    private void prepareForUpdate() {
+        closeOpenZipFile();
+        if (!isBatchInProgress()) {
+            recoverIncompleteUpdate();
+        }
+    }
+
+    // The read handle must be closed before calling this method.
+    //
+    private void recoverIncompleteUpdate() {
+        try {
+            if (ZipFileAppender.recover(getFile())) {
+                invalidateEntryIndex();
+            }
+        } catch (IOException ioe) {
+            LOGGER.warning("WLSDPLY-01562", ioe, getFileName(), ioe.getLocalizedMessage());
+        }
+    }
+
     private boolean zipFileIsNotEmpty() {
         final String METHOD = "zipFileIsNotEmpty";
 
@@ -631,35 +860,129 @@ public class WLSDeployZipFile {
         return value;
     }
 
-    private LinkedHashMap<String, ZipEntry> getZipFileEntries(File zipFile) throws WLSDeployArchiveIOException {
-        final String METHOD = "getZipEntries";
+    // Returns a copy of the entry index that the caller is free to modify before saving changes.
+    //
+    private LinkedHashMap<String, ZipEntry> getZipFileEntries() throws WLSDeployArchiveIOException {
+        return new LinkedHashMap<>(getEntryIndex());
+    }
+
+    private ZipFile getReadZipFile() throws IOException {
+        if (getOpenZipFile() == null) {
+            setOpenZipFile(new ZipFile(getFile(), ZIP_FILE_OPEN_MODE));
+        }
+        return getOpenZipFile();
+    }
+
+    private Map<String, ZipEntry> getEntryIndex() throws WLSDeployArchiveIOException {
+        final String METHOD = "getEntryIndex";
 
-        LinkedHashMap<String, ZipEntry> savedZipEntries = new LinkedHashMap<>();
-        if (zipFileIsNotEmpty()) {
-            savedZipEntries = new LinkedHashMap<>();
-            try (ZipFile zipper = new ZipFile(zipFile, ZIP_FILE_OPEN_MODE)) {
-                Enumeration<?> entries = zipper.entries();
-                while (entries.hasMoreElements()) {
-                    ZipEntry entry = (ZipEntry) entries.nextElement();
-                    String key = entry.getName();
-                    savedZipEntries.put(key, entry);
+        if (entryIndex != null && !isBatchInProgress() && (entryIndexFileLength != getFile().length() ||
+            entryIndexFileModified != getFile().lastModified())) {
+            // Somebody else rewrote the file so both the index and the read handle are stale.
+            //
+            closeOpenZipFile();
+            invalidateEntryIndex();
+        }
+
+        if (entryIndex == null) {
+            LinkedHashMap<String, ZipEntry> index = new LinkedHashMap<>();
+            long fileLength = getFile().length();
+            long fileModified = getFile().lastModified();
+            if (zipFileIsNotEmpty()) {
+                try {
+                    Enumeration<? extends ZipEntry> entries = getReadZipFile().entries();
+                    while (entries.hasMoreElements()) {
+                        ZipEntry entry = entries.nextElement();
+                        index.put(entry.getName(), entry);
+                    }
+                } catch (IOException ioe) {
+                    closeOpenZipFile();
+                    WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01503",
+                        ioe, getFileName(), ioe.getLocalizedMessage());
+                    LOGGER.throwing(CLASS, METHOD, wdaioe);
+                    throw wdaioe;
                 }
-            } catch (IOException ioe) {
-                WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01503",
-                    ioe, getFileName(), ioe.getLocalizedMessage());
-                LOGGER.throwing(CLASS, METHOD, wdaioe);
-                throw wdaioe;
             }
+            setEntryIndex(index);
+            entryIndexFileLength = fileLength;
+            entryIndexFileModified = fileModified;
+        }
+        return entryIndex;
+    }
+
+    private void setEntryIndex(LinkedHashMap<String, ZipEntry> index) {
+        List<String> names = new ArrayList<>(index.keySet());
+        TreeMap<String, Integer> sortedIndex = new TreeMap<>();
+        for (int i = 0; i < names.size(); i++) {
+            sortedIndex.put(names.get(i), i);
         }
-        return savedZipEntries;
+        entryIndex = index;
+        entryIndexNames = names;
+        sortedEntryIndex = sortedIndex;
+    }
+
+    // Returns the entry names starting with prefix, in zip file order, by walking only the matching
+    // range of the sorted index.
+    //
+    private List<String> getEntryNamesWithPrefix(String prefix) throws WLSDeployArchiveIOException {
+        getEntryIndex();
+
+        List<Integer> positions = new ArrayList<>();
+        for (Map.Entry<String, Integer> entry : sortedEntryIndex.tailMap(prefix, true).entrySet()) {
+            if (!entry.getKey().startsWith(prefix)) {
+                break;
+            }
+            positions.add(entry.getValue());
+        }
+        Collections.sort(positions);
+
+        List<String> result = new ArrayList<>(positions.size());
+        for (Integer position : positions) {
+            result.add(entryIndexNames.get(position));
+        }
+        return result;
+    }
+
+    private void invalidateEntryIndex() {
+        entryIndex = null;
+        entryIndexNames = null;
+        sortedEntryIndex = null;
     }
 
     private void saveChangesToZip(Map<String, ZipEntry> updatedZipEntries, Map<String, InputStream> newEntries)
         throws WLSDeployArchiveIOException {
+        saveChangesToZip(updatedZipEntries, newEntries, getNewEntriesSize(newEntries));
+    }
+
+    // The size of the new entries decides whether the changes can be appended to the existing zip file.
+    // A negative size means that it is unknown, or that the caller wants a full rewrite, so the whole zip
+    // file is written again.
+    //
+    private void saveChangesToZip(Map<String, ZipEntry> updatedZipEntries, Map<String, InputStream> newEntries,
+        long newEntriesSize) throws WLSDeployArchiveIOException {
         final String METHOD = "saveChangesToZip";
 
-        LOGGER.entering(CLASS, METHOD, updatedZipEntries, newEntries);
+        LOGGER.entering(CLASS, METHOD, updatedZipEntries, newEntries, newEntriesSize);
+        if (isBatchInProgress()) {
+            stageChanges(updatedZipEntries, newEntries);
+            LOGGER.exiting(CLASS, METHOD);
+            return;
+        }
+        invalidateEntryIndex();
+        if (isCompressAhead() && newEntries != null && !newEntries.isEmpty()) {
+            saveCompressedChanges(updatedZipEntries, newEntries, newEntriesSize >= 0,
+                Collections.<String, CompressedEntry>emptyMap());
+        } else if (newEntriesSize < 0 || !saveChangesInPlace(updatedZipEntries, newEntries, newEntriesSize)) {
+            rewriteZipFile(updatedZipEntries, newEntries);
+        }
+        LOGGER.exiting(CLASS, METHOD);
+    }
 
+    private void rewriteZipFile(Map<String, ZipEntry> updatedZipEntries, Map<String, InputStream> newEntries)
+        throws WLSDeployArchiveIOException {
+        final String METHOD = "rewriteZipFile";
+
+        LOGGER.entering(CLASS, METHOD);
         File newOutputFile = getNewOutputFile();
         if ((updatedZipEntries != null && !updatedZipEntries.isEmpty()) ||
             (newEntries != null && !newEntries.isEmpty())) {
@@ -690,7 +1013,7 @@ public class WLSDeployZipFile {
             InputStream inputStream = null;
             try (ZipOutputStream zos = new ZipOutputStream(new FileOutputStream(newOutputFile, false))) {
                 if (updatedZipEntries != null && !updatedZipEntries.isEmpty()) {
-                    openZipFile = new ZipFile(getFile(), ZIP_FILE_OPEN_MODE);
+                    ZipFile zipFile = getReadZipFile();
 
                     ZipEntry ze;
                     for (Map.Entry<String, ZipEntry> updatedEntry : updatedZipEntries.entrySet()) {
@@ -701,7 +1024,7 @@ public class WLSDeployZipFile {
                             zos.putNextEntry(ze);
                             zos.closeEntry();
                         } else {
-                            inputStream = openZipFile.getInputStream(ze);
+                            inputStream = zipFile.getInputStream(ze);
 
                             zos.putNextEntry(ze);
                             readWriteBytes(updatedKey, inputStream, zos);
@@ -772,6 +1095,289 @@ public class WLSDeployZipFile {
         LOGGER.exiting(CLASS, METHOD);
     }
 
+    // The new entries are compressed first, in parallel, and then either appended to the zip file or written
+    // to a new zip file along with the raw bytes of the retained entries.  Entries copied from another zip
+    // file are already compressed and are written the same way.  If the zip file layout cannot be handled
+    // like this, the prepared entries are inflated again for a regular rewrite.
+    //
+    private void saveCompressedChanges(Map<String, ZipEntry> updatedZipEntries, Map<String, InputStream> newEntries,
+        boolean appendAllowed, Map<String, CompressedEntry> copiedEntries) throws WLSDeployArchiveIOException {
+        final String METHOD = "saveCompressedChanges";
+
+        LOGGER.entering(CLASS, METHOD, appendAllowed);
+        LOGGER.fine("WLSDPLY-01558", getFileName(), newEntries.size());
+        Map<String, CompressedEntry> compressedEntries;
+        try {
+            compressedEntries = new ZipEntryCompressor(getFile().getParentFile()).compress(newEntries);
+            compressedEntries.putAll(copiedEntries);
+        } catch (IOException ioe) {
+            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01559", ioe,
+                getFileName(), ioe.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, wdaioe);
+            throw wdaioe;
+        }
+
+        Collection<String> retainedEntries = Collections.emptySet();
+        if (updatedZipEntries != null) {
+            retainedEntries = updatedZipEntries.keySet();
+        }
+        LinkedHashMap<String, InputStream> uncompressedEntries = new LinkedHashMap<>();
+        File newOutputFile = null;
+        try {
+            ZipFileAppender appender = new ZipFileAppender(getFile());
+            boolean loaded = true;
+            boolean saved = false;
+            if (zipFileIsNotEmpty()) {
+                // the read handle must not see the file change underneath it
+                closeOpenZipFile();
+                recoverIncompleteUpdate();
+                loaded = appender.load();
+                saved = loaded && appendAllowed && appender.appendCompressed(retainedEntries, compressedEntries);
+                if (saved) {
+                    LOGGER.fine("WLSDPLY-01550", getFileName(), compressedEntries.size(), retainedEntries.size());
+                }
+            }
+            if (!saved && loaded) {
+                newOutputFile = getNewOutputFile();
+                saved = appender.rewrite(newOutputFile, retainedEntries, compressedEntries);
+                if (saved) {
+                    LOGGER.fine("WLSDPLY-01560", getFileName(), compressedEntries.size(), retainedEntries.size());
+                    if (isNewFile()) {
+                        setNewFile(false);
+                    } else {
+                        swapFiles(getFile(), newOutputFile);
+                    }
+                    newOutputFile = null;
+                }
+            }
+
+            if (!saved) {
+                deleteNewOutputFile(newOutputFile);
+                newOutputFile = null;
+                for (CompressedEntry entry : compressedEntries.values()) {
+                    uncompressedEntries.put(entry.getName(), entry.openUncompressed());
+                }
+                rewriteZipFile(updatedZipEntries, uncompressedEntries);
+            }
+        } catch (IOException ioe) {
+            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01522", ioe,
+                getFileName(), ioe.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, wdaioe);
+            throw wdaioe;
+        } finally {
+            deleteNewOutputFile(newOutputFile);
+            cleanupUnsavedEntries(uncompressedEntries);
+            ZipEntryCompressor.deleteAll(compressedEntries.values());
+        }
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    private void deleteNewOutputFile(File newOutputFile) {
+        if (newOutputFile != null && !isNewFile() && newOutputFile.exists() && !newOutputFile.delete()) {
+            LOGGER.finest("WLSDPLY-01557", newOutputFile.getAbsolutePath());
+        }
+    }
+
+    private boolean saveChangesInPlace(Map<String, ZipEntry> updatedZipEntries, Map<String, InputStream> newEntries,
+        long newEntriesSize) throws WLSDeployArchiveIOException {
+        final String METHOD = "saveChangesInPlace";
+
+        if (!zipFileIsNotEmpty()) {
+            return false;
+        }
+
+        Collection<String> retainedEntries = Collections.emptySet();
+        if (updatedZipEntries != null) {
+            retainedEntries = updatedZipEntries.keySet();
+        }
+        Map<String, InputStream> addedEntries = Collections.emptyMap();
+        if (newEntries != null) {
+            addedEntries = newEntries;
+        }
+
+        // the read handle must not see the file change underneath it
+        closeOpenZipFile();
+        recoverIncompleteUpdate();
+        boolean saved;
+        try {
+            ZipFileAppender appender = new ZipFileAppender(getFile());
+            saved = appender.load() && appender.append(retainedEntries, addedEntries, newEntriesSize);
+        } catch (IOException ioe) {
+            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01553", ioe,
+                getFileName(), ioe.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, wdaioe);
+            throw wdaioe;
+        }
+        if (saved) {
+            LOGGER.fine("WLSDPLY-01550", getFileName(), addedEntries.size(), retainedEntries.size());
+            cleanupUnsavedEntries(addedEntries);
+        }
+        return saved;
+    }
+
+    private static long getNewEntriesSize(Map<String, InputStream> newEntries) {
+        long size = 0;
+        if (newEntries != null) {
+            for (InputStream inputStream : newEntries.values()) {
+                if (inputStream instanceof FileInputStream) {
+                    try {
+                        FileChannel channel = ((FileInputStream) inputStream).getChannel();
+                        size += channel.size() - channel.position();
+                    } catch (IOException ignore) {
+                        return -1;
+                    }
+                } else if (inputStream != null) {
+                    return -1;
+                }
+            }
+        }
+        return size;
+    }
+
+    // Allows the WLSDeployArchive to tell entries whose content is only in the batch spool file from entries
+    // whose central directory metadata can be checked.
+    //
+    boolean isStagedEntry(String key) {
+        return isBatchInProgress() && (batchStagedEntries.containsKey(key) || batchCopiedEntries.containsKey(key));
+    }
+
+    // The caller's map holds every entry that should remain, so anything it dropped is a removal.
+    // New entries replace any entry with the same name and their content is copied to the spool file
+    // right away since the callers close their input streams as soon as this returns.  With compress ahead,
+    // the spooled entries are compressed in parallel when the batch is committed.
+    //
+    private void stageChanges(Map<String, ZipEntry> updatedZipEntries, Map<String, InputStream> newEntries)
+        throws WLSDeployArchiveIOException {
+
+        LinkedHashMap<String, ZipEntry> stagedIndex = new LinkedHashMap<>();
+        if (updatedZipEntries != null) {
+            stagedIndex.putAll(updatedZipEntries);
+        }
+        batchStagedEntries.keySet().retainAll(stagedIndex.keySet());
+        batchCopiedEntries.keySet().retainAll(stagedIndex.keySet());
+
+        if (newEntries != null) {
+            for (Map.Entry<String, InputStream> entry : newEntries.entrySet()) {
+                String key = entry.getKey();
+                stagedIndex.remove(key);
+                stagedIndex.put(key, new ZipEntry(key));
+                batchStagedEntries.remove(key);
+                batchCopiedEntries.remove(key);
+                batchStagedEntries.put(key, spoolEntry(key, entry.getValue()));
+            }
+        }
+        batchChanged = true;
+        setEntryIndex(stagedIndex);
+    }
+
+    private String spoolEntry(String key, InputStream inputStream) throws WLSDeployArchiveIOException {
+        final String METHOD = "spoolEntry";
+
+        if (key.endsWith(ZIP_SEP)) {
+            return null;
+        }
+
+        String spoolEntryName = Integer.toString(batchSpoolCount++);
+        try {
+            if (batchSpoolStream == null) {
+                String[] nameComponents = FileUtils.parseFileName(getFileName());
+                batchSpoolFile = File.createTempFile(nameComponents[0], DOT + nameComponents[1],
+                    getFile().getParentFile());
+                batchSpoolFile.deleteOnExit();
+                batchSpoolStream = new ZipOutputStream(new FileOutputStream(batchSpoolFile, false));
+                // the spool file is read back once on commit so don't spend time compressing it
+                batchSpoolStream.setLevel(Deflater.NO_COMPRESSION);
+            }
+            batchSpoolStream.putNextEntry(new ZipEntry(spoolEntryName));
+            readWriteBytes(key, inputStream, batchSpoolStream);
+            batchSpoolStream.closeEntry();
+        } catch (IOException ioe) {
+            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01546", ioe,
+                getFileName(), ioe.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, wdaioe);
+            throw wdaioe;
+        }
+        LOGGER.finer("WLSDPLY-01543", getFileName(), key, batchSpoolFile.getAbsolutePath());
+        return spoolEntryName;
+    }
+
+    private void writeBatch() throws WLSDeployArchiveIOException {
+        final String METHOD = "writeBatch";
+
+        LOGGER.entering(CLASS, METHOD);
+        LinkedHashMap<String, ZipEntry> retainedEntries = new LinkedHashMap<>(getEntryIndex());
+        LinkedHashMap<String, InputStream> newEntries = new LinkedHashMap<>();
+        ZipFile spoolZipFile = null;
+        try {
+            if (batchSpoolStream != null) {
+                batchSpoolStream.close();
+                batchSpoolStream = null;
+                spoolZipFile = new ZipFile(batchSpoolFile, ZIP_FILE_OPEN_MODE);
+            }
+            long newEntriesSize = 0;
+            for (Map.Entry<String, String> stagedEntry : batchStagedEntries.entrySet()) {
+                retainedEntries.remove(stagedEntry.getKey());
+                InputStream inputStream = null;
+                if (stagedEntry.getValue() != null && spoolZipFile != null) {
+                    ZipEntry spoolEntry = spoolZipFile.getEntry(stagedEntry.getValue());
+                    inputStream = spoolZipFile.getInputStream(spoolEntry);
+                    newEntriesSize += spoolEntry.getSize();
+                }
+                newEntries.put(stagedEntry.getKey(), inputStream);
+            }
+            retainedEntries.keySet().removeAll(batchCopiedEntries.keySet());
+            if (batchCompact) {
+                LOGGER.fine("WLSDPLY-01554", getFileName());
+                newEntriesSize = -1;
+            }
+            LOGGER.fine("WLSDPLY-01544", getFileName(), newEntries.size() + batchCopiedEntries.size());
+            if (batchCopiedEntries.isEmpty()) {
+                saveChangesToZip(retainedEntries, newEntries, newEntriesSize);
+            } else {
+                invalidateEntryIndex();
+                saveCompressedChanges(retainedEntries, newEntries, newEntriesSize >= 0, batchCopiedEntries);
+            }
+        } catch (IOException ioe) {
+            WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException("WLSDPLY-01522",
+                ioe, getFileName(), ioe.getLocalizedMessage());
+            LOGGER.throwing(CLASS, METHOD, wdaioe);
+            throw wdaioe;
+        } finally {
+            cleanupUnsavedEntries(newEntries);
+            if (spoolZipFile != null) {
+                try {
+                    spoolZipFile.close();
+                } catch (IOException ioe) {
+                    LOGGER.warning("WLSDPLY-01514", ioe, batchSpoolFile.getAbsolutePath(), ioe.getLocalizedMessage());
+                }
+            }
+        }
+        LOGGER.exiting(CLASS, METHOD);
+    }
+
+    private void discardBatch() {
+        if (batchSpoolStream != null) {
+            try {
+                batchSpoolStream.close();
+            } catch (IOException ioe) {
+                LOGGER.finest("WLSDPLY-01541", ioe, batchSpoolFile.getAbsolutePath(), ioe.getLocalizedMessage());
+            }
+            batchSpoolStream = null;
+        }
+        if (batchSpoolFile != null) {
+            if (!batchSpoolFile.delete()) {
+                LOGGER.warning("WLSDPLY-01548", batchSpoolFile.getAbsolutePath());
+            }
+            batchSpoolFile = null;
+        }
+        batchStagedEntries = null;
+        batchCopiedEntries = null;
+        batchChanged = false;
+        batchCompact = false;
+        // the index may hold staged entries so reload it from the zip file on next use
+        invalidateEntryIndex();
+    }
+
     private File getNewOutputFile() throws WLSDeployArchiveIOException {
         final String METHOD = "getNewOutputFile";
 
@@ -869,8 +1475,7 @@ public class WLSDeployZipFile {
         LOGGER.entering(entryName);
 
         boolean renameNeeded = false;
-        Map<String, ZipEntry> zipEntryMap = getZipFileEntries(getFile());
-        if (zipEntryMap.containsKey(entryName)) {
+        if (getEntryIndex().containsKey(entryName)) {
             LOGGER.finest("WLSDPLY-01534", entryName);
             renameNeeded = true;
         }
@@ -896,11 +1501,8 @@ public class WLSDeployZipFile {
         }
         LOGGER.finer("WLSDPLY-01535", entryName, entryNameBase, entryNameExtension);
         ArrayList<String> matchingSavedEntries = new ArrayList<>();
-        Map<String, ZipEntry> zipEntriesMap = getZipFileEntries(getFile());
-
-        for (String zipEntryKey : zipEntriesMap.keySet()) {
-            if (zipEntryKey.startsWith(entryNameBase) && entryReallyMatches(zipEntryKey, entryNameBase,
-                entryNameExtension)) {
+        for (String zipEntryKey : getEntryNamesWithPrefix(entryNameBase)) {
+            if (entryReallyMatches(zipEntryKey, entryNameBase, entryNameExtension)) {
                 LOGGER.finer("WLSDPLY-01536", entryName, zipEntryKey);
                 matchingSavedEntries.add(zipEntryKey);
             }
@@ -1010,21 +1612,21 @@ public class WLSDeployZipFile {
     }
 
     private void addDirectoryToUnsavedMap(Map<String, InputStream> unsavedChanges,
-        File directory, String directoryEntryName) throws WLSDeployArchiveIOException {
+        File directory, String directoryEntryName, String entryType) throws WLSDeployArchiveIOException {
         final String METHOD = "addDirectoryToUnsavedMap";
 
-        LOGGER.entering(CLASS, METHOD, directory.getAbsolutePath(), directoryEntryName);
+        LOGGER.entering(CLASS, METHOD, directory.getAbsolutePath(), directoryEntryName, entryType);
         File[] dirEntries = directory.listFiles();
         if (dirEntries != null) {
             for (File dirEntry : dirEntries) {
                 String newEntryName = directoryEntryName + dirEntry.getName();
                 if (dirEntry.isDirectory()) {
                     newEntryName += ZIP_SEP;
-                    addDirectoryToUnsavedMap(unsavedChanges, dirEntry, newEntryName);
+                    addDirectoryToUnsavedMap(unsavedChanges, dirEntry, newEntryName, entryType);
                 } else {
                     FileInputStream inputStream;
                     try {
-                        inputStream = new FileInputStream(dirEntry);
+                        inputStream = openEntryFile(dirEntry, entryType);
                     } catch (IOException ioe) {
                         WLSDeployArchiveIOException wdaioe = new WLSDeployArchiveIOException(
                             "WLSDPLY-01425", ioe, getFileName(), dirEntry.getAbsolutePath(), newEntryName,
@@ -1039,6 +1641,32 @@ public class WLSDeployZipFile {
         LOGGER.exiting(CLASS, METHOD);
     }
 
+    // The manifest record is computed while the file is copied into the zip file.  Without the hashing
+    // algorithm the file is still added, it just has no record.
+    //
+    private static FileInputStream openEntryFile(File file, String entryType) throws IOException {
+        if (entryType != null) {
+            try {
+                return new ArchiveManifest.RecordingInputStream(entryType, file);
+            } catch (NoSuchAlgorithmException nsae) {
+                LOGGER.fine("WLSDPLY-01564", file.getAbsolutePath(), nsae.getLocalizedMessage());
+            }
+        }
+        return new FileInputStream(file);
+    }
+
+    private static void collectRecords(Map<String, InputStream> newEntries,
+        Map<String, ArchiveManifest.Record> records) {
+        for (Map.Entry<String, InputStream> entry : newEntries.entrySet()) {
+            if (entry.getValue() instanceof ArchiveManifest.RecordingInputStream) {
+                ArchiveManifest.Record record = ((ArchiveManifest.RecordingInputStream) entry.getValue()).getRecord();
+                if (record != null) {
+                    records.put(entry.getKey(), record);
+                }
+            }
+        }
+    }
+
     private static void cleanupUnsavedEntries(Map<String, InputStream> unsavedEntries) {
         if (unsavedEntries != null && !unsavedEntries.isEmpty()) {
             for (Map.Entry<String, InputStream> entry : unsavedEntries.entrySet()) {
@@ -1056,13 +1684,17 @@ public class WLSDeployZipFile {
         }
     }
 
-    private void addEntryToMap(LinkedHashMap<String, ZipEntry> zipMap, LinkedHashMap<String, InputStream> map,
+    private void addEntryToMap(Map<String, ZipEntry> zipMap, LinkedHashMap<String, InputStream> map,
         String key) throws IOException {
 
+        if (isStagedEntry(key)) {
+            LOGGER.finer("WLSDPLY-01549", getFileName(), key);
+            return;
+        }
         LOGGER.finer("WLSDPLY-01500", getFileName(), key);
         ZipEntry entry = zipMap.get(key);
         sanitizeZipEntry(entry);
-        InputStream stream = openZipFile.getInputStream(entry);
+        InputStream stream = getReadZipFile().getInputStream(entry);
         LOGGER.finer("WLSDPLY-01501", getFileName(), key, stream);
         map.put(key, stream);
     }
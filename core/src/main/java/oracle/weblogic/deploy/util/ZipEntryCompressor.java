@@ -0,0 +1,454 @@
+/*
+ * Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+ * The Universal Permissive License (UPL), Version 1.0
+ */
+package oracle.weblogic.deploy.util;
+
+import java.io.BufferedOutputStream;
+import java.io.File;
+import java.io.FileInputStream;
+import java.io.FileOutputStream;
+import java.io.FilterInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.Callable;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.ThreadFactory;
+import java.util.zip.CRC32;
+import java.util.zip.Deflater;
+import java.util.zip.Inflater;
+import java.util.zip.InflaterInputStream;
+import java.util.zip.ZipEntry;
+
+import oracle.weblogic.deploy.logging.PlatformLogger;
+import oracle.weblogic.deploy.logging.WLSDeployLogFactory;
+
+/**
+ * Compresses new zip entries ahead of writing them for the WLSDeployZipFile class.  Entries that are already
+ * compressed, either because of their file extension or because a sample of their content does not deflate,
+ * are stored as is.  The remaining entries are deflated concurrently on a bounded pool so that the zip file
+ * itself only needs to be written by copying the prepared bytes.
+ */
+class ZipEntryCompressor {
+    private static final String CLASS = ZipEntryCompressor.class.getName();
+    private static final PlatformLogger LOGGER = WLSDeployLogFactory.getLogger("wlsdeploy.archive");
+
+    // Java and other archive formats are zip files already, so deflating them again gains almost nothing.
+    private static final String[] STORED_EXTENSIONS = {
+        ".ear", ".war", ".jar", ".rar", ".sar", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z",
+        ".jpg", ".jpeg", ".png", ".gif"
+    };
+    private static final int BUFFER_SIZE = 64 * 1024;
+    private static final int MIN_PROBE_SIZE = 1024;
+    // a sample that deflates to more than 90% of its size is treated as incompressible
+    private static final int MAX_PROBE_RATIO_PERCENT = 90;
+    private static final int MAX_THREADS = 8;
+    private static final String TEMP_FILE_PREFIX = "wlsdeploy-entry";
+
+    private final File tempDirectory;
+    private final int threads;
+
+    /**
+     * Constructor for the ZipEntryCompressor class.
+     *
+     * @param tempDirectory the directory in which to keep the compressed entries until they are written
+     */
+    ZipEntryCompressor(File tempDirectory) {
+        this(tempDirectory, Math.min(Runtime.getRuntime().availableProcessors(), MAX_THREADS));
+    }
+
+    /**
+     * Constructor for the ZipEntryCompressor class.
+     *
+     * @param tempDirectory the directory in which to keep the compressed entries until they are written
+     * @param threads the maximum number of entries to compress at the same time
+     */
+    ZipEntryCompressor(File tempDirectory, int threads) {
+        this.tempDirectory = tempDirectory;
+        this.threads = Math.max(1, threads);
+    }
+
+    /**
+     * Whether or not the entry name has the extension of a format that is already compressed.
+     *
+     * @param name the entry name
+     * @return true if the entry should be stored without compression
+     */
+    static boolean hasStoredExtension(String name) {
+        String lowerName = name.toLowerCase(Locale.ENGLISH);
+        for (String extension : STORED_EXTENSIONS) {
+            if (lowerName.endsWith(extension)) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Compress the content of the new entries.  The input streams are read to the end but not closed.
+     * If any entry fails, the entries that were already compressed are deleted before the error is thrown.
+     *
+     * @param newEntries the new entries, with null input streams for directory entries
+     * @return the compressed entries in the same order as the new entries
+     * @throws IOException if an error occurs reading an input stream or writing a compressed entry
+     */
+    Map<String, CompressedEntry> compress(Map<String, InputStream> newEntries) throws IOException {
+        final String METHOD = "compress";
+
+        LOGGER.entering(CLASS, METHOD, newEntries.size(), threads);
+        List<Callable<CompressedEntry>> tasks = new ArrayList<>(newEntries.size());
+        for (final Map.Entry<String, InputStream> entry : newEntries.entrySet()) {
+            tasks.add(new Callable<CompressedEntry>() {
+                @Override
+                public CompressedEntry call() throws IOException {
+                    return compressEntry(entry.getKey(), entry.getValue());
+                }
+            });
+        }
+
+        LinkedHashMap<String, CompressedEntry> result = new LinkedHashMap<>();
+        IOException error = null;
+        int poolSize = Math.min(threads, tasks.size());
+        if (poolSize <= 1) {
+            for (Callable<CompressedEntry> task : tasks) {
+                try {
+                    CompressedEntry compressed = task.call();
+                    result.put(compressed.getName(), compressed);
+                } catch (Exception e) {
+                    error = toIOException(e);
+                    break;
+                }
+            }
+        } else {
+            ExecutorService executor = Executors.newFixedThreadPool(poolSize, new ThreadFactory() {
+                @Override
+                public Thread newThread(Runnable runnable) {
+                    Thread thread = new Thread(runnable, "wlsdeploy-archive-compress");
+                    thread.setDaemon(true);
+                    return thread;
+                }
+            });
+            try {
+                // collect every outcome, even after a failure, so that no temporary file is left behind
+                for (Future<CompressedEntry> future : executor.invokeAll(tasks)) {
+                    try {
+                        CompressedEntry compressed = future.get();
+                        result.put(compressed.getName(), compressed);
+                    } catch (ExecutionException ee) {
+                        if (error == null) {
+                            error = toIOException(ee.getCause());
+                        }
+                    }
+                }
+            } catch (InterruptedException ie) {
+                Thread.currentThread().interrupt();
+                error = toIOException(ie);
+            } finally {
+                executor.shutdownNow();
+            }
+        }
+
+        if (error != null) {
+            deleteAll(result.values());
+            LOGGER.throwing(CLASS, METHOD, error);
+            throw error;
+        }
+        LOGGER.exiting(CLASS, METHOD, result.size());
+        return result;
+    }
+
+    /**
+     * Delete the temporary files of the specified compressed entries.
+     *
+     * @param entries the compressed entries
+     */
+    static void deleteAll(Collection<CompressedEntry> entries) {
+        for (CompressedEntry entry : entries) {
+            entry.delete();
+        }
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // Private Helper Methods                                                //
+    ///////////////////////////////////////////////////////////////////////////
+
+    private CompressedEntry compressEntry(String name, InputStream inputStream) throws IOException {
+        if (inputStream == null || name.endsWith("/")) {
+            return new CompressedEntry(name, ZipEntry.STORED, 0, 0, 0, null);
+        }
+
+        File dataFile = File.createTempFile(TEMP_FILE_PREFIX, null, tempDirectory);
+        dataFile.deleteOnExit();
+        CompressedEntry result = null;
+        boolean written = false;
+        try {
+            try (OutputStream output = new BufferedOutputStream(new FileOutputStream(dataFile), BUFFER_SIZE)) {
+                result = writeEntry(name, inputStream, output, dataFile);
+            }
+            written = true;
+        } finally {
+            if (!written && !dataFile.delete()) {
+                LOGGER.finest("WLSDPLY-01557", dataFile.getAbsolutePath());
+            }
+        }
+        return result;
+    }
+
+    private static CompressedEntry writeEntry(String name, InputStream inputStream, OutputStream output,
+        File dataFile) throws IOException {
+        byte[] readBuffer = new byte[BUFFER_SIZE];
+        int sampleLength = readFully(inputStream, readBuffer);
+        boolean store = hasStoredExtension(name) || isIncompressible(readBuffer, sampleLength);
+
+        CRC32 crc = new CRC32();
+        long size = 0;
+        long compressedSize;
+        Deflater deflater = store ? null : new Deflater(Deflater.DEFAULT_COMPRESSION, true);
+        try {
+            byte[] deflateBuffer = store ? null : new byte[BUFFER_SIZE];
+            int bytesRead = sampleLength;
+            while (bytesRead >= 0) {
+                if (bytesRead > 0) {
+                    crc.update(readBuffer, 0, bytesRead);
+                    size += bytesRead;
+                    if (store) {
+                        output.write(readBuffer, 0, bytesRead);
+                    } else {
+                        deflater.setInput(readBuffer, 0, bytesRead);
+                        while (!deflater.needsInput()) {
+                            writeDeflated(output, deflater, deflateBuffer);
+                        }
+                    }
+                }
+                bytesRead = inputStream.read(readBuffer);
+            }
+            if (store) {
+                compressedSize = size;
+            } else {
+                deflater.finish();
+                while (!deflater.finished()) {
+                    writeDeflated(output, deflater, deflateBuffer);
+                }
+                compressedSize = deflater.getBytesWritten();
+            }
+        } finally {
+            if (deflater != null) {
+                deflater.end();
+            }
+        }
+        int method = store ? ZipEntry.STORED : ZipEntry.DEFLATED;
+        LOGGER.finer("WLSDPLY-01556", name, store ? "STORED" : "DEFLATED", size, compressedSize);
+        return new CompressedEntry(name, method, crc.getValue(), size, compressedSize, dataFile);
+    }
+
+    private static boolean isIncompressible(byte[] sample, int sampleLength) {
+        if (sampleLength < MIN_PROBE_SIZE) {
+            return false;
+        }
+        Deflater probe = new Deflater(Deflater.BEST_SPEED, true);
+        try {
+            probe.setInput(sample, 0, sampleLength);
+            probe.finish();
+            byte[] probeBuffer = new byte[BUFFER_SIZE];
+            while (!probe.finished()) {
+                probe.deflate(probeBuffer);
+            }
+            return probe.getBytesWritten() * 100 > (long) sampleLength * MAX_PROBE_RATIO_PERCENT;
+        } finally {
+            probe.end();
+        }
+    }
+
+    private static int readFully(InputStream inputStream, byte[] buffer) throws IOException {
+        int length = 0;
+        while (length < buffer.length) {
+            int bytesRead = inputStream.read(buffer, length, buffer.length - length);
+            if (bytesRead < 0) {
+                break;
+            }
+            length += bytesRead;
+        }
+        return length;
+    }
+
+    private static void writeDeflated(OutputStream output, Deflater deflater, byte[] deflateBuffer)
+        throws IOException {
+        int length = deflater.deflate(deflateBuffer);
+        if (length > 0) {
+            output.write(deflateBuffer, 0, length);
+        }
+    }
+
+    private static IOException toIOException(Throwable cause) {
+        if (cause instanceof IOException) {
+            return (IOException) cause;
+        }
+        return new IOException(cause.getLocalizedMessage(), cause);
+    }
+
+    /**
+     * A zip entry whose content has already been compressed, or stored, either into a temporary file or as part
+     * of another zip file.  Only temporary files are deleted when the entry is no longer needed.
+     */
+    static final class CompressedEntry {
+        private final String name;
+        private final int method;
+        private final long crc;
+        private final long size;
+        private final long compressedSize;
+        private final File dataFile;
+        private final long dataOffset;
+        private final boolean temporary;
+
+        CompressedEntry(String name, int method, long crc, long size, long compressedSize, File dataFile) {
+            this(name, method, crc, size, compressedSize, dataFile, 0, true);
+        }
+
+        CompressedEntry(String name, int method, long crc, long size, long compressedSize, File dataFile,
+            long dataOffset, boolean temporary) {
+            this.name = name;
+            this.method = method;
+            this.crc = crc;
+            this.size = size;
+            this.compressedSize = compressedSize;
+            this.dataFile = dataFile;
+            this.dataOffset = dataOffset;
+            this.temporary = temporary;
+        }
+
+        /**
+         * Get a copy of this entry under a different name that shares the same compressed bytes.
+         *
+         * @param newName the entry name to use
+         * @return the renamed entry
+         */
+        CompressedEntry withName(String newName) {
+            return new CompressedEntry(newName, method, crc, size, compressedSize, dataFile, dataOffset, temporary);
+        }
+
+        String getName() {
+            return name;
+        }
+
+        int getMethod() {
+            return method;
+        }
+
+        long getCrc() {
+            return crc;
+        }
+
+        long getSize() {
+            return size;
+        }
+
+        long getCompressedSize() {
+            return compressedSize;
+        }
+
+        /**
+         * Open the compressed bytes exactly as they are written to the zip file.
+         *
+         * @return the stream, or null for a directory entry
+         * @throws IOException if the temporary file cannot be opened
+         */
+        InputStream openCompressed() throws IOException {
+            if (dataFile == null) {
+                return null;
+            }
+            FileInputStream inputStream = new FileInputStream(dataFile);
+            if (dataOffset == 0 && temporary) {
+                return inputStream;
+            }
+            try {
+                inputStream.getChannel().position(dataOffset);
+            } catch (IOException ioe) {
+                inputStream.close();
+                throw ioe;
+            }
+            return new RegionInputStream(inputStream, compressedSize);
+        }
+
+        /**
+         * Open the original, uncompressed content of the entry.
+         *
+         * @return the stream, or null for a directory entry
+         * @throws IOException if the temporary file cannot be opened
+         */
+        InputStream openUncompressed() throws IOException {
+            InputStream compressed = openCompressed();
+            if (compressed == null || method == ZipEntry.STORED) {
+                return compressed;
+            }
+            return new InflaterInputStream(compressed, new Inflater(true), BUFFER_SIZE);
+        }
+
+        void delete() {
+            if (temporary && dataFile != null && !dataFile.delete()) {
+                LOGGER.finest("WLSDPLY-01557", dataFile.getAbsolutePath());
+            }
+        }
+    }
+
+    // Reads no further than the end of an entry's data inside a larger file.
+    //
+    private static final class RegionInputStream extends FilterInputStream {
+        private long remaining;
+
+        private RegionInputStream(InputStream inputStream, long length) {
+            super(inputStream);
+            this.remaining = length;
+        }
+
+        @Override
+        public int read() throws IOException {
+            if (remaining <= 0) {
+                return -1;
+            }
+            int result = super.read();
+            if (result >= 0) {
+                remaining--;
+            }
+            return result;
+        }
+
+        @Override
+        public int read(byte[] buffer, int offset, int length) throws IOException {
+            if (remaining <= 0) {
+                return -1;
+            }
+            int result = super.read(buffer, offset, (int) Math.min(length, remaining));
+            if (result > 0) {
+                remaining -= result;
+            }
+            return result;
+        }
+
+        @Override
+        public long skip(long count) throws IOException {
+            long result = super.skip(Math.min(count, remaining));
+            remaining -= result;
+            return result;
+        }
+
+        @Override
+        public int available() throws IOException {
+            return (int) Math.min(super.available(), remaining);
+        }
+
+        @Override
+        public boolean markSupported() {
+            return false;
+        }
+    }
+}
@@ -0,0 +1,742 @@
+/*
+ * Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+ * The Universal Permissive License (UPL), Version 1.0
+ */
+package oracle.weblogic.deploy.util;
+
+import java.io.ByteArrayOutputStream;
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.RandomAccessFile;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.util.ArrayList;
+import java.util.Calendar;
+import java.util.Collection;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.zip.CRC32;
+import java.util.zip.Deflater;
+import java.util.zip.ZipEntry;
+import java.util.zip.ZipException;
+
+import oracle.weblogic.deploy.logging.PlatformLogger;
+import oracle.weblogic.deploy.logging.WLSDeployLogFactory;
+import oracle.weblogic.deploy.util.ZipEntryCompressor.CompressedEntry;
+
+/**
+ * Updates an existing zip file in place for the WLSDeployZipFile class.  New entries are written to the end of
+ * the file followed by a new central directory so that the existing entries are never copied.  The space used
+ * by replaced or removed entries is only reclaimed when the zip file is rewritten, so an update that would leave
+ * too much unused space is declined and the caller falls back to rewriting the file.  When the file is rewritten
+ * with entries that were compressed ahead of time, the existing entries are copied without being inflated and
+ * deflated again.
+ *
+ * An in-place update never overwrites existing bytes, so the original zip file is still intact at the start of
+ * the file while the new entries are written.  Before writing, the original length is saved in a recovery file
+ * next to the zip file, and the recovery file is deleted once the new central directory is synced to disk.  If
+ * the process dies in between, the zip file has no valid central directory at its end.  The recover() method,
+ * called before the zip file is next updated, truncates it back to the original length, which restores the
+ * original central directory.
+ */
+class ZipFileAppender {
+    private static final String CLASS = ZipFileAppender.class.getName();
+    private static final PlatformLogger LOGGER = WLSDeployLogFactory.getLogger("wlsdeploy.archive");
+
+    private static final int LOCAL_HEADER_SIGNATURE = 0x04034b50;
+    private static final int DATA_DESCRIPTOR_SIGNATURE = 0x08074b50;
+    private static final int CENTRAL_HEADER_SIGNATURE = 0x02014b50;
+    private static final int END_HEADER_SIGNATURE = 0x06054b50;
+    private static final int ZIP64_LOCATOR_SIGNATURE = 0x07064b50;
+    private static final int LOCAL_HEADER_SIZE = 30;
+    private static final int CENTRAL_HEADER_SIZE = 46;
+    private static final int END_HEADER_SIZE = 22;
+    private static final int ZIP64_LOCATOR_SIZE = 20;
+    private static final int LOCAL_HEADER_CRC_OFFSET = 14;
+    private static final int CENTRAL_HEADER_OFFSET_OFFSET = 42;
+    private static final int DATA_DESCRIPTOR_SIZE = 16;
+    private static final int MAX_COMMENT_SIZE = 0xFFFF;
+    private static final int MAX_ENTRIES = 0xFFFF;
+    private static final long MAX_OFFSET = 0xFFFFFFFFL;
+    private static final int MAX_DEAD_SPACE_PERCENT = 25;
+    private static final int VERSION_STORED = 10;
+    private static final int VERSION_DEFLATED = 20;
+    private static final int FLAG_ENCRYPTED = 0x1;
+    private static final int FLAG_DATA_DESCRIPTOR = 0x8;
+    private static final int FLAG_UTF8 = 0x800;
+    private static final int BUFFER_SIZE = 64 * 1024;
+
+    // the suffix added to the zip file name to name the recovery file of an in-place update
+    static final String RECOVERY_FILE_SUFFIX = ".append";
+
+    private final File file;
+    private long fileLength;
+    private byte[] comment;
+    private LinkedHashMap<String, byte[]> centralRecords;
+
+    /**
+     * Constructor for the ZipFileAppender class.
+     *
+     * @param file the existing zip file to update
+     */
+    ZipFileAppender(File file) {
+        this.file = file;
+    }
+
+    /**
+     * Restore the zip file to its original state if an in-place update of the file did not complete.
+     *
+     * @param file the zip file
+     * @return true if the zip file was restored, false if there was no incomplete update
+     * @throws IOException if an error occurs while restoring the zip file
+     */
+    static boolean recover(File file) throws IOException {
+        final String METHOD = "recover";
+
+        File recoveryFile = getRecoveryFile(file);
+        if (!recoveryFile.isFile()) {
+            return false;
+        }
+
+        LOGGER.entering(CLASS, METHOD, file);
+        boolean restored = false;
+        long originalLength = readRecoveryFile(recoveryFile);
+        if (originalLength >= 0 && file.isFile() && file.length() > originalLength) {
+            try (RandomAccessFile raf = new RandomAccessFile(file, "rw")) {
+                raf.setLength(originalLength);
+                raf.getFD().sync();
+            }
+            LOGGER.warning("WLSDPLY-01561", file.getAbsolutePath(), originalLength);
+            restored = true;
+        }
+        deleteRecoveryFile(recoveryFile);
+        LOGGER.exiting(CLASS, METHOD, restored);
+        return restored;
+    }
+
+    /**
+     * Read the central directory of the zip file.
+     *
+     * @return true if the zip file can be updated in place, false if it uses zip64 extensions or a layout
+     *         that this class does not handle
+     * @throws IOException if an error occurs while reading the zip file
+     */
+    boolean load() throws IOException {
+        final String METHOD = "load";
+
+        LOGGER.entering(CLASS, METHOD, file);
+        boolean supported = false;
+        try (RandomAccessFile raf = new RandomAccessFile(file, "r")) {
+            fileLength = raf.length();
+            long endPosition = findEndHeader(raf);
+            if (endPosition >= 0) {
+                ByteBuffer end = read(raf, endPosition, END_HEADER_SIZE);
+                int diskNumber = getUnsignedShort(end, 4);
+                int centralDisk = getUnsignedShort(end, 6);
+                int diskEntries = getUnsignedShort(end, 8);
+                int totalEntries = getUnsignedShort(end, 10);
+                long centralSize = getUnsignedInt(end, 12);
+                long centralOffset = getUnsignedInt(end, 16);
+                int commentLength = getUnsignedShort(end, 20);
+
+                supported = diskNumber == 0 && centralDisk == 0 && diskEntries == totalEntries &&
+                    totalEntries != MAX_ENTRIES && centralSize < Integer.MAX_VALUE && centralOffset != MAX_OFFSET &&
+                    centralOffset + centralSize == endPosition && !hasZip64Locator(raf, endPosition);
+                if (supported) {
+                    comment = read(raf, endPosition + END_HEADER_SIZE, commentLength).array();
+                    ByteBuffer central = read(raf, centralOffset, (int) centralSize);
+                    supported = readCentralRecords(central, totalEntries);
+                }
+            }
+        }
+        if (!supported) {
+            LOGGER.fine("WLSDPLY-01551", file.getAbsolutePath());
+        }
+        LOGGER.exiting(CLASS, METHOD, supported);
+        return supported;
+    }
+
+    /**
+     * Append the new entries and write a new central directory listing the retained and new entries.  Retained
+     * entries that also appear in the new entries are replaced.  Nothing is written if the update cannot be done
+     * without zip64 extensions or if it would leave too much unused space in the file.  If writing fails, the file
+     * is truncated back to its original length, which leaves the original central directory in effect.  If the
+     * process dies while writing, the recover() method truncates the file when it is next opened.
+     *
+     * @param retainedEntries the names of the existing entries to keep
+     * @param newEntries      the new entries, with null input streams for directory entries
+     * @param newEntriesSize  the uncompressed size of the new entries
+     * @return true if the zip file was updated, false if nothing was written
+     * @throws IOException if an error occurs while updating the zip file
+     */
+    boolean append(Collection<String> retainedEntries, Map<String, InputStream> newEntries, long newEntriesSize)
+        throws IOException {
+        final String METHOD = "append";
+
+        LOGGER.entering(CLASS, METHOD, retainedEntries.size(), newEntries.size(), newEntriesSize);
+        List<byte[]> keptRecords = getKeptRecords(retainedEntries, newEntries.keySet());
+
+        // Deflate can expand incompressible data slightly so leave some room for that in the estimate.
+        //
+        if (keptRecords == null ||
+            !canAppend(keptRecords, newEntries.keySet(), newEntriesSize + (newEntriesSize >> 10))) {
+            LOGGER.exiting(CLASS, METHOD, false);
+            return false;
+        }
+
+        File recoveryFile = writeRecoveryFile();
+        try (RandomAccessFile raf = new RandomAccessFile(file, "rw")) {
+            try {
+                raf.seek(fileLength);
+                ByteArrayOutputStream central = getCentralDirectory(keptRecords);
+                writeEntries(raf, newEntries, central);
+                writeEndHeader(raf, central.toByteArray(), keptRecords.size() + newEntries.size());
+                raf.getFD().sync();
+            } catch (IOException | RuntimeException e) {
+                raf.setLength(fileLength);
+                deleteRecoveryFile(recoveryFile);
+                throw e;
+            }
+        }
+        deleteRecoveryFile(recoveryFile);
+        LOGGER.exiting(CLASS, METHOD, true);
+        return true;
+    }
+
+    /**
+     * Append entries that were compressed ahead of time, under the same conditions as the append() method.
+     *
+     * @param retainedEntries the names of the existing entries to keep
+     * @param newEntries      the compressed new entries
+     * @return true if the zip file was updated, false if nothing was written
+     * @throws IOException if an error occurs while updating the zip file
+     */
+    boolean appendCompressed(Collection<String> retainedEntries, Map<String, CompressedEntry> newEntries)
+        throws IOException {
+        final String METHOD = "appendCompressed";
+
+        LOGGER.entering(CLASS, METHOD, retainedEntries.size(), newEntries.size());
+        List<byte[]> keptRecords = getKeptRecords(retainedEntries, newEntries.keySet());
+        if (keptRecords == null || !canAppend(keptRecords, newEntries.keySet(), getCompressedSize(newEntries))) {
+            LOGGER.exiting(CLASS, METHOD, false);
+            return false;
+        }
+
+        File recoveryFile = writeRecoveryFile();
+        try (RandomAccessFile raf = new RandomAccessFile(file, "rw")) {
+            try {
+                raf.seek(fileLength);
+                ByteArrayOutputStream central = getCentralDirectory(keptRecords);
+                byte[] copyBuffer = new byte[BUFFER_SIZE];
+                for (CompressedEntry entry : newEntries.values()) {
+                    central.write(writeCompressedEntry(raf, entry, copyBuffer));
+                }
+                writeEndHeader(raf, central.toByteArray(), keptRecords.size() + newEntries.size());
+                raf.getFD().sync();
+            } catch (IOException | RuntimeException e) {
+                raf.setLength(fileLength);
+                deleteRecoveryFile(recoveryFile);
+                throw e;
+            }
+        }
+        deleteRecoveryFile(recoveryFile);
+        LOGGER.exiting(CLASS, METHOD, true);
+        return true;
+    }
+
+    /**
+     * Write a new zip file holding the retained entries followed by the new entries.  The retained entries are
+     * copied from this zip file byte for byte, so they are not inflated and deflated again.  If load() was not
+     * called or did not find a zip file, there must be no retained entries.  Nothing is written if the new zip
+     * file would need zip64 extensions.
+     *
+     * @param targetFile      the file to write, which must not be the file of this zip unless nothing is retained
+     * @param retainedEntries the names of the existing entries to keep
+     * @param newEntries      the compressed new entries
+     * @return true if the new zip file was written, false if nothing was written
+     * @throws IOException if an error occurs while reading this zip file or writing the new one
+     */
+    boolean rewrite(File targetFile, Collection<String> retainedEntries, Map<String, CompressedEntry> newEntries)
+        throws IOException {
+        final String METHOD = "rewrite";
+
+        LOGGER.entering(CLASS, METHOD, targetFile, retainedEntries.size(), newEntries.size());
+        List<byte[]> keptRecords = new ArrayList<>();
+        if (!retainedEntries.isEmpty()) {
+            keptRecords = centralRecords == null ? null : getKeptRecords(retainedEntries, newEntries.keySet());
+            if (keptRecords == null) {
+                LOGGER.exiting(CLASS, METHOD, false);
+                return false;
+            }
+        }
+        if (comment == null) {
+            comment = new byte[0];
+        }
+
+        long projectedLength = getLiveBytes(keptRecords) + getCentralDirectorySize(keptRecords) +
+            getCompressedSize(newEntries) + END_HEADER_SIZE + comment.length +
+            (long) keptRecords.size() * DATA_DESCRIPTOR_SIZE;
+        for (String name : newEntries.keySet()) {
+            projectedLength += LOCAL_HEADER_SIZE + CENTRAL_HEADER_SIZE + 2L * getNameBytes(name).length;
+        }
+        if (keptRecords.size() + newEntries.size() >= MAX_ENTRIES || projectedLength >= MAX_OFFSET) {
+            LOGGER.fine("WLSDPLY-01552", file.getAbsolutePath());
+            LOGGER.exiting(CLASS, METHOD, false);
+            return false;
+        }
+
+        try (RandomAccessFile source = keptRecords.isEmpty() ? null : new RandomAccessFile(file, "r");
+             RandomAccessFile target = new RandomAccessFile(targetFile, "rw")) {
+            target.setLength(0);
+            byte[] copyBuffer = new byte[BUFFER_SIZE];
+            ByteArrayOutputStream central = new ByteArrayOutputStream();
+            for (byte[] record : keptRecords) {
+                central.write(copyEntry(source, target, record, copyBuffer));
+            }
+            for (CompressedEntry entry : newEntries.values()) {
+                central.write(writeCompressedEntry(target, entry, copyBuffer));
+            }
+            writeEndHeader(target, central.toByteArray(), keptRecords.size() + newEntries.size());
+        }
+        LOGGER.exiting(CLASS, METHOD, true);
+        return true;
+    }
+
+    /**
+     * Get an existing file entry as a compressed entry that points at its bytes in this zip file, so that it
+     * can be written to another zip file without being inflated and deflated again.  The load() method must
+     * have been called and the zip file must not change while the compressed entry is in use.
+     *
+     * @param name    the name of the existing entry
+     * @param newName the name to give the compressed entry
+     * @return the compressed entry, or null if there is no such file entry or its method or flags are not supported
+     * @throws IOException if an error occurs while reading the zip file
+     */
+    CompressedEntry getCompressedEntry(String name, String newName) throws IOException {
+        byte[] record = centralRecords.get(name);
+        if (record == null || name.endsWith("/")) {
+            return null;
+        }
+
+        ByteBuffer central = ByteBuffer.wrap(record).order(ByteOrder.LITTLE_ENDIAN);
+        int flags = getUnsignedShort(central, 8);
+        int method = getUnsignedShort(central, 10);
+        if ((flags & FLAG_ENCRYPTED) != 0 || (method != ZipEntry.STORED && method != ZipEntry.DEFLATED)) {
+            return null;
+        }
+        long headerOffset = getUnsignedInt(central, CENTRAL_HEADER_OFFSET_OFFSET);
+        ByteBuffer header;
+        try (RandomAccessFile raf = new RandomAccessFile(file, "r")) {
+            header = read(raf, headerOffset, LOCAL_HEADER_SIZE);
+        }
+        if (header.getInt(0) != LOCAL_HEADER_SIGNATURE) {
+            return null;
+        }
+        long dataOffset = headerOffset + LOCAL_HEADER_SIZE + getUnsignedShort(header, 26) +
+            getUnsignedShort(header, 28);
+        return new CompressedEntry(newName, method, getUnsignedInt(central, 16), getUnsignedInt(central, 24),
+            getUnsignedInt(central, 20), file, dataOffset, false);
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // Private Helper Methods                                                //
+    ///////////////////////////////////////////////////////////////////////////
+
+    private static File getRecoveryFile(File zipFile) {
+        return new File(zipFile.getPath() + RECOVERY_FILE_SUFFIX);
+    }
+
+    // Saves the original length of the zip file, synced to disk before any new bytes are written.  The line
+    // terminator marks a complete recovery file, so a recovery file cut short by a crash is ignored.
+    //
+    private File writeRecoveryFile() throws IOException {
+        File recoveryFile = getRecoveryFile(file);
+        try (FileOutputStream outputStream = new FileOutputStream(recoveryFile, false)) {
+            outputStream.write((Long.toString(fileLength) + '\n').getBytes(StandardCharsets.US_ASCII));
+            outputStream.getFD().sync();
+        }
+        return recoveryFile;
+    }
+
+    // Returns the original length from the recovery file, or -1 if the recovery file is not complete.
+    //
+    private static long readRecoveryFile(File recoveryFile) throws IOException {
+        String text = new String(Files.readAllBytes(recoveryFile.toPath()), StandardCharsets.US_ASCII);
+        if (!text.endsWith("\n")) {
+            return -1;
+        }
+        try {
+            return Long.parseLong(text.trim());
+        } catch (NumberFormatException ignore) {
+            return -1;
+        }
+    }
+
+    private static void deleteRecoveryFile(File recoveryFile) {
+        if (recoveryFile.exists() && !recoveryFile.delete()) {
+            LOGGER.warning("WLSDPLY-01563", recoveryFile.getAbsolutePath());
+        }
+    }
+
+    // Returns the central directory records of the retained entries that the new entries do not replace,
+    // or null if a retained entry is not in the central directory.
+    //
+    private List<byte[]> getKeptRecords(Collection<String> retainedEntries, Collection<String> newEntryNames) {
+        List<byte[]> keptRecords = new ArrayList<>();
+        for (String name : retainedEntries) {
+            if (newEntryNames.contains(name)) {
+                continue;
+            }
+            byte[] record = centralRecords.get(name);
+            if (record == null) {
+                LOGGER.fine("WLSDPLY-01551", file.getAbsolutePath());
+                return null;
+            }
+            keptRecords.add(record);
+        }
+        return keptRecords;
+    }
+
+    private boolean canAppend(List<byte[]> keptRecords, Collection<String> newEntryNames, long newDataSize) {
+        long liveBytes = getLiveBytes(keptRecords);
+        long projectedLength = fileLength + newDataSize + getCentralDirectorySize(keptRecords) +
+            END_HEADER_SIZE + comment.length;
+        for (String name : newEntryNames) {
+            projectedLength += LOCAL_HEADER_SIZE + CENTRAL_HEADER_SIZE + 2L * getNameBytes(name).length + 1024;
+        }
+        long deadBytes = fileLength - liveBytes;
+        if (keptRecords.size() + newEntryNames.size() >= MAX_ENTRIES || projectedLength >= MAX_OFFSET) {
+            LOGGER.fine("WLSDPLY-01552", file.getAbsolutePath());
+            return false;
+        } else if (deadBytes * 100 > projectedLength * MAX_DEAD_SPACE_PERCENT) {
+            LOGGER.fine("WLSDPLY-01555", file.getAbsolutePath(), deadBytes);
+            return false;
+        }
+        return true;
+    }
+
+    private static long getLiveBytes(List<byte[]> records) {
+        long liveBytes = 0;
+        for (byte[] record : records) {
+            ByteBuffer buffer = ByteBuffer.wrap(record).order(ByteOrder.LITTLE_ENDIAN);
+            liveBytes += LOCAL_HEADER_SIZE + getUnsignedShort(buffer, 28) + getUnsignedShort(buffer, 30) +
+                getUnsignedInt(buffer, 20);
+        }
+        return liveBytes;
+    }
+
+    private static long getCentralDirectorySize(List<byte[]> records) {
+        long size = 0;
+        for (byte[] record : records) {
+            size += record.length;
+        }
+        return size;
+    }
+
+    private static ByteArrayOutputStream getCentralDirectory(List<byte[]> records) throws IOException {
+        ByteArrayOutputStream central = new ByteArrayOutputStream((int) getCentralDirectorySize(records));
+        for (byte[] record : records) {
+            central.write(record);
+        }
+        return central;
+    }
+
+    private static long getCompressedSize(Map<String, CompressedEntry> entries) {
+        long size = 0;
+        for (CompressedEntry entry : entries.values()) {
+            size += entry.getCompressedSize();
+        }
+        return size;
+    }
+
+    private long findEndHeader(RandomAccessFile raf) throws IOException {
+        if (fileLength < END_HEADER_SIZE) {
+            return -1;
+        }
+
+        // The end header is followed only by the zip file comment, so search backwards from the end.
+        //
+        int tailLength = (int) Math.min(fileLength, END_HEADER_SIZE + MAX_COMMENT_SIZE);
+        long tailStart = fileLength - tailLength;
+        ByteBuffer tail = read(raf, tailStart, tailLength);
+        for (int i = tailLength - END_HEADER_SIZE; i >= 0; i--) {
+            if (tail.getInt(i) == END_HEADER_SIGNATURE &&
+                i + END_HEADER_SIZE + getUnsignedShort(tail, i + 20) == tailLength) {
+                return tailStart + i;
+            }
+        }
+        return -1;
+    }
+
+    private static boolean hasZip64Locator(RandomAccessFile raf, long endPosition) throws IOException {
+        return endPosition >= ZIP64_LOCATOR_SIZE &&
+            read(raf, endPosition - ZIP64_LOCATOR_SIZE, 4).getInt(0) == ZIP64_LOCATOR_SIGNATURE;
+    }
+
+    private boolean readCentralRecords(ByteBuffer central, int totalEntries) {
+        centralRecords = new LinkedHashMap<>();
+        int position = 0;
+        for (int i = 0; i < totalEntries; i++) {
+            if (position + CENTRAL_HEADER_SIZE > central.capacity() ||
+                central.getInt(position) != CENTRAL_HEADER_SIGNATURE) {
+                return false;
+            }
+            int nameLength = getUnsignedShort(central, position + 28);
+            int recordLength = CENTRAL_HEADER_SIZE + nameLength + getUnsignedShort(central, position + 30) +
+                getUnsignedShort(central, position + 32);
+            if (position + recordLength > central.capacity() ||
+                getUnsignedInt(central, position + 20) == MAX_OFFSET ||
+                getUnsignedInt(central, position + 24) == MAX_OFFSET ||
+                getUnsignedInt(central, position + 42) == MAX_OFFSET) {
+                return false;
+            }
+
+            byte[] record = new byte[recordLength];
+            central.position(position);
+            central.get(record);
+            String name = new String(record, CENTRAL_HEADER_SIZE, nameLength, StandardCharsets.UTF_8);
+            centralRecords.put(name, record);
+            position += recordLength;
+        }
+        return true;
+    }
+
+    private void writeEntries(RandomAccessFile raf, Map<String, InputStream> newEntries, ByteArrayOutputStream central)
+        throws IOException {
+
+        byte[] readBuffer = new byte[BUFFER_SIZE];
+        byte[] deflateBuffer = new byte[BUFFER_SIZE];
+        Deflater deflater = new Deflater(Deflater.DEFAULT_COMPRESSION, true);
+        try {
+            for (Map.Entry<String, InputStream> entry : newEntries.entrySet()) {
+                central.write(writeEntry(raf, entry.getKey(), entry.getValue(), deflater, readBuffer, deflateBuffer));
+            }
+        } finally {
+            deflater.end();
+        }
+    }
+
+    private static byte[] writeEntry(RandomAccessFile raf, String name, InputStream inputStream, Deflater deflater,
+        byte[] readBuffer, byte[] deflateBuffer) throws IOException {
+
+        byte[] nameBytes = getNameBytes(name);
+        boolean directory = inputStream == null || name.endsWith("/");
+        int method = directory ? ZipEntry.STORED : ZipEntry.DEFLATED;
+        int version = directory ? VERSION_STORED : VERSION_DEFLATED;
+        int flags = nameBytes.length == name.length() ? 0 : FLAG_UTF8;
+        int dosTime = (int) toDosTime(System.currentTimeMillis());
+        long headerOffset = raf.getFilePointer();
+
+        raf.write(getLocalHeader(nameBytes, version, flags, method, dosTime, 0, 0, 0));
+
+        long crc = 0;
+        long compressedSize = 0;
+        long size = 0;
+        if (!directory) {
+            CRC32 crc32 = new CRC32();
+            deflater.reset();
+            int bytesRead;
+            while ((bytesRead = inputStream.read(readBuffer)) >= 0) {
+                if (bytesRead > 0) {
+                    crc32.update(readBuffer, 0, bytesRead);
+                    deflater.setInput(readBuffer, 0, bytesRead);
+                    while (!deflater.needsInput()) {
+                        writeDeflated(raf, deflater, deflateBuffer);
+                    }
+                }
+            }
+            deflater.finish();
+            while (!deflater.finished()) {
+                writeDeflated(raf, deflater, deflateBuffer);
+            }
+            crc = crc32.getValue();
+            compressedSize = deflater.getBytesWritten();
+            size = deflater.getBytesRead();
+            if (compressedSize >= MAX_OFFSET || size >= MAX_OFFSET || raf.getFilePointer() >= MAX_OFFSET) {
+                throw new ZipException(name);
+            }
+
+            // the sizes are only known now, so go back and fill them into the local header
+            long entryEnd = raf.getFilePointer();
+            ByteBuffer sizes = ByteBuffer.allocate(12).order(ByteOrder.LITTLE_ENDIAN);
+            sizes.putInt((int) crc);
+            sizes.putInt((int) compressedSize);
+            sizes.putInt((int) size);
+            raf.seek(headerOffset + LOCAL_HEADER_CRC_OFFSET);
+            raf.write(sizes.array());
+            raf.seek(entryEnd);
+        }
+
+        return getCentralRecord(nameBytes, version, flags, method, dosTime, crc, compressedSize, size, headerOffset);
+    }
+
+    private static byte[] writeCompressedEntry(RandomAccessFile raf, CompressedEntry entry, byte[] copyBuffer)
+        throws IOException {
+
+        String name = entry.getName();
+        byte[] nameBytes = getNameBytes(name);
+        int method = entry.getMethod();
+        int version = method == ZipEntry.STORED ? VERSION_STORED : VERSION_DEFLATED;
+        int flags = nameBytes.length == name.length() ? 0 : FLAG_UTF8;
+        int dosTime = (int) toDosTime(System.currentTimeMillis());
+        long headerOffset = raf.getFilePointer();
+
+        raf.write(getLocalHeader(nameBytes, version, flags, method, dosTime, entry.getCrc(),
+            entry.getCompressedSize(), entry.getSize()));
+        try (InputStream inputStream = entry.openCompressed()) {
+            if (inputStream != null) {
+                int bytesRead;
+                while ((bytesRead = inputStream.read(copyBuffer)) >= 0) {
+                    raf.write(copyBuffer, 0, bytesRead);
+                }
+            }
+        }
+        if (entry.getSize() >= MAX_OFFSET || raf.getFilePointer() >= MAX_OFFSET) {
+            throw new ZipException(name);
+        }
+        return getCentralRecord(nameBytes, version, flags, method, dosTime, entry.getCrc(),
+            entry.getCompressedSize(), entry.getSize(), headerOffset);
+    }
+
+    // Copies the local header, data and data descriptor of an entry as they are and returns the central
+    // directory record of the entry updated with its new position.
+    //
+    private static byte[] copyEntry(RandomAccessFile source, RandomAccessFile target, byte[] record,
+        byte[] copyBuffer) throws IOException {
+
+        ByteBuffer central = ByteBuffer.wrap(record).order(ByteOrder.LITTLE_ENDIAN);
+        long headerOffset = getUnsignedInt(central, CENTRAL_HEADER_OFFSET_OFFSET);
+        ByteBuffer header = read(source, headerOffset, LOCAL_HEADER_SIZE);
+        if (header.getInt(0) != LOCAL_HEADER_SIGNATURE) {
+            throw new ZipException(new String(record, CENTRAL_HEADER_SIZE, getUnsignedShort(central, 28),
+                StandardCharsets.UTF_8));
+        }
+        long length = LOCAL_HEADER_SIZE + getUnsignedShort(header, 26) + getUnsignedShort(header, 28) +
+            getUnsignedInt(central, 20);
+        if ((getUnsignedShort(central, 8) & FLAG_DATA_DESCRIPTOR) != 0) {
+            // the descriptor signature is optional
+            boolean signed = read(source, headerOffset + length, 4).getInt(0) == DATA_DESCRIPTOR_SIGNATURE;
+            length += signed ? DATA_DESCRIPTOR_SIZE : DATA_DESCRIPTOR_SIZE - 4;
+        }
+
+        long newOffset = target.getFilePointer();
+        source.seek(headerOffset);
+        while (length > 0) {
+            int bytesRead = source.read(copyBuffer, 0, (int) Math.min(copyBuffer.length, length));
+            if (bytesRead < 0) {
+                throw new ZipException(source.toString());
+            }
+            target.write(copyBuffer, 0, bytesRead);
+            length -= bytesRead;
+        }
+
+        byte[] newRecord = record.clone();
+        ByteBuffer newCentral = ByteBuffer.wrap(newRecord).order(ByteOrder.LITTLE_ENDIAN);
+        newCentral.putInt(CENTRAL_HEADER_OFFSET_OFFSET, (int) newOffset);
+        return newRecord;
+    }
+
+    private static byte[] getLocalHeader(byte[] nameBytes, int version, int flags, int method, int dosTime, long crc,
+        long compressedSize, long size) {
+        ByteBuffer header = ByteBuffer.allocate(LOCAL_HEADER_SIZE + nameBytes.length).order(ByteOrder.LITTLE_ENDIAN);
+        header.putInt(LOCAL_HEADER_SIGNATURE);
+        header.putShort((short) version);
+        header.putShort((short) flags);
+        header.putShort((short) method);
+        header.putInt(dosTime);
+        header.putInt((int) crc);
+        header.putInt((int) compressedSize);
+        header.putInt((int) size);
+        header.putShort((short) nameBytes.length);
+        header.putShort((short) 0);
+        header.put(nameBytes);
+        return header.array();
+    }
+
+    private static byte[] getCentralRecord(byte[] nameBytes, int version, int flags, int method, int dosTime, long crc,
+        long compressedSize, long size, long headerOffset) {
+        ByteBuffer record = ByteBuffer.allocate(CENTRAL_HEADER_SIZE + nameBytes.length).order(ByteOrder.LITTLE_ENDIAN);
+        record.putInt(CENTRAL_HEADER_SIGNATURE);
+        record.putShort((short) version);
+        record.putShort((short) version);
+        record.putShort((short) flags);
+        record.putShort((short) method);
+        record.putInt(dosTime);
+        record.putInt((int) crc);
+        record.putInt((int) compressedSize);
+        record.putInt((int) size);
+        record.putShort((short) nameBytes.length);
+        record.putShort((short) 0);
+        record.putShort((short) 0);
+        record.putShort((short) 0);
+        record.putShort((short) 0);
+        record.putInt(0);
+        record.putInt((int) headerOffset);
+        record.put(nameBytes);
+        return record.array();
+    }
+
+    private static void writeDeflated(RandomAccessFile raf, Deflater deflater, byte[] deflateBuffer)
+        throws IOException {
+        int length = deflater.deflate(deflateBuffer);
+        if (length > 0) {
+            raf.write(deflateBuffer, 0, length);
+        }
+    }
+
+    private void writeEndHeader(RandomAccessFile raf, byte[] central, int totalEntries) throws IOException {
+        long centralOffset = raf.getFilePointer();
+        if (centralOffset + central.length >= MAX_OFFSET) {
+            throw new ZipException(file.getAbsolutePath());
+        }
+        raf.write(central);
+
+        ByteBuffer end = ByteBuffer.allocate(END_HEADER_SIZE + comment.length).order(ByteOrder.LITTLE_ENDIAN);
+        end.putInt(END_HEADER_SIGNATURE);
+        end.putShort((short) 0);
+        end.putShort((short) 0);
+        end.putShort((short) totalEntries);
+        end.putShort((short) totalEntries);
+        end.putInt(central.length);
+        end.putInt((int) centralOffset);
+        end.putShort((short) comment.length);
+        end.put(comment);
+        raf.write(end.array());
+    }
+
+    private static ByteBuffer read(RandomAccessFile raf, long position, int length) throws IOException {
+        byte[] bytes = new byte[length];
+        raf.seek(position);
+        raf.readFully(bytes);
+        return ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN);
+    }
+
+    private static int getUnsignedShort(ByteBuffer buffer, int index) {
+        return buffer.getShort(index) & 0xFFFF;
+    }
+
+    private static long getUnsignedInt(ByteBuffer buffer, int index) {
+        return buffer.getInt(index) & MAX_OFFSET;
+    }
+
+    private static byte[] getNameBytes(String name) {
+        return name.getBytes(StandardCharsets.UTF_8);
+    }
+
+    private static long toDosTime(long time) {
+        Calendar calendar = Calendar.getInstance();
+        calendar.setTimeInMillis(time);
+        int year = calendar.get(Calendar.YEAR);
+        if (year < 1980) {
+            return (1 << 21) | (1 << 16);
+        }
+        return (long) (year - 1980) << 25 | (calendar.get(Calendar.MONTH) + 1) << 21 |
+            calendar.get(Calendar.DAY_OF_MONTH) << 16 | calendar.get(Calendar.HOUR_OF_DAY) << 11 |
+            calendar.get(Calendar.MINUTE) << 5 | calendar.get(Calendar.SECOND) >> 1;
+    }
+}
@@ -31,8 +31,11 @@ from wlsdeploy.aliases.wlst_modes import WlstModes
 from wlsdeploy.exception import exception_helper
 from wlsdeploy.exception.expection_types import ExceptionType
 from wlsdeploy.logging.platform_logger import PlatformLogger
+from wlsdeploy.tool.deploy import checkpoint_journal
+from wlsdeploy.tool.deploy import chunked_activator
 from wlsdeploy.tool.deploy import deployer_utils
 from wlsdeploy.tool.deploy import model_deployer
+from wlsdeploy.tool.deploy.chunked_activator import ChunkedActivator
 from wlsdeploy.tool.validate.validator import Validator
 from wlsdeploy.tool.util import filter_helper
 from wlsdeploy.tool.util.wlst_helper import WlstHelper
@@ -70,7 +73,14 @@ __optional_arguments = [
     CommandLineArgUtil.ADMIN_USER_SWITCH,
     CommandLineArgUtil.ADMIN_PASS_SWITCH,
     CommandLineArgUtil.USE_ENCRYPTION_SWITCH,
-    CommandLineArgUtil.PASSPHRASE_SWITCH
+    CommandLineArgUtil.PASSPHRASE_SWITCH,
+    CommandLineArgUtil.SKIP_UNCHANGED_ATTRIBUTES_SWITCH,
+    CommandLineArgUtil.MAX_PARALLEL_DEPLOYMENTS_SWITCH,
+    CommandLineArgUtil.ACTIVATION_CHUNK_SIZE_SWITCH,
+    CommandLineArgUtil.USE_CHECKPOINT_JOURNAL_SWITCH,
+    CommandLineArgUtil.DEPLOYMENT_STATE_DIR_SWITCH,
+    CommandLineArgUtil.FILE_VARIABLE_CACHE_SIZE_SWITCH,
+    CommandLineArgUtil.CHECK_FILE_VARIABLE_TIMES_SWITCH
 ]
 
 
@@ -262,10 +272,19 @@ def __deploy(model, model_context, aliases):
     :param aliases: the aliases
     :raises DeployException: if an error occurs
     """
+    _method_name = '__deploy'
+
     if __wlst_mode == WlstModes.ONLINE:
-        __deploy_online(model, model_context, aliases)
+        checkpoint_journal.open_journal(model_context, __tmp_model_dir is not None, __logger)
+        try:
+            __deploy_online(model, model_context, aliases)
+        except BundleAwareException, ex:
+            checkpoint_journal.close_journal(False)
+            raise ex
+        checkpoint_journal.close_journal(True)
     else:
         __deploy_offline(model, model_context, aliases)
+    deployer_utils.log_attribute_counts(_class_name, _method_name)
     return
 
 
@@ -295,15 +314,20 @@ def __deploy_online(model, model_context, aliases):
 
     __logger.info("WLSDPLY-09007", admin_url, method_name=_method_name, class_name=_class_name)
 
+    # the top-level elements report to the activator as they complete, so it can activate them in chunks
+    activator = ChunkedActivator(model_context.get_activation_chunk_size(), __logger, ExceptionType.DEPLOY)
+    chunked_activator.set_activator(activator)
     try:
         model_deployer.deploy_resources(model, model_context, aliases, wlst_mode=__wlst_mode)
-    except DeployException, de:
+    except (DeployException, VariableException), de:
+        # a lazily substituted section may raise VariableException when it is first accessed
+        chunked_activator.set_activator(None)
         __release_edit_session_and_disconnect()
         raise de
+    chunked_activator.set_activator(None)
 
     try:
-        __wlst_helper.save()
-        __wlst_helper.activate()
+        activator.activate_remaining()
     except BundleAwareException, ex:
         __release_edit_session_and_disconnect()
         raise ex
@@ -396,15 +420,21 @@ def __clean_up_temp_files():
         __tmp_model_dir = None
 
 
-def validate_model(model_dictionary, model_context, aliases):
+def validate_model(model_dictionary, model_context, aliases, changed_paths=None):
     _method_name = 'validate_model'
 
     try:
         validator = Validator(model_context, aliases, wlst_mode=__wlst_mode)
 
-        # no need to pass the variable file for processing, substitution has already been performed
-        return_code = validator.validate_in_tool_mode(model_dictionary, variables_file_name=None,
-                                                      archive_file_name=model_context.get_archive_file_name())
+        # if changed_paths is specified, the model has not been substituted, so pass the variable file.
+        # The validator substitutes a copy, and records the changed paths for the lazy substitution.
+        variables_file_name = None
+        if changed_paths is not None:
+            variables_file_name = model_context.get_variable_file()
+
+        return_code = validator.validate_in_tool_mode(model_dictionary, variables_file_name=variables_file_name,
+                                                      archive_file_name=model_context.get_archive_file_name(),
+                                                      changed_paths=changed_paths)
     except ValidateException, ex:
         __logger.severe('WLSDPLY-20000', _program_name, ex.getLocalizedMessage(), error=ex,
                         class_name=_class_name, method_name=_method_name)
@@ -451,11 +481,15 @@ def main(args):
         __clean_up_temp_files()
         tool_exit.end(model_context, CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
 
+    # filters expect a substituted model, otherwise each section is substituted when it is first accessed
+    lazy_substitution = not filter_helper.has_filters("deploy")
+
     try:
         variable_map = {}
         if model_context.get_variable_file():
             variable_map = variables.load_variables(model_context.get_variable_file())
-        variables.substitute(model_dictionary, variable_map, model_context)
+        if not lazy_substitution:
+            variables.substitute(model_dictionary, variable_map, model_context)
     except VariableException, ex:
         __logger.severe('WLSDPLY-20004', _program_name, ex.getLocalizedMessage(), error=ex,
                         class_name=_class_name, method_name=_method_name)
@@ -463,20 +497,33 @@ def main(args):
         tool_exit.end(model_context, CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
 
     aliases = Aliases(model_context, wlst_mode=__wlst_mode)
-    validate_model(model_dictionary, model_context, aliases)
 
-    if filter_helper.apply_filters(model_dictionary, "deploy"):
-        # if any filters were applied, re-validate the model
+    if lazy_substitution:
+        changed_paths = {}
+        validate_model(model_dictionary, model_context, aliases, changed_paths)
+        model = Model(model_dictionary, variable_map=variable_map, model_context=model_context,
+                      changed_paths=changed_paths)
+    else:
         validate_model(model_dictionary, model_context, aliases)
 
-    try:
+        if filter_helper.apply_filters(model_dictionary, "deploy"):
+            # if any filters were applied, re-validate the model
+            validate_model(model_dictionary, model_context, aliases)
+
         model = Model(model_dictionary)
+
+    try:
         __deploy(model, model_context, aliases)
     except DeployException, ex:
         __logger.severe('WLSDPLY-09015', _program_name, ex.getLocalizedMessage(), error=ex,
                         class_name=_class_name, method_name=_method_name)
         __clean_up_temp_files()
         tool_exit.end(model_context, CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
+    except VariableException, ex:
+        __logger.severe('WLSDPLY-20004', _program_name, ex.getLocalizedMessage(), error=ex,
+                        class_name=_class_name, method_name=_method_name)
+        __clean_up_temp_files()
+        tool_exit.end(model_context, CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
 
     __clean_up_temp_files()
     return
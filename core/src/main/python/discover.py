@@ -72,7 +72,10 @@ __optional_arguments = [
     CommandLineArgUtil.ADMIN_URL_SWITCH,
     CommandLineArgUtil.ADMIN_USER_SWITCH,
     CommandLineArgUtil.ADMIN_PASS_SWITCH,
-    CommandLineArgUtil.TARGET_MODE_SWITCH
+    CommandLineArgUtil.TARGET_MODE_SWITCH,
+    CommandLineArgUtil.PREVIOUS_ARCHIVE_FILE_SWITCH,
+    CommandLineArgUtil.COMPRESS_ARCHIVE_AHEAD_SWITCH,
+    CommandLineArgUtil.DEDUPLICATE_BINARIES_SWITCH
 ]
 
 
@@ -96,6 +99,8 @@ def __process_args(args):
     __verify_required_args_present(required_arg_map)
     __wlst_mode = __process_online_args(optional_arg_map)
     __process_archive_filename_arg(required_arg_map)
+    __process_archive_options_args(required_arg_map, optional_arg_map)
+    __process_previous_archive_filename_arg(required_arg_map, optional_arg_map)
     __process_variable_filename_arg(optional_arg_map)
 
     combined_arg_map = optional_arg_map.copy()
@@ -177,6 +182,47 @@ def __process_archive_filename_arg(required_arg_map):
     return
 
 
+def __process_archive_options_args(required_arg_map, optional_arg_map):
+    """
+    Set the archive file options that are selected by switches.
+    :param required_arg_map: the required arguments map containing the archive file object
+    :param optional_arg_map: the optional arguments map
+    """
+    archive_file = required_arg_map[CommandLineArgUtil.ARCHIVE_FILE]
+
+    # discovered binaries are mostly jar, war and ear files, so store those as is and deflate the rest in parallel
+    if CommandLineArgUtil.COMPRESS_ARCHIVE_AHEAD_SWITCH in optional_arg_map:
+        archive_file.setCompressAhead(True)
+    # domains often reference the same binary from several places, so store each one only once
+    if CommandLineArgUtil.DEDUPLICATE_BINARIES_SWITCH in optional_arg_map:
+        archive_file.setDeduplicateBinaries(True)
+    return
+
+
+def __process_previous_archive_filename_arg(required_arg_map, optional_arg_map):
+    """
+    If the previous archive file argument is present, let the archive file copy unchanged binaries from it.
+    :param required_arg_map: the required arguments map containing the archive file object
+    :param optional_arg_map: the optional arguments map containing the previous archive file name
+    :raises CLAException: if the previous archive file cannot be opened
+    """
+    _method_name = '__process_previous_archive_filename_arg'
+
+    if CommandLineArgUtil.PREVIOUS_ARCHIVE_FILE_SWITCH in optional_arg_map:
+        previous_archive_file_name = optional_arg_map[CommandLineArgUtil.PREVIOUS_ARCHIVE_FILE_SWITCH]
+        archive_file = required_arg_map[CommandLineArgUtil.ARCHIVE_FILE]
+        try:
+            archive_file.setPreviousArchive(previous_archive_file_name)
+        except (WLSDeployArchiveIOException, IllegalArgumentException), ex:
+            cla_ex = exception_helper.create_cla_exception('WLSDPLY-06025', previous_archive_file_name,
+                                                           archive_file.getArchiveFileName(),
+                                                           ex.getLocalizedMessage(), error=ex)
+            cla_ex.setExitCode(CommandLineArgUtil.ARG_VALIDATION_ERROR_EXIT_CODE)
+            __logger.throwing(cla_ex, class_name=_class_name, method_name=_method_name)
+            raise cla_ex
+    return
+
+
 def __process_variable_filename_arg(optional_arg_map):
     """
     If the variable filename argument is present, the required model variable injector json file must exist in
@@ -221,6 +267,7 @@ def __discover(model_context, aliases):
         DeploymentsDiscoverer(model_context, model.get_model_app_deployments(), base_location, wlst_mode=__wlst_mode,
                               aliases=aliases).discover()
         __discover_multi_tenant(model, model_context, base_location, aliases)
+        __commit_archive(model_context)
     except AliasException, ae:
         wls_version = WebLogicHelper(__logger).get_actual_weblogic_version()
         wlst_mode = WlstModes.from_value(__wlst_mode)
@@ -297,7 +344,8 @@ def __connect_to_domain(model_context):
 
 def __clear_archive_file(model_context):
     """
-    Remove any binaries already in the archive file.
+    Remove any binaries already in the archive file.  This starts the batch of archive changes that
+    __discover commits, so the archive file is only rewritten once for all the discovered binaries.
     :param model_context: the model context
     :raises DiscoverException: if an error occurs while removing the binaries
     """
@@ -312,6 +360,7 @@ def __clear_archive_file(model_context):
         raise de
 
     try:
+        archive_file.beginBatch()
         archive_file.removeAllBinaries()
     except WLSDeployArchiveIOException, wioe:
         de = exception_helper.create_discover_exception('WLSDPLY-06005', wioe.getLocalizedMessage())
@@ -403,7 +452,9 @@ def __persist_model(model, model_context):
     if add_to_archive:
         try:
             archive_file = model_context.get_archive_file()
+            archive_file.beginBatch()
             archive_file.addModel(model_file, model_file_name)
+            archive_file.commit()
             if not model_file.delete():
                 model_file.deleteOnExit()
         except (WLSDeployArchiveIOException, IllegalArgumentException), arch_ex:
@@ -419,6 +470,27 @@ def __persist_model(model, model_context):
     return
 
 
+def __commit_archive(model_context):
+    """
+    Write the binaries staged during discovery to the archive file.
+    :param model_context: the model context
+    :raises DiscoverException: if an error occurs while writing the archive file
+    """
+    _method_name = '__commit_archive'
+
+    __logger.entering(class_name=_class_name, method_name=_method_name)
+    archive_file = model_context.get_archive_file()
+    try:
+        archive_file.commit()
+    except (WLSDeployArchiveIOException, IllegalStateException), arch_ex:
+        ex = exception_helper.create_discover_exception('WLSDPLY-06024', model_context.get_archive_file_name(),
+                                                        arch_ex.getLocalizedMessage(), error=arch_ex)
+        __logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+        raise ex
+    __logger.exiting(class_name=_class_name, method_name=_method_name)
+    return
+
+
 def __check_and_customize_model(model, model_context, aliases):
     """
     Customize the model dictionary before persisting. Validate the model after customization for informational
@@ -509,7 +581,7 @@ def main(args):
     try:
         __persist_model(model, model_context)
 
-    except TranslateException, ex:
+    except (DiscoverException, TranslateException), ex:
         __logger.severe('WLSDPLY-20024', _program_name, model_context.get_archive_file_name(), ex.getLocalizedMessage(),
                         error=ex, class_name=_class_name, method_name=_method_name)
         __log_and_exit(model_context, CommandLineArgUtil.PROG_ERROR_EXIT_CODE, _class_name, _method_name)
@@ -2,8 +2,10 @@
 Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
+from java.lang import IllegalArgumentException
 from java.lang import String
 
+from oracle.weblogic.deploy.aliases import AliasException
 from oracle.weblogic.deploy.aliases import TypeUtils
 from oracle.weblogic.deploy.aliases import VersionUtils
 from oracle.weblogic.deploy.encrypt import EncryptionException
@@ -17,6 +19,7 @@ from wlsdeploy.exception import exception_helper
 from wlsdeploy.logging.platform_logger import PlatformLogger
 from wlsdeploy.aliases import alias_utils
 from wlsdeploy.aliases import password_utils
+from wlsdeploy.util import dictionary_utils
 from wlsdeploy.util import string_utils
 from wlsdeploy.util.weblogic_helper import WebLogicHelper
 
@@ -1014,20 +1017,22 @@ class Aliases(object):
     def attribute_values_are_equal(self, location, model_attribute_name, model_attribute_value, wlst_attribute_value):
         """
         Returns whether or not the model and WLST values for a given model attribute,
-        should be considered equal.
+        should be considered equal, so that setting the model value would not change the attribute.
 
-        :param location:
-        :param model_attribute_name:
-        :param model_attribute_value:
-        :param wlst_attribute_value:
+        Both values are converted the same way discover converts WLST values to model values, so a model value
+        that matches the default is equal to a WLST value that is unset.  Password attributes are never
+        considered equal, since the existing value cannot be compared.
+
+        :param location: the location
+        :param model_attribute_name: the model attribute name
+        :param model_attribute_value: the model attribute value
+        :param wlst_attribute_value: the existing WLST attribute value
         :return: boolean
         :raises: AliasException: if an error occurs
         """
 
         _method_name = 'attribute_values_are_equal'
 
-        result = False
-
         module_folder = self._alias_entries.get_dictionary_for_location(location)
 
         if ATTRIBUTES not in module_folder:
@@ -1035,13 +1040,28 @@ class Aliases(object):
             self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
             raise ex
 
-        for key, value in module_folder[ATTRIBUTES].iteritems():
-            if key == model_attribute_name:
-                attribute_info = module_folder[ATTRIBUTES][key]
-                if attribute_info and VALUE in attribute_info and DEFAULT in attribute_info[VALUE]:
-                    result = (model_attribute_value == wlst_attribute_value and
-                              model_attribute_value == attribute_info[VALUE][DEFAULT])
+        attribute_info = dictionary_utils.get_dictionary_element(module_folder[ATTRIBUTES], model_attribute_name)
+        if not attribute_info or self.__is_model_attribute_read_only(location, attribute_info) or \
+                attribute_info[WLST_TYPE] == PASSWORD or attribute_info[WLST_TYPE] in ALIAS_MAP_TYPES:
+            return False
+
+        wlst_attribute_name = attribute_info[WLST_NAME]
+        try:
+            _, model_value = \
+                self.get_model_attribute_name_and_value(location, wlst_attribute_name, model_attribute_value)
+            _, existing_value = \
+                self.get_model_attribute_name_and_value(location, wlst_attribute_name, wlst_attribute_value)
+        except (AliasException, IllegalArgumentException, TypeError, ValueError), e:
+            self._logger.finer('WLSDPLY-08411', model_attribute_name, location.get_folder_path(), str(e),
+                               class_name=self._class_name, method_name=_method_name)
+            return False
 
+        if model_value is None or existing_value is None:
+            result = model_value is None and existing_value is None
+        elif isinstance(model_value, list) or isinstance(existing_value, list):
+            result = _to_string_list(model_value) == _to_string_list(existing_value)
+        else:
+            result = str(model_value) == str(existing_value)
         return result
 
     def is_valid_model_attribute_name(self, location, model_attribute_name):
@@ -1175,6 +1195,17 @@ class Aliases(object):
         return rtnval
 
 
+def _to_string_list(value):
+    """
+    Convert a converted list value, or a delimited string, to a list of strings for comparison.
+    :param value: the value
+    :return: the list of strings
+    """
+    if isinstance(value, list):
+        return [str(element) for element in value]
+    return [element.strip() for element in str(value).split(MODEL_LIST_DELIMITER)]
+
+
 def _strings_are_empty(converted_value, default_value):
     """
     Test converted and default values to see if they are both either None or an empty string
@@ -4,14 +4,17 @@ The Universal Permissive License (UPL), Version 1.0
 """
 import copy
 import javaos as os
-from java.io import ByteArrayOutputStream
 from java.io import File
+from java.io import FileInputStream
 from java.io import FileNotFoundException
 from java.io import IOException
 from java.lang import IllegalStateException
+from java.lang import System
 from java.security import NoSuchAlgorithmException
 from java.util.jar import JarFile
+from java.util.jar import Manifest
 from java.util.zip import ZipException
+from oracle.weblogic.deploy.deploy import DeployException
 from sets import Set
 from wlsdeploy.aliases.location_context import LocationContext
 from wlsdeploy.aliases.model_constants import ABSOLUTE_SOURCE_PATH
@@ -32,13 +35,22 @@ from wlsdeploy.aliases.model_constants import TARGETS
 from wlsdeploy.aliases.wlst_modes import WlstModes
 from wlsdeploy.exception import exception_helper
 from wlsdeploy.tool.deploy import deployer_utils
+from wlsdeploy.tool.deploy import deployment_fingerprints
+from wlsdeploy.tool.deploy import deployment_scheduler
 from wlsdeploy.tool.deploy.deployer import Deployer
+from wlsdeploy.tool.deploy.deployment_fingerprints import DeploymentFingerprintStore
+from wlsdeploy.tool.deploy.deployment_scheduler import DeploymentScheduler
+from wlsdeploy.tool.deploy.progress_poller import ProgressPoller
 from wlsdeploy.util import dictionary_utils
 from wlsdeploy.util import string_utils
 
 import oracle.weblogic.deploy.util.FileUtils as FileUtils
 import oracle.weblogic.deploy.util.PyOrderedDict as OrderedDict
 
+# the main manifest attributes that determine the versioned name of an application or library
+_MANIFEST_VERSION_ATTRIBUTES = ['Weblogic-Application-Version', 'Extension-Name', 'Specification-Version',
+                                'Implementation-Version']
+
 
 class ApplicationsDeployer(Deployer):
     """
@@ -52,7 +64,11 @@ class ApplicationsDeployer(Deployer):
         Deployer.__init__(self, model, model_context, aliases, wlst_mode)
         self._class_name = 'ApplicationDeployer'
         self._base_location = base_location
+        self._scope = None
         self._parent_dict, self._parent_name, self._parent_type = self.__get_parent_by_location(self._base_location)
+        self._fingerprints = None
+        self._deployed_fingerprints = []
+        self._binary_digests = dict()
 
     def deploy(self):
         """
@@ -86,6 +102,7 @@ class ApplicationsDeployer(Deployer):
         shared_library_location = LocationContext(self._base_location).append_location(LIBRARY)
         shared_library_token = self.alias_helper.get_name_token(shared_library_location)
         existing_shared_libraries = deployer_utils.get_existing_object_list(shared_library_location, self.alias_helper)
+        self.__extract_source_paths_from_archive(shared_libraries)
 
         for shared_library_name in shared_libraries:
             self.logger.info('WLSDPLY-09608', LIBRARY, shared_library_name, self._parent_type, self._parent_name,
@@ -106,9 +123,7 @@ class ApplicationsDeployer(Deployer):
                 raise ex
 
             if deployer_utils.is_path_into_archive(shlib_source_path):
-                if self.archive_helper is not None:
-                    self.archive_helper.extract_file(shlib_source_path)
-                else:
+                if self.archive_helper is None:
                     ex = exception_helper.create_deploy_exception('WLSDPLY-09303', shared_library_name)
                     self.logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
                     raise ex
@@ -147,6 +162,7 @@ class ApplicationsDeployer(Deployer):
         application_location = LocationContext(self._base_location).append_location(APPLICATION)
         application_token = self.alias_helper.get_name_token(application_location)
         existing_applications = deployer_utils.get_existing_object_list(application_location, self.alias_helper)
+        self.__extract_source_paths_from_archive(applications)
 
         for application_name in applications:
             self.logger.info('WLSDPLY-09301', APPLICATION, application_name, self._parent_type, self._parent_name,
@@ -162,9 +178,7 @@ class ApplicationsDeployer(Deployer):
                 raise ex
 
             if deployer_utils.is_path_into_archive(app_source_path):
-                if self.archive_helper is not None:
-                    self.archive_helper.extract_file(app_source_path)
-                else:
+                if self.archive_helper is None:
                     ex = exception_helper.create_deploy_exception('WLSDPLY-09303', application_name)
                     self.logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
                     raise ex
@@ -210,6 +224,14 @@ class ApplicationsDeployer(Deployer):
             # Nothing to do...
             return
 
+        # the last-deployed fingerprints record the digests, targets and options of the deployed binaries
+        self._fingerprints = \
+            DeploymentFingerprintStore(deployment_fingerprints.get_store_file_name(self.model_context), self.logger)
+        self._fingerprints.load()
+        self._deployed_fingerprints = []
+        # the operation ids and fingerprints of same-named apps in other partitions or resource groups differ
+        self._scope = self.__get_deployment_scope(base_location)
+
         existing_app_refs = self.__get_existing_apps(self._base_location)
         existing_lib_refs = self.__get_library_references(self._base_location)
         existing_libs = existing_lib_refs.keys()
@@ -235,9 +257,12 @@ class ApplicationsDeployer(Deployer):
         deployed_app_list = []
         redeploy_app_list = []
 
+        # the operations are run as a dependency graph, so that independent operations can overlap
+        scheduler = DeploymentScheduler(self.model_context.get_max_parallel_deployments(), self.logger, self._scope)
+
         # shared library updated, app referenced must be stopped, redeployed, and started so stop the app first
         for app in stop_app_list:
-            self.__stop_app(app)
+            scheduler.add_operation(deployment_scheduler.STOP, app, self.__stop_app)
             # add the referenced app to the redeploy list
             redeploy_app_list.append(app)
             # add the referenced app to the start list
@@ -245,18 +270,39 @@ class ApplicationsDeployer(Deployer):
 
         # app is updated, it must be stopped and undeployed first
         for app in stop_and_undeploy_app_list:
-            self.__stop_app(app)
-            self.__undeploy_app(app)
+            stop_id = scheduler.add_operation(deployment_scheduler.STOP, app, self.__stop_app)
+            scheduler.add_operation(deployment_scheduler.UNDEPLOY, app, self.__undeploy_app, depends_on=[stop_id])
 
-        # library is updated, it must be undeployed first
+        # library is updated, it must be undeployed first, after the apps referencing it are stopped
         for lib in update_library_list:
-            self.__undeploy_app(lib, library_module='true')
+            stop_ids = []
+            for app in _get_ref_apps(existing_lib_refs, lib):
+                stop_ids.append(deployment_scheduler.get_operation_id(deployment_scheduler.STOP, app, self._scope))
+            scheduler.add_operation(deployment_scheduler.UNDEPLOY, lib, self.__undeploy_app,
+                                    kwargs={'library_module': 'true'}, depends_on=stop_ids)
 
-        self.__deploy_model_libraries(model_shared_libraries, lib_location)
-        self.__deploy_model_applications(model_applications, app_location, deployed_app_list)
+        library_deploy_ids = self.__deploy_model_libraries(model_shared_libraries, lib_location, scheduler)
+        self.__deploy_model_applications(model_applications, app_location, deployed_app_list, scheduler,
+                                         library_deploy_ids)
 
+        # a referencing app is redeployed once the updated libraries that it references are deployed
         for app in redeploy_app_list:
-            self.__redeploy_app(app)
+            depends_on = [deployment_scheduler.get_operation_id(deployment_scheduler.STOP, app, self._scope),
+                          deployment_scheduler.get_operation_id(deployment_scheduler.DEPLOY, app, self._scope)]
+            for lib in update_library_list:
+                if app in _get_ref_apps(existing_lib_refs, lib):
+                    depends_on.append(deployment_scheduler.get_operation_id(deployment_scheduler.DEPLOY, lib,
+                                                                            self._scope))
+            scheduler.add_operation(deployment_scheduler.REDEPLOY, app, self.__redeploy_app, depends_on=depends_on)
+
+        try:
+            scheduler.run()
+        except DeployException, de:
+            # the manifests read from the model binaries are still valid
+            self._fingerprints.save()
+            raise de
+
+        self.__record_deployed_fingerprints()
 
         self.__start_all_apps(deployed_app_list, base_location)
         self.logger.exiting(class_name=self._class_name, method_name=_method_name)
@@ -389,11 +435,8 @@ class ApplicationsDeployer(Deployer):
                 absolute_sourcepath = attributes_map['AbsoluteSourcePath']
                 absolute_planpath = attributes_map['AbsolutePlanPath']
                 deployment_order = attributes_map['DeploymentOrder']
-                app_hash = self.__get_file_hash(absolute_sourcepath)
-                if absolute_planpath is not None:
-                    plan_hash = self.__get_file_hash(absolute_planpath)
-                else:
-                    plan_hash = None
+                app_hash = self.__get_deployed_hash(APPLICATION, app, absolute_sourcepath, False)
+                plan_hash = self.__get_deployed_hash(APPLICATION, app, absolute_planpath, True)
 
                 _update_ref_dictionary(ref_dictionary, app, absolute_sourcepath, app_hash, None,
                                        absolute_plan_path=absolute_planpath, deploy_order=deployment_order,
@@ -439,7 +482,8 @@ class ApplicationsDeployer(Deployer):
                 # TODO(jshum) - Why does the deployment plan not get considered?
                 absolute_source_path = config_attributes[ABSOLUTE_SOURCE_PATH]
                 deployment_order = config_attributes[DEPLOYMENT_ORDER]
-                lib_hash = self.__get_file_hash(absolute_source_path)
+                # the library is listed by each server runtime, so the digest is remembered for the next one
+                lib_hash = self.__get_deployed_hash(LIBRARY, lib, absolute_source_path, False)
 
                 if string_utils.to_boolean(runtime_attributes['Referenced']) is True:
                     referenced_path = library_runtime_path + lib + '/ReferencingRuntimes/'
@@ -498,8 +542,10 @@ class ApplicationsDeployer(Deployer):
 
                     # user libraries
                     model_lib_hash = self.__get_hash(model_src_path)
-                    existing_lib_hash = self.__get_file_hash(existing_src_path)
-                    if model_lib_hash != existing_lib_hash:
+                    existing_lib_hash = dictionary_utils.get_element(existing_lib_ref, 'hash')
+                    # the existing targets are read from the domain, so only the deployment options are compared
+                    if model_lib_hash != existing_lib_hash or \
+                            self.__deployed_settings_changed(LIBRARY, lib, model_libs, 'true', False):
                         #
                         # updated library and add referencing apps to the stop list
                         #
@@ -536,27 +582,69 @@ class ApplicationsDeployer(Deployer):
 
                 if app in existing_apps:
                     existing_app_ref = dictionary_utils.get_dictionary_element(existing_app_refs, app)
-                    plan_path = dictionary_utils.get_element(existing_app_ref, 'planPath')
-                    src_path = dictionary_utils.get_element(existing_app_ref, 'sourcePath')
 
                     model_src_hash = \
                         self.__get_hash(dictionary_utils.get_element(app_dict, SOURCE_PATH))
                     model_plan_hash = \
                         self.__get_hash(dictionary_utils.get_element(app_dict, PLAN_PATH))
 
-                    existing_src_hash = self.__get_file_hash(src_path)
-                    existing_plan_hash = self.__get_file_hash(plan_path)
+                    # the existing digests were read with the existing apps
+                    existing_src_hash = dictionary_utils.get_element(existing_app_ref, 'hash')
+                    existing_plan_hash = dictionary_utils.get_element(existing_app_ref, 'planHash')
                     if model_src_hash == existing_src_hash:
-                        if model_plan_hash == existing_plan_hash:
-                            self.__remove_app_from_deployment(model_apps, app)
-                        else:
+                        if model_plan_hash != existing_plan_hash:
                             # updated deployment plan
                             stop_and_undeploy_app_list.append(app)
+                        elif self.__deployed_settings_changed(APPLICATION, app, model_apps, 'false', True):
+                            # updated targets or deployment options
+                            stop_and_undeploy_app_list.append(app)
+                        else:
+                            self.__remove_app_from_deployment(model_apps, app)
                     else:
                         # updated app
                         stop_and_undeploy_app_list.append(app)
         return
 
+    def __deployed_settings_changed(self, type_name, name, model_dict, library_module, compare_targets):
+        """
+        Determine if the model targets or deployment options of an unchanged application or library differ
+        from the ones it was last deployed with.  A deployment that was not recorded is assumed to match.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the application or library
+        :param model_dict: the model applications or libraries
+        :param library_module: whether or not it is a library (as a string)
+        :param compare_targets: whether or not the recorded targets are compared
+        :return: True if the targets or options changed, False otherwise
+        """
+        _method_name = '__deployed_settings_changed'
+
+        deployed_options = self._fingerprints.get_deployed_options(type_name, name, self._scope)
+        if deployed_options is None:
+            return False
+
+        changed = deployed_options != _get_options_text(_get_deploy_options(model_dict, name, library_module))
+        if not changed and compare_targets:
+            deployed_targets = self._fingerprints.get_deployed_targets(type_name, name, self._scope)
+            model_targets = _get_targets_text(dictionary_utils.get_element(model_dict[name], TARGET))
+            changed = deployed_targets is not None and deployed_targets != model_targets
+
+        if changed:
+            self.logger.info('WLSDPLY-09365', type_name, name, class_name=self._class_name, method_name=_method_name)
+        return changed
+
+    def __record_deployed_fingerprints(self):
+        """
+        Record the fingerprints of the deployed applications and libraries, and save the fingerprint store.
+        The digests of the model binaries are used, since they match the deployed binaries.
+        """
+        for type_name, name, model_src_path, model_plan_path, kwargs, targets, options in self._deployed_fingerprints:
+            self._fingerprints.record_deployment(type_name, name, kwargs['path'], self.__get_hash(model_src_path),
+                                                 dictionary_utils.get_element(kwargs, 'planPath'),
+                                                 self.__get_hash(model_plan_path), targets, options, self._scope)
+        self._fingerprints.remove_unused_manifests()
+        self._fingerprints.save()
+        return
+
     def __get_uses_path_tokens_attribute_names(self, app_location):
         location = LocationContext(app_location)
         token_name = self.alias_helper.get_name_token(location)
@@ -576,9 +664,41 @@ class ApplicationsDeployer(Deployer):
             raise ex
         return hash_value
 
+    def __get_deployed_hash(self, type_name, name, absolute_path, is_plan):
+        """
+        Get the digest of the source or plan of an existing application or library.  The digest recorded in
+        the fingerprint store when the binary was last deployed from the same path is used, if there is one,
+        so that the existing binary is not read again.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the existing application or library
+        :param absolute_path: the absolute source or plan path of the existing deployment
+        :param is_plan: whether or not the path is the plan path
+        :return: the digest, or None if there is no path
+        :raises: DeployException: if the digest cannot be computed
+        """
+        _method_name = '__get_deployed_hash'
+
+        if string_utils.is_empty(absolute_path):
+            return None
+
+        if is_plan:
+            hash_value = self._fingerprints.get_deployed_plan_digest(type_name, name, absolute_path, self._scope)
+        else:
+            hash_value = self._fingerprints.get_deployed_source_digest(type_name, name, absolute_path, self._scope)
+
+        if hash_value is None:
+            hash_value = self.__get_hash(absolute_path)
+        else:
+            self.logger.finer('WLSDPLY-09366', type_name, name, class_name=self._class_name,
+                              method_name=_method_name)
+        return hash_value
+
     def __get_hash(self, path):
         _method_name = '__get_hash'
 
+        if path in self._binary_digests:
+            return self._binary_digests[path]
+
         if string_utils.is_empty(path):
             hash_value = None
         elif os.path.isabs(path):
@@ -589,6 +709,7 @@ class ApplicationsDeployer(Deployer):
             ex = exception_helper.create_deploy_exception('WLSDPLY-09310', path)
             self.logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
             raise ex
+        self._binary_digests[path] = hash_value
         return hash_value
 
     def __get_config_targets(self):
@@ -625,87 +746,135 @@ class ApplicationsDeployer(Deployer):
         model_dict.pop(lib_name)
         return
 
-    def __stop_app(self, application_name, partition_name=None, timeout=None):
+    def __stop_app(self, application_name, partition_name=None, timeout=None, block=None):
         _method_name = '__stop_app'
 
         self.logger.info('WLSDPLY-09312', application_name, class_name=self._class_name, method_name=_method_name)
-        progress = self.wlst_helper.stop_application(application_name, partition=partition_name, timeout=timeout)
-        while progress.isRunning():
-            continue
-        return
-
-    def __start_app(self, application_name, partition_name=None):
+        kwargs = _get_block_kwargs(block)
+        start_time = System.currentTimeMillis()
+        progress = self.wlst_helper.stop_application(application_name, partition=partition_name, timeout=timeout,
+                                                     **kwargs)
+        if block is None:
+            poller = ProgressPoller(self.logger)
+            poller.add(application_name, deployment_scheduler.STOP, application_name, progress, start_time)
+            poller.wait_for_finished()
+        return progress
+
+    def __start_app(self, application_name, partition_name=None, block=None):
         _method_name = '__start_app'
 
         self.logger.info('WLSDPLY-09313', application_name, class_name=self._class_name, method_name=_method_name)
-        self.wlst_helper.start_application(application_name, partition=partition_name)
-        return
+        kwargs = _get_block_kwargs(block)
+        return self.wlst_helper.start_application(application_name, partition=partition_name, **kwargs)
 
     def __undeploy_app(self, application_name, library_module='false', partition_name=None,
-                       resource_group_template=None, timeout=None):
+                       resource_group_template=None, timeout=None, block=None):
         _method_name = '__undeploy_app'
 
         self.logger.info('WLSDPLY-09314', application_name, class_name=self._class_name, method_name=_method_name)
-        self.wlst_helper.undeploy_application(application_name, libraryModule=library_module, partition=partition_name,
-                                              resourceGroupTemplate=resource_group_template, timeout=timeout)
-        return
+        kwargs = _get_block_kwargs(block)
+        return self.wlst_helper.undeploy_application(application_name, libraryModule=library_module,
+                                                     partition=partition_name,
+                                                     resourceGroupTemplate=resource_group_template, timeout=timeout,
+                                                     **kwargs)
 
-    def __redeploy_app(self, application_name):
+    def __redeploy_app(self, application_name, block=None):
         _method_name = '__redeploy_app'
 
         self.logger.info('WLSDPLY-09315', application_name, class_name=self._class_name, method_name=_method_name)
-        self.wlst_helper.redeploy_application(application_name)
-        return
+        kwargs = _get_block_kwargs(block)
+        return self.wlst_helper.redeploy_application(application_name, **kwargs)
 
-    def __deploy_model_libraries(self, model_libs, lib_location):
+    def __deploy_model_libraries(self, model_libs, lib_location, scheduler):
+        """
+        Schedule the deployment of the model libraries.  Each library is deployed after its previous version
+        is undeployed, and after the libraries with a lower deployment order.
+        :param model_libs: the model libraries to deploy
+        :param lib_location: the location of the libraries
+        :param scheduler: the deployment scheduler
+        :return: the identifiers of the library deploy operations
+        :raises: DeployException: if an error occurs
+        """
+        deploy_ids = []
         if model_libs is not None and len(model_libs) > 0:
             uses_path_tokens_attribute_names = self.__get_uses_path_tokens_attribute_names(lib_location)
             deploy_ordered_keys = self.__get_deployment_ordering(model_libs)
             location = LocationContext(lib_location)
             token_name = self.alias_helper.get_name_token(location)
+            self.__extract_files_from_archive(model_libs, uses_path_tokens_attribute_names)
             for lib_name in deploy_ordered_keys:
                 lib_dict = model_libs[lib_name]
                 src_path = dictionary_utils.get_element(lib_dict, SOURCE_PATH)
                 plan_file = dictionary_utils.get_element(lib_dict, PLAN_PATH)
                 targets = dictionary_utils.get_element(lib_dict, TARGET)
                 options = _get_deploy_options(model_libs, lib_name, library_module='true')
-                for uses_path_tokens_attribute_name in uses_path_tokens_attribute_names:
-                    if uses_path_tokens_attribute_name in lib_dict:
-                        self.__extract_file_from_archive(lib_dict[uses_path_tokens_attribute_name])
 
                 location.add_name_token(token_name, lib_name)
                 resource_group_template_name, resource_group_name, partition_name = \
                     self.__get_mt_names_from_location(location)
-                self.__deploy_app_online(lib_name, src_path, targets, plan=plan_file,
-                                         partition=partition_name, resource_group=resource_group_name,
-                                         resource_group_template=resource_group_template_name, options=options)
+                new_lib_name, kwargs = \
+                    self.__get_deploy_arguments(lib_name, src_path, targets, plan=plan_file,
+                                                partition=partition_name, resource_group=resource_group_name,
+                                                resource_group_template=resource_group_template_name, options=options)
                 location.remove_name_token(token_name)
-        return
-
-    def __deploy_model_applications(self, model_apps, app_location, deployed_applist):
+                # the library targets may have been adjusted for the existing library, so they are not recorded
+                self._deployed_fingerprints.append((LIBRARY, new_lib_name, src_path, plan_file, kwargs, None,
+                                                    _get_options_text(options)))
+
+                undeploy_id = deployment_scheduler.get_operation_id(deployment_scheduler.UNDEPLOY, lib_name,
+                                                                    self._scope)
+                deploy_id = scheduler.add_operation(deployment_scheduler.DEPLOY, new_lib_name, self.__deploy_app_online,
+                                                    kwargs=kwargs, key=lib_name, group=LIBRARY,
+                                                    order=dictionary_utils.get_element(lib_dict, DEPLOYMENT_ORDER),
+                                                    depends_on=[undeploy_id])
+                deploy_ids.append(deploy_id)
+        return deploy_ids
+
+    def __deploy_model_applications(self, model_apps, app_location, deployed_applist, scheduler, library_deploy_ids):
+        """
+        Schedule the deployment of the model applications.  Each application is deployed after its previous
+        version is undeployed, after the model libraries are deployed, and after the applications with a
+        lower deployment order.
+        :param model_apps: the model applications to deploy
+        :param app_location: the location of the applications
+        :param deployed_applist: the list of applications to start, updated by this method
+        :param scheduler: the deployment scheduler
+        :param library_deploy_ids: the identifiers of the library deploy operations
+        :raises: DeployException: if an error occurs
+        """
         if model_apps is not None:
             uses_path_tokens_attribute_names = self.__get_uses_path_tokens_attribute_names(app_location)
             deploy_ordered_keys = self.__get_deployment_ordering(model_apps)
             location = LocationContext(app_location)
             token_name = self.alias_helper.get_name_token(location)
+            self.__extract_files_from_archive(model_apps, uses_path_tokens_attribute_names)
             for app_name in deploy_ordered_keys:
                 app_dict = model_apps[app_name]
                 src_path = dictionary_utils.get_element(app_dict, SOURCE_PATH)
                 plan_file = dictionary_utils.get_element(app_dict, PLAN_PATH)
                 targets = dictionary_utils.get_element(app_dict, TARGET)
                 options = _get_deploy_options(model_apps, app_name, library_module='false')
-                for uses_path_tokens_attribute_name in uses_path_tokens_attribute_names:
-                    if uses_path_tokens_attribute_name in app_dict:
-                        self.__extract_file_from_archive(app_dict[uses_path_tokens_attribute_name])
 
                 location.add_name_token(token_name, app_name)
                 resource_group_template_name, resource_group_name, partition_name = \
                     self.__get_mt_names_from_location(location)
 
-                new_app_name = self.__deploy_app_online(app_name, src_path, targets, plan=plan_file,
-                                         partition=partition_name, resource_group=resource_group_name,
-                                         resource_group_template=resource_group_template_name, options=options)
+                new_app_name, kwargs = \
+                    self.__get_deploy_arguments(app_name, src_path, targets, plan=plan_file,
+                                                partition=partition_name, resource_group=resource_group_name,
+                                                resource_group_template=resource_group_template_name, options=options)
                 location.remove_name_token(token_name)
+                self._deployed_fingerprints.append((APPLICATION, new_app_name, src_path, plan_file, kwargs,
+                                                    _get_targets_text(targets), _get_options_text(options)))
+
+                # the libraries referenced by a new application binary are not known, so wait for all of them
+                depends_on = list(library_deploy_ids)
+                depends_on.append(deployment_scheduler.get_operation_id(deployment_scheduler.UNDEPLOY, app_name,
+                                                                        self._scope))
+                scheduler.add_operation(deployment_scheduler.DEPLOY, new_app_name, self.__deploy_app_online,
+                                        kwargs=kwargs, key=app_name, group=APPLICATION,
+                                        order=dictionary_utils.get_element(app_dict, DEPLOYMENT_ORDER),
+                                        depends_on=depends_on)
                 deployed_applist.append(new_app_name)
         return
 
@@ -730,17 +899,41 @@ class ApplicationsDeployer(Deployer):
         dummy_location.pop_location()
         return resource_group_template_name, resource_group_name, partition_name
 
-    def __deploy_app_online(self, application_name, source_path, targets, plan=None, partition=None,
-                            resource_group=None, resource_group_template=None, options=None):
-        _method_name = '__deploy_app_online'
+    def __get_deployment_scope(self, base_location):
+        """
+        Get the scope that distinguishes the applications and libraries at the base location from the
+        same-named ones in the domain and in other resource group templates, partitions or resource groups.
+        :param base_location: the base location of the applications and libraries
+        :return: the scope, such as Partition=partition1/ResourceGroup=group1, or None for the domain
+        """
+        resource_group_template_name, resource_group_name, partition_name = \
+            self.__get_mt_names_from_location(base_location)
 
-        self.logger.info('WLSDPLY-09316', application_name, class_name=self._class_name, method_name=_method_name)
+        scope_names = []
+        for type_name, name in [(RESOURCE_GROUP_TEMPLATE, resource_group_template_name), (PARTITION, partition_name),
+                                (RESOURCE_GROUP, resource_group_name)]:
+            if name is not None:
+                scope_names.append(type_name + '=' + name)
+
+        if len(scope_names) == 0:
+            return None
+        return '/'.join(scope_names)
+
+    def __get_deploy_arguments(self, application_name, source_path, targets, plan=None, partition=None,
+                               resource_group=None, resource_group_template=None, options=None):
+        """
+        Validate the deployment of the application or library, and compute its name and deploy arguments.
+        :return: the name to deploy the application or library with, and the dictionary of deploy arguments
+        :raises: DeployException: if the source or plan cannot be found, or the name cannot be computed
+        """
+        _method_name = '__get_deploy_arguments'
 
         if string_utils.is_empty(source_path):
             ex = exception_helper.create_deploy_exception('WLSDPLY-09317', application_name, SOURCE_PATH)
             self.logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
             raise ex
 
+        model_source_path = source_path
         if not os.path.isabs(source_path):
             source_path = self.model_context.get_domain_home() + '/' + source_path
 
@@ -750,11 +943,11 @@ class ApplicationsDeployer(Deployer):
             raise ex
 
         # if options is not None and 'libraryModule' in options and string_utils.to_boolean(options['libraryModule']):
-        computed_name = self.__get_deployable_library_versioned_name(source_path, application_name)
+        computed_name = \
+            self.__get_deployable_library_versioned_name(source_path, application_name, model_source_path)
         application_name = computed_name
 
         # build the dictionary of named arguments to pass to the deploy_application method
-        args = list()
         kwargs = {'path': str(source_path), 'targets': str(targets)}
         if plan is not None:
             if not os.path.isabs(plan):
@@ -774,18 +967,47 @@ class ApplicationsDeployer(Deployer):
         if options is not None:
             for key, value in options.iteritems():
                 kwargs[key] = value
+        return application_name, kwargs
+
+    def __deploy_app_online(self, application_name, **kwargs):
+        _method_name = '__deploy_app_online'
 
+        self.logger.info('WLSDPLY-09316', application_name, class_name=self._class_name, method_name=_method_name)
         self.logger.fine('WLSDPLY-09320', application_name, kwargs,
                          class_name=self._class_name, method_name=_method_name)
-        self.wlst_helper.deploy_application(application_name, *args, **kwargs)
-        return application_name
+        return self.wlst_helper.deploy_application(application_name, **kwargs)
+
+    def __extract_source_paths_from_archive(self, deployables):
+        """
+        Extract the archive binaries named by the SourcePath of each application or library in one bulk operation.
+        :param deployables: the model dictionary of applications or libraries
+        :raises: DeployException: if an error occurs
+        """
+        if self.archive_helper is not None:
+            self.__extract_files_from_archive(deployables, [SOURCE_PATH])
+        return
 
-    def __extract_file_from_archive(self, path):
-        if path is not None and deployer_utils.is_path_into_archive(path):
-            self.archive_helper.extract_file(path)
+    def __extract_files_from_archive(self, deployables, attribute_names):
+        """
+        Extract the archive files referenced by the specified attributes of each application or library
+        in one bulk operation, so the binaries are inflated concurrently.
+        :param deployables: the model dictionary of applications or libraries
+        :param attribute_names: the names of the attributes that may hold paths into the archive
+        :raises: DeployException: if an error occurs
+        """
+        archive_paths = []
+        for name in deployables:
+            deployable = deployables[name]
+            for attribute_name in attribute_names:
+                path = dictionary_utils.get_element(deployable, attribute_name)
+                if path is not None and deployer_utils.is_path_into_archive(path) and path not in archive_paths:
+                    archive_paths.append(path)
+
+        if len(archive_paths) > 0:
+            self.archive_helper.extract_files(archive_paths)
         return
 
-    def __get_deployable_library_versioned_name(self, source_path, model_name):
+    def __get_deployable_library_versioned_name(self, source_path, model_name, model_source_path=None):
         """
         Get the proper name of the deployable library that WLST requires in the target domain.  This method is
         primarily needed for shared libraries in the Oracle Home where the implementation version may have
@@ -793,6 +1015,8 @@ class ApplicationsDeployer(Deployer):
         the information from the target domain's archive file (e.g., war file) and compute the correct name.
         :param source_path: the SourcePath value of the shared library
         :param model_name: the model name of the library
+        :param model_source_path: the SourcePath value in the model, used to find the manifest attributes of the
+                                  library in the fingerprint store, or None to always read the manifest
         :return: the updated shared library name for the target environment
         :raises: DeployException: if an error occurs
         """
@@ -803,14 +1027,7 @@ class ApplicationsDeployer(Deployer):
         old_name_tuple = deployer_utils.get_library_name_components(model_name, self.wlst_mode)
         try:
             source_path = self.model_context.replace_token_string(source_path)
-            archive = JarFile(source_path)
-            manifest_object = archive.getManifest()
-            tokens = []
-            if manifest_object is not None:
-                bao = ByteArrayOutputStream()
-                manifest_object.write(bao)
-                manifest = bao.toString('UTF-8')
-                tokens = manifest.split()
+            tokens = self.__get_manifest_text(source_path, model_source_path).split()
 
             # this is specific to application not shared library, so just returns it
 
@@ -862,6 +1079,54 @@ class ApplicationsDeployer(Deployer):
         self.logger.exiting(class_name=self._class_name, method_name=_method_name, result=versioned_name)
         return versioned_name
 
+    def __get_manifest_text(self, source_path, model_source_path):
+        """
+        Get the manifest attributes that determine the versioned name of an application or library.
+        The attributes of an archive are kept in the fingerprint store by the digest of the archive, which is
+        shared with the deploy strategy and found in the file hash cache while the size and modification time
+        of the archive are unchanged.  Only the archives chosen for deployment get here, so the stored attributes
+        are used when an unchanged archive is deployed again, such as for new targets or options, or after a
+        failed run.  For an exploded directory, only its manifest file is read.
+        :param source_path: the path of the archive or exploded directory
+        :param model_source_path: the SourcePath value in the model, or None to always read the manifest
+        :return: the manifest attribute text, which is empty if there is no manifest
+        :raises: IOException, ZipException: if the manifest cannot be read
+        :raises: DeployException: if the digest of the archive cannot be computed
+        """
+        _method_name = '__get_manifest_text'
+
+        if os.path.isdir(source_path):
+            manifest_object = None
+            manifest_file = File(source_path, JarFile.MANIFEST_NAME)
+            if manifest_file.isFile():
+                input_stream = FileInputStream(manifest_file)
+                try:
+                    manifest_object = Manifest(input_stream)
+                finally:
+                    input_stream.close()
+            return _get_manifest_attributes_text(manifest_object)
+
+        digest = None
+        if self._fingerprints is not None and model_source_path is not None and \
+                (os.path.isabs(model_source_path) or
+                 (deployer_utils.is_path_into_archive(model_source_path) and self.archive_helper is not None)):
+            digest = self.__get_hash(model_source_path)
+            manifest_text = self._fingerprints.get_manifest(digest)
+            if manifest_text is not None:
+                self.logger.finer('WLSDPLY-09364', source_path, class_name=self._class_name,
+                                  method_name=_method_name)
+                return manifest_text
+
+        archive = JarFile(source_path)
+        try:
+            manifest_text = _get_manifest_attributes_text(archive.getManifest())
+        finally:
+            archive.close()
+
+        if digest is not None:
+            self._fingerprints.record_manifest(digest, manifest_text)
+        return manifest_text
+
     def __get_deployment_ordering(self, apps):
         _method_name = '__get_deployment_ordering'
         name_sorted_keys = apps.keys()
@@ -917,9 +1182,12 @@ class ApplicationsDeployer(Deployer):
                 temp_app_dict[app] = OrderedDict()
             temp_app_dict[app][DEPLOYMENT_ORDER] = deployment_order
 
+        scheduler = DeploymentScheduler(self.model_context.get_max_parallel_deployments(), self.logger, self._scope)
         start_order = self.__get_deployment_ordering(temp_app_dict)
         for app in start_order:
-            self.__start_app(app)
+            scheduler.add_operation(deployment_scheduler.START, app, self.__start_app,
+                                    order=temp_app_dict[app][DEPLOYMENT_ORDER])
+        scheduler.run()
         return
 
 def _get_deploy_options(model_apps, app_name, library_module):
@@ -954,6 +1222,57 @@ def _get_deploy_options(model_apps, app_name, library_module):
         deploy_options = None
     return deploy_options
 
+
+def _get_manifest_attributes_text(manifest_object):
+    """
+    Get the main manifest attributes that determine the versioned name, one 'name: value' line for each.
+    :param manifest_object: the manifest, or None
+    :return: the attribute text, which is empty if there is no manifest
+    """
+    lines = []
+    if manifest_object is not None:
+        attributes = manifest_object.getMainAttributes()
+        for name in _MANIFEST_VERSION_ATTRIBUTES:
+            value = attributes.getValue(name)
+            if value is not None:
+                lines.append(name + ': ' + value)
+    return '\n'.join(lines)
+
+
+def _get_targets_text(targets):
+    """
+    Get the targets of an application in the form recorded in the deployment fingerprints.
+    :param targets: the model targets, as a comma-separated string or a list, or None
+    :return: the sorted comma-separated target names
+    """
+    if targets is None:
+        targets = []
+    elif type(targets) is str:
+        targets = targets.split(',')
+
+    target_names = []
+    for target in targets:
+        target_name = str(target).strip()
+        if len(target_name) > 0:
+            target_names.append(target_name)
+    target_names.sort()
+    return ','.join(target_names)
+
+
+def _get_options_text(options):
+    """
+    Get the deploy options in the form recorded in the deployment fingerprints.
+    :param options: the dictionary of deploy options, or None
+    :return: the sorted comma-separated 'name=value' options
+    """
+    option_list = []
+    if options is not None:
+        for key, value in options.iteritems():
+            option_list.append('%s=%s' % (key, value))
+    option_list.sort()
+    return ','.join(option_list)
+
+
 def _find_deployorder_list(apps_dict, ordered_list, order):
     """
     Get the deployment order for the apps
@@ -975,12 +1294,32 @@ def _add_ref_apps_to_stoplist(stop_applist, lib_refs, lib_name):
     :param lib_refs: the library references
     :param lib_name: the library name
     """
-    if lib_refs[lib_name].has_key('referencingApp'):
-        apps = lib_refs[lib_name]['referencingApp'].keys()
-        for app in apps:
-            stop_applist.append(app)
+    for app in _get_ref_apps(lib_refs, lib_name):
+        stop_applist.append(app)
     return
 
+def _get_ref_apps(lib_refs, lib_name):
+    """
+    Get the names of the apps that reference the specified shared library.
+    :param lib_refs: the library references
+    :param lib_name: the library name
+    :return: the list of referencing app names
+    """
+    if lib_refs.has_key(lib_name) and lib_refs[lib_name].has_key('referencingApp'):
+        return lib_refs[lib_name]['referencingApp'].keys()
+    return []
+
+def _get_block_kwargs(block):
+    """
+    Get the keyword arguments that control whether a WLST application command blocks.
+    :param block: 'true' or 'false', or None to use the WLST default
+    :return: the dictionary of keyword arguments
+    """
+    kwargs = dict()
+    if block is not None:
+        kwargs['block'] = block
+    return kwargs
+
 def _update_ref_dictionary(ref_dictionary, lib_name, absolute_sourcepath, lib_hash, configured_targets,
                            absolute_plan_path=None, plan_hash=None, app_name=None, deploy_order=None):
     """
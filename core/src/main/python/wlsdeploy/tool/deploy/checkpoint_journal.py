@@ -0,0 +1,334 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+from java.io import BufferedReader
+from java.io import File
+from java.io import FileOutputStream
+from java.io import FileReader
+from java.io import IOException
+from java.io import PrintWriter
+from java.lang import Boolean
+
+from wlsdeploy.tool.deploy import deployer_utils
+
+# the suffix added to the model or archive file name to name the journal
+JOURNAL_FILE_SUFFIX = '.checkpoint'
+
+# the record types in the journal file, one record per line in the form type=value
+_MODEL_RECORD = 'model'
+_ARCHIVE_RECORD = 'archive'
+_ELEMENT_RECORD = 'element'
+_ACTIVATION_RECORD = 'activation'
+_OPERATION_RECORD = 'operation'
+
+# the journal for the current online deployment, or None if no journal is being kept
+_journal = None
+
+
+def open_journal(model_context, model_from_archive, logger):
+    """
+    Open the journal for an online deployment, if the model context requests one.  The completed work
+    recorded by an earlier run with the same model and archive is skipped by this run.
+    :param model_context: the model context
+    :param model_from_archive: True if the model file was extracted from the archive
+    :param logger: the logger
+    :raises: DeployException: if a fingerprint cannot be computed
+    """
+    global _journal
+
+    if model_context.is_use_checkpoint_journal():
+        journal = CheckpointJournal(get_journal_file_name(model_context, model_from_archive), model_context, logger)
+        journal.open()
+        _journal = journal
+    return
+
+
+def close_journal(completed):
+    """
+    Close the journal, if one is open.  The journal file is deleted if the deployment completed,
+    and kept for the next run otherwise.
+    :param completed: True if the deployment completed, False if it failed
+    """
+    global _journal
+
+    if _journal is not None:
+        if completed:
+            _journal.complete()
+        else:
+            _journal.keep()
+        _journal = None
+    return
+
+
+def is_element_completed(type_name, name):
+    """
+    Determine if a top-level model element was activated by an earlier run with the same model and archive.
+    :param type_name: the model folder type of the element
+    :param name: the name of the element, or None for a single MBean folder
+    :return: True if the element was activated, False otherwise
+    """
+    return _journal is not None and _journal.is_element_completed(get_element_key(type_name, name))
+
+
+def is_operation_completed(operation_id):
+    """
+    Determine if an application or library operation was completed by an earlier run with the same model
+    and archive.
+    :param operation_id: the identifier of the operation
+    :return: True if the operation was completed, False otherwise
+    """
+    return _journal is not None and _journal.is_operation_completed(operation_id)
+
+
+def record_activation(element_keys):
+    """
+    Record the top-level model elements whose changes have just been activated.
+    :param element_keys: the keys of the activated elements
+    """
+    if _journal is not None:
+        _journal.record_activation(element_keys)
+    return
+
+
+def record_operation(operation_id):
+    """
+    Record a completed application or library operation.
+    :param operation_id: the identifier of the operation
+    """
+    if _journal is not None:
+        _journal.record_operation(operation_id)
+    return
+
+
+def get_element_key(type_name, name):
+    """
+    Get the key that identifies a top-level model element in the journal.
+    :param type_name: the model folder type of the element
+    :param name: the name of the element, or None for a single MBean folder
+    :return: the element key
+    """
+    if name is None:
+        return type_name
+    return type_name + ':' + name
+
+
+def get_journal_file_name(model_context, model_from_archive):
+    """
+    Get the name of the journal file, next to the model file, or next to the archive if the model was
+    extracted from the archive.
+    :param model_context: the model context
+    :param model_from_archive: True if the model file was extracted from the archive
+    :return: the journal file name
+    """
+    if model_from_archive:
+        return model_context.get_archive_file_name() + JOURNAL_FILE_SUFFIX
+    return model_context.get_model_file() + JOURNAL_FILE_SUFFIX
+
+
+class CheckpointJournal(object):
+    """
+    Records the completed work of an online deployment in a file, so that a run that fails part way can be
+    continued by running the tool again.  The journal records the top-level model elements at each activation,
+    and each completed application and library operation.  The file starts with the fingerprints of the model,
+    variable and archive files, and is only used to skip work when those fingerprints match.  The file is
+    deleted when the deployment completes.
+
+    The journal is written as the work completes, so that it survives the failure of the tool.  If the journal
+    cannot be written, a warning is logged and the deployment continues without it.
+    """
+    _class_name = 'CheckpointJournal'
+
+    def __init__(self, file_name, model_context, logger):
+        self._file_name = file_name
+        self._model_context = model_context
+        self._logger = logger
+        self._writer = None
+        self._completed_elements = dict()
+        self._completed_operations = dict()
+        self._activation_count = 0
+        return
+
+    def open(self):
+        """
+        Load the completed work from the journal file if its fingerprints match the current files,
+        and start a new journal file otherwise.
+        :raises: DeployException: if a fingerprint cannot be computed
+        """
+        _method_name = 'open'
+
+        model_fingerprint = self.__get_model_fingerprint()
+        archive_fingerprint = self.__get_archive_fingerprint()
+
+        journal_file = File(self._file_name)
+        resume = False
+        if journal_file.isFile():
+            records = self.__read_records()
+            if records is not None and _get_value(records, _MODEL_RECORD) == model_fingerprint \
+                    and _get_value(records, _ARCHIVE_RECORD) == archive_fingerprint:
+                self.__load_completed_work(records)
+                resume = True
+                self._logger.info('WLSDPLY-09350', self._file_name, len(self._completed_elements),
+                                  self._activation_count, len(self._completed_operations),
+                                  class_name=self._class_name, method_name=_method_name)
+            else:
+                self._logger.info('WLSDPLY-09351', self._file_name, class_name=self._class_name,
+                                  method_name=_method_name)
+
+        try:
+            self._writer = PrintWriter(FileOutputStream(journal_file, Boolean(resume)), True)
+        except IOException, ioe:
+            self.__disable(ioe)
+            return
+
+        if not resume:
+            self.__write(_MODEL_RECORD, model_fingerprint)
+            self.__write(_ARCHIVE_RECORD, archive_fingerprint)
+        return
+
+    def is_element_completed(self, element_key):
+        return element_key in self._completed_elements
+
+    def is_operation_completed(self, operation_id):
+        return operation_id in self._completed_operations
+
+    def record_activation(self, element_keys):
+        """
+        Record the elements of an activated chunk, followed by the activation point.  Elements that are
+        not followed by an activation point are ignored when the journal is loaded.
+        :param element_keys: the keys of the activated elements
+        """
+        for element_key in element_keys:
+            self._completed_elements[element_key] = True
+            self.__write(_ELEMENT_RECORD, element_key)
+        self._activation_count += 1
+        self.__write(_ACTIVATION_RECORD, str(self._activation_count))
+        return
+
+    def record_operation(self, operation_id):
+        self._completed_operations[operation_id] = True
+        self.__write(_OPERATION_RECORD, operation_id)
+        return
+
+    def complete(self):
+        """
+        Close and delete the journal file after the deployment has completed.
+        """
+        _method_name = 'complete'
+
+        self.__close()
+        File(self._file_name).delete()
+        self._logger.fine('WLSDPLY-09353', self._file_name, class_name=self._class_name, method_name=_method_name)
+        return
+
+    def keep(self):
+        """
+        Close the journal file after the deployment has failed, keeping it for the next run.
+        """
+        _method_name = 'keep'
+
+        if self._writer is not None:
+            self.__close()
+            self._logger.info('WLSDPLY-09352', self._file_name, class_name=self._class_name,
+                              method_name=_method_name)
+        return
+
+    def __get_model_fingerprint(self):
+        fingerprint = deployer_utils.get_file_hash(self._model_context.get_model_file())
+        variable_file = self._model_context.get_variable_file()
+        if variable_file is not None:
+            fingerprint += ',' + deployer_utils.get_file_hash(variable_file)
+        return fingerprint
+
+    def __get_archive_fingerprint(self):
+        archive_file = self._model_context.get_archive_file_name()
+        if archive_file is None:
+            return ''
+        return deployer_utils.get_file_hash(archive_file)
+
+    def __read_records(self):
+        """
+        Read the records from the journal file.
+        :return: a list of (type, value) tuples, or None if the file cannot be read
+        """
+        _method_name = '__read_records'
+
+        records = []
+        reader = None
+        try:
+            try:
+                reader = BufferedReader(FileReader(self._file_name))
+                line = reader.readLine()
+                while line is not None:
+                    index = line.find('=')
+                    if index > 0:
+                        records.append((line[:index], line[index + 1:]))
+                    line = reader.readLine()
+            except IOException, ioe:
+                self._logger.warning('WLSDPLY-09354', self._file_name, ioe.getLocalizedMessage(), error=ioe,
+                                     class_name=self._class_name, method_name=_method_name)
+                records = None
+        finally:
+            if reader is not None:
+                reader.close()
+        return records
+
+    def __load_completed_work(self, records):
+        """
+        Load the completed elements and operations from the journal records.  Elements are only loaded
+        if their activation was recorded.
+        :param records: the journal records
+        """
+        pending_elements = []
+        for record_type, value in records:
+            if record_type == _ELEMENT_RECORD:
+                pending_elements.append(value)
+            elif record_type == _ACTIVATION_RECORD:
+                for element_key in pending_elements:
+                    self._completed_elements[element_key] = True
+                pending_elements = []
+                self._activation_count += 1
+            elif record_type == _OPERATION_RECORD:
+                self._completed_operations[value] = True
+        return
+
+    def __write(self, record_type, value):
+        if self._writer is not None:
+            self._writer.println(record_type + '=' + value)
+            if self._writer.checkError():
+                self.__disable(None)
+        return
+
+    def __disable(self, error):
+        """
+        Stop writing the journal after an I/O error.
+        :param error: the error, or None if it is not available
+        """
+        _method_name = '__disable'
+
+        message = None
+        if error is not None:
+            message = error.getLocalizedMessage()
+        self._logger.warning('WLSDPLY-09355', self._file_name, message, class_name=self._class_name,
+                             method_name=_method_name)
+        self.__close()
+        return
+
+    def __close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return
+
+
+def _get_value(records, record_type):
+    """
+    Get the value of the first record of the specified type.
+    :param records: the journal records
+    :param record_type: the record type
+    :return: the value, or None if there is no record of that type
+    """
+    for this_type, value in records:
+        if this_type == record_type:
+            return value
+    return None
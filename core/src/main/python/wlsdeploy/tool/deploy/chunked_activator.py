@@ -0,0 +1,157 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+from java.lang import System
+
+from oracle.weblogic.deploy.exception import BundleAwareException
+
+from wlsdeploy.tool.deploy import checkpoint_journal
+from wlsdeploy.tool.util.wlst_helper import WlstHelper
+from wlsdeploy.util.cla_utils import CommandLineArgUtil
+
+# the chunk size that activates the changes after each top-level model section
+SECTION = CommandLineArgUtil.ACTIVATION_CHUNK_SECTION
+
+# the activator for the current online deployment, or None if changes are not being activated in chunks
+_activator = None
+
+
+def set_activator(activator):
+    """
+    Set the activator to be notified as the deployers complete model elements.
+    :param activator: the activator, or None to stop notifications
+    """
+    global _activator
+    _activator = activator
+    return
+
+
+def element_completed(type_name, name):
+    """
+    Notify the current activator that a top-level model element has been added or updated.
+    :param type_name: the model folder type of the element
+    :param name: the name of the element, or None for a single MBean folder
+    :raises: BundleAwareException of the specified type: if the activation of a chunk fails
+    """
+    if _activator is not None:
+        _activator.element_completed(type_name, name)
+    return
+
+
+def section_completed(type_name):
+    """
+    Notify the current activator that all of the top-level elements of a model folder type have been
+    added or updated.
+    :param type_name: the model folder type
+    :raises: BundleAwareException of the specified type: if the activation of a chunk fails
+    """
+    if _activator is not None:
+        _activator.section_completed(type_name)
+    return
+
+
+class ChunkedActivator(object):
+    """
+    Saves and activates the changes of an online deployment after each model section, or after a number of
+    top-level model elements.  The deployers report each top-level element and section as it completes,
+    through the module functions, to the activator that was set for the deployment.
+
+    Each activated chunk is recorded, so that the log of a failed deployment shows which changes are active,
+    and which changes were in the chunk that failed.  Since the deployers update existing MBeans, running
+    the tool again resumes from the failed chunk.
+    """
+    _class_name = 'ChunkedActivator'
+
+    def __init__(self, chunk_size, logger, exception_type):
+        """
+        Create the activator.
+        :param chunk_size: SECTION, the number of top-level model elements in a chunk, or None for a single chunk
+        :param logger: the logger
+        :param exception_type: the type of exception to raise
+        """
+        self._chunk_size = chunk_size
+        self._logger = logger
+        self._wlst_helper = WlstHelper(logger, exception_type)
+        self._chunk = []
+        self._activated_chunks = []
+        return
+
+    def get_activated_chunks(self):
+        """
+        Get the chunks that have been activated, in order.
+        :return: a list of chunks, each a list of the names of its top-level model elements
+        """
+        return list(self._activated_chunks)
+
+    def element_completed(self, type_name, name):
+        """
+        Record a completed top-level model element, and activate the chunk if it has reached the chunk size.
+        :param type_name: the model folder type of the element
+        :param name: the name of the element, or None for a single MBean folder
+        :raises: BundleAwareException of the specified type: if the activation fails
+        """
+        self._chunk.append(checkpoint_journal.get_element_key(type_name, name))
+
+        if self._chunk_size is not None and self._chunk_size != SECTION and len(self._chunk) >= self._chunk_size:
+            self.__activate_chunk(True)
+        return
+
+    def section_completed(self, type_name):
+        """
+        Activate the chunk at the end of a top-level model section, if chunking by section.
+        :param type_name: the model folder type
+        :raises: BundleAwareException of the specified type: if the activation fails
+        """
+        _method_name = 'section_completed'
+
+        if self._chunk_size == SECTION and len(self._chunk) > 0:
+            self._logger.fine('WLSDPLY-09340', type_name, class_name=self._class_name, method_name=_method_name)
+            self.__activate_chunk(True)
+        return
+
+    def activate_remaining(self):
+        """
+        Save and activate the changes that are not yet active, and end the edit session.
+        :raises: BundleAwareException of the specified type: if the activation fails
+        """
+        self.__activate_chunk(False)
+        return
+
+    def __activate_chunk(self, start_edit):
+        """
+        Save and activate the current chunk, and record it as activated.
+        :param start_edit: True if a new edit session should be started for the next chunk
+        :raises: BundleAwareException of the specified type: if the activation fails
+        """
+        _method_name = '__activate_chunk'
+
+        chunk_number = len(self._activated_chunks) + 1
+        start_time = System.currentTimeMillis()
+        try:
+            self._wlst_helper.save()
+            self._wlst_helper.activate()
+        except BundleAwareException, ex:
+            self._logger.severe('WLSDPLY-09342', chunk_number, self._chunk, ex.getLocalizedMessage(),
+                                class_name=self._class_name, method_name=_method_name)
+            if len(self._activated_chunks) > 0:
+                self._logger.severe('WLSDPLY-09343', len(self._activated_chunks), self._get_activated_names(),
+                                    class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        elapsed = System.currentTimeMillis() - start_time
+        self._logger.info('WLSDPLY-09341', chunk_number, len(self._chunk), elapsed,
+                          class_name=self._class_name, method_name=_method_name)
+        checkpoint_journal.record_activation(self._chunk)
+        self._activated_chunks.append(self._chunk)
+        self._chunk = []
+
+        if start_edit:
+            self._wlst_helper.start_edit()
+        return
+
+    def _get_activated_names(self):
+        names = []
+        for chunk in self._activated_chunks:
+            names.extend(chunk)
+        return names
@@ -13,6 +13,8 @@ from wlsdeploy.aliases.location_context import LocationContext
 from wlsdeploy.exception import exception_helper
 from wlsdeploy.exception.expection_types import ExceptionType
 from wlsdeploy.logging.platform_logger import PlatformLogger
+from wlsdeploy.tool.deploy import checkpoint_journal
+from wlsdeploy.tool.deploy import chunked_activator
 from wlsdeploy.tool.deploy import deployer_utils
 from wlsdeploy.tool.deploy import log_helper
 from wlsdeploy.tool.util.alias_helper import AliasHelper
@@ -47,6 +49,12 @@ class Deployer(object):
         self.wlst_helper = WlstHelper(self.logger, ExceptionType.DEPLOY)
         self.attribute_setter = AttributeSetter(self.aliases, self.logger, ExceptionType.DEPLOY, wlst_mode=wlst_mode)
 
+        # the existing attribute values at the location being set, read from WLST at most once per location
+        # and read again only for attributes that were set since then
+        self._existing_attribute_values = None
+        self._existing_attribute_gets = {}
+        self._set_wlst_attribute_names = []
+
         self.archive_helper = None
         archive_file_name = self.model_context.get_archive_file_name()
         if archive_file_name is not None:
@@ -68,6 +76,7 @@ class Deployer(object):
         if len(model_nodes) == 0:
             return
 
+        is_top_level = location.is_empty()
         parent_type, parent_name = self.get_location_type_and_name(location)
         location = LocationContext(location).append_location(type_name)
         if not self._check_location(location):
@@ -78,6 +87,11 @@ class Deployer(object):
 
         token = self.alias_helper.get_name_token(location)
         for name in model_nodes:
+            if is_top_level and checkpoint_journal.is_element_completed(type_name, name):
+                self.logger.fine('WLSDPLY-09206', type_name, name, class_name=self._class_name,
+                                 method_name=_method_name)
+                continue
+
             is_add = name not in existing_names
             log_helper.log_updating_named_folder(type_name, name, parent_type, parent_name, is_add, self._class_name,
                                                  _method_name)
@@ -88,6 +102,11 @@ class Deployer(object):
 
             child_nodes = dictionary_utils.get_dictionary_element(model_nodes, name)
             self._set_attributes_and_add_subfolders(location, child_nodes)
+            if is_top_level:
+                chunked_activator.element_completed(type_name, name)
+
+        if is_top_level:
+            chunked_activator.section_completed(type_name)
         return
 
     def _add_subfolders(self, model_nodes, location, excludes=None):
@@ -121,6 +140,11 @@ class Deployer(object):
         """
         _method_name = '_add_model_elements'
 
+        is_top_level = location.is_empty()
+        if is_top_level and checkpoint_journal.is_element_completed(type_name, None):
+            self.logger.fine('WLSDPLY-09206', type_name, None, class_name=self._class_name, method_name=_method_name)
+            return
+
         parent_type, parent_name = self.get_location_type_and_name(location)
         location = LocationContext(location).append_location(type_name)
         if not self._check_location(location):
@@ -136,6 +160,9 @@ class Deployer(object):
         deployer_utils.create_and_cd(location, existing_subfolder_names, self.alias_helper)
 
         self._set_attributes_and_add_subfolders(location, model_nodes)
+        if is_top_level:
+            chunked_activator.element_completed(type_name, None)
+            chunked_activator.section_completed(type_name)
         return
 
     def _set_attributes_and_add_subfolders(self, location, model_nodes):
@@ -165,6 +192,7 @@ class Deployer(object):
         merge_attribute_names = self.alias_helper.get_model_merge_required_attribute_names(location)
         lsa_required_attribute_names = self.aliases.get_model_lsa_required_attribute_names(location)
         set_method_map = self.alias_helper.get_model_mbean_set_method_attribute_names_and_types(location)
+        self._clear_existing_attribute_values()
 
         for key in model_nodes:
             key_excluded = (excludes is not None) and (key in excludes)
@@ -177,8 +205,12 @@ class Deployer(object):
                 if key in merge_attribute_names:
                     wlst_merge_value = self._get_existing_wlst_value(location, key, lsa_required_attribute_names)
 
-                if not self._skip_setting_attribute(key, value, wlst_merge_value, restart_attribute_names) and \
-                        (not self.set_special_attribute(location, key, value, wlst_merge_value, set_method_map)):
+                if self._skip_setting_attribute(location, key, value, wlst_merge_value, restart_attribute_names,
+                                                lsa_required_attribute_names):
+                    continue
+
+                self._invalidate_existing_value(location, key)
+                if not self.set_special_attribute(location, key, value, wlst_merge_value, set_method_map):
                     try:
                         self.attribute_setter.set_attribute(location, key, value, wlst_merge_value)
                     except PyWLSTException, pwe:
@@ -189,29 +221,101 @@ class Deployer(object):
                         raise ex
         return
 
-    def _skip_setting_attribute(self, key, value, wlst_merge_value, restart_attribute_names):
+    def _skip_setting_attribute(self, location, key, value, wlst_merge_value, restart_attribute_names,
+                                lsa_required_attribute_names):
         """
-        For the case where a change to an attribute will require restart, verify that the new value is different
-        from the current value in WLST.
+        Determine whether the attribute can be skipped because its current value in WLST already matches the model.
+        The current values are compared for every attribute if skipping unchanged attributes was requested,
+        and otherwise only for online attributes whose change would require a restart.  The current value is
+        read the same way as for a merge, so the lsa() values are only trusted for the attributes that require them.
+        :param location: the location of the attribute
         :param key: the attribute key
         :param value: the attribute value from the model
         :param wlst_merge_value: the WLST value to check for merge
         :param restart_attribute_names: a list of attribute names that require system restart
+        :param lsa_required_attribute_names: a list of attribute names that must be read with lsa()
         :return: True if the attribute does not need to be set
         """
         _method_name = '_skip_setting_attribute'
         self.logger.entering(str(key), str(value), str(wlst_merge_value), str(restart_attribute_names),
+                             str(lsa_required_attribute_names), class_name=self._class_name, method_name=_method_name)
+
+        if not self.model_context.is_skip_unchanged_attributes() and \
+                not (self.wlst_mode == WlstModes.ONLINE and key in restart_attribute_names):
+            return False
+
+        wlst_key = self.alias_helper.get_wlst_attribute_name(location, key)
+        if wlst_key is None:
+            return False
+
+        if key in lsa_required_attribute_names and wlst_key not in self._get_existing_attribute_values(wlst_key):
+            return False
+
+        existing_value = self._get_existing_wlst_value(location, key, lsa_required_attribute_names)
+        skip = self.alias_helper.attribute_values_are_equal(location, key, value, existing_value)
+        if skip:
+            loc_type, loc_name = self.get_location_type_and_name(location)
+            self.logger.fine('WLSDPLY-09205', key, loc_type, loc_name,
                              class_name=self._class_name, method_name=_method_name)
+        deployer_utils.count_compared_attribute(not skip)
+        return skip
 
-        # Needs implementation. Return true if model key in restart attribute_names,
-        # and WLST helper determines that set is required,
-        # based on model key, model value, and the WLST merge value
+    def _get_existing_attribute_values(self, wlst_key=None):
+        """
+        Returns the existing attribute values at the current location, reading them all with one lsa call
+        the first time they are needed for the location.  They are read again if the requested attribute
+        was set since then.
+        :param wlst_key: the WLST name of the attribute that will be read from the values, if any
+        :return: a dictionary of the WLST attribute values, keyed by WLST attribute name
+        """
+        if self._existing_attribute_values is None or \
+                (wlst_key is not None and wlst_key in self._set_wlst_attribute_names):
+            self._existing_attribute_values = self.wlst_helper.lsa()
+            self._set_wlst_attribute_names = []
+        else:
+            deployer_utils.count_avoided_wlst_call()
+        return self._existing_attribute_values
 
-        return False
+    def _get_existing_attribute_value(self, wlst_key):
+        """
+        Returns the existing value of an attribute at the current location that must be read with get,
+        reading it from WLST only the first time it is needed for the location.
+        :param wlst_key: the WLST attribute name
+        :return: the WLST attribute value
+        """
+        if wlst_key in self._existing_attribute_gets:
+            deployer_utils.count_avoided_wlst_call()
+        else:
+            self._existing_attribute_gets[wlst_key] = self.wlst_helper.get(wlst_key)
+        return self._existing_attribute_gets[wlst_key]
+
+    def _invalidate_existing_value(self, location, key):
+        """
+        Discard any existing value of the attribute that was read at the current location, because it is being set.
+        :param location: the location of the attribute
+        :param key: the model attribute name
+        """
+        wlst_key = self.alias_helper.get_wlst_attribute_name(location, key)
+        if wlst_key is not None:
+            if wlst_key in self._existing_attribute_gets:
+                del self._existing_attribute_gets[wlst_key]
+            if self._existing_attribute_values is not None and wlst_key not in self._set_wlst_attribute_names:
+                self._set_wlst_attribute_names.append(wlst_key)
+        return
+
+    def _clear_existing_attribute_values(self):
+        """
+        Discard all the existing values that were read, before moving to another location.
+        """
+        self._existing_attribute_values = None
+        self._existing_attribute_gets = {}
+        self._set_wlst_attribute_names = []
+        return
 
     def _get_existing_wlst_value(self, location, key, lsa_required_attribute_names):
         """
         Returns the existing value for the specified attribute key in the specified location.
+        Values already read at the location are reused rather than read from WLST again.
         :param location: the location to be checked
         :param key: the attribute key
         :return: The value of the attribute in WLST
@@ -223,7 +327,7 @@ class Deployer(object):
             return None
 
         if key in lsa_required_attribute_names:
-            attribute_map = self.wlst_helper.lsa()
+            attribute_map = self._get_existing_attribute_values(wlst_key)
             if wlst_key in attribute_map:
                 wlst_value = attribute_map[wlst_key]
             else:
@@ -232,7 +336,7 @@ class Deployer(object):
                 self.logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
                 raise ex
         else:
-            wlst_value = self.wlst_helper.get(wlst_key)
+            wlst_value = self._get_existing_attribute_value(wlst_key)
 
         wlst_value = self._convert_if_mbean_list(wlst_value)
 
@@ -25,6 +25,12 @@ _class_name = "deployer_utils"
 _logger = platform_logger.PlatformLogger('wlsdeploy.deploy.utils')
 _wlst_helper = WlstHelper(_logger, ExceptionType.DEPLOY)
 
+# the number of model attributes that were compared with their existing WLST values, and the number of
+# WLST calls avoided by reusing existing values already read at a location, across all deployers
+_unchanged_attribute_count = 0
+_changed_attribute_count = 0
+_avoided_wlst_call_count = 0
+
 
 def set_attribute(location, model_key, model_value, alias_helper, use_raw_value=False):
     """
@@ -308,3 +314,48 @@ def get_file_hash(file_name):
         raise ex
     _logger.exiting(class_name=_class_name, method_name=_method_name, result=result)
     return result
+
+
+def count_compared_attribute(changed):
+    """
+    Count a model attribute that was compared with its existing WLST value.
+    :param changed: True if the attribute was set because its value changed, False if it was skipped
+    """
+    global _unchanged_attribute_count, _changed_attribute_count
+
+    if changed:
+        _changed_attribute_count += 1
+    else:
+        _unchanged_attribute_count += 1
+    return
+
+
+def count_avoided_wlst_call():
+    """
+    Count an existing attribute value that was reused instead of being read from WLST again.
+    """
+    global _avoided_wlst_call_count
+
+    _avoided_wlst_call_count += 1
+    return
+
+
+def log_attribute_counts(class_name, method_name):
+    """
+    Log how many of the compared model attributes were unchanged and how many were set, and how many
+    WLST calls were avoided, and reset the counts.  Nothing is logged for counts that are zero.
+    :param class_name: the class name of the caller
+    :param method_name: the method name of the caller
+    """
+    global _unchanged_attribute_count, _changed_attribute_count, _avoided_wlst_call_count
+
+    compared = _unchanged_attribute_count + _changed_attribute_count
+    if compared > 0:
+        _logger.info('WLSDPLY-09109', compared, _unchanged_attribute_count, _changed_attribute_count,
+                     class_name=class_name, method_name=method_name)
+    if _avoided_wlst_call_count > 0:
+        _logger.fine('WLSDPLY-09110', _avoided_wlst_call_count, class_name=class_name, method_name=method_name)
+    _unchanged_attribute_count = 0
+    _changed_attribute_count = 0
+    _avoided_wlst_call_count = 0
+    return
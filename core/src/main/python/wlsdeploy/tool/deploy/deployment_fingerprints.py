@@ -0,0 +1,238 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import javaos as os
+
+from java.io import File
+from java.io import FileInputStream
+from java.io import FileOutputStream
+from java.io import IOException
+from java.util import Properties
+
+from wlsdeploy.exception import exception_helper
+
+# the name of the store file in the state directory
+FINGERPRINT_FILE_NAME = 'deployment-fingerprints.properties'
+
+# the state directory under the domain home, if no state directory is specified
+DEFAULT_STATE_DIR = 'wlsdeploy'
+
+# the prefixes of the store keys
+_DEPLOYMENT_PREFIX = 'deployment.'
+_MANIFEST_PREFIX = 'manifest.'
+
+# the fields of each deployment record
+_SOURCE_PATH = 'sourcePath'
+_SOURCE_DIGEST = 'sourceDigest'
+_PLAN_PATH = 'planPath'
+_PLAN_DIGEST = 'planDigest'
+_TARGETS = 'targets'
+_OPTIONS = 'options'
+
+
+def get_store_file_name(model_context):
+    """
+    Get the name of the fingerprint store file, in the deployment state directory if one was specified,
+    or in the wlsdeploy directory of the domain home.
+    :param model_context: the model context
+    :return: the store file name
+    """
+    state_dir = model_context.get_deployment_state_dir()
+    if state_dir is None:
+        state_dir = os.path.join(model_context.get_domain_home(), DEFAULT_STATE_DIR)
+    return os.path.join(state_dir, FINGERPRINT_FILE_NAME)
+
+
+class DeploymentFingerprintStore(object):
+    """
+    A persistent store of the last-deployed fingerprints of the applications and libraries in a domain.
+
+    For each deployed application and library, the store records the paths and digests of the deployed source
+    and plan, the targets and the deployment options.  The recorded digests stand in for the digests of the
+    existing binaries, as long as the deployment still uses the same paths, so that the existing binaries are
+    not read again.  The recorded targets and options are compared with the model, so that a change to the
+    targets or options of an unchanged binary is deployed.  The store is kept with the domain, so it does not
+    depend on the user running the tool.
+
+    The store also keeps the manifest attributes that determine the versioned names of the deployed binaries,
+    by the digest of each binary, so that a binary is only opened to read its manifest when it changes.
+    """
+    _class_name = 'DeploymentFingerprintStore'
+
+    def __init__(self, file_name, logger):
+        self._file_name = file_name
+        self._logger = logger
+        self._properties = Properties()
+        self._modified = False
+        return
+
+    def load(self):
+        """
+        Load the store from its file, if the file exists.  A store that cannot be read is ignored.
+        """
+        _method_name = 'load'
+
+        if not File(self._file_name).isFile():
+            return
+
+        input_stream = None
+        try:
+            try:
+                input_stream = FileInputStream(self._file_name)
+                self._properties.load(input_stream)
+                self._logger.fine('WLSDPLY-09360', self._file_name, class_name=self._class_name,
+                                  method_name=_method_name)
+            except IOException, ioe:
+                self._logger.warning('WLSDPLY-09361', self._file_name, ioe.getLocalizedMessage(), error=ioe,
+                                     class_name=self._class_name, method_name=_method_name)
+                self._properties = Properties()
+        finally:
+            if input_stream is not None:
+                input_stream.close()
+        return
+
+    def save(self):
+        """
+        Save the store to its file, if it was modified.  A store that cannot be written is logged and ignored,
+        since it only saves the work of computing the digests again.
+        """
+        _method_name = 'save'
+
+        if not self._modified:
+            return
+
+        output_stream = None
+        try:
+            try:
+                File(self._file_name).getParentFile().mkdirs()
+                output_stream = FileOutputStream(self._file_name)
+                self._properties.store(output_stream, exception_helper.get_message('WLSDPLY-09362'))
+                self._modified = False
+            except IOException, ioe:
+                self._logger.warning('WLSDPLY-09363', self._file_name, ioe.getLocalizedMessage(), error=ioe,
+                                     class_name=self._class_name, method_name=_method_name)
+        finally:
+            if output_stream is not None:
+                output_stream.close()
+        return
+
+    def get_deployed_source_digest(self, type_name, name, source_path, scope=None):
+        """
+        Get the digest of the source that the application or library was last deployed from.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the application or library
+        :param source_path: the absolute source path of the existing deployment
+        :param scope: the partition or resource group scope of the deployment, or None for the domain
+        :return: the digest, or None if it was not recorded or the deployment now uses a different source path
+        """
+        return self.__get_deployed_digest(type_name, name, _SOURCE_PATH, _SOURCE_DIGEST, source_path, scope)
+
+    def get_deployed_plan_digest(self, type_name, name, plan_path, scope=None):
+        """
+        Get the digest of the plan that the application was last deployed with.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the application or library
+        :param plan_path: the absolute plan path of the existing deployment
+        :param scope: the partition or resource group scope of the deployment, or None for the domain
+        :return: the digest, or None if it was not recorded or the deployment now uses a different plan path
+        """
+        return self.__get_deployed_digest(type_name, name, _PLAN_PATH, _PLAN_DIGEST, plan_path, scope)
+
+    def get_deployed_targets(self, type_name, name, scope=None):
+        """
+        Get the targets that the application or library was last deployed to.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the application or library
+        :param scope: the partition or resource group scope of the deployment, or None for the domain
+        :return: the targets, as a sorted comma-separated string, or None if they were not recorded
+        """
+        return self.__get(_get_deployment_key(type_name, name, scope, _TARGETS))
+
+    def get_deployed_options(self, type_name, name, scope=None):
+        """
+        Get the deployment options that the application or library was last deployed with.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the application or library
+        :param scope: the partition or resource group scope of the deployment, or None for the domain
+        :return: the options, as a sorted comma-separated string, or None if the deployment was not recorded
+        """
+        return self.__get(_get_deployment_key(type_name, name, scope, _OPTIONS))
+
+    def record_deployment(self, type_name, name, source_path, source_digest, plan_path, plan_digest, targets,
+                          options, scope=None):
+        """
+        Record the deployment of an application or library.
+        :param type_name: the model type, Application or Library
+        :param name: the name of the application or library
+        :param source_path: the absolute path of the deployed source
+        :param source_digest: the digest of the deployed source
+        :param plan_path: the absolute path of the deployed plan, or None if there is no plan
+        :param plan_digest: the digest of the deployed plan, or None if there is no plan
+        :param targets: the targets, as a sorted comma-separated string, or None if they are not recorded
+        :param options: the deployment options, as a sorted comma-separated string
+        :param scope: the partition or resource group scope of the deployment, or None for the domain
+        """
+        self.__set(_get_deployment_key(type_name, name, scope, _SOURCE_PATH), source_path)
+        self.__set(_get_deployment_key(type_name, name, scope, _SOURCE_DIGEST), source_digest)
+        self.__set(_get_deployment_key(type_name, name, scope, _PLAN_PATH), plan_path)
+        self.__set(_get_deployment_key(type_name, name, scope, _PLAN_DIGEST), plan_digest)
+        self.__set(_get_deployment_key(type_name, name, scope, _TARGETS), targets)
+        self.__set(_get_deployment_key(type_name, name, scope, _OPTIONS), options)
+        return
+
+    def get_manifest(self, digest):
+        """
+        Get the manifest attributes of the binary with the specified digest.
+        :param digest: the digest of the binary
+        :return: the manifest attribute text, or None if it is not in the store
+        """
+        return self.__get(_MANIFEST_PREFIX + digest)
+
+    def record_manifest(self, digest, manifest_text):
+        """
+        Record the manifest attributes of the binary with the specified digest.
+        :param digest: the digest of the binary
+        :param manifest_text: the manifest attribute text
+        """
+        self.__set(_MANIFEST_PREFIX + digest, manifest_text)
+        return
+
+    def remove_unused_manifests(self):
+        """
+        Remove the manifest attributes of the binaries that are no longer the source of a recorded deployment.
+        """
+        source_digest_suffix = '.' + _SOURCE_DIGEST
+        used_digests = dict()
+        for key in self._properties.stringPropertyNames():
+            if key.startswith(_DEPLOYMENT_PREFIX) and key.endswith(source_digest_suffix):
+                used_digests[self.__get(key)] = True
+
+        for key in self._properties.stringPropertyNames():
+            if key.startswith(_MANIFEST_PREFIX) and key[len(_MANIFEST_PREFIX):] not in used_digests:
+                self.__set(key, None)
+        return
+
+    def __get_deployed_digest(self, type_name, name, path_field, digest_field, path, scope):
+        if path is None or self.__get(_get_deployment_key(type_name, name, scope, path_field)) != path:
+            return None
+        return self.__get(_get_deployment_key(type_name, name, scope, digest_field))
+
+    def __get(self, key):
+        return self._properties.getProperty(key)
+
+    def __set(self, key, value):
+        if value is None:
+            if self._properties.containsKey(key):
+                self._properties.remove(key)
+                self._modified = True
+        elif self._properties.getProperty(key) != str(value):
+            self._properties.setProperty(key, str(value))
+            self._modified = True
+        return
+
+
+def _get_deployment_key(type_name, name, scope, field):
+    if scope is not None:
+        name = scope + '/' + name
+    return _DEPLOYMENT_PREFIX + type_name + '.' + name + '.' + field
@@ -0,0 +1,246 @@
+"""
+Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+from java.lang import System
+
+from oracle.weblogic.deploy.exception import BundleAwareException
+
+from wlsdeploy.exception import exception_helper
+from wlsdeploy.tool.deploy import checkpoint_journal
+from wlsdeploy.tool.deploy.progress_poller import ProgressPoller
+
+# the operations performed on applications and libraries
+STOP = 'stop'
+UNDEPLOY = 'undeploy'
+DEPLOY = 'deploy'
+REDEPLOY = 'redeploy'
+START = 'start'
+
+
+def get_operation_id(action, key, scope=None):
+    """
+    Get the identifier of the operation for the specified action and key.  The scope distinguishes the
+    operations on same-named applications and libraries in different partitions or resource groups.
+    :param action: the action, such as DEPLOY
+    :param key: the key of the application or library, usually its model name
+    :param scope: the scope of the application or library, or None for the domain
+    :return: the operation identifier
+    """
+    if scope is None:
+        return action + ':' + key
+    return action + ':' + scope + '/' + key
+
+
+class DeploymentScheduler(object):
+    """
+    Runs online application and library operations as a dependency graph.  An operation is started once
+    the operations it depends on have completed, and once every operation in its group with a lower
+    deployment order has completed.  Operations without a deployment order follow the ordered ones.
+
+    When more than one operation may run at once, each operation is submitted with block='false' and a
+    single ProgressPoller tracks the returned WLST progress objects until they complete.  Otherwise, each
+    operation blocks, so the operations run one at a time in the order they were added.  In both cases,
+    the state and elapsed time of every submitted operation is logged when the schedule finishes.
+    """
+    _class_name = 'DeploymentScheduler'
+
+    def __init__(self, max_parallel, logger, scope=None):
+        self._max_parallel = max_parallel
+        self._logger = logger
+        self._scope = scope
+        self._operations = []
+        self._operation_ids = dict()
+        self._completed_ids = dict()
+        return
+
+    def add_operation(self, action, name, submit_method, args=None, kwargs=None, key=None, group=None,
+                      order=None, depends_on=None):
+        """
+        Add an operation to the schedule.  An operation with the same action and key as one already
+        scheduled is ignored.
+        :param action: the action, such as DEPLOY
+        :param name: the name of the application or library passed to WLST
+        :param submit_method: the method that submits the operation and returns its WLST progress object
+        :param args: the positional arguments for the submit method, the default is the name
+        :param kwargs: the keyword arguments for the submit method
+        :param key: the key used to identify the operation, the default is the name
+        :param group: the group of operations that are ordered by deployment order, the default is the action
+        :param order: the deployment order of the operation within its group
+        :param depends_on: the identifiers of the operations that must complete first
+        :return: the identifier of the operation
+        """
+        if key is None:
+            key = name
+        operation_id = get_operation_id(action, key, self._scope)
+        if operation_id in self._operation_ids:
+            return operation_id
+
+        if args is None:
+            args = [name]
+        if kwargs is None:
+            kwargs = dict()
+        if group is None:
+            group = action
+        if depends_on is None:
+            depends_on = []
+
+        operation = _Operation(operation_id, action, name, submit_method, args, kwargs, group, _get_order(order),
+                               depends_on)
+        self._operations.append(operation)
+        self._operation_ids[operation_id] = operation
+        return operation_id
+
+    def run(self):
+        """
+        Run the scheduled operations.  If an operation fails, no further operations are started, the
+        running operations are allowed to complete, and the first failure is raised.
+        :raises: DeployException: if an operation fails
+        """
+        _method_name = 'run'
+
+        if len(self._operations) == 0:
+            return
+
+        self._logger.info('WLSDPLY-09327', len(self._operations), self._max_parallel,
+                          class_name=self._class_name, method_name=_method_name)
+
+        pending = []
+        for operation in self._operations:
+            if checkpoint_journal.is_operation_completed(operation.operation_id):
+                self._logger.info('WLSDPLY-09336', operation.action, operation.name,
+                                  class_name=self._class_name, method_name=_method_name)
+                self._completed_ids[operation.operation_id] = operation
+            else:
+                pending.append(operation)
+
+        poller = ProgressPoller(self._logger)
+        error = None
+        while poller.get_running_count() > 0 or (error is None and len(pending) > 0):
+            if error is None:
+                error = self.__submit_ready_operations(pending, poller)
+
+            if error is None and poller.get_running_count() == 0 and len(pending) > 0:
+                pending_ids = []
+                for operation in pending:
+                    pending_ids.append(operation.operation_id)
+                error = exception_helper.create_deploy_exception('WLSDPLY-09331', pending_ids)
+
+            for tracked in poller.wait_for_finished():
+                operation_error = self.__complete(tracked)
+                if error is None:
+                    error = operation_error
+
+        poller.log_summary()
+        if len(pending) > 0:
+            self._logger.info('WLSDPLY-09335', len(pending), class_name=self._class_name, method_name=_method_name)
+
+        if error is not None:
+            self._logger.throwing(error, class_name=self._class_name, method_name=_method_name)
+            raise error
+        return
+
+    def __submit_ready_operations(self, pending, poller):
+        """
+        Submit the pending operations that are ready to run, up to the concurrency limit.
+        :param pending: the operations that have not been submitted, updated by this method
+        :param poller: the poller that tracks the submitted operations, updated by this method
+        :return: the error raised by a submit method, or None if all of the submissions succeeded
+        """
+        _method_name = '__submit_ready_operations'
+
+        for operation in list(pending):
+            if poller.get_running_count() >= self._max_parallel:
+                break
+
+            if self.__is_ready(operation):
+                pending.remove(operation)
+                kwargs = dict(operation.kwargs)
+                if self._max_parallel > 1:
+                    kwargs['block'] = 'false'
+
+                self._logger.fine('WLSDPLY-09328', operation.action, operation.name,
+                                  class_name=self._class_name, method_name=_method_name)
+                start_time = System.currentTimeMillis()
+                try:
+                    progress = operation.submit_method(*operation.args, **kwargs)
+                except BundleAwareException, ex:
+                    return ex
+                poller.add(operation.operation_id, operation.action, operation.name, progress, start_time)
+        return None
+
+    def __is_ready(self, operation):
+        """
+        Determine if the operation may be started.
+        :param operation: the operation
+        :return: True if the operation is ready to run, False otherwise
+        """
+        for depends_on in operation.depends_on:
+            if depends_on in self._operation_ids and depends_on not in self._completed_ids:
+                return False
+
+        for other in self._operations:
+            if other.group == operation.group and other.operation_id not in self._completed_ids \
+                    and _is_before(other.order, operation.order):
+                return False
+        return True
+
+    def __complete(self, tracked):
+        """
+        Record the completion of an operation.
+        :param tracked: the tracked progress of the operation
+        :return: the error if the operation failed, or None if it succeeded
+        """
+        if tracked.is_failed():
+            return exception_helper.create_deploy_exception('WLSDPLY-09330', tracked.action, tracked.name,
+                                                            tracked.get_message())
+
+        self._completed_ids[tracked.key] = self._operation_ids[tracked.key]
+        checkpoint_journal.record_operation(tracked.key)
+        return None
+
+
+class _Operation(object):
+    """
+    An application or library operation waiting to be submitted.
+    """
+
+    def __init__(self, operation_id, action, name, submit_method, args, kwargs, group, order, depends_on):
+        self.operation_id = operation_id
+        self.action = action
+        self.name = name
+        self.submit_method = submit_method
+        self.args = args
+        self.kwargs = kwargs
+        self.group = group
+        self.order = order
+        self.depends_on = depends_on
+        return
+
+
+def _get_order(order):
+    """
+    Get the deployment order as an integer.
+    :param order: the deployment order from the model or from WLST
+    :return: the integer deployment order, or None if the order is not set or is not an integer
+    """
+    if order is None:
+        return None
+    try:
+        return int(str(order))
+    except ValueError:
+        return None
+
+
+def _is_before(order, other_order):
+    """
+    Determine if the first deployment order comes before the second.  Operations without an order come last.
+    :param order: the first deployment order
+    :param other_order: the second deployment order
+    :return: True if the first order comes before the second, False otherwise
+    """
+    if order is None:
+        return False
+    if other_order is None:
+        return True
+    return order < other_order
@@ -0,0 +1,141 @@
+"""
+Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+from java.lang import System
+from java.lang import Thread
+
+# the bounds of the wait between checks of the running operations, the wait doubles
+# after each check that finds no finished operations and resets when one finishes
+_MIN_POLL_INTERVAL_MILLIS = 250
+_MAX_POLL_INTERVAL_MILLIS = 8000
+
+
+class ProgressPoller(object):
+    """
+    Tracks the WLST progress objects returned by application commands submitted with block='false'.
+    A single poller checks all of the running operations together, backing off while none of them finish,
+    and keeps the state and elapsed time of every operation for the summary.
+    """
+    _class_name = 'ProgressPoller'
+
+    def __init__(self, logger):
+        self._logger = logger
+        self._tracked = []
+        self._running = []
+        self._interval = _MIN_POLL_INTERVAL_MILLIS
+        return
+
+    def add(self, key, action, name, progress, start_time):
+        """
+        Start tracking the progress of an operation.
+        :param key: the key that identifies the operation to the caller
+        :param action: the action, such as deploy
+        :param name: the name of the application or library
+        :param progress: the WLST progress object, or None if the command did not return one
+        :param start_time: the time the operation was submitted, in milliseconds
+        :return: the tracked progress
+        """
+        tracked = TrackedProgress(key, action, name, progress, start_time)
+        self._tracked.append(tracked)
+        self._running.append(tracked)
+        return tracked
+
+    def get_running_count(self):
+        """
+        Get the number of operations that have not been seen to finish.
+        :return: the number of running operations
+        """
+        return len(self._running)
+
+    def wait_for_finished(self):
+        """
+        Wait until at least one of the running operations finishes.  The operations are checked
+        immediately, and then with a growing wait between checks.
+        :return: the list of tracked progress for the operations that finished, empty if none were running
+        """
+        _method_name = 'wait_for_finished'
+
+        while len(self._running) > 0:
+            finished = []
+            for tracked in list(self._running):
+                if tracked.check():
+                    self._running.remove(tracked)
+                    finished.append(tracked)
+                    self._logger.fine('WLSDPLY-09329', tracked.action, tracked.name, tracked.get_state(),
+                                      tracked.get_elapsed(), class_name=self._class_name, method_name=_method_name)
+
+            if len(finished) > 0:
+                self._interval = _MIN_POLL_INTERVAL_MILLIS
+                return finished
+
+            Thread.sleep(self._interval)
+            self._interval = min(self._interval * 2, _MAX_POLL_INTERVAL_MILLIS)
+        return []
+
+    def log_summary(self):
+        """
+        Log the state and elapsed time of every tracked operation, including the failure messages.
+        """
+        _method_name = 'log_summary'
+
+        failed_count = 0
+        for tracked in self._tracked:
+            if tracked.is_failed():
+                failed_count += 1
+                self._logger.warning('WLSDPLY-09333', tracked.action, tracked.name, tracked.get_elapsed(),
+                                     tracked.get_message(), class_name=self._class_name, method_name=_method_name)
+            else:
+                self._logger.info('WLSDPLY-09332', tracked.action, tracked.name, tracked.get_state(),
+                                  tracked.get_elapsed(), class_name=self._class_name, method_name=_method_name)
+
+        self._logger.info('WLSDPLY-09334', len(self._tracked), failed_count, len(self._running),
+                          class_name=self._class_name, method_name=_method_name)
+        return
+
+
+class TrackedProgress(object):
+    """
+    The progress of one application or library operation.
+    """
+
+    def __init__(self, key, action, name, progress, start_time):
+        self.key = key
+        self.action = action
+        self.name = name
+        self._progress = progress
+        self._start_time = start_time
+        self._end_time = None
+        return
+
+    def check(self):
+        """
+        Check whether the operation has finished, and record the time if it has.
+        :return: True if the operation has finished, False otherwise
+        """
+        if self._end_time is None and (self._progress is None or not self._progress.isRunning()):
+            self._end_time = System.currentTimeMillis()
+        return self._end_time is not None
+
+    def is_failed(self):
+        return self._progress is not None and self._progress.isFailed()
+
+    def get_state(self):
+        if self._progress is None:
+            return None
+        return self._progress.getState()
+
+    def get_message(self):
+        if self._progress is None:
+            return None
+        return self._progress.getMessage()
+
+    def get_elapsed(self):
+        """
+        Get the elapsed time of the operation, up to now if it has not finished.
+        :return: the elapsed time in milliseconds
+        """
+        end_time = self._end_time
+        if end_time is None:
+            end_time = System.currentTimeMillis()
+        return end_time - self._start_time
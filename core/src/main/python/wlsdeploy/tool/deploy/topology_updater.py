@@ -11,6 +11,7 @@ from wlsdeploy.aliases.model_constants import SECURITY
 from wlsdeploy.aliases.model_constants import SECURITY_CONFIGURATION
 from wlsdeploy.aliases.model_constants import SERVER
 from wlsdeploy.aliases.model_constants import SERVER_TEMPLATE
+from wlsdeploy.aliases.model_constants import TOPOLOGY
 from wlsdeploy.aliases.model_constants import UNIX_MACHINE
 from wlsdeploy.aliases.wlst_modes import WlstModes
 from wlsdeploy.exception.expection_types import ExceptionType
@@ -36,7 +37,8 @@ class TopologyUpdater(Deployer):
         self._topology_helper = TopologyHelper(self.aliases, ExceptionType.DEPLOY, self.logger)
         self._domain_typedef = self.model_context.get_domain_typedef()
 
-        self._security_provider_creator = SecurityProviderCreator(model.get_model(), model_context, aliases,
+        # the security provider creator only reads the topology section, so the other sections are not resolved
+        self._security_provider_creator = SecurityProviderCreator({TOPOLOGY: self._topology}, model_context, aliases,
                                                                   ExceptionType.DEPLOY, self.logger)
 
         self.library_helper = LibraryHelper(self.model, self.model_context, self.aliases,
@@ -54,8 +54,10 @@ class CoherenceResourcesDiscoverer(Discoverer):
         _method_name = 'discover'
         _logger.entering(class_name=_class_name, method_name=_method_name)
         _logger.fine('WLSDPLY-06310', class_name=_class_name, method_name=_method_name)
+        self._begin_archive_batch()
         model_top_folder_name, result = self.get_coherence_clusters()
         discoverer.add_to_model_if_not_empty(self._dictionary, model_top_folder_name, result)
+        self._commit_archive_batch()
 
         _logger.exiting(class_name=_class_name, method_name=_method_name, result=model_top_folder_name)
         return model_top_folder_name, self._dictionary
@@ -41,10 +41,12 @@ class DeploymentsDiscoverer(Discoverer):
         _method_name = 'discover'
         _logger.entering(class_name=_class_name, method_name=_method_name)
         _logger.info('WLSDPLY-06380', class_name=_class_name, method_name=_method_name)
+        self._begin_archive_batch()
         model_top_folder_name, libraries = self.get_shared_libraries()
         discoverer.add_to_model_if_not_empty(self._dictionary, model_top_folder_name, libraries)
         model_top_folder_name, applications = self.get_applications()
         discoverer.add_to_model_if_not_empty(self._dictionary, model_top_folder_name, applications)
+        self._commit_archive_batch()
         _logger.exiting(class_name=_class_name, method_name=_method_name)
         return self._dictionary
 
@@ -4,11 +4,14 @@ The Universal Permissive License (UPL), Version 1.0
 """
 import javaos as os
 
+from java.lang import IllegalStateException
+
 from oracle.weblogic.deploy.aliases import AliasException
 from oracle.weblogic.deploy.discover import DiscoverException
 from oracle.weblogic.deploy.util import PyOrderedDict as OrderedDict
 from oracle.weblogic.deploy.util import PyWLSTException
 from oracle.weblogic.deploy.util import StringUtils
+from oracle.weblogic.deploy.util import WLSDeployArchiveIOException
 
 from wlsdeploy.aliases.aliases import Aliases
 from wlsdeploy.aliases.location_context import LocationContext
@@ -538,6 +541,32 @@ class Discoverer(object):
     def _add_att_handler(self, attribute_key, method):
         self._att_handler_map[attribute_key] = method
 
+    def _begin_archive_batch(self):
+        """
+        Stage the binaries this discoverer adds to the archive file so that the archive is rewritten once
+        when _commit_archive_batch is called instead of once per binary.
+        """
+        archive_file = self._model_context.get_archive_file()
+        if archive_file is not None:
+            archive_file.beginBatch()
+
+    def _commit_archive_batch(self):
+        """
+        Write the binaries staged since _begin_archive_batch to the archive file.
+        :raises DiscoverException: if the archive file cannot be written
+        """
+        _method_name = '_commit_archive_batch'
+        archive_file = self._model_context.get_archive_file()
+        if archive_file is not None:
+            try:
+                archive_file.commit()
+            except (WLSDeployArchiveIOException, IllegalStateException), wioe:
+                de = exception_helper.create_discover_exception('WLSDPLY-06148',
+                                                                self._model_context.get_archive_file_name(),
+                                                                wioe.getLocalizedMessage())
+                _logger.throwing(class_name=_class_name, method_name=_method_name, error=de)
+                raise de
+
     def _convert_path(self, file_name):
         file_name_resolved = self._model_context.replace_token_string(file_name)
         if path_utils.is_relative_path(file_name_resolved):
@@ -58,6 +58,7 @@ class TopologyDiscoverer(Discoverer):
 
         _logger.info('WLSDPLY-06600', class_name=_class_name, method_name=_method_name)
 
+        self._begin_archive_batch()
         self.discover_domain_parameters()
 
         model_top_folder_name, clusters = self.get_clusters()
@@ -81,6 +82,7 @@ class TopologyDiscoverer(Discoverer):
         model_top_folder_name, security_configuration = self.discover_security_configuration()
         discoverer.add_to_model_if_not_empty(self._dictionary, model_top_folder_name, security_configuration)
 
+        self._commit_archive_batch()
         _logger.exiting(class_name=_class_name, method_name=_method_name)
         return self._dictionary
 
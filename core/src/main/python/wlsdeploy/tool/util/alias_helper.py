@@ -698,6 +698,26 @@ class AliasHelper(object):
             raise ex
         return result
 
+    def attribute_values_are_equal(self, location, model_name, model_value, wlst_value):
+        """
+        Determine whether setting the model value would leave the existing WLST value unchanged.
+        :param location: the location
+        :param model_name: the model attribute name
+        :param model_value: the model attribute value
+        :param wlst_value: the existing WLST attribute value
+        :return: True if the values are equal, False otherwise
+        :raises: BundleAwareException of the specified type: if an error occurs
+        """
+        _method_name = 'attribute_values_are_equal'
+        try:
+            result = self.__aliases.attribute_values_are_equal(location, model_name, model_value, wlst_value)
+        except AliasException, ae:
+            ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19037', model_name,
+                                                   location.get_folder_path(), ae.getLocalizedMessage(), error=ae)
+            self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
+            raise ex
+        return result
+
     def get_model_domain_info_attribute_names_and_types(self):
         """
         Get the attribute names and types for the domainInfo section of the model.
@@ -5,6 +5,7 @@ The Universal Permissive License (UPL), Version 1.0
 from java.io import File
 from java.lang import IllegalArgumentException
 from java.lang import IllegalStateException
+from java.util import ArrayList
 
 from oracle.weblogic.deploy.util import FileUtils
 from oracle.weblogic.deploy.util import WLSDeployArchive
@@ -160,6 +161,47 @@ class ArchiveHelper(object):
         self.__logger.exiting(class_name=self.__class_name, method_name=_method_name, result=result)
         return result
 
+    def extract_files(self, paths, location=None):
+        """
+        Extract the specified files from the archive into the Domain Home directory, or the specified location,
+        inflating them concurrently.
+        :param paths: the paths into the archive
+        :param location: the location to which to extract the files
+        :return: the paths to the extracted files, in the same order
+        :raises: BundleAwareException of the appropriate type: if an error occurs
+        """
+        _method_name = 'extract_files'
+
+        self.__logger.entering(paths, class_name=self.__class_name, method_name=_method_name)
+        archive_paths = ArrayList()
+        for path in paths:
+            archive_paths.add(path)
+
+        try:
+            if location is None:
+                extract_results = self.__archive_file.extractFiles(archive_paths, self.__domain_home, False)
+            else:
+                extract_location = FileUtils.getCanonicalFile(File(location))
+                extract_results = self.__archive_file.extractFiles(archive_paths, extract_location, True)
+        except (IllegalArgumentException, WLSDeployArchiveIOException), e:
+            ex = exception_helper.create_exception(self.__exception_type, "WLSDPLY-19303", paths,
+                                                   self.__archive_file_name, e.getLocalizedMessage(), error=e)
+            self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
+            raise ex
+
+        result = []
+        for extract_result in extract_results:
+            if not extract_result.isSuccessful():
+                e = extract_result.getError()
+                ex = exception_helper.create_exception(self.__exception_type, "WLSDPLY-19303",
+                                                       extract_result.getPath(), self.__archive_file_name,
+                                                       e.getLocalizedMessage(), error=e)
+                self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
+                raise ex
+            result.append(extract_result.getExtractedFileName())
+        self.__logger.exiting(class_name=self.__class_name, method_name=_method_name, result=result)
+        return result
+
     def get_file_hash(self, path):
         """
         Get the Base64-encoded hash value for the file at the specified path within the archive.
@@ -206,6 +248,34 @@ class ArchiveHelper(object):
         self.__logger.exiting(class_name=self.__class_name, method_name=_method_name)
         return
 
+    def extract_domain_libraries(self, lib_paths):
+        """
+        Extract the specified domain libraries to the $DOMAIN_HOME/lib directory, inflating them concurrently.
+        :param lib_paths: the domain library paths into the archive file
+        :raises: BundleAwareException of the appropriate type: if an error occurs
+        """
+        _method_name = 'extract_domain_libraries'
+
+        self.__logger.entering(lib_paths, class_name=self.__class_name, method_name=_method_name)
+        try:
+            domain_libs = self.__archive_file.listDomainLibLibraries()
+        except WLSDeployArchiveIOException, e:
+            ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19306', lib_paths,
+                                                   self.__archive_file_name, e.getLocalizedMessage(), error=e)
+            self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
+            raise ex
+
+        for lib_path in lib_paths:
+            if lib_path not in domain_libs:
+                ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19305',
+                                                       lib_path, self.__archive_file_name)
+                self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
+                raise ex
+
+        self.extract_files(lib_paths, File(self.__domain_home, 'lib').getAbsolutePath())
+        self.__logger.exiting(class_name=self.__class_name, method_name=_method_name)
+        return
+
     def extract_classpath_libraries(self):
         """
         Extract all of the classpath libraries in the archive to the $DOMAIN_HOME/wlsdeploy/classpathLibraries
@@ -75,6 +75,11 @@ from wlsdeploy.aliases.model_constants import WS_RELIABLE_DELIVERY_POLICY
 from wlsdeploy.aliases.model_constants import XML_ENTITY_CACHE
 from wlsdeploy.aliases.model_constants import XML_REGISTRY
 
+# MBeans found while resolving references, keyed by (type, WLST list path, name).  The index is shared by
+# all AttributeSetter instances, and is discarded when the WlstHelper existing object generation changes.
+_reference_index = dict()
+_reference_index_generation = None
+
 
 class AttributeSetter(object):
     """
@@ -844,7 +849,13 @@ class AttributeSetter(object):
 
         location = LocationContext(location).append_location(element_type)
         if self.__alias_helper.get_wlst_mbean_type(location) is not None:
-            existing_names = self.__get_existing_object_list(location)
+            list_path = self.__alias_helper.get_wlst_list_path(location)
+            index_key = (element_type, list_path, name)
+            mbean = self.__get_indexed_mbean(index_key)
+            if mbean is not None:
+                return mbean
+
+            existing_names = self.__wlst_helper.get_existing_object_list(list_path)
             if name in existing_names:
                 location_type, location_name = self.__alias_helper.get_model_type_and_name(location)
                 self.__logger.fine('WLSDPLY-19204', element_type, name, location_type, location_name,
@@ -852,7 +863,9 @@ class AttributeSetter(object):
                 token = self.__alias_helper.get_name_token(location)
                 location.add_name_token(token, name)
                 path = self.__alias_helper.get_wlst_attributes_path(location)
-                return self.__wlst_helper.get_mbean_for_wlst_path(path)
+                mbean = self.__wlst_helper.get_mbean_for_wlst_path(path)
+                _reference_index[index_key] = mbean
+                return mbean
 
         if required:
             ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19202', element_type, name)
@@ -861,6 +874,24 @@ class AttributeSetter(object):
 
         return None
 
+    def __get_indexed_mbean(self, index_key):
+        """
+        Get the MBean previously found for the specified key.
+        The index is discarded if MBeans may have been deleted since it was populated.
+        :param index_key: the (type, WLST list path, name) key of the MBean
+        :return: the MBean, or None if it is not in the index
+        """
+        global _reference_index_generation
+
+        generation = self.__wlst_helper.get_existing_object_generation()
+        if generation != _reference_index_generation:
+            _reference_index.clear()
+            _reference_index_generation = generation
+
+        if index_key in _reference_index:
+            return _reference_index[index_key]
+        return None
+
     def __get_domain_location(self, location):
         """
         Returns a copy of the specified location with all folders removed, but tokens intact.
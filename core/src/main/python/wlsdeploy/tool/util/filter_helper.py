@@ -50,6 +50,24 @@ def apply_filters(model, tool_type):
     return filter_applied
 
 
+def has_filters(tool_type):
+    """
+    Determine if any filters are configured for the specified tool type.
+    :param tool_type: the name of the filter tool type
+    :return: True if filters are configured for the tool type, False otherwise
+    """
+    _method_name = 'has_filters'
+
+    try:
+        if os.path.isfile(__filter_file_location):
+            filters_dictionary = FileToPython(__filter_file_location).parse()
+            return tool_type in filters_dictionary
+    except Exception, ex:
+        __logger.severe('WLSDPLY-20018', str(ex), error=ex, class_name=__class_name, method_name=_method_name)
+
+    return False
+
+
 def _apply_filter(model, the_filter):
     """
     Apply the specified filter to the specified model.
@@ -52,7 +52,7 @@ class LibraryHelper(object):
             for domain_lib in domain_libs:
                 self.logger.info('WLSDPLY-12215', domain_lib, self.domain_home,
                                  class_name=self.__class_name, method_name=_method_name)
-                self.archive_helper.extract_domain_library(domain_lib)
+            self.archive_helper.extract_domain_libraries(domain_libs)
 
         self.logger.exiting(class_name=self.__class_name, method_name=_method_name)
         return
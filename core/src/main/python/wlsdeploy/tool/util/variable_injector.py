@@ -72,6 +72,8 @@ _fake_name_marker = 'fakename'
 _fake_name_replacement = re.compile('.' + _fake_name_marker)
 _white_space_replacement = re.compile('\s')
 _split_around_special_names = re.compile('([\w]+\[[\w\.,]+\])|\.')
+# injector regexp patterns, compiled once for each pattern string
+_compiled_patterns = dict()
 
 _wlsdeploy_location = os.environ.get('WLSDEPLOY_HOME')
 _class_name = 'variable_injector'
@@ -164,102 +166,171 @@ class VariableInjector(object):
         """
         _method_name = 'inject_variables_keyword_dictionary'
         _logger.entering(injector_file_list, class_name=_class_name, method_name=_method_name)
-        variable_dictionary = dict()
+        injector_dictionaries = []
         for filename in injector_file_list:
-            injector_dictionary = _load_injector_file(self._replace_tokens(filename))
-            entries = self.inject_variables(injector_dictionary)
-            if entries:
+            injector_dictionaries.append((filename, _load_injector_file(self._replace_tokens(filename))))
+
+        # the injectors of all the files are compiled into one trie, and the model is walked once
+        injected_files = dict()
+        variable_dictionary = self.__inject_variables(injector_dictionaries, injected_files)
+        for filename in injector_file_list:
+            if filename in injected_files:
                 _logger.finer('WLSDPLY-19513', filename, class_name=_class_name, method_name=_method_name)
-                variable_dictionary.update(entries)
         _logger.exiting(class_name=_class_name, method_name=_method_name, result=variable_dictionary)
         return variable_dictionary
 
     def inject_variables(self, injector_dictionary):
         """
         Iterate through the injector dictionary that was loaded from the file for the model
-        injector file keyword.
+        injector file keyword. The injector paths are compiled into a trie, and the model is
+        walked once, applying every matching injector at each node.
         :param injector_dictionary:
         :return: variable dictionary containing the variable string and model value entries
         """
+        return self.__inject_variables([(None, injector_dictionary)], dict())
+
+    def __inject_variables(self, injector_dictionaries, injected_files):
+        """
+        Compile the injectors of all the injector dictionaries into one trie, and walk the model once.
+        The injectors are applied in dictionary order at each node, so an attribute replaced by an
+        injector of an earlier dictionary is not replaced again by a later one.
+        :param injector_dictionaries: a list of (injector file name, injector dictionary) tuples, in order
+        :param injected_files: the dictionary to update with the names of the files that inserted variables
+        :return: variable dictionary containing the variable string and model value entries
+        """
+        _method_name = '__inject_variables'
         variable_dict = dict()
-        if injector_dictionary:
+        roots = self.__compile_injectors(injector_dictionaries)
+        if roots:
             location = LocationContext()
             domain_token = self.__aliases.get_name_token(location)
             location.add_name_token(domain_token, _fake_name_marker)
-            for injector, injector_values in injector_dictionary.iteritems():
-                entries_dict = self.__inject_variable(location, injector, injector_values)
-                if len(entries_dict) > 0:
-                    variable_dict.update(entries_dict)
+            for section, root_node in roots:
+                if section is None:
+                    # domain attribute injectors with no topology section in the model
+                    for injector, attribute, __, __ in root_node.injectors:
+                        _logger.finer('WLSDPLY-19517', attribute, injector, location.get_folder_path(),
+                                      class_name=_class_name, method_name=_method_name)
+                    continue
+                self.__inject_node(section, root_node, location, variable_dict, injected_files)
 
         return variable_dict
 
-    def __inject_variable(self, location, injector, injector_values):
-        _method_name = '__inject_variable'
-        _logger.entering(injector, class_name=_class_name, method_name=_method_name)
-        variable_dict = dict()
-        start_mbean_list, attribute = _split_injector(injector)
-
-        def _traverse_variables(model_section, mbean_list):
-            if mbean_list:
-                mbean = mbean_list.pop(0)
-                mbean, mbean_name_list = self._find_special_name(mbean)
-                _logger.finer('WLSDPLY-19523', mbean, location.get_folder_path(), class_name=_class_name,
-                              method_name=_method_name)
-                if mbean in model_section:
-                    _logger.finest('WLSDPLY-19514', mbean, class_name=_class_name, method_name=_method_name)
-                    next_model_section = model_section[mbean]
-                    location.append_location(mbean)
-                    name_token = self.__aliases.get_name_token(location)
-                    if not mbean_name_list:
-                        if self.__aliases.supports_multiple_mbean_instances(location):
-                            mbean_name_list = next_model_section
-                        else:
-                            self._check_name_token(location, name_token)
-                    else:
-                        _logger.fine('WLSDPLY-19506', mbean_name_list, attribute, location.get_folder_path(),
-                                     class_name=_class_name, method_name=_method_name)
-                    if mbean_name_list:
-                        for mbean_name in mbean_name_list:
-                            if mbean_name in next_model_section:
-                                continue_mbean_list = copy.copy(mbean_list)
-                                location.add_name_token(name_token, mbean_name)
-                                _traverse_variables(next_model_section[mbean_name], continue_mbean_list)
-                                location.remove_name_token(name_token)
-                    else:
-                        _traverse_variables(next_model_section, mbean_list)
-                    location.pop_location()
-                else:
-                    self._log_mbean_not_found(mbean, injector, location)
-                    return False
-            else:
-                self._check_insert_attribute_model(location, model_section, attribute, injector_values)
-                if attribute in model_section:
-                    returned_dict = self._variable_info(model_section, attribute, location, injector_values)
-                    if returned_dict:
-                        variable_dict.update(returned_dict)
-                else:
-                    _logger.finer('WLSDPLY-19517', attribute, injector, location.get_folder_path(),
-                                  class_name=_class_name, method_name=_method_name)
-            return True
-
-        section = self.__model
+    def __compile_injectors(self, injector_dictionaries):
+        """
+        Compile the injector paths into a trie of mbean folders for each model section.
+        The special name filters for each mbean segment are resolved once.
+        :param injector_dictionaries: a list of (injector file name, injector dictionary) tuples, in order
+        :return: a list of (model section, root trie node) tuples, in injector order
+        """
+        roots = []
+        special_names = dict()
+        for injector_file, injector, injector_values in _get_injectors(injector_dictionaries):
+            start_mbean_list, attribute = _split_injector(injector)
+            for segment in start_mbean_list:
+                if segment not in special_names:
+                    special_names[segment] = self._find_special_name(segment)
+
+            section = self.__get_injector_section(start_mbean_list, special_names)
+            node = None
+            for root_section, root_node in roots:
+                if root_section is section:
+                    node = root_node
+                    break
+            if node is None:
+                node = _InjectorNode(None, None, None)
+                roots.append((section, node))
+
+            node.injector_names.append(injector)
+            for segment in start_mbean_list:
+                mbean, mbean_name_list = special_names[segment]
+                node = node.get_child(segment, mbean, mbean_name_list)
+                node.injector_names.append(injector)
+            node.injectors.append((injector, attribute, injector_values, injector_file))
+        return roots
+
+    def __get_injector_section(self, start_mbean_list, special_names):
+        """
+        Find the model section that contains the top mbean folder of an injector.
+        :param start_mbean_list: the mbean segments of the injector
+        :param special_names: the resolved special name filters for each segment
+        :return: the model section, the full model if the folder is not in a section,
+            or None for a domain attribute when the model has no topology section
+        """
         if start_mbean_list:
             # Find out in what section is the mbean top folder so can move to that section in the model
-            top_mbean, __ = self._find_special_name(start_mbean_list[0])
+            top_mbean, __ = special_names[start_mbean_list[0]]
             for entry in self.__section_keys:
                 if entry in self.__model and top_mbean in self.__model[entry]:
-                    section = self.__model[entry]
-                    break
-        else:
-            # This is a domain attribute
-            section = self.__model[model_sections.get_model_topology_key()]
-        # if it wasn't found, will log appropriately in the called method
-        # This also will allow someone to put the section in the injector string
-        _traverse_variables(section, start_mbean_list)
-
-        _logger.exiting(class_name=_class_name, method_name=_method_name, result=variable_dict)
+                    return self.__model[entry]
+            # if it wasn't found, will log appropriately when the model is walked
+            # This also will allow someone to put the section in the injector string
+            return self.__model
+
+        # This is a domain attribute
+        topology_key = model_sections.get_model_topology_key()
+        if topology_key in self.__model:
+            return self.__model[topology_key]
+        return None
+
+    def __inject_node(self, model_section, node, location, variable_dict, injected_files):
+        """
+        Apply the injectors that end at the trie node to the model section, then continue with
+        the mbean folders of the child nodes.
+        :param model_section: the model folder for the node
+        :param node: the trie node
+        :param location: the location of the model folder
+        :param variable_dict: the dictionary to update with the variable entries
+        :param injected_files: the dictionary to update with the names of the files that inserted variables
+        """
+        _method_name = '__inject_node'
+        for injector, attribute, injector_values, injector_file in node.injectors:
+            self._check_insert_attribute_model(location, model_section, attribute, injector_values)
+            if attribute in model_section:
+                returned_dict = self._variable_info(model_section, attribute, location, injector_values)
+                if returned_dict:
+                    variable_dict.update(returned_dict)
+                    injected_files[injector_file] = True
+            else:
+                _logger.finer('WLSDPLY-19517', attribute, injector, location.get_folder_path(),
+                              class_name=_class_name, method_name=_method_name)
 
-        return variable_dict
+        for child in node.children:
+            mbean = child.mbean
+            _logger.finer('WLSDPLY-19523', mbean, location.get_folder_path(), class_name=_class_name,
+                          method_name=_method_name)
+            if mbean not in model_section:
+                for injector in child.injector_names:
+                    self._log_mbean_not_found(mbean, injector, location)
+                continue
+
+            _logger.finest('WLSDPLY-19514', mbean, class_name=_class_name, method_name=_method_name)
+            next_model_section = model_section[mbean]
+            location.append_location(mbean)
+            if not child.resolved:
+                child.name_token = self.__aliases.get_name_token(location)
+                child.multiple = self.__aliases.supports_multiple_mbean_instances(location)
+                child.resolved = True
+            name_token = child.name_token
+            mbean_name_list = child.mbean_name_list
+            if not mbean_name_list:
+                if child.multiple:
+                    mbean_name_list = next_model_section
+                else:
+                    self._check_name_token(location, name_token)
+            else:
+                _logger.fine('WLSDPLY-19506', mbean_name_list, child.injector_names, location.get_folder_path(),
+                             class_name=_class_name, method_name=_method_name)
+            if mbean_name_list:
+                for mbean_name in mbean_name_list:
+                    if mbean_name in next_model_section:
+                        location.add_name_token(name_token, mbean_name)
+                        self.__inject_node(next_model_section[mbean_name], child, location, variable_dict,
+                                           injected_files)
+                        location.remove_name_token(name_token)
+            else:
+                self.__inject_node(next_model_section, child, location, variable_dict, injected_files)
+            location.pop_location()
 
     def __format_variable_name(self, location, attribute):
         _method_name = '__format_variable_name'
@@ -551,6 +622,42 @@ class VariableInjector(object):
         return value
 
 
+class _InjectorNode(object):
+    """
+    A node in the compiled injector trie, representing an mbean folder segment of one or more injector paths.
+    """
+
+    def __init__(self, segment, mbean, mbean_name_list):
+        self.segment = segment
+        self.mbean = mbean
+        self.mbean_name_list = mbean_name_list
+        self.children = []
+        self.__children_by_segment = dict()
+        # injectors whose attribute is in this folder, as (injector, attribute, injector values)
+        self.injectors = []
+        # names of all injectors that pass through this folder
+        self.injector_names = []
+        # alias information for the folder, resolved on the first visit
+        self.resolved = False
+        self.name_token = None
+        self.multiple = False
+
+    def get_child(self, segment, mbean, mbean_name_list):
+        """
+        Get the child node for the segment, adding it if it does not exist.
+        :param segment: the injector path segment, including any special name filter
+        :param mbean: the mbean folder name
+        :param mbean_name_list: the special names for the folder, or an empty list
+        :return: the child node
+        """
+        if segment in self.__children_by_segment:
+            return self.__children_by_segment[segment]
+        child = _InjectorNode(segment, mbean, mbean_name_list)
+        self.children.append(child)
+        self.__children_by_segment[segment] = child
+        return child
+
+
 def get_default_variable_injector_file_name(variable_injector_file_name=VARIABLE_INJECTOR_FILE_NAME):
     """
     Return the default name and location of the model variable injector json file
@@ -664,6 +771,20 @@ def _get_keyword_files_location(**kwargs):
         return os.path.join(_wlsdeploy_location, DEFAULT_FILE_LOCATION, INJECTORS_LOCATION)
 
 
+def _get_injectors(injector_dictionaries):
+    """
+    Get the injectors of the injector dictionaries, in dictionary order.
+    :param injector_dictionaries: a list of (injector file name, injector dictionary) tuples
+    :return: a list of (injector file name, injector, injector values) tuples
+    """
+    injectors = []
+    for injector_file, injector_dictionary in injector_dictionaries:
+        if injector_dictionary:
+            for injector, injector_values in injector_dictionary.iteritems():
+                injectors.append((injector_file, injector, injector_values))
+    return injectors
+
+
 def _load_injector_file(injector_file_name):
     _method_name = '_load_injector_file'
     _logger.entering(injector_file_name, class_name=_class_name, method_name=_method_name)
@@ -720,11 +841,15 @@ def _replace_segment(regexp, variable_value, attribute_value):
 
 
 def _compile_pattern(pattern):
+    if pattern in _compiled_patterns:
+        return _compiled_patterns[pattern]
+    compiled = None
     try:
-        return re.compile(pattern)
+        compiled = re.compile(pattern)
     except Exception, e:
         _logger.warning('WLSDPLY-19511', pattern, e, class_name=_class_name, method_name='_compile_pattern')
-    return None
+    _compiled_patterns[pattern] = compiled
+    return compiled
 
 
 def _already_property(check_string):
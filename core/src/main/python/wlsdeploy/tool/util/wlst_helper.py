@@ -7,6 +7,14 @@ from oracle.weblogic.deploy.util import PyWLSTException
 from wlsdeploy.exception import exception_helper
 from wlsdeploy.util import wlst_helper
 
+# The existing object lists are kept at module level so that every WlstHelper instance sees
+# the creates and deletes made through the others.  The lists are only cached for the offline
+# domain and the online edit tree, and are discarded whenever the WLST tree changes.
+_existing_object_lists = dict()
+_existing_object_generation = 0
+_current_tree = None
+_CACHED_TREES = [None, 'edit']
+
 
 class WlstHelper(object):
     """
@@ -50,6 +58,10 @@ class WlstHelper(object):
         """
         _method_name = 'cd'
 
+        tree_separator = wlst_path.find(':/')
+        if tree_separator > 0 and wlst_path.find('/') > tree_separator:
+            _set_current_tree(wlst_path[:tree_separator])
+
         try:
             result = wlst_helper.cd(wlst_path)
         except PyWLSTException, pwe:
@@ -145,6 +157,8 @@ class WlstHelper(object):
                 ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19134', base_provider_type,
                                                        wlst_type, wlst_name, pwe.getLocalizedMessage(), error=pwe)
             raise ex
+
+        self.__add_existing_object(wlst_name, wlst_type, base_provider_type)
         return mbean
 
     def delete(self, wlst_name, wlst_type):
@@ -163,6 +177,13 @@ class WlstHelper(object):
                                                    pwe.getLocalizedMessage(), error=pwe)
             self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
             raise ex
+
+        parent_path = _get_cache_path(self.get_pwd())
+        if parent_path is None:
+            _clear_existing_object_lists()
+        else:
+            _remove_existing_object_lists(parent_path)
+            _next_existing_object_generation()
         return
 
     def create_and_cd(self, alias_helper, type_name, name, location, create_path=None):
@@ -182,6 +203,7 @@ class WlstHelper(object):
             if create_path is not None:
                 wlst_helper.cd(create_path)
             wlst_helper.create(name, type_name)
+            self.__add_existing_object(name, type_name, parent_path=create_path)
             result = wlst_helper.cd(alias_helper.get_wlst_attributes_path(location))
         except PyWLSTException, pwe:
             ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19104', type_name, name,
@@ -249,13 +271,21 @@ class WlstHelper(object):
 
     def get_existing_object_list(self, wlst_path=None):
         """
-        Get the existing directory list at the provided WLST path.
+        Get the existing directory list at the provided WLST path.  Lists for absolute paths in the
+        offline domain or the online edit tree are cached, and are kept current by create() and delete().
         :param wlst_path: the WLST path, by default it uses the current location
         :return: the list of folder names
         :raises: BundleAwareException of the specified type: if an error occurs
         """
         _method_name = 'get_existing_object_list'
 
+        list_path = _get_cache_path(wlst_path)
+        if list_path is not None and list_path in _existing_object_lists:
+            result = list(_existing_object_lists[list_path])
+            self.__logger.finest('WLSDPLY-19144', list_path, result,
+                                 class_name=self.__class_name, method_name=_method_name)
+            return result
+
         try:
             result = wlst_helper.get_existing_object_list(wlst_path)
         except PyWLSTException, pwe:
@@ -263,8 +293,19 @@ class WlstHelper(object):
                                                    pwe.getLocalizedMessage(), error=pwe)
             self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
             raise ex
+
+        if list_path is not None:
+            _existing_object_lists[list_path] = list(result)
         return result
 
+    def get_existing_object_generation(self):
+        """
+        Get the generation of the existing objects.  The generation changes whenever an MBean is deleted
+        or the WLST tree is changed, so MBeans found in an earlier generation may no longer exist.
+        :return: the existing object generation
+        """
+        return _existing_object_generation
+
     def set_option_if_needed(self, option_name, option_value):
         """
         Set the WLST domain option to the provided value if the name and value are not None.
@@ -294,6 +335,8 @@ class WlstHelper(object):
         """
         _method_name = 'set_server_groups'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.set_server_groups(server_name, server_groups_to_target)
         except PyWLSTException, pwe:
@@ -336,6 +379,8 @@ class WlstHelper(object):
         """
         _method_name = 'read_domain'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.read_domain(domain_home)
         except PyWLSTException, pwe:
@@ -385,6 +430,8 @@ class WlstHelper(object):
         """
         _method_name = 'close_domain'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.close_domain()
         except PyWLSTException, pwe:
@@ -402,6 +449,8 @@ class WlstHelper(object):
         """
         _method_name = 'read_template'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.read_template(template_name)
         except PyWLSTException, pwe:
@@ -419,6 +468,8 @@ class WlstHelper(object):
         """
         _method_name = 'select_template'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.select_template(template_name)
         except PyWLSTException, pwe:
@@ -436,6 +487,8 @@ class WlstHelper(object):
         """
         _method_name = 'add_template'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.add_template(template_name)
         except PyWLSTException, pwe:
@@ -452,6 +505,8 @@ class WlstHelper(object):
         """
         _method_name = 'load_templates'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.load_templates()
         except PyWLSTException, pwe:
@@ -468,6 +523,8 @@ class WlstHelper(object):
         """
         _method_name = 'close_template'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.close_template()
         except PyWLSTException, pwe:
@@ -484,6 +541,8 @@ class WlstHelper(object):
         """
         _method_name = 'connect'
 
+        _set_current_tree('serverConfig')
+
         try:
             wlst_helper.connect(admin_user, admin_pwd, admin_url)
         except PyWLSTException, pwe:
@@ -500,6 +559,8 @@ class WlstHelper(object):
         """
         _method_name = 'edit'
 
+        _set_current_tree('edit')
+
         try:
             wlst_helper.edit()
         except PyWLSTException, pwe:
@@ -516,6 +577,8 @@ class WlstHelper(object):
         """
         _method_name = 'start_edit'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.start_edit()
         except PyWLSTException, pwe:
@@ -532,6 +595,8 @@ class WlstHelper(object):
         """
         _method_name = 'stop_edit'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.stop_edit()
         except PyWLSTException, pwe:
@@ -548,6 +613,8 @@ class WlstHelper(object):
         """
         _method_name = 'undo'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.undo()
         except PyWLSTException, pwe:
@@ -580,6 +647,8 @@ class WlstHelper(object):
         """
         _method_name = 'activate'
 
+        _clear_existing_object_lists()
+
         try:
             wlst_helper.activate()
         except PyWLSTException, pwe:
@@ -596,6 +665,8 @@ class WlstHelper(object):
         """
         _method_name = 'disconnect'
 
+        _set_current_tree(None)
+
         try:
             wlst_helper.disconnect()
         except PyWLSTException, pwe:
@@ -779,6 +850,8 @@ class WlstHelper(object):
         """
         _method_name = 'deploy_application'
 
+        _clear_existing_object_lists()
+
         try:
             result = wlst_helper.deploy_application(application_name, *args, **kwargs)
         except PyWLSTException, pwe:
@@ -799,8 +872,10 @@ class WlstHelper(object):
         """
         _method_name = 'redeploy_application'
 
+        _clear_existing_object_lists()
+
         try:
-            result = wlst_helper.redeploy_application(application_name, args, kwargs)
+            result = wlst_helper.redeploy_application(application_name, *args, **kwargs)
         except PyWLSTException, pwe:
             ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19138', application_name,
                                                    pwe.getLocalizedMessage(), error=pwe)
@@ -819,8 +894,10 @@ class WlstHelper(object):
         """
         _method_name = 'undeploy_application'
 
+        _clear_existing_object_lists()
+
         try:
-            result = wlst_helper.redeploy_application(application_name, args, kwargs)
+            result = wlst_helper.undeploy_application(application_name, *args, **kwargs)
         except PyWLSTException, pwe:
             ex = exception_helper.create_exception(self.__exception_type, 'WLSDPLY-19141', application_name,
                                                    pwe.getLocalizedMessage(), error=pwe)
@@ -828,6 +905,33 @@ class WlstHelper(object):
             raise ex
         return result
 
+    def __add_existing_object(self, wlst_name, wlst_type, base_provider_type=None, parent_path=None):
+        """
+        Record a newly created MBean in the cached existing object lists.
+        :param wlst_name: the MBean name
+        :param wlst_type: the MBean type
+        :param base_provider_type: the base security provider type, if one was used to create the MBean
+        :param parent_path: the WLST path where the MBean was created, by default it uses the current location
+        :raises: BundleAwareException of the specified type: if an error occurs
+        """
+        if len(_existing_object_lists) == 0:
+            return
+
+        if parent_path is None:
+            parent_path = self.get_pwd()
+        parent_path = _get_cache_path(parent_path)
+        if parent_path is None:
+            _clear_existing_object_lists()
+        elif base_provider_type is not None:
+            # security providers are listed by base type, not by the type used to create them
+            _remove_existing_object_lists(parent_path)
+        else:
+            type_path = _join_path(parent_path, wlst_type)
+            _remove_existing_object_lists(_join_path(type_path, wlst_name))
+            _add_existing_name(parent_path, wlst_type)
+            _add_existing_name(type_path, wlst_name)
+        return
+
     def server_config(self):
         """
         Change to the serverConfig MBean tree.
@@ -835,6 +939,8 @@ class WlstHelper(object):
         """
         _method_name = 'server_config'
 
+        _set_current_tree('serverConfig')
+
         try:
             wlst_helper.server_config()
         except PyWLSTException, pwe:
@@ -851,6 +957,8 @@ class WlstHelper(object):
         """
         _method_name = 'domain_runtime'
 
+        _set_current_tree('domainRuntime')
+
         try:
             wlst_helper.domain_runtime()
         except PyWLSTException, pwe:
@@ -867,6 +975,8 @@ class WlstHelper(object):
         """
         _method_name = 'domain_runtime'
 
+        _set_current_tree('custom')
+
         try:
             wlst_helper.custom()
         except PyWLSTException, pwe:
@@ -875,3 +985,87 @@ class WlstHelper(object):
             self.__logger.throwing(ex, class_name=self.__class_name, method_name=_method_name)
             raise ex
         return
+
+
+def _set_current_tree(tree_name):
+    """
+    Discard the cached existing object lists if the WLST tree is changing.
+    :param tree_name: the name of the WLST tree, or None for the offline domain
+    """
+    global _current_tree
+
+    if tree_name != _current_tree:
+        _clear_existing_object_lists()
+        _current_tree = tree_name
+    return
+
+
+def _clear_existing_object_lists():
+    """
+    Discard all of the cached existing object lists.
+    """
+    _existing_object_lists.clear()
+    _next_existing_object_generation()
+    return
+
+
+def _next_existing_object_generation():
+    """
+    Start a new generation of existing objects.
+    """
+    global _existing_object_generation
+
+    _existing_object_generation += 1
+    return
+
+
+def _get_cache_path(wlst_path):
+    """
+    Get the key used to cache the existing object list for the specified WLST path.
+    :param wlst_path: the WLST path
+    :return: the normalized path, or None if the list for the path should not be cached
+    """
+    if wlst_path is None or not wlst_path.startswith('/') or _current_tree not in _CACHED_TREES:
+        return None
+
+    cache_path = wlst_path.rstrip('/')
+    if len(cache_path) == 0:
+        cache_path = '/'
+    return cache_path
+
+
+def _join_path(parent_path, child_name):
+    """
+    Append a folder name to a normalized WLST path.
+    :param parent_path: the normalized WLST path
+    :param child_name: the folder name
+    :return: the child path
+    """
+    if parent_path == '/':
+        return parent_path + child_name
+    return parent_path + '/' + child_name
+
+
+def _add_existing_name(list_path, name):
+    """
+    Add the name to the cached existing object list for the path, if the list is cached.
+    :param list_path: the normalized WLST path
+    :param name: the name to add
+    """
+    if list_path in _existing_object_lists:
+        names = _existing_object_lists[list_path]
+        if name not in names:
+            names.append(name)
+    return
+
+
+def _remove_existing_object_lists(wlst_path):
+    """
+    Discard the cached existing object lists for the path and everything below it.
+    :param wlst_path: the normalized WLST path
+    """
+    child_prefix = _join_path(wlst_path, '')
+    for list_path in _existing_object_lists.keys():
+        if list_path == wlst_path or list_path.startswith(child_prefix):
+            del _existing_object_lists[list_path]
+    return
@@ -3,7 +3,6 @@ Copyright (c) 2017, 2019, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
 import os
-import copy
 
 from oracle.weblogic.deploy.util import WLSDeployArchive
 from oracle.weblogic.deploy.util import VariableException
@@ -109,20 +108,15 @@ class Validator(object):
         """
         _method_name = 'validate_in_standalone_mode'
 
-        # We need to make a deep copy of model_dict here, to ensure it's
-        # treated as a "read-only'" reference variable, during the variable
-        # file validation process. The variable file validation process could
-        # actually require changes to be made to the cloned model dictionary
-        cloned_model_dict = copy.deepcopy(model_dict)
-
         self._logger.entering(variables_file_name, archive_file_name, class_name=_class_name, method_name=_method_name)
         self._validation_mode = _ValidationModes.STANDALONE
-        self.__validate_model_file(cloned_model_dict, variables_file_name, archive_file_name)
+        self.__validate_model_file(model_dict, variables_file_name, archive_file_name)
 
         self._logger.exiting(class_name=_class_name, method_name=_method_name)
         return self._validation_results
 
-    def validate_in_tool_mode(self, model_dict, variables_file_name=None, archive_file_name=None):
+    def validate_in_tool_mode(self, model_dict, variables_file_name=None, archive_file_name=None,
+                              changed_paths=None):
         """
         Performs model file validate and returns a code that allows a tool (e.g. discover,
         deploy, create, etc.) to determine if it should proceed, or not. Validation results are
@@ -138,22 +132,18 @@ class Validator(object):
         Defaults to None.
         :param archive_file_name: Path to file containing binaries associated with the model file.
         Defaults to None.
+        :param changed_paths: optional dictionary to be populated with the model paths changed by substitution.
+        Defaults to None.
         :return: A Validator.ReturnCode value
         :raises ValidationException: if an unhandleable AliasException is raised during an invocation of an
         aliases API call.
         """
         _method_name = 'validate_in_tool_mode'
 
-        # We need to make a deep copy of model_dict here, to ensure it's
-        # treated as a "read-only'" reference variable, during the variable
-        # file validation process. The variable file validation process could
-        # actually require changes to be made to the cloned model dictionary
-        cloned_model_dict = copy.deepcopy(model_dict)
-
         self._logger.entering(variables_file_name, archive_file_name, class_name=_class_name, method_name=_method_name)
         return_code = Validator.ReturnCode.STOP
         self._validation_mode = _ValidationModes.TOOL
-        self.__validate_model_file(cloned_model_dict, variables_file_name, archive_file_name)
+        self.__validate_model_file(model_dict, variables_file_name, archive_file_name, changed_paths)
 
         status = Validator.ValidationStatus.VALID
 
@@ -210,7 +200,7 @@ class Validator(object):
     #
     ####################################################################################
 
-    def __validate_model_file(self, model_dict, variables_file_name, archive_file_name):
+    def __validate_model_file(self, model_dict, variables_file_name, archive_file_name, changed_paths=None):
         _method_name = '__validate_model_file'
 
         self.__pre_validation_setup(model_dict, archive_file_name)
@@ -227,7 +217,10 @@ class Validator(object):
                 self._logger.info('WLSDPLY-05004', variables_file_name, class_name=_class_name, method_name=_method_name)
                 self._variable_properties = variables.load_variables(variables_file_name)
 
-            variables.substitute(model_dict, self._variable_properties, self._model_context)
+            # model_dict is treated as a read-only reference during validation, so variables are
+            # substituted into a copy. Only the nodes changed by substitution are copied.
+            model_dict = variables.substitute_copy(model_dict, self._variable_properties, self._model_context,
+                                                   changed_paths)
         except VariableException, ve:
             ex = exception_helper.create_validate_exception('WLSDPLY-20004', 'validateModel',
                                                             ve.getLocalizedMessage(), error=ve)
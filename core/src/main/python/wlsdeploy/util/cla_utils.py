@@ -42,6 +42,7 @@ class CommandLineArgUtil(object):
     ARCHIVE_FILE_SWITCH        = '-archive_file'
     MODEL_FILE_SWITCH          = '-model_file'
     PREVIOUS_MODEL_FILE_SWITCH = '-prev_model_file'
+    PREVIOUS_ARCHIVE_FILE_SWITCH = '-prev_archive_file'
     VARIABLE_FILE_SWITCH       = '-variable_file'
     PRINT_USAGE_SWITCH         = '-print_usage'
     RCU_DB_SWITCH              = '-rcu_db'
@@ -57,6 +58,17 @@ class CommandLineArgUtil(object):
     ONE_PASS_SWITCH            = '-password'
     USE_ENCRYPTION_SWITCH      = '-use_encryption'
     RUN_RCU_SWITCH             = '-run_rcu'
+    SKIP_UNCHANGED_ATTRIBUTES_SWITCH = '-skip_unchanged_attributes'
+    MAX_PARALLEL_DEPLOYMENTS_SWITCH = '-max_parallel_deployments'
+    ACTIVATION_CHUNK_SIZE_SWITCH = '-activation_chunk_size'
+    USE_CHECKPOINT_JOURNAL_SWITCH = '-use_checkpoint_journal'
+    DEPLOYMENT_STATE_DIR_SWITCH = '-deployment_state_dir'
+    FILE_VARIABLE_CACHE_SIZE_SWITCH = '-file_variable_cache_size'
+    CHECK_FILE_VARIABLE_TIMES_SWITCH = '-check_file_variable_times'
+    COMPRESS_ARCHIVE_AHEAD_SWITCH = '-compress_archive_ahead'
+    DEDUPLICATE_BINARIES_SWITCH = '-deduplicate_binaries'
+    # the activation chunk size value that activates after each top-level model section
+    ACTIVATION_CHUNK_SECTION   = 'section'
     TARGET_VERSION_SWITCH      = '-target_version'
     TARGET_MODE_SWITCH         = '-target_mode'
     ATTRIBUTES_ONLY_SWITCH     = '-attributes_only'
@@ -239,6 +251,15 @@ class CommandLineArgUtil(object):
                     ex = self._get_out_of_args_exception(key)
                     self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
                     raise ex
+            elif self.is_previous_archive_file_key(key):
+                idx += 1
+                if idx < args_len:
+                    full_path = self._validate_previous_archive_file_arg(args[idx])
+                    self._add_arg(key, full_path, True)
+                else:
+                    ex = self._get_out_of_args_exception(key)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+                    raise ex
             elif self.is_print_usage_key(key):
                 idx += 1
                 if idx < args_len:
@@ -317,6 +338,52 @@ class CommandLineArgUtil(object):
                 self._add_arg(key, True)
             elif self.is_run_rcu_switch(key):
                 self._add_arg(key, True)
+            elif self.is_skip_unchanged_attributes_switch(key):
+                self._add_arg(key, True)
+            elif self.is_use_checkpoint_journal_switch(key):
+                self._add_arg(key, True)
+            elif self.is_check_file_variable_times_switch(key):
+                self._add_arg(key, True)
+            elif self.is_compress_archive_ahead_switch(key):
+                self._add_arg(key, True)
+            elif self.is_deduplicate_binaries_switch(key):
+                self._add_arg(key, True)
+            elif self.is_file_variable_cache_size_switch(key):
+                idx += 1
+                if idx < args_len:
+                    cache_size = self._validate_file_variable_cache_size_arg(args[idx])
+                    self._add_arg(key, cache_size)
+                else:
+                    ex = self._get_out_of_args_exception(key)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+                    raise ex
+            elif self.is_max_parallel_deployments_switch(key):
+                idx += 1
+                if idx < args_len:
+                    max_parallel = self._validate_max_parallel_deployments_arg(args[idx])
+                    self._add_arg(key, max_parallel)
+                else:
+                    ex = self._get_out_of_args_exception(key)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+                    raise ex
+            elif self.is_deployment_state_dir_switch(key):
+                idx += 1
+                if idx < args_len:
+                    full_path = self._validate_deployment_state_dir_arg(args[idx])
+                    self._add_arg(key, full_path, True)
+                else:
+                    ex = self._get_out_of_args_exception(key)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+                    raise ex
+            elif self.is_activation_chunk_size_switch(key):
+                idx += 1
+                if idx < args_len:
+                    chunk_size = self._validate_activation_chunk_size_arg(args[idx])
+                    self._add_arg(key, chunk_size)
+                else:
+                    ex = self._get_out_of_args_exception(key)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+                    raise ex
             elif self.is_target_version_switch(key):
                 idx += 1
                 if idx < args_len:
@@ -681,6 +748,24 @@ class CommandLineArgUtil(object):
             raise ex
         return model.getAbsolutePath()
 
+    def get_previous_archive_file_key(self):
+        return self.PREVIOUS_ARCHIVE_FILE_SWITCH
+
+    def is_previous_archive_file_key(self, key):
+        return self.PREVIOUS_ARCHIVE_FILE_SWITCH == key
+
+    def _validate_previous_archive_file_arg(self, value):
+        method_name = '_validate_previous_archive_file_arg'
+
+        try:
+            archive = JFileUtils.validateExistingFile(value)
+        except JIllegalArgumentException, iae:
+            ex = exception_helper.create_cla_exception('WLSDPLY-01637', value, iae.getLocalizedMessage(), error=iae)
+            ex.setExitCode(self.ARG_VALIDATION_ERROR_EXIT_CODE)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+            raise ex
+        return archive.getAbsolutePath()
+
     def get_print_usage_key(self):
         return self.PRINT_USAGE_SWITCH
 
@@ -842,6 +927,121 @@ class CommandLineArgUtil(object):
     def is_run_rcu_switch(self, key):
         return self.RUN_RCU_SWITCH == key
 
+    def get_skip_unchanged_attributes_switch(self):
+        return self.SKIP_UNCHANGED_ATTRIBUTES_SWITCH
+
+    def is_skip_unchanged_attributes_switch(self, key):
+        return self.SKIP_UNCHANGED_ATTRIBUTES_SWITCH == key
+
+    def get_use_checkpoint_journal_switch(self):
+        return self.USE_CHECKPOINT_JOURNAL_SWITCH
+
+    def is_use_checkpoint_journal_switch(self, key):
+        return self.USE_CHECKPOINT_JOURNAL_SWITCH == key
+
+    def get_max_parallel_deployments_switch(self):
+        return self.MAX_PARALLEL_DEPLOYMENTS_SWITCH
+
+    def is_max_parallel_deployments_switch(self, key):
+        return self.MAX_PARALLEL_DEPLOYMENTS_SWITCH == key
+
+    def _validate_max_parallel_deployments_arg(self, value):
+        method_name = '_validate_max_parallel_deployments_arg'
+
+        try:
+            max_parallel = int(value)
+        except ValueError:
+            max_parallel = 0
+
+        if max_parallel < 1:
+            ex = exception_helper.create_cla_exception('WLSDPLY-01638', self.MAX_PARALLEL_DEPLOYMENTS_SWITCH, value)
+            ex.setExitCode(self.ARG_VALIDATION_ERROR_EXIT_CODE)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+            raise ex
+        return max_parallel
+
+    def get_file_variable_cache_size_switch(self):
+        return self.FILE_VARIABLE_CACHE_SIZE_SWITCH
+
+    def is_file_variable_cache_size_switch(self, key):
+        return self.FILE_VARIABLE_CACHE_SIZE_SWITCH == key
+
+    def _validate_file_variable_cache_size_arg(self, value):
+        method_name = '_validate_file_variable_cache_size_arg'
+
+        try:
+            cache_size = int(value)
+        except ValueError:
+            cache_size = -1
+
+        if cache_size < 0:
+            ex = exception_helper.create_cla_exception('WLSDPLY-01641', self.FILE_VARIABLE_CACHE_SIZE_SWITCH, value)
+            ex.setExitCode(self.ARG_VALIDATION_ERROR_EXIT_CODE)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+            raise ex
+        return cache_size
+
+    def get_check_file_variable_times_switch(self):
+        return self.CHECK_FILE_VARIABLE_TIMES_SWITCH
+
+    def is_check_file_variable_times_switch(self, key):
+        return self.CHECK_FILE_VARIABLE_TIMES_SWITCH == key
+
+    def get_compress_archive_ahead_switch(self):
+        return self.COMPRESS_ARCHIVE_AHEAD_SWITCH
+
+    def is_compress_archive_ahead_switch(self, key):
+        return self.COMPRESS_ARCHIVE_AHEAD_SWITCH == key
+
+    def get_deduplicate_binaries_switch(self):
+        return self.DEDUPLICATE_BINARIES_SWITCH
+
+    def is_deduplicate_binaries_switch(self, key):
+        return self.DEDUPLICATE_BINARIES_SWITCH == key
+
+    def get_deployment_state_dir_switch(self):
+        return self.DEPLOYMENT_STATE_DIR_SWITCH
+
+    def is_deployment_state_dir_switch(self, key):
+        return self.DEPLOYMENT_STATE_DIR_SWITCH == key
+
+    def _validate_deployment_state_dir_arg(self, value):
+        method_name = '_validate_deployment_state_dir_arg'
+
+        try:
+            state_dir = JFileUtils.validateWritableDirectory(value)
+        except JIllegalArgumentException, iae:
+            ex = exception_helper.create_cla_exception('WLSDPLY-01640', value, iae.getLocalizedMessage(), error=iae)
+            ex.setExitCode(self.ARG_VALIDATION_ERROR_EXIT_CODE)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+            raise ex
+        return state_dir.getAbsolutePath()
+
+    def get_activation_chunk_size_switch(self):
+        return self.ACTIVATION_CHUNK_SIZE_SWITCH
+
+    def is_activation_chunk_size_switch(self, key):
+        return self.ACTIVATION_CHUNK_SIZE_SWITCH == key
+
+    def _validate_activation_chunk_size_arg(self, value):
+        method_name = '_validate_activation_chunk_size_arg'
+
+        if value == self.ACTIVATION_CHUNK_SECTION:
+            return value
+
+        try:
+            chunk_size = int(value)
+        except ValueError:
+            chunk_size = 0
+
+        if chunk_size < 1:
+            ex = exception_helper.create_cla_exception('WLSDPLY-01639', self.ACTIVATION_CHUNK_SIZE_SWITCH, value,
+                                                       self.ACTIVATION_CHUNK_SECTION)
+            ex.setExitCode(self.ARG_VALIDATION_ERROR_EXIT_CODE)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=method_name)
+            raise ex
+        return chunk_size
+
     def get_target_version_switch(self):
         return self.TARGET_VERSION_SWITCH
 
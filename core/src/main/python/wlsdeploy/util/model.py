@@ -10,6 +10,7 @@ import pprint
 import oracle.weblogic.deploy.util.PyOrderedDict as OrderedDict
 
 from wlsdeploy.logging.platform_logger import PlatformLogger
+from wlsdeploy.util import variables
 from wlsdeploy.util.weblogic_helper import WebLogicHelper
 
 
@@ -19,9 +20,25 @@ class Model(object):
     """
     _class_name = 'Model'
 
-    def __init__(self, model_dictionary=None, wls_version=None):
+    def __init__(self, model_dictionary=None, wls_version=None, variable_map=None, model_context=None,
+                 changed_paths=None):
+        """
+        Create the model wrapper.
+        If a variable map is specified, variable tokens in each section are resolved when the section
+        is first accessed, and VariableException is raised at that time if a variable is not found.
+        :param model_dictionary: the model dictionary
+        :param wls_version: the WebLogic version
+        :param variable_map: optional variables for lazy substitution, or None if the model is already substituted
+        :param model_context: used to resolve variables in file paths, required with variable_map
+        :param changed_paths: optional model paths recorded by an earlier substitution of the model,
+            such as the validation copy. If specified, only these paths are resolved.
+        """
         self._logger = PlatformLogger('wlsdeploy.model')
         self._wls_helper = WebLogicHelper(wls_version)
+        self._variable_map = variable_map
+        self._model_context = model_context
+        self._changed_paths = changed_paths
+        self._resolved_sections = {}
         self._topology = OrderedDict()
         self._resources = OrderedDict()
         self._deployments = OrderedDict()
@@ -45,35 +62,41 @@ class Model(object):
         """
         Get the resources section of the model.
         :return: the resources dictionary
+        :raises VariableException: if lazy substitution is enabled and a variable is not found
         """
-        return self._resources
+        return self._resolve_section('resources', self._resources)
 
     def get_model_app_deployments(self):
         """
         Get the appDeployments section of the model.
         :return: the appDeployments dictionary
+        :raises VariableException: if lazy substitution is enabled and a variable is not found
         """
-        return self._deployments
+        return self._resolve_section('appDeployments', self._deployments)
 
     def get_model_topology(self):
         """
         Get the topology section of the model.
         :return: the topology dictionary
+        :raises VariableException: if lazy substitution is enabled and a variable is not found
         """
-        return self._topology
+        return self._resolve_section('topology', self._topology)
 
     def get_model_domain_info(self):
         """
         Get the domainInfo section of the model.
         :return: the domainInfo dictionary
+        :raises VariableException: if lazy substitution is enabled and a variable is not found
         """
-        return self._domain_info
+        return self._resolve_section('domainInfo', self._domain_info)
 
     def get_model(self):
         """
         Get the model.
         :return: the model dictionary
+        :raises VariableException: if lazy substitution is enabled and a variable is not found
         """
+        self.resolve_variables()
         model = OrderedDict()
         if len(self._domain_info):
             model['domainInfo'] = self._domain_info
@@ -85,6 +108,31 @@ class Model(object):
             model['appDeployments'] = self._deployments
         return model
 
+    def resolve_variables(self):
+        """
+        Resolve variable tokens in all the sections that have not been accessed yet.
+        :raises VariableException: if lazy substitution is enabled and a variable is not found
+        """
+        self._resolve_section('domainInfo', self._domain_info)
+        self._resolve_section('topology', self._topology)
+        self._resolve_section('resources', self._resources)
+        self._resolve_section('appDeployments', self._deployments)
+
+    def _resolve_section(self, section_key, section):
+        """
+        Resolve variable tokens in the section the first time it is accessed, if lazy substitution is enabled.
+        :param section_key: the section key, such as 'topology'
+        :param section: the section dictionary
+        :return: the section dictionary
+        :raises VariableException: if a variable is not found
+        """
+        if self._variable_map is not None and section_key not in self._resolved_sections:
+            # the section is wrapped with its key, so the model paths match the recorded paths
+            variables.substitute({section_key: section}, self._variable_map, self._model_context,
+                                 limit_paths=self._changed_paths)
+            self._resolved_sections[section_key] = True
+        return section
+
     def log_model(self, level, message, method_name, class_name='Model'):
         """
         Log the model.
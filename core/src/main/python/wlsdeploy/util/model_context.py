@@ -47,6 +47,13 @@ class ModelContext(object):
         self._print_usage = None
         self._variable_file_name = None
         self._run_rcu = False
+        self._skip_unchanged_attributes = False
+        self._max_parallel_deployments = 1
+        self._activation_chunk_size = None
+        self._use_checkpoint_journal = False
+        self._deployment_state_dir = None
+        self._file_variable_cache_size = None
+        self._check_file_variable_times = False
         self._rcu_database = None
         self._rcu_prefix = None
         self._rcu_sys_pass = None
@@ -114,6 +121,27 @@ class ModelContext(object):
         if CommandLineArgUtil.RUN_RCU_SWITCH in arg_map:
             self._run_rcu = arg_map[CommandLineArgUtil.RUN_RCU_SWITCH]
 
+        if CommandLineArgUtil.SKIP_UNCHANGED_ATTRIBUTES_SWITCH in arg_map:
+            self._skip_unchanged_attributes = arg_map[CommandLineArgUtil.SKIP_UNCHANGED_ATTRIBUTES_SWITCH]
+
+        if CommandLineArgUtil.MAX_PARALLEL_DEPLOYMENTS_SWITCH in arg_map:
+            self._max_parallel_deployments = arg_map[CommandLineArgUtil.MAX_PARALLEL_DEPLOYMENTS_SWITCH]
+
+        if CommandLineArgUtil.ACTIVATION_CHUNK_SIZE_SWITCH in arg_map:
+            self._activation_chunk_size = arg_map[CommandLineArgUtil.ACTIVATION_CHUNK_SIZE_SWITCH]
+
+        if CommandLineArgUtil.USE_CHECKPOINT_JOURNAL_SWITCH in arg_map:
+            self._use_checkpoint_journal = arg_map[CommandLineArgUtil.USE_CHECKPOINT_JOURNAL_SWITCH]
+
+        if CommandLineArgUtil.DEPLOYMENT_STATE_DIR_SWITCH in arg_map:
+            self._deployment_state_dir = arg_map[CommandLineArgUtil.DEPLOYMENT_STATE_DIR_SWITCH]
+
+        if CommandLineArgUtil.FILE_VARIABLE_CACHE_SIZE_SWITCH in arg_map:
+            self._file_variable_cache_size = arg_map[CommandLineArgUtil.FILE_VARIABLE_CACHE_SIZE_SWITCH]
+
+        if CommandLineArgUtil.CHECK_FILE_VARIABLE_TIMES_SWITCH in arg_map:
+            self._check_file_variable_times = arg_map[CommandLineArgUtil.CHECK_FILE_VARIABLE_TIMES_SWITCH]
+
         if CommandLineArgUtil.RCU_DB_SWITCH in arg_map:
             self._rcu_database = arg_map[CommandLineArgUtil.RCU_DB_SWITCH]
 
@@ -330,6 +358,56 @@ class ModelContext(object):
         """
         return self._run_rcu
 
+    def is_skip_unchanged_attributes(self):
+        """
+        Get whether or not to skip setting attributes whose existing values already match the model.
+        :return: whether or not to skip setting unchanged attributes
+        """
+        return self._skip_unchanged_attributes
+
+    def get_max_parallel_deployments(self):
+        """
+        Get the maximum number of online application and library operations to run at once.
+        :return: the maximum number of parallel deployments
+        """
+        return self._max_parallel_deployments
+
+    def get_activation_chunk_size(self):
+        """
+        Get the size of the chunks in which online configuration changes are saved and activated.
+        :return: 'section', the number of top-level model elements in a chunk, or None to activate all changes at once
+        """
+        return self._activation_chunk_size
+
+    def is_use_checkpoint_journal(self):
+        """
+        Get whether or not to record completed online work in a checkpoint journal, and skip the work
+        recorded by an earlier run with the same model and archive.
+        :return: whether or not to use a checkpoint journal
+        """
+        return self._use_checkpoint_journal
+
+    def get_deployment_state_dir(self):
+        """
+        Get the directory that holds the fingerprints of the deployed applications and libraries.
+        :return: the deployment state directory, or None to use the domain home
+        """
+        return self._deployment_state_dir
+
+    def get_file_variable_cache_size(self):
+        """
+        Get the maximum number of @@FILE:path@@ values to keep after they are read.
+        :return: the cache size, zero to disable the cache, or None to use the default size
+        """
+        return self._file_variable_cache_size
+
+    def is_check_file_variable_times(self):
+        """
+        Get whether or not a cached @@FILE:path@@ value is read again when the modification time of its file changes.
+        :return: whether or not to check the modification times of the cached files
+        """
+        return self._check_file_variable_times
+
     def get_rcu_database(self):
         """
         Get the RCU database connect string.
@@ -12,9 +12,13 @@ from java.io import FileInputStream
 from java.io import FileOutputStream
 from java.io import FileReader
 from java.io import IOException
+from java.util import ArrayList
 from java.util import Properties
+from java.util.concurrent import Callable
+from java.util.concurrent import Executors
 
 from oracle.weblogic.deploy.util import PyOrderedDict as OrderedDict
+from oracle.weblogic.deploy.util import VariableException
 
 from wlsdeploy.util import path_utils
 from wlsdeploy.exception import exception_helper
@@ -23,9 +27,22 @@ from wlsdeploy.logging import platform_logger
 _class_name = "variables"
 _logger = platform_logger.PlatformLogger('wlsdeploy.variables')
 _variable_pattern = re.compile("\\$\\{[\w.-]+\\}")
-_file_variable_pattern = re.compile("@@FILE:[\w.\\\/:-]+@@")
-_property_pattern = re.compile("@@PROP:[\w.-]+@@")
-_file_nested_variable_pattern = re.compile("@@FILE:@@[\w]+@@[\w.\\\/:-]+@@")
+
+# values read for @@FILE:path@@ tokens during this run, keyed by canonical path
+_file_cache = {}
+_file_cache_order = []
+_file_cache_max_entries = 1000
+_file_cache_check_modified = False
+_FILE_PRELOAD_THREADS = 8
+
+# a single pattern for all substitution tokens, so each text is scanned once.
+# @@FILE:path@@ tokens may start with a constant such as @@ORACLE_HOME@@,
+# and the path may contain @@PROP:key@@ and ${key} tokens.
+# @@PROP:key@@ tokens may contain ${key} tokens, such as @@PROP:${env}.port@@.
+_token_pattern = re.compile("\\$\\{(?P<variable>[\w.-]+)\\}"
+                            "|@@FILE:(?P<constant>@@[\w]+@@)?"
+                            "(?P<file>(?:@@PROP:(?:\\$\\{[\w.-]+\\}|[\w.-])+@@|\\$\\{[\w.-]+\\}|[\w.\\\/:-])+)@@"
+                            "|@@PROP:(?P<property>(?:\\$\\{[\w.-]+\\}|[\w.-])+)@@")
 
 
 def load_variables(file_path):
@@ -127,105 +144,497 @@ def get_variable_names(text):
     return names
 
 
-def substitute(dictionary, variables, model_context):
+def substitute(dictionary, variables, model_context, changed_paths=None, limit_paths=None):
     """
     Substitute fields in the specified dictionary with variable values.
     :param dictionary: the dictionary in which to substitute variables
     :param variables: a dictionary of variables for substitution
-    :param model_context: used to resolve variables in file paths
+    :param model_context: used to resolve variables in file paths, and to configure the file value cache
+    :param changed_paths: optional dictionary to be populated with the model paths of changed keys and values,
+        and all their parent paths, such as 'topology:/Server/s1/ListenPort', 'topology:/Server/s1', 'topology:'
+    :param limit_paths: optional dictionary of model paths from an earlier substitution of the same dictionary
+        with the same variables, the keys and values at other paths are untouched by substitution, and are skipped
     """
-    _process_node(dictionary, variables, model_context)
+    configure_file_cache(model_context.get_file_variable_cache_size(), model_context.is_check_file_variable_times())
+    # with limit_paths, the file values were preloaded by the substitution that recorded the paths
+    if limit_paths is None:
+        preload_file_values(dictionary, variables, model_context)
+    elif len(limit_paths) == 0:
+        return
+
+    _process_node(dictionary, variables, model_context, changed_paths, limit_paths)
 
 
-def _process_node(nodes, variables, model_context):
+def substitute_copy(dictionary, variables, model_context, changed_paths=None):
     """
-    Process variables in the node.
-    :param nodes: the dictionary to process
+    Get a copy of the specified dictionary with variable values substituted, without changing the dictionary.
+    The changed paths are recorded first, then only the nodes on those paths are copied and substituted.
+    The untouched subtrees are shared with the dictionary, so the copy must not be modified.
+    :param dictionary: the dictionary to substitute
+    :param variables: a dictionary of variables for substitution
+    :param model_context: used to resolve variables in file paths, and to configure the file value cache
+    :param changed_paths: optional dictionary to be populated with the model paths of changed keys and values
+    :return: the substituted copy
+    """
+    configure_file_cache(model_context.get_file_variable_cache_size(), model_context.is_check_file_variable_times())
+    if changed_paths is None:
+        changed_paths = {}
+
+    preload_file_values(dictionary, variables, model_context)
+    _process_node(dictionary, variables, model_context, changed_paths, None, record_only=True)
+    dictionary_copy = _copy_changed_nodes(dictionary, changed_paths, None)
+    _process_node(dictionary_copy, variables, model_context, None, changed_paths)
+    return dictionary_copy
+
+
+def is_path_changed(changed_paths, model_path):
+    """
+    Determine if substitution changed any key or value at or below the model path.
+    :param changed_paths: the dictionary populated by substitute() or substitute_copy()
+    :param model_path: the model path, such as 'topology:/Server/s1', using the keys before substitution
+    :return: True if the model path or any of its children were changed, False otherwise
+    """
+    return model_path in changed_paths
+
+
+def _process_node(dictionary, variables, model_context, changed_paths, limit_paths, record_only=False):
+    """
+    Process variables in the dictionary and all of its child dictionaries.
+    Nodes are processed from an explicit stack, and are not copied. Key renames are collected
+    while iterating over each node, and applied after the iteration completes.
+    Model paths use the keys before substitution, so they can be used to find the nodes again.
+    :param dictionary: the dictionary to process
     :param variables: the variables to use
     :param model_context: used to resolve variables in file paths
+    :param changed_paths: optional dictionary of changed model paths to populate, or None
+    :param limit_paths: optional dictionary of the only model paths to process, or None to process all paths
+    :param record_only: if True, the changed paths are recorded without changing the dictionary
+    """
+    track_paths = changed_paths is not None or limit_paths is not None
+    stack = [(dictionary, [])]
+    while stack:
+        nodes, node_paths = stack.pop()
+        node_path = None
+        if node_paths:
+            node_path = node_paths[-1]
+
+        renames = []
+        for key in nodes:
+            key_path = None
+            if track_paths:
+                key_path = _get_child_path(node_path, key)
+                if limit_paths is not None and key_path not in limit_paths:
+                    continue
+
+            value = nodes[key]
+
+            # if the key changes with substitution, remove old key and map value to new key after iterating
+            new_key = _substitute(key, variables, model_context, not record_only)
+            if new_key is not key:
+                renames.append((key, new_key))
+                _add_changed_path(changed_paths, node_paths, key_path)
+
+            if isinstance(value, dict):
+                child_paths = node_paths
+                if track_paths:
+                    child_paths = node_paths + [key_path]
+                stack.append((value, child_paths))
+            elif type(value) is str:
+                new_value = _substitute(value, variables, model_context, not record_only)
+                if new_value is not value:
+                    if not record_only:
+                        nodes[key] = new_value
+                    _add_changed_path(changed_paths, node_paths, key_path)
+
+        if not record_only:
+            for key, new_key in renames:
+                nodes[new_key] = nodes.pop(key)
+
+
+def _get_child_path(node_path, key):
+    """
+    Get the model path of a key in the node.
+    :param node_path: the model path of the node, or None for the top level of the model
+    :param key: the key in the node
+    :return: the model path of the key
+    """
+    if node_path is None:
+        return key + ':'
+    return node_path + '/' + key
+
+
+def _add_changed_path(changed_paths, node_paths, key_path):
+    """
+    Add the model path of a changed key or value, and the paths of all its parents, to the changed paths.
+    :param changed_paths: the dictionary of changed model paths, or None if paths are not recorded
+    :param node_paths: the model paths of the parent nodes, from the top of the model
+    :param key_path: the model path of the changed key or value
+    """
+    if changed_paths is not None:
+        changed_paths[key_path] = True
+        for node_path in node_paths:
+            changed_paths[node_path] = True
+
+
+def _copy_changed_nodes(nodes, changed_paths, node_path):
+    """
+    Copy the node, and the child nodes on the changed paths. Other child nodes are shared with the original.
+    :param nodes: the dictionary to copy
+    :param changed_paths: the dictionary of changed model paths
+    :param node_path: the model path of the node, or None for the top level of the model
+    :return: the copy
     """
-    # iterate over copy to avoid concurrent change for add/delete
     if type(nodes) is OrderedDict:
-        nodes_iterator = OrderedDict(nodes)
+        nodes_copy = OrderedDict(nodes)
     else:
-        nodes_iterator = dict(nodes)
-    for key in nodes_iterator:
-        value = nodes[key]
-
-        # if the key changes with substitution, remove old key and map value to new key
-        new_key = _substitute(key, variables, model_context)
-        if new_key is not key:
-            nodes.pop(key)
-            nodes[new_key] = value
+        nodes_copy = dict(nodes)
 
+    for key in nodes:
+        value = nodes[key]
         if isinstance(value, dict):
-            _process_node(value, variables, model_context)
-        elif type(value) is str:
-            nodes[key] = _substitute(value, variables, model_context)
+            key_path = _get_child_path(node_path, key)
+            if key_path in changed_paths:
+                nodes_copy[key] = _copy_changed_nodes(value, changed_paths, key_path)
+    return nodes_copy
 
 
-def _substitute(text, variables, model_context):
+def _substitute(text, variables, model_context, log_variables=True):
     """
     Substitute the variable placeholders with the variable value.
+    The text is split into literal and token segments in a single scan, each token is resolved,
+    and the segments are joined once.
     :param text: the text to process for variable placeholders
     :param variables: the variables to use
     :param model_context: used to resolve variables in file paths
+    :param log_variables: if False, the replacement of deprecated ${key} tokens is not logged
     :return: the replaced text
     """
-    method_name = '_substitute'
+    # skip the scan for text with no tokens
+    if '${' not in text and '@@' not in text:
+        return text
 
-    if '${' in text:
-        tokens = _variable_pattern.findall(text)
-        if tokens:
-            for token in tokens:
-                key = token[2:-1]
-                # for ${key} variables, leave them in place if not defined.
-                # there are cases where WebLogic allows ${key} values, such as server templates.
-                # ${key} substitution is deprecated, so log if replacement occurs.
-                if key in variables:
-                    value = variables[key]
-                    text = text.replace(token, value)
-                    _logger.info('WLSDPLY-01735', token, key, method_name=method_name, class_name=_class_name)
-
-    # skip lookups for text with no @@
-    if '@@' in text:
-
-        # do properties first, to cover the case @@FILE:/dir/@@PROP:name@@.txt@@
-        tokens = _property_pattern.findall(text)
-        if tokens:
-            for token in tokens:
-                key = token[7:-2]
-                # for @@PROP:key@@ variables, throw an exception if key is not found.
-                if key not in variables:
-                    ex = exception_helper.create_variable_exception('WLSDPLY-01732', key)
-                    _logger.throwing(ex, class_name=_class_name, method_name=method_name)
-                    raise ex
-                value = variables[key]
-                text = text.replace(token, value)
-
-        tokens = _file_variable_pattern.findall(text)
-        if tokens:
-            for token in tokens:
-                path = token[7:-2]
-                value = _read_value_from_file(path)
-                text = text.replace(token, value)
+    resolved_text, rescan = _resolve_tokens(text, variables, model_context, log_variables=log_variables)
 
-        # special case for @@FILE:@@ORACLE_HOME@@/dir/name.txt@@
-        tokens = _file_nested_variable_pattern.findall(text)
-        if tokens:
-            for token in tokens:
-                path = token[7:-2]
-                path = model_context.replace_token_string(path)
-                value = _read_value_from_file(path)
-                text = text.replace(token, value)
+    # a deprecated ${key} value may contain @@ tokens, these were resolved after ${key} substitution
+    if rescan:
+        resolved_text, rescan = _resolve_tokens(resolved_text, variables, model_context, resolve_variables=False,
+                                                log_variables=log_variables)
+    return resolved_text
+
+
+def _resolve_tokens(text, variables, model_context, resolve_variables=True, log_variables=True):
+    """
+    Split the text into literal and token segments, and replace each token with its value.
+    :param text: the text to process for variable placeholders
+    :param variables: the variables to use
+    :param model_context: used to resolve variables in file paths
+    :param resolve_variables: if False, ${key} tokens are left in place
+    :param log_variables: if False, the replacement of deprecated ${key} tokens is not logged
+    :return: the replaced text, and True if a ${key} value introduced @@ tokens
+    """
+    segments = []
+    rescan = False
+    position = 0
+    for match in _token_pattern.finditer(text):
+        token = match.group(0)
+        if match.group('file') is not None:
+            value = _resolve_file_token(match, variables, model_context, log_variables)
+        elif match.group('property') is not None:
+            value = _resolve_property_token(match.group('property'), variables, model_context, log_variables)
+        elif resolve_variables:
+            value = _resolve_variable_token(token, match.group('variable'), variables, log_variables)
+            rescan = rescan or (value is not token and '@@' in value)
+        else:
+            value = token
+
+        segments.append(text[position:match.start()])
+        segments.append(value)
+        position = match.end()
+
+    if not segments:
+        return text, False
+
+    segments.append(text[position:])
+    return ''.join(segments), rescan
+
+
+def _resolve_variable_token(token, key, variables, log_variables):
+    """
+    Resolve a ${key} token.
+    :param token: the full token text
+    :param key: the variable name
+    :param variables: the variables to use
+    :param log_variables: if False, the replacement is not logged
+    :return: the variable value, or the unchanged token if the variable is not defined
+    """
+    method_name = '_resolve_variable_token'
+
+    # for ${key} variables, leave them in place if not defined.
+    # there are cases where WebLogic allows ${key} values, such as server templates.
+    # ${key} substitution is deprecated, so log if replacement occurs.
+    if key in variables:
+        if log_variables:
+            _logger.info('WLSDPLY-01735', token, key, method_name=method_name, class_name=_class_name)
+        return variables[key]
+    return token
+
+
+def _resolve_property_token(key, variables, model_context, log_variables):
+    """
+    Resolve a @@PROP:key@@ token. The key may contain ${key} tokens, such as @@PROP:${env}.port@@,
+    these are resolved before the property is looked up.
+    :param key: the property name
+    :param variables: the variables to use
+    :param model_context: used to resolve variables in file paths
+    :param log_variables: if False, the replacement of ${key} tokens is not logged
+    :return: the property value, or the partly resolved token if the key contains undefined ${key} tokens
+    :raises VariableException if the property is not defined
+    """
+    method_name = '_resolve_property_token'
+
+    if '${' in key:
+        key = _resolve_tokens(key, variables, model_context, log_variables=log_variables)[0]
 
-    return text
+        # an undefined ${key} leaves the property token unresolved
+        if '${' in key:
+            return '@@PROP:' + key + '@@'
 
+    # for @@PROP:key@@ variables, throw an exception if key is not found.
+    if key not in variables:
+        ex = exception_helper.create_variable_exception('WLSDPLY-01732', key)
+        _logger.throwing(ex, class_name=_class_name, method_name=method_name)
+        raise ex
+    return variables[key]
 
-def _read_value_from_file(file_path):
+
+def _resolve_file_token(match, variables, model_context, log_variables):
+    """
+    Resolve a @@FILE:path@@ token. The path may contain @@PROP:key@@ and ${key} tokens,
+    such as @@FILE:/dir/@@PROP:name@@.txt@@, or may start with a constant,
+    such as @@FILE:@@ORACLE_HOME@@/dir/name.txt@@.
+    :param match: the token match
+    :param variables: the variables to use
+    :param model_context: used to resolve constants in file paths
+    :param log_variables: if False, the replacement of ${key} tokens is not logged
+    :return: the value from the file, or the partly resolved token if the path contains undefined ${key} tokens
+    """
+    path = _resolve_file_path(match, variables, model_context, log_variables)
+    if path is None:
+        constant = match.group('constant')
+        if constant is None:
+            constant = ''
+        file_path = _resolve_tokens(match.group('file'), variables, model_context, log_variables=False)[0]
+        return '@@FILE:' + constant + file_path + '@@'
+    return _get_file_value(path)
+
+
+def _resolve_file_path(match, variables, model_context, log_variables):
+    """
+    Resolve the file path from a @@FILE:path@@ token match.
+    :param match: the token match
+    :param variables: the variables to use
+    :param model_context: used to resolve constants in file paths
+    :param log_variables: if False, the replacement of ${key} tokens is not logged
+    :return: the file path, or None if the path contains undefined ${key} tokens
+    :raises VariableException if the path contains an undefined @@PROP:key@@ token
+    """
+    path = match.group('file')
+    if '${' in path or '@@' in path:
+        path = _resolve_tokens(path, variables, model_context, log_variables=log_variables)[0]
+
+    # an undefined ${key} leaves the file token unresolved
+    if '${' in path:
+        return None
+
+    # the constant may also come from a ${key} value, such as @@FILE:${dir}/name.txt@@ with dir=@@ORACLE_HOME@@
+    constant = match.group('constant')
+    if constant is not None:
+        path = model_context.replace_token_string(constant + path)
+    elif '@@' in path:
+        path = model_context.replace_token_string(path)
+    return path
+
+
+def configure_file_cache(max_entries=None, check_modified=None):
+    """
+    Configure the cache of values read for @@FILE:path@@ tokens.
+    :param max_entries: the maximum number of file values to keep, zero disables the cache, None keeps the setting
+    :param check_modified: if True, re-read a cached file when its modification time changes,
+        None keeps the setting
+    """
+    global _file_cache_max_entries, _file_cache_check_modified
+
+    if max_entries is not None:
+        _file_cache_max_entries = max_entries
+        while len(_file_cache_order) > _file_cache_max_entries:
+            oldest = _file_cache_order.pop(0)
+            del _file_cache[oldest]
+    if check_modified is not None:
+        _file_cache_check_modified = check_modified
+
+
+def clear_file_cache():
+    """
+    Discard all the values read for @@FILE:path@@ tokens.
+    """
+    _file_cache.clear()
+    del _file_cache_order[:]
+
+
+def preload_file_values(dictionary, variables, model_context):
+    """
+    Read the files referenced by @@FILE:path@@ tokens in the dictionary concurrently, and cache their values.
+    Files that cannot be read are skipped, the error is reported when the token is substituted.
+    :param dictionary: the dictionary to search for @@FILE:path@@ tokens
+    :param variables: the variables to use for paths that contain @@PROP:key@@ and ${key} tokens
+    :param model_context: used to resolve constants in file paths
+    """
+    method_name = 'preload_file_values'
+
+    if _file_cache_max_entries <= 0:
+        return
+
+    paths = {}
+    _collect_file_paths(dictionary, variables, model_context, paths)
+    tasks = ArrayList()
+    for path in paths.keys():
+        if _get_cached_file_value(_get_canonical_path(path)) is None:
+            tasks.add(_FileValueTask(path))
+    if tasks.isEmpty():
+        return
+
+    _logger.finer('WLSDPLY-01737', tasks.size(), class_name=_class_name, method_name=method_name)
+    thread_count = min(tasks.size(), _FILE_PRELOAD_THREADS)
+    executor = Executors.newFixedThreadPool(thread_count)
+    try:
+        for future in executor.invokeAll(tasks):
+            canonical_path, value, modified = future.get()
+            if value is not None:
+                _put_cached_file_value(canonical_path, value, modified)
+    finally:
+        executor.shutdown()
+
+
+def _collect_file_paths(nodes, variables, model_context, paths):
+    """
+    Add the paths of @@FILE:path@@ tokens in the node keys and values to the paths dictionary.
+    The replacement of ${key} tokens in the paths is logged when the tokens are substituted, not here.
+    :param nodes: the dictionary to search
+    :param variables: the variables to use
+    :param model_context: used to resolve constants in file paths
+    :param paths: the dictionary of paths found
+    """
+    for key in nodes:
+        value = nodes[key]
+        if isinstance(value, dict):
+            _collect_file_paths(value, variables, model_context, paths)
+            texts = [key]
+        elif type(value) is str:
+            texts = [key, value]
+        else:
+            texts = [key]
+
+        for text in texts:
+            if '@@FILE:' in text:
+                for match in _token_pattern.finditer(text):
+                    if match.group('file') is not None:
+                        try:
+                            path = _resolve_file_path(match, variables, model_context, False)
+                        except VariableException:
+                            path = None
+                        if path is not None:
+                            paths[path] = True
+
+
+def _get_file_value(file_path):
+    """
+    Get the value for a @@FILE:path@@ token, reading the file if it is not in the cache.
+    :param file_path: the file from which to read the value
+    :return: the text value
+    :raises BundleAwareException if an error occurs while reading the value
+    """
+    if _file_cache_max_entries <= 0:
+        return _read_value_from_file(file_path)
+
+    canonical_path = _get_canonical_path(file_path)
+    value = _get_cached_file_value(canonical_path)
+    if value is None:
+        modified = File(canonical_path).lastModified()
+        value = _read_value_from_file(file_path)
+        _put_cached_file_value(canonical_path, value, modified)
+    return value
+
+
+def _get_canonical_path(file_path):
+    """
+    Get the canonical path of the file, used as the cache key.
+    :param file_path: the file path
+    :return: the canonical path, or the absolute path if the canonical path cannot be determined
+    """
+    java_file = File(file_path)
+    try:
+        return java_file.getCanonicalPath()
+    except IOException:
+        return java_file.getAbsolutePath()
+
+
+def _get_cached_file_value(canonical_path):
+    """
+    Get the cached value for the file.
+    :param canonical_path: the canonical path of the file
+    :return: the cached value, or None if the file is not cached, or has been modified and modification
+        times are checked
+    """
+    if canonical_path not in _file_cache:
+        return None
+
+    value, modified = _file_cache[canonical_path]
+    if _file_cache_check_modified and File(canonical_path).lastModified() != modified:
+        return None
+    return value
+
+
+def _put_cached_file_value(canonical_path, value, modified):
+    """
+    Add the value for the file to the cache, removing the oldest entry if the cache is full.
+    :param canonical_path: the canonical path of the file
+    :param value: the value read from the file
+    :param modified: the modification time of the file before it was read
+    """
+    if canonical_path not in _file_cache:
+        if len(_file_cache_order) >= _file_cache_max_entries:
+            oldest = _file_cache_order.pop(0)
+            del _file_cache[oldest]
+        _file_cache_order.append(canonical_path)
+    _file_cache[canonical_path] = (value, modified)
+
+
+class _FileValueTask(Callable):
+    """
+    Read the value of a @@FILE:path@@ token on a preload thread.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def call(self):
+        """
+        Read the file value.
+        :return: the canonical path, the value or None if it could not be read, and the modification time
+        """
+        canonical_path = _get_canonical_path(self.file_path)
+        modified = File(canonical_path).lastModified()
+        try:
+            value = _read_value_from_file(self.file_path, log_errors=False)
+        except VariableException:
+            value = None
+        return canonical_path, value, modified
+
+
+def _read_value_from_file(file_path, log_errors=True):
     """
     Read a single text value from the first line in the specified file.
     :param file_path: the file from which to read the value
+    :param log_errors: if False, errors are raised without being logged
     :return: the text value
     :raises BundleAwareException if an error occurs while reading the value
     """
@@ -237,12 +646,14 @@ def _read_value_from_file(file_path):
         file_reader.close()
     except IOException, e:
         ex = exception_helper.create_variable_exception('WLSDPLY-01733', file_path, e.getLocalizedMessage(), error=e)
-        _logger.throwing(ex, class_name=_class_name, method_name=method_name)
+        if log_errors:
+            _logger.throwing(ex, class_name=_class_name, method_name=method_name)
         raise ex
 
     if line is None:
         ex = exception_helper.create_variable_exception('WLSDPLY-01734', file_path)
-        _logger.throwing(ex, class_name=_class_name, method_name=method_name)
+        if log_errors:
+            _logger.throwing(ex, class_name=_class_name, method_name=method_name)
         raise ex
 
     return str(line).strip()
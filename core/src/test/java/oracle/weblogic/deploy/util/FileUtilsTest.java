@@ -8,6 +8,7 @@ import java.io.File;
 import java.text.MessageFormat;
 
 import org.junit.Assert;
+import org.junit.Before;
 import org.junit.Test;
 
 public class FileUtilsTest {
@@ -48,6 +49,17 @@ public class FileUtilsTest {
     private static final String ARCHIVE_FILE_NAME = "src/test/resources/DemoDomain.zip";
     private static final String APP_PATH = "wlsdeploy/applications/simpleear.ear";
     private static final String APP_FILE_NAME = "src/test/resources/simpleear.ear";
+    private static final String HASH_CACHE_FILE_NAME = WLSDeployZipFileTest.UNIT_TEST_TARGET_DIR +
+        "/hash-cache.properties";
+
+    @Before
+    public void setup() throws Exception {
+        File hashCacheFile = new File(HASH_CACHE_FILE_NAME).getCanonicalFile();
+        hashCacheFile.getParentFile().mkdirs();
+        hashCacheFile.delete();
+        System.setProperty(FileHashCache.CACHE_FILE_PROP, hashCacheFile.getPath());
+        FileHashCache.reset();
+    }
 
     @Test
     public void testNormalFile_parseFileName() throws Exception {
@@ -104,6 +116,31 @@ public class FileUtilsTest {
         Assert.assertEquals(appHash, archiveHash);
     }
 
+    @Test
+    public void testHashCache() throws Exception {
+        File appFile = FileUtils.getCanonicalFile(new File(APP_FILE_NAME));
+        String appHash = FileUtils.computeHash(appFile);
+        Assert.assertFalse("expected hash cache file to be written on flush", new File(HASH_CACHE_FILE_NAME).exists());
+        FileHashCache.flush();
+        Assert.assertTrue("expected hash cache file to be written", new File(HASH_CACHE_FILE_NAME).isFile());
+
+        // an unchanged file is answered from the persisted cache without reading it again
+        FileHashCache.putFileHash(appFile, "cached-hash");
+        FileHashCache.flush();
+        FileHashCache.reset();
+        Assert.assertEquals("cached-hash", FileUtils.computeHash(appFile));
+
+        // a changed modification time invalidates the cached hash
+        long lastModified = appFile.lastModified();
+        Assert.assertTrue(appFile.setLastModified(lastModified - 2000));
+        try {
+            Assert.assertEquals(appHash, FileUtils.computeHash(appFile));
+        } finally {
+            appFile.setLastModified(lastModified);
+            FileHashCache.putFileHash(appFile, appHash);
+        }
+    }
+
 
     private void assertMatch(String name, String got, String expected) {
         Assert.assertTrue(MessageFormat.format(FILE_ERR_FORMAT, name, got, expected),
@@ -8,6 +8,8 @@ import java.io.File;
 import java.io.FileInputStream;
 import java.io.FileOutputStream;
 import java.io.IOException;
+import java.util.Arrays;
+import java.util.List;
 
 import org.junit.Assert;
 import org.junit.Before;
@@ -20,6 +22,12 @@ public class WLSDeployArchiveTest {
 
     private static final String APPS_MODEL = "src/test/resources/simple-model.yaml";
     private static final String APPS_ARCHIVE_FILE_NAME = "target/unit-tests/appsArchive.zip";
+    private static final String MANIFEST_ARCHIVE_FILE_NAME = "target/unit-tests/manifestArchive.zip";
+    private static final String EXTRACT_ARCHIVE_FILE_NAME = "target/unit-tests/extractArchive.zip";
+    private static final String DEDUP_ARCHIVE_FILE_NAME = "target/unit-tests/dedupArchive.zip";
+    private static final String PREVIOUS_ARCHIVE_FILE_NAME = "target/unit-tests/previousArchive.zip";
+    private static final String REBUILT_ARCHIVE_FILE_NAME = "target/unit-tests/rebuiltArchive.zip";
+    private static final String HASH_CACHE_FILE_NAME = "target/unit-tests/archive-hash-cache.properties";
     private static final String APP1_TO_ADD = "src/test/resources/my-app.war";
     private static final String APP2_TO_ADD = "src/test/resources/my-other-app.war";
     private static final String APP1_ENTRY_NAME1 = "wlsdeploy/applications/my-app.war";
@@ -136,4 +144,255 @@ public class WLSDeployArchiveTest {
         Assert.assertFalse("expected appName to be not empty", StringUtils.isEmpty(appName));
         archive.close();
     }
+
+    @Test
+    public void testManifest() throws Exception {
+        File archiveFile = new File(MANIFEST_ARCHIVE_FILE_NAME);
+        archiveFile.delete();
+        WLSDeployArchive archive = new WLSDeployArchive(MANIFEST_ARCHIVE_FILE_NAME);
+        archive.beginBatch();
+        archive.addApplication(new File(APP1_TO_ADD));
+        archive.addApplication(new File(APP_DIR_TO_ADD));
+        archive.commit();
+        archive.close();
+
+        archive = new WLSDeployArchive(MANIFEST_ARCHIVE_FILE_NAME);
+        Assert.assertTrue("expected the archive to contain a manifest",
+            archive.containsFile(WLSDeployArchive.ARCHIVE_MANIFEST_ENTRY));
+        Assert.assertEquals("application", archive.getManifestEntryType(APP1_ENTRY_NAME1));
+        Assert.assertNull(archive.getManifestEntryType(INVALID_APP_ENTRY_NAME));
+        try (FileInputStream appStream = new FileInputStream(APP1_TO_ADD)) {
+            Assert.assertEquals(FileUtils.computeHash(appStream), archive.getFileHash(APP1_ENTRY_NAME1));
+        }
+
+        // the files of an exploded application are recorded as they are copied into the archive
+        String manifestEntryName = APP_DIR_ENTRY_NAME + "META-INF/MANIFEST.MF";
+        Assert.assertEquals("application", archive.getManifestEntryType(manifestEntryName));
+        try (FileInputStream manifestStream = new FileInputStream(APP_DIR_TO_ADD + "META-INF/MANIFEST.MF")) {
+            Assert.assertEquals(FileUtils.computeHash(manifestStream), archive.getFileHash(manifestEntryName));
+        }
+
+        // removing the binaries removes the manifest along with them
+        archive.beginBatch();
+        archive.removeAllBinaries();
+        archive.commit();
+        Assert.assertFalse("expected the manifest to be removed",
+            archive.containsFile(WLSDeployArchive.ARCHIVE_MANIFEST_ENTRY));
+        Assert.assertNull(archive.getManifestEntryType(APP1_ENTRY_NAME1));
+        archive.close();
+    }
+
+    @Test
+    public void testDeduplicateBinaries() throws Exception {
+        File archiveFile = new File(DEDUP_ARCHIVE_FILE_NAME);
+        archiveFile.delete();
+        WLSDeployArchive archive = new WLSDeployArchive(DEDUP_ARCHIVE_FILE_NAME);
+        archive.setDeduplicateBinaries(true);
+        archive.beginBatch();
+        Assert.assertEquals(APP1_ENTRY_NAME1, archive.addApplication(new File(APP1_TO_ADD)));
+        Assert.assertEquals("expected staged duplicate to resolve to the existing entry",
+            APP1_ENTRY_NAME1, archive.addApplication(new File(APP1_TO_ADD)));
+        Assert.assertEquals(APP2_ENTRY_NAME1, archive.addApplication(new File(APP2_TO_ADD)));
+        archive.commit();
+
+        Assert.assertEquals("expected committed duplicate to resolve to the existing entry",
+            APP2_ENTRY_NAME1, archive.addApplication(new File(APP2_TO_ADD)));
+        Assert.assertEquals("expected 2 applications", 2, archive.listApplications().size());
+
+        // without deduplication, identical content is stored under a new name
+        archive.setDeduplicateBinaries(false);
+        Assert.assertEquals(APP1_ENTRY_NAME2, archive.addApplication(new File(APP1_TO_ADD)));
+        archive.close();
+    }
+
+    @Test
+    public void testReuseBinariesFromPreviousArchive() throws Exception {
+        new File(PREVIOUS_ARCHIVE_FILE_NAME).delete();
+        WLSDeployArchive previous = new WLSDeployArchive(PREVIOUS_ARCHIVE_FILE_NAME);
+        previous.beginBatch();
+        previous.addApplication(new File(APP1_TO_ADD));
+        previous.addApplication(new File(APP2_TO_ADD));
+        previous.commit();
+        String app1Hash = previous.getFileHash(APP1_ENTRY_NAME1);
+        previous.close();
+
+        new File(REBUILT_ARCHIVE_FILE_NAME).delete();
+        WLSDeployArchive rebuilt = new WLSDeployArchive(REBUILT_ARCHIVE_FILE_NAME);
+        rebuilt.setPreviousArchive(PREVIOUS_ARCHIVE_FILE_NAME);
+        rebuilt.beginBatch();
+        Assert.assertEquals(APP1_ENTRY_NAME1, rebuilt.addApplication(new File(APP1_TO_ADD)));
+        rebuilt.commit();
+        Assert.assertEquals("expected the copied entry to match the file", app1Hash,
+            rebuilt.getFileHash(APP1_ENTRY_NAME1));
+        rebuilt.close();
+
+        // the previous archive may also be the archive that is rebuilt
+        rebuilt = new WLSDeployArchive(REBUILT_ARCHIVE_FILE_NAME);
+        rebuilt.setPreviousArchive(REBUILT_ARCHIVE_FILE_NAME);
+        rebuilt.beginBatch();
+        rebuilt.removeAllBinaries();
+        Assert.assertEquals(APP1_ENTRY_NAME1, rebuilt.addApplication(new File(APP1_TO_ADD)));
+        Assert.assertEquals(APP2_ENTRY_NAME1, rebuilt.addApplication(new File(APP2_TO_ADD)));
+        rebuilt.commit();
+        Assert.assertEquals(app1Hash, rebuilt.getFileHash(APP1_ENTRY_NAME1));
+        Assert.assertEquals("expected 2 applications", 2, rebuilt.listApplications().size());
+        rebuilt.close();
+    }
+
+    @Test
+    public void testHashCacheIsSavedOnFlush() throws Exception {
+        File hashCacheFile = new File(HASH_CACHE_FILE_NAME).getCanonicalFile();
+        hashCacheFile.delete();
+        System.setProperty(FileHashCache.CACHE_FILE_PROP, hashCacheFile.getPath());
+        FileHashCache.reset();
+        try {
+            new File(PREVIOUS_ARCHIVE_FILE_NAME).delete();
+            WLSDeployArchive previous = new WLSDeployArchive(PREVIOUS_ARCHIVE_FILE_NAME);
+            previous.addApplication(new File(APP_DIR_TO_ADD));
+            previous.close();
+
+            new File(REBUILT_ARCHIVE_FILE_NAME).delete();
+            WLSDeployArchive rebuilt = new WLSDeployArchive(REBUILT_ARCHIVE_FILE_NAME);
+            rebuilt.setPreviousArchive(PREVIOUS_ARCHIVE_FILE_NAME);
+            rebuilt.beginBatch();
+            rebuilt.addApplication(new File(APP1_TO_ADD));
+            rebuilt.addApplication(new File(APP2_TO_ADD));
+            rebuilt.addApplication(new File(APP_DIR_TO_ADD));
+            rebuilt.commit();
+            rebuilt.close();
+            Assert.assertFalse("expected the hash cache not to be saved per file", hashCacheFile.exists());
+
+            FileHashCache.flush();
+            Assert.assertTrue("expected the hash cache to be saved on flush", hashCacheFile.isFile());
+            FileHashCache.reset();
+            File app1File = FileUtils.getCanonicalFile(new File(APP1_TO_ADD));
+            Assert.assertNotNull(FileHashCache.getFileHash(app1File));
+            File dirFile = FileUtils.getCanonicalFile(new File(APP_DIR_TO_ADD + "META-INF/MANIFEST.MF"));
+            Assert.assertNull("expected exploded directory files not to be cached", FileHashCache.getFileHash(dirFile));
+        } finally {
+            System.clearProperty(FileHashCache.CACHE_FILE_PROP);
+            FileHashCache.reset();
+        }
+    }
+
+    @Test
+    public void testEntryHashIsKeyedByArchive() throws Exception {
+        System.setProperty(FileHashCache.CACHE_FILE_PROP, "");
+        FileHashCache.reset();
+        try {
+            File archiveFile = FileUtils.getCanonicalFile(new File(APPS_ARCHIVE_FILE_NAME));
+            File otherArchiveFile = FileUtils.getCanonicalFile(new File(PREVIOUS_ARCHIVE_FILE_NAME));
+            archiveFile.delete();
+            otherArchiveFile.delete();
+            WLSDeployArchive archive = new WLSDeployArchive(APPS_ARCHIVE_FILE_NAME);
+            archive.addApplication(new File(APP1_TO_ADD));
+            archive.close();
+            WLSDeployArchive otherArchive = new WLSDeployArchive(PREVIOUS_ARCHIVE_FILE_NAME);
+            otherArchive.addApplication(new File(APP1_TO_ADD));
+            otherArchive.close();
+
+            FileHashCache.putEntryHash(archiveFile, APP1_ENTRY_NAME1, 1L, 2L, "hash");
+            Assert.assertEquals("hash", FileHashCache.getEntryHash(archiveFile, APP1_ENTRY_NAME1, 1L, 2L));
+            Assert.assertNull("expected the hash not to be used for another archive",
+                FileHashCache.getEntryHash(otherArchiveFile, APP1_ENTRY_NAME1, 1L, 2L));
+
+            Assert.assertTrue(archiveFile.setLastModified(archiveFile.lastModified() - 60000));
+            Assert.assertNull("expected the hash not to be used after the archive changed",
+                FileHashCache.getEntryHash(archiveFile, APP1_ENTRY_NAME1, 1L, 2L));
+        } finally {
+            System.clearProperty(FileHashCache.CACHE_FILE_PROP);
+            FileHashCache.reset();
+        }
+    }
+
+    @Test
+    public void testExtractFiles() throws Exception {
+        File archiveFile = new File(EXTRACT_ARCHIVE_FILE_NAME);
+        archiveFile.delete();
+        WLSDeployArchive archive = new WLSDeployArchive(EXTRACT_ARCHIVE_FILE_NAME);
+        archive.beginBatch();
+        archive.addApplication(new File(APP1_TO_ADD));
+        archive.addApplication(new File(APP2_TO_ADD));
+        archive.commit();
+
+        File extractDir =
+            new File(WLSDeployZipFileTest.UNIT_TEST_TARGET_DIR + File.separator + "bulk-extract").getCanonicalFile();
+        extractDir.mkdirs();
+        List<ArchiveExtractResult> results = archive.extractFiles(
+            Arrays.asList(APP1_ENTRY_NAME1, APP2_ENTRY_NAME1, INVALID_APP_ENTRY_NAME), extractDir, true, 2);
+        archive.close();
+
+        Assert.assertEquals("expected a result per path", 3, results.size());
+        Assert.assertTrue("expected " + APP1_ENTRY_NAME1 + " to be extracted", results.get(0).isSuccessful());
+        Assert.assertTrue("expected " + APP2_ENTRY_NAME1 + " to be extracted", results.get(1).isSuccessful());
+        Assert.assertFalse("expected " + INVALID_APP_ENTRY_NAME + " to fail", results.get(2).isSuccessful());
+
+        File extractedApp = new File(results.get(0).getExtractedFileName());
+        Assert.assertEquals(new File(extractDir, "my-app.war"), extractedApp);
+        Assert.assertEquals(new File(APP1_TO_ADD).length(), extractedApp.length());
+        Assert.assertTrue(new File(extractDir, "my-other-app.war").isFile());
+    }
+
+    @Test
+    public void testExtractCachesOnlySingleFileHashes() throws Exception {
+        System.setProperty(FileHashCache.CACHE_FILE_PROP, "");
+        FileHashCache.reset();
+        try {
+            File archiveFile = new File(EXTRACT_ARCHIVE_FILE_NAME);
+            archiveFile.delete();
+            WLSDeployArchive archive = new WLSDeployArchive(EXTRACT_ARCHIVE_FILE_NAME);
+            archive.beginBatch();
+            archive.addApplication(new File(APP1_TO_ADD));
+            archive.addApplication(new File(APP_DIR_TO_ADD));
+            archive.commit();
+
+            File extractDir = new File(WLSDeployZipFileTest.UNIT_TEST_TARGET_DIR + File.separator +
+                "cache-extract").getCanonicalFile();
+            extractDir.mkdirs();
+            List<ArchiveExtractResult> results = archive.extractFiles(
+                Arrays.asList(APP1_ENTRY_NAME1, APP_DIR_ENTRY_NAME), extractDir, true, 2);
+            archive.close();
+            Assert.assertTrue(results.get(0).isSuccessful());
+            Assert.assertTrue(results.get(1).isSuccessful());
+
+            File extractedApp = FileUtils.getCanonicalFile(new File(extractDir, "my-app.war"));
+            Assert.assertNotNull("expected the single file hash to be cached",
+                FileHashCache.getFileHash(extractedApp));
+            File extractedDirFile = FileUtils.getCanonicalFile(new File(extractDir, "my-app/META-INF/MANIFEST.MF"));
+            Assert.assertTrue(extractedDirFile.isFile());
+            Assert.assertNull("expected exploded directory files not to be cached",
+                FileHashCache.getFileHash(extractedDirFile));
+        } finally {
+            System.clearProperty(FileHashCache.CACHE_FILE_PROP);
+            FileHashCache.reset();
+        }
+    }
+
+    @Test
+    public void testExtractSkipsCurrentFiles() throws Exception {
+        File archiveFile = new File(EXTRACT_ARCHIVE_FILE_NAME);
+        archiveFile.delete();
+        WLSDeployArchive archive = new WLSDeployArchive(EXTRACT_ARCHIVE_FILE_NAME);
+        archive.addApplication(new File(APP1_TO_ADD));
+
+        File extractDir =
+            new File(WLSDeployZipFileTest.UNIT_TEST_TARGET_DIR + File.separator + "skip-extract").getCanonicalFile();
+        extractDir.mkdirs();
+        File extractedApp = new File(archive.extractFile(APP1_ENTRY_NAME1, extractDir, true));
+        long modified = extractedApp.lastModified() - 60000;
+        Assert.assertTrue(extractedApp.setLastModified(modified));
+
+        archive.extractFile(APP1_ENTRY_NAME1, extractDir, true);
+        Assert.assertEquals("expected the current file not to be written", modified, extractedApp.lastModified());
+
+        try (FileOutputStream outputStream = new FileOutputStream(extractedApp)) {
+            outputStream.write(new byte[(int) new File(APP1_TO_ADD).length()]);
+        }
+        Assert.assertTrue(extractedApp.setLastModified(modified - 60000));
+        archive.extractFile(APP1_ENTRY_NAME1, extractDir, true);
+        archive.close();
+        Assert.assertNotEquals("expected the changed file to be written", modified - 60000,
+            extractedApp.lastModified());
+        Assert.assertEquals(FileUtils.computeHash(new File(APP1_TO_ADD)), FileUtils.computeHash(extractedApp));
+    }
 }
@@ -7,12 +7,16 @@ package oracle.weblogic.deploy.util;
 import java.io.File;
 import java.io.FileInputStream;
 import java.io.FileOutputStream;
+import java.io.FilenameFilter;
 import java.io.IOException;
 import java.io.InputStream;
+import java.nio.file.Files;
 import java.util.Arrays;
 import java.util.Iterator;
 import java.util.List;
 import java.util.Map;
+import java.util.zip.ZipEntry;
+import java.util.zip.ZipFile;
 
 import org.junit.Assert;
 import org.junit.Before;
@@ -43,6 +47,7 @@ public class WLSDeployZipFileTest {
        "wlsdeploy/applications/get-listen-address-app.war", "wlsdeploy/applications/simpleear.ear" };
 
     private static final String ZIP_FILE_SIMPLE_APPS_MODEL_FILE3 = "sample-apps-archive3.zip";
+    private static final String ZIP_FILE_SIMPLE_APPS_MODEL_FILE4 = "sample-apps-archive4.zip";
     private static final String LOG_PROPERTIES_SOURCE_LOCATION =
         UNIT_TEST_SOURCE_DIR + File.separator + "log.properties";
 
@@ -77,6 +82,7 @@ public class WLSDeployZipFileTest {
         copyFile(ZIP_FILE_SIMPLE_APPS_MODEL_FILE);
         copyFile(ZIP_FILE_SIMPLE_APPS_MODEL_FILE, ZIP_FILE_SIMPLE_APPS_MODEL_FILE2);
         copyFile(ZIP_FILE_SIMPLE_APPS_MODEL_FILE, ZIP_FILE_SIMPLE_APPS_MODEL_FILE3);
+        copyFile(ZIP_FILE_SIMPLE_APPS_MODEL_FILE, ZIP_FILE_SIMPLE_APPS_MODEL_FILE4);
     }
 
     @Test
@@ -206,6 +212,178 @@ public class WLSDeployZipFileTest {
         zf.close();
     }
 
+    @Test
+    public void testListEntriesWithPrefix() throws Exception {
+        File f = new File(UNIT_TEST_TARGET_DIR + File.separator + ZIP_FILE_SIMPLE_APPS_MODEL_FILE3);
+        WLSDeployZipFile zf = new WLSDeployZipFile(f);
+
+        List<String> entries = zf.listZipEntries("wlsdeploy/applications/");
+        Assert.assertEquals("expected 2 entries to be returned", 2, entries.size());
+        Assert.assertEquals("expected 0 entries to be returned", 0, zf.listZipEntries("wlsdeploy/z").size());
+
+        // the index must pick up entries written through the same object
+        File logPropertiesFile = new File(LOG_PROPERTIES_SOURCE_LOCATION);
+        FileInputStream inputStream = new FileInputStream(logPropertiesFile);
+        boolean added = zf.addZipEntry("wlsdeploy/applications/log.properties", inputStream);
+        Assert.assertTrue("expected entry to be added", added);
+        entries = zf.listZipEntries("wlsdeploy/applications/");
+        Assert.assertEquals("expected 3 entries to be returned", 3, entries.size());
+        Assert.assertEquals("expected new entry to be listed last", "wlsdeploy/applications/log.properties",
+            entries.get(2));
+        zf.close();
+    }
+
+    @Test
+    public void testBatchedChanges() throws Exception {
+        File f = new File(UNIT_TEST_TARGET_DIR + File.separator + ZIP_FILE_SIMPLE_APPS_MODEL_FILE3);
+        long originalLength = f.length();
+        WLSDeployZipFile zf = new WLSDeployZipFile(f);
+
+        zf.beginBatch();
+        File logPropertiesFile = new File(LOG_PROPERTIES_SOURCE_LOCATION);
+        FileInputStream inputStream = new FileInputStream(logPropertiesFile);
+        Assert.assertTrue("expected entry to be added", zf.addZipEntry("model/logging/log.properties", inputStream));
+        inputStream.close();
+        inputStream = new FileInputStream(logPropertiesFile);
+        String newName = zf.addZipEntry("model/logging/log.properties", inputStream, true);
+        inputStream.close();
+        Assert.assertEquals("expected staged entry to be renamed", "model/logging/log(1).properties", newName);
+        Assert.assertTrue("expected to remove entry", zf.removeZipEntries("wlsdeploy/sharedLibraries/"));
+
+        Assert.assertEquals("expected zip file to be unchanged", originalLength, f.length());
+        Assert.assertEquals("expected 2 staged entries", 2, zf.listZipEntries("model/logging/").size());
+        Assert.assertNull("expected staged entry to be unreadable", zf.getZipEntry("model/logging/log.properties"));
+        zf.commit();
+
+        WLSDeployZipFile zf2 = new WLSDeployZipFile(f);
+        Assert.assertEquals("expected 2 entries", 2, zf2.listZipEntries("model/logging/").size());
+        Assert.assertEquals("expected no entries", 0, zf2.listZipEntries("wlsdeploy/sharedLibraries/").size());
+        InputStream stream = zf2.getZipEntry("model/logging/log(1).properties");
+        Assert.assertNotNull("expected non-null InputStream to be returned", stream);
+        Assert.assertEquals("unexpected entry size", logPropertiesFile.length(), readInputStream(stream));
+        stream.close();
+        zf2.close();
+        zf.close();
+    }
+
+    @Test
+    public void testPutEntryInPlace() throws Exception {
+        File f = new File(UNIT_TEST_TARGET_DIR + File.separator + ZIP_FILE_SIMPLE_APPS_MODEL_FILE3);
+        byte[] original = Files.readAllBytes(f.toPath());
+        WLSDeployZipFile zf = new WLSDeployZipFile(f);
+
+        File logPropertiesFile = new File(LOG_PROPERTIES_SOURCE_LOCATION);
+        FileInputStream inputStream = new FileInputStream(logPropertiesFile);
+        zf.putZipEntry("model/logging/log.properties", inputStream);
+        inputStream.close();
+
+        // the existing content must not have been rewritten
+        byte[] updated = Files.readAllBytes(f.toPath());
+        Assert.assertTrue("expected zip file to grow", updated.length > original.length);
+        Assert.assertArrayEquals("expected original content to be kept", original,
+            Arrays.copyOf(updated, original.length));
+
+        Assert.assertEquals("expected 6 entries", 6, zf.listZipEntries().size());
+        InputStream stream = zf.getZipEntry("model/logging/log.properties");
+        Assert.assertEquals("unexpected entry size", logPropertiesFile.length(), readInputStream(stream));
+        stream = zf.getZipEntry("wlsdeploy/applications/simpleear.ear");
+        Assert.assertTrue("expected existing entry to be readable", readInputStream(stream) > 0);
+        zf.close();
+
+        zf.compact();
+        Assert.assertEquals("expected 6 entries after compaction", 6, zf.listZipEntries().size());
+        zf.close();
+    }
+
+    @Test
+    public void testRecoverIncompleteAppend() throws Exception {
+        File f = new File(UNIT_TEST_TARGET_DIR + File.separator + ZIP_FILE_SIMPLE_APPS_MODEL_FILE2);
+        byte[] original = Files.readAllBytes(f.toPath());
+
+        // simulate an in-place update that was interrupted after writing part of a new entry
+        File recoveryFile = new File(f.getPath() + ZipFileAppender.RECOVERY_FILE_SUFFIX);
+        try (FileOutputStream outputStream = new FileOutputStream(recoveryFile)) {
+            outputStream.write((Long.toString(original.length) + '\n').getBytes("US-ASCII"));
+        }
+        try (FileOutputStream outputStream = new FileOutputStream(f, true)) {
+            outputStream.write(new byte[100 * 1024]);
+        }
+
+        // opening the archive must not change it
+        WLSDeployZipFile zf = new WLSDeployZipFile(f);
+        Assert.assertTrue("expected recovery file to be kept", recoveryFile.exists());
+        Assert.assertEquals("expected zip file to be unchanged", original.length + 100 * 1024, f.length());
+
+        // the next update restores the original content before changing the zip file
+        Assert.assertFalse("expected no entry to be removed", zf.removeZipEntry("does/not/exist"));
+        Assert.assertFalse("expected recovery file to be deleted", recoveryFile.exists());
+        Assert.assertArrayEquals("expected original content to be restored", original,
+            Files.readAllBytes(f.toPath()));
+        Assert.assertEquals("expected 5 entries", 5, zf.listZipEntries().size());
+        zf.close();
+    }
+
+    @Test
+    public void testCompressAhead() throws Exception {
+        File f = new File(UNIT_TEST_TARGET_DIR + File.separator + ZIP_FILE_SIMPLE_APPS_MODEL_FILE4);
+        WLSDeployZipFile zf = new WLSDeployZipFile(f);
+        zf.setCompressAhead(true);
+
+        // appended in place
+        File logPropertiesFile = new File(LOG_PROPERTIES_SOURCE_LOCATION);
+        FileInputStream inputStream = new FileInputStream(logPropertiesFile);
+        zf.putZipEntry("model/logging/log.properties", inputStream);
+        inputStream.close();
+
+        // rewritten, copying the existing entries as they are
+        zf.beginBatch();
+        inputStream = new FileInputStream(logPropertiesFile);
+        zf.putZipEntry("wlsdeploy/classpathLibraries/log.jar", inputStream);
+        inputStream.close();
+        zf.compact();
+        zf.commit();
+
+        // spooled as they are added, then compressed in parallel and appended in place on commit
+        zf.beginBatch();
+        inputStream = new FileInputStream(logPropertiesFile);
+        zf.putZipEntry("model/logging/batch.properties", inputStream);
+        inputStream.close();
+        inputStream = new FileInputStream(logPropertiesFile);
+        zf.putZipEntry("wlsdeploy/classpathLibraries/batch.jar", inputStream);
+        inputStream.close();
+        zf.commit();
+        zf.close();
+        String[] leftoverFiles = f.getParentFile().list(new FilenameFilter() {
+            @Override
+            public boolean accept(File dir, String name) {
+                return name.startsWith("sample-apps-archive4") && !name.equals(ZIP_FILE_SIMPLE_APPS_MODEL_FILE4);
+            }
+        });
+        Assert.assertEquals("expected the batch spool file to be deleted", 0, leftoverFiles.length);
+
+        ZipFile zipFile = new ZipFile(f);
+        Assert.assertEquals("expected 9 entries", 9, zipFile.size());
+        ZipEntry entry = zipFile.getEntry("model/logging/batch.properties");
+        Assert.assertEquals("expected text entry to be deflated", ZipEntry.DEFLATED, entry.getMethod());
+        Assert.assertEquals("unexpected entry size", logPropertiesFile.length(),
+            readInputStream(zipFile.getInputStream(entry)));
+        entry = zipFile.getEntry("wlsdeploy/classpathLibraries/batch.jar");
+        Assert.assertEquals("expected jar entry to be stored", ZipEntry.STORED, entry.getMethod());
+        Assert.assertEquals("unexpected entry size", logPropertiesFile.length(),
+            readInputStream(zipFile.getInputStream(entry)));
+        entry = zipFile.getEntry("model/logging/log.properties");
+        Assert.assertEquals("expected text entry to be deflated", ZipEntry.DEFLATED, entry.getMethod());
+        Assert.assertEquals("unexpected entry size", logPropertiesFile.length(),
+            readInputStream(zipFile.getInputStream(entry)));
+        entry = zipFile.getEntry("wlsdeploy/classpathLibraries/log.jar");
+        Assert.assertEquals("expected jar entry to be stored", ZipEntry.STORED, entry.getMethod());
+        Assert.assertEquals("unexpected entry size", logPropertiesFile.length(),
+            readInputStream(zipFile.getInputStream(entry)));
+        entry = zipFile.getEntry("wlsdeploy/applications/simpleear.ear");
+        Assert.assertTrue("expected existing entry to be readable", readInputStream(zipFile.getInputStream(entry)) > 0);
+        zipFile.close();
+    }
+
     @Test
     public void testReallyMatches() throws Exception {
         File f = new File(UNIT_TEST_TARGET_DIR + File.separator + ZIP_FILE_EXISTING_EMPTY_FILE);
@@ -368,6 +368,22 @@ class AliasesTestCase(unittest.TestCase):
         self.assertEqual(model_attribute_value, string_value[1])
         return
 
+    def testAttributeValuesAreEqual(self):
+        location = LocationContext()
+        self.assertEqual(self.aliases.attribute_values_are_equal(location, 'AdministrationPort', '9002', 9002), True)
+        self.assertEqual(self.aliases.attribute_values_are_equal(location, 'AdministrationPort', 9003, '9002'), False)
+
+        location.append_location(FOLDERS.JDBC_SYSTEM_RESOURCE)
+        token = self.aliases.get_name_token(location)
+        if token:
+            location.add_name_token(token, 'my-datasource')
+        location.append_location(FOLDERS.JDBC_RESOURCE)
+        location.append_location(FOLDERS.JDBC_DATASOURCE_PARAMS)
+        self.assertEqual(self.aliases.attribute_values_are_equal(location, 'RowPrefetchSize', 123, '123'), True)
+        self.assertEqual(self.aliases.attribute_values_are_equal(location, 'RowPrefetch', 'true', 1), True)
+        self.assertEqual(self.aliases.attribute_values_are_equal(location, 'RowPrefetch', 'true', 0), False)
+        return
+
     def testConvertToTypeJarray(self):
         location = LocationContext()
         location.append_location(FOLDERS.SERVER)
@@ -0,0 +1,73 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import os
+from shutil import copy2
+import unittest
+
+import wlsdeploy.logging.platform_logger as platform_logger
+from wlsdeploy.tool.deploy import checkpoint_journal
+from wlsdeploy.tool.deploy.checkpoint_journal import CheckpointJournal
+from wlsdeploy.util.cla_utils import CommandLineArgUtil
+from wlsdeploy.util.model_context import ModelContext
+
+
+class CheckpointJournalTestCase(unittest.TestCase):
+    """
+    Test that the checkpoint journal keeps the completed work only while the model is unchanged.
+    """
+    _logger = platform_logger.PlatformLogger('wlsdeploy.deploy')
+    _execution_dir = '../../unit-tests/'
+    _resources_dir = '../../test-classes/'
+
+    _src_model_file = os.path.join(_resources_dir, 'encryption-test.yaml')
+    _other_model_file = os.path.join(_resources_dir, 'encryption-test-variables.yaml')
+    _target_model_file = os.path.join(_execution_dir, 'checkpoint-test.yaml')
+
+    def setUp(self):
+        if not os.path.exists(self._execution_dir):
+            os.makedirs(self._execution_dir)
+        copy2(self._src_model_file, self._target_model_file)
+
+        self._model_context = ModelContext('test', {CommandLineArgUtil.MODEL_FILE_SWITCH: self._target_model_file})
+        self._journal_file = checkpoint_journal.get_journal_file_name(self._model_context, False)
+        if os.path.exists(self._journal_file):
+            os.remove(self._journal_file)
+
+    def testCompletedWorkIsLoadedForSameModel(self):
+        journal = self._open_journal()
+        journal.record_activation(['Server:m1', 'Cluster:c1'])
+        journal.record_operation('deploy:app1')
+        journal.keep()
+
+        journal = self._open_journal()
+        self.assertEqual(True, journal.is_element_completed('Server:m1'))
+        self.assertEqual(True, journal.is_element_completed('Cluster:c1'))
+        self.assertEqual(False, journal.is_element_completed('Server:m2'))
+        self.assertEqual(True, journal.is_operation_completed('deploy:app1'))
+        self.assertEqual(False, journal.is_operation_completed('start:app1'))
+
+        journal.complete()
+        self.assertEqual(False, os.path.exists(self._journal_file))
+
+    def testCompletedWorkIsDiscardedForChangedModel(self):
+        journal = self._open_journal()
+        journal.record_activation(['Server:m1'])
+        journal.record_operation('deploy:app1')
+        journal.keep()
+
+        copy2(self._other_model_file, self._target_model_file)
+        journal = self._open_journal()
+        self.assertEqual(False, journal.is_element_completed('Server:m1'))
+        self.assertEqual(False, journal.is_operation_completed('deploy:app1'))
+        journal.complete()
+
+    def _open_journal(self):
+        journal = CheckpointJournal(self._journal_file, self._model_context, self._logger)
+        journal.open()
+        return journal
+
+
+if __name__ == '__main__':
+    unittest.main()
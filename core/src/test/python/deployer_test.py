@@ -0,0 +1,92 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import unittest
+
+from wlsdeploy.aliases.aliases import Aliases
+from wlsdeploy.aliases.location_context import LocationContext
+import wlsdeploy.aliases.model_constants as FOLDERS
+from wlsdeploy.aliases.wlst_modes import WlstModes
+from wlsdeploy.tool.deploy.deployer import Deployer
+from wlsdeploy.util.cla_utils import CommandLineArgUtil
+from wlsdeploy.util.model_context import ModelContext
+
+
+class DeployerTestCase(unittest.TestCase):
+    """
+    Test how the deployer decides that an online attribute that requires a restart already has the model value,
+    using a stand-in for WLST.
+    """
+    wls_version = '12.2.1.3'
+
+    arg_map = {
+        CommandLineArgUtil.ORACLE_HOME_SWITCH: '/oracleHome',
+        CommandLineArgUtil.DOMAIN_HOME_SWITCH: ''
+    }
+
+    model_context = ModelContext('test', arg_map)
+    aliases = Aliases(model_context=model_context, wlst_mode=WlstModes.ONLINE, wls_version=wls_version)
+
+    def setUp(self):
+        self._deployer = Deployer(dict(), self.model_context, self.aliases, wlst_mode=WlstModes.ONLINE)
+        self._location = LocationContext()
+        self._location.append_location(FOLDERS.SERVER)
+        self._location.add_name_token(self.aliases.get_name_token(self._location), 'AdminServer')
+
+    def testAttributeIsComparedWithGetValue(self):
+        # lsa() has no value for the attribute, which would match the model default
+        wlst = _Wlst({'ListenPort': None}, {'ListenPort': 7002})
+        self._deployer.wlst_helper = wlst
+        self._deployer._clear_existing_attribute_values()
+
+        self.assertEqual(False, self._skip('ListenPort', 7001, []))
+        self.assertEqual(True, self._skip('ListenPort', 7002, []))
+        self.assertEqual(['get ListenPort'], wlst.calls)
+
+    def testLsaRequiredAttributeIsComparedWithLsaValue(self):
+        wlst = _Wlst({'ListenPort': 7002}, {'ListenPort': 7003})
+        self._deployer.wlst_helper = wlst
+        self._deployer._clear_existing_attribute_values()
+
+        self.assertEqual(True, self._skip('ListenPort', 7002, ['ListenPort']))
+        self.assertEqual(False, self._skip('ListenPort', 7003, ['ListenPort']))
+        self.assertEqual(['lsa'], wlst.calls)
+
+    def testSetAttributeIsReadAgain(self):
+        wlst = _Wlst({}, {'ListenPort': 7002})
+        self._deployer.wlst_helper = wlst
+        self._deployer._clear_existing_attribute_values()
+
+        self.assertEqual(True, self._skip('ListenPort', 7002, []))
+        self._deployer._invalidate_existing_value(self._location, 'ListenPort')
+        wlst.get_values['ListenPort'] = 7003
+        self.assertEqual(True, self._skip('ListenPort', 7003, []))
+        self.assertEqual(['get ListenPort', 'get ListenPort'], wlst.calls)
+
+    def _skip(self, key, value, lsa_required_attribute_names):
+        return self._deployer._skip_setting_attribute(self._location, key, value, None, [key],
+                                                      lsa_required_attribute_names)
+
+
+class _Wlst(object):
+    """
+    Stands in for the WLST helper, returning fixed lsa() and get() values and recording the calls.
+    """
+
+    def __init__(self, lsa_values, get_values):
+        self.lsa_values = lsa_values
+        self.get_values = get_values
+        self.calls = []
+
+    def lsa(self):
+        self.calls.append('lsa')
+        return dict(self.lsa_values)
+
+    def get(self, attribute_name):
+        self.calls.append('get ' + attribute_name)
+        return self.get_values[attribute_name]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import os
+import unittest
+
+import wlsdeploy.logging.platform_logger as platform_logger
+from wlsdeploy.tool.deploy import deployment_fingerprints
+from wlsdeploy.tool.deploy.deployment_fingerprints import DeploymentFingerprintStore
+
+
+class DeploymentFingerprintsTestCase(unittest.TestCase):
+    """
+    Test that the last-deployed fingerprints are kept across runs.
+    """
+    _logger = platform_logger.PlatformLogger('wlsdeploy.deploy')
+    _execution_dir = '../../unit-tests/'
+
+    _store_file = os.path.join(_execution_dir, deployment_fingerprints.FINGERPRINT_FILE_NAME)
+
+    def setUp(self):
+        if not os.path.exists(self._execution_dir):
+            os.makedirs(self._execution_dir)
+        if os.path.exists(self._store_file):
+            os.remove(self._store_file)
+
+    def testDeploymentIsReadAcrossRuns(self):
+        store = self._load_store()
+        store.record_deployment('Application', 'app1', '/apps/app1.ear', 'digest1', None, None, 'cluster1,server1',
+                                'deploymentOrder=5')
+        store.record_deployment('Library', 'lib1', '/libs/lib1.war', 'digest2', None, None, None, 'libraryModule=true')
+        store.save()
+
+        store = self._load_store()
+        self.assertEqual('cluster1,server1', store.get_deployed_targets('Application', 'app1'))
+        self.assertEqual('deploymentOrder=5', store.get_deployed_options('Application', 'app1'))
+        self.assertEqual(None, store.get_deployed_targets('Library', 'lib1'))
+        self.assertEqual('libraryModule=true', store.get_deployed_options('Library', 'lib1'))
+        self.assertEqual(None, store.get_deployed_options('Application', 'app2'))
+
+    def testDigestsAreUsedForTheSamePaths(self):
+        store = self._load_store()
+        store.record_deployment('Application', 'app1', '/apps/app1.ear', 'digest1', '/plans/plan1.xml', 'digest2',
+                                'cluster1', '')
+        store.save()
+
+        store = self._load_store()
+        self.assertEqual('digest1', store.get_deployed_source_digest('Application', 'app1', '/apps/app1.ear'))
+        self.assertEqual('digest2', store.get_deployed_plan_digest('Application', 'app1', '/plans/plan1.xml'))
+        self.assertEqual(None, store.get_deployed_source_digest('Application', 'app1', '/apps/other.ear'))
+        self.assertEqual(None, store.get_deployed_plan_digest('Application', 'app1', '/plans/other.xml'))
+        self.assertEqual(None, store.get_deployed_source_digest('Application', 'app1', '/apps/app1.ear',
+                                                                'Partition=part1'))
+
+    def testDeploymentWithoutOptionsIsRecorded(self):
+        store = self._load_store()
+        store.record_deployment('Application', 'app1', '/apps/app1.ear', 'digest1', None, None, 'cluster1', '')
+        store.save()
+
+        store = self._load_store()
+        self.assertEqual('', store.get_deployed_options('Application', 'app1'))
+
+    def testDeploymentIsRecordedPerScope(self):
+        store = self._load_store()
+        store.record_deployment('Application', 'app1', '/apps/app1.ear', 'digest1', None, None, 'cluster1',
+                                'deploymentOrder=5')
+        store.record_deployment('Application', 'app1', '/apps/app1.ear', 'digest2', None, None, 'cluster2', '',
+                                'Partition=part1')
+        store.save()
+
+        store = self._load_store()
+        self.assertEqual('cluster1', store.get_deployed_targets('Application', 'app1'))
+        self.assertEqual('cluster2', store.get_deployed_targets('Application', 'app1', 'Partition=part1'))
+        self.assertEqual('', store.get_deployed_options('Application', 'app1', 'Partition=part1'))
+        self.assertEqual(None, store.get_deployed_options('Application', 'app1', 'Partition=part2'))
+
+    def testManifestIsKeptForDeployedDigest(self):
+        store = self._load_store()
+        store.record_manifest('digest1', 'Extension-Name: lib1')
+        store.record_manifest('digest2', 'Extension-Name: lib2')
+        store.record_deployment('Library', 'lib1', '/libs/lib1.war', 'digest1', None, None, None, 'libraryModule=true')
+        store.remove_unused_manifests()
+        store.save()
+
+        store = self._load_store()
+        self.assertEqual('Extension-Name: lib1', store.get_manifest('digest1'))
+        self.assertEqual(None, store.get_manifest('digest2'))
+
+    def _load_store(self):
+        store = DeploymentFingerprintStore(self._store_file, self._logger)
+        store.load()
+        return store
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Copyright (c) 2019, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import unittest
+
+from oracle.weblogic.deploy.deploy import DeployException
+
+import wlsdeploy.logging.platform_logger as platform_logger
+from wlsdeploy.tool.deploy import deployment_scheduler
+from wlsdeploy.tool.deploy.deployment_scheduler import DeploymentScheduler
+
+
+class DeploymentSchedulerTestCase(unittest.TestCase):
+    """
+    Test the dependency ordering and concurrency of the deployment scheduler, using stand-in progress objects.
+    """
+    _logger = platform_logger.PlatformLogger('wlsdeploy.deploy')
+
+    def setUp(self):
+        self._events = []
+        self._progress = dict()
+
+    def testSerialOperationsRunInOrderAdded(self):
+        scheduler = DeploymentScheduler(1, self._logger)
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'lib1', self._submit, group='lib')
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'app1', self._submit, group='app')
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'app2', self._submit, group='app')
+        scheduler.run()
+
+        self.assertEqual(['submit lib1 None', 'submit app1 None', 'submit app2 None'], self._events)
+
+    def testParallelOperationsFollowDependenciesAndOrder(self):
+        scheduler = DeploymentScheduler(3, self._logger)
+        lib_id = scheduler.add_operation(deployment_scheduler.DEPLOY, 'lib1', self._submit, group='lib')
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'app1', self._submit, group='app', order=100,
+                                depends_on=[lib_id])
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'app2', self._submit, group='app', order=100,
+                                depends_on=[lib_id])
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'app3', self._submit, group='app', order=200)
+        scheduler.add_operation(deployment_scheduler.STOP, 'app4', self._submit)
+        scheduler.run()
+
+        # lib1 and app4 are independent, app1 and app2 share an order, and app3 waits for the lower order
+        self.assertEqual('submit lib1 false', self._events[0])
+        self.assertEqual('submit app4 false', self._events[1])
+        self.assertEqual(['submit app1 false', 'submit app2 false'], self._events[2:4])
+        self.assertEqual('submit app3 false', self._events[4])
+
+    def testFailedOperationStopsTheSchedule(self):
+        scheduler = DeploymentScheduler(2, self._logger)
+        lib_id = scheduler.add_operation(deployment_scheduler.DEPLOY, 'bad', self._submit)
+        scheduler.add_operation(deployment_scheduler.DEPLOY, 'app1', self._submit, group='app',
+                                depends_on=[lib_id])
+
+        self.assertRaises(DeployException, scheduler.run)
+        self.assertEqual(['submit bad false'], self._events)
+
+    def testScopedOperationIds(self):
+        domain_scheduler = DeploymentScheduler(1, self._logger)
+        partition_scheduler = DeploymentScheduler(1, self._logger, 'Partition=part1')
+        domain_id = domain_scheduler.add_operation(deployment_scheduler.DEPLOY, 'app1', self._submit)
+        partition_id = partition_scheduler.add_operation(deployment_scheduler.DEPLOY, 'app1', self._submit)
+
+        self.assertEqual('deploy:app1', domain_id)
+        self.assertEqual('deploy:Partition=part1/app1', partition_id)
+        self.assertEqual(partition_id,
+                         deployment_scheduler.get_operation_id(deployment_scheduler.DEPLOY, 'app1', 'Partition=part1'))
+
+    def _submit(self, name, block=None):
+        self._events.append('submit %s %s' % (name, block))
+        progress = _Progress(name == 'bad')
+        self._progress[name] = progress
+        return progress
+
+
+class _Progress(object):
+    """
+    Stands in for a WLST progress object that is running for the first status check.
+    """
+
+    def __init__(self, failed):
+        self._failed = failed
+        self._checks = 0
+
+    def isRunning(self):
+        self._checks += 1
+        return self._checks < 2
+
+    def isFailed(self):
+        return self._failed
+
+    def getState(self):
+        if self._failed:
+            return 'failed'
+        return 'completed'
+
+    def getMessage(self):
+        return 'failed'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -226,6 +226,18 @@ class VariableFileHelperTest(unittest.TestCase):
         actual = self._helper.inject_variables(replacement_dict)
         self._compare_to_expected_dictionary(expected, actual)
 
+    def testWithMBeanNameAndSharedPath(self):
+        expected = dict()
+        expected['Server.m1.SSL.Enabled'] = 'True'
+        expected['Server.AdminServer.ListenPort'] = '9001'
+        expected['Server.m1.ListenPort'] = '9003'
+        expected['Server.m2.ListenPort'] = '9005'
+        replacement_dict = dict()
+        replacement_dict['Server[m1].SSL.Enabled'] = dict()
+        replacement_dict['Server.ListenPort'] = dict()
+        actual = self._helper.inject_variables(replacement_dict)
+        self._compare_to_expected_dictionary(expected, actual)
+
     def testWithVariableHelperKeywords(self):
         expected = dict()
         expected['JMSSystemResource.MyJmsModule.JmsResource.ForeignServer.MyForeignServer.ConnectionURL'] \
@@ -246,6 +258,19 @@ class VariableFileHelperTest(unittest.TestCase):
         actual = variables.load_variables(self._variable_file)
         self._compare_to_expected_dictionary(expected, actual)
 
+    def testInjectorFilesOverrideOrder(self):
+        expected = dict()
+        expected['Server.AdminServer.ListenPort'] = '9001'
+        expected['Server.m2.ListenPort'] = '9005'
+        expected['Server.m1.ListenPort'] = '9003'
+        expected['Machine.machine1.NodeManager.ListenPort'] = '5557'
+        expected['Machine.machine1.NodeManager.PasswordEncrypted'] = '--FIX ME--'
+        expected['Machine.machine1.NodeManager.UserName'] = 'weblogic'
+        injector_file_list = [self._resources_dir + '/credentials_value.json', self._resources_dir + '/port.json',
+                              self._resources_dir + '/credentials.json']
+        actual = self._helper.inject_variables_keyword_dictionary(injector_file_list)
+        self._compare_to_expected_dictionary(expected, actual)
+
     def testForceAttribute(self):
         expected = dict()
         expected['Server.AdminServer.SSL.HostnameVerificationIgnored'] = 'false'
@@ -2,16 +2,21 @@
 Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
+import os
 import unittest
 
+from java.io import File
+
 import wlsdeploy.util.variables as variables
 from oracle.weblogic.deploy.util import VariableException
+from wlsdeploy.util.model import Model
 from wlsdeploy.util.model_context import ModelContext
 from wlsdeploy.util.model_translator import FileToPython
 
 
 class VariablesTestCase(unittest.TestCase):
     _resources_dir = '../../test-classes'
+    _execution_dir = '../../unit-tests'
     _variables_file = _resources_dir + '/variables.properties'
     _file_variable_name = 'file-variable.txt'
     _file_variable_path = _resources_dir + '/' + _file_variable_name
@@ -47,6 +52,69 @@ class VariablesTestCase(unittest.TestCase):
         self.assertEqual(True, 'myCluster' in model['topology']['Cluster'])
         self.assertEqual(True, 's3' in model['topology']['Server'])
 
+    def testChangedPaths(self):
+        model = FileToPython(self._resources_dir + '/variables-test.yaml', self._use_ordering).parse()
+        variable_map = variables.load_variables(self._variables_file)
+        changed_paths = {}
+        variables.substitute(model, variable_map, self.model_context, changed_paths)
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:'), True)
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:/Server/s1'), True)
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:/Server/s1/ListenPort'), True)
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:/Server/@@PROP:server3.id@@'), True)
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:/Server/s1/ListenAddress'), False)
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:/Server/AdminServer'), False)
+
+    def testSubstituteCopy(self):
+        model = FileToPython(self._resources_dir + '/variables-test.yaml', self._use_ordering).parse()
+        variable_map = variables.load_variables(self._variables_file)
+        changed_paths = {}
+        model_copy = variables.substitute_copy(model, variable_map, self.model_context, changed_paths)
+        self.assertEqual(model_copy['topology']['Name'], 'xyz123')
+        self.assertEqual(model_copy['topology']['Server']['s1']['ListenPort'], '1009')
+        self.assertEqual(model_copy['topology']['Server']['s2']['Cluster'], 'myCluster')
+        self.assertEqual(True, 's3' in model_copy['topology']['Server'])
+        self.assertEqual(variables.is_path_changed(changed_paths, 'topology:/Server/s2/Cluster'), True)
+
+        # the original model is not changed, and the unchanged nodes are shared
+        self.assertEqual(model['topology']['Server']['s1']['ListenPort'], '${my.port}')
+        self.assertEqual(True, '@@PROP:server3.id@@' in model['topology']['Server'])
+        self.assertEqual(True, model_copy['topology']['Server']['AdminServer'] is
+                         model['topology']['Server']['AdminServer'])
+        self.assertEqual(False, model_copy['topology']['Server']['s1'] is model['topology']['Server']['s1'])
+
+    def testLazyModelSubstitution(self):
+        model_dictionary = FileToPython(self._resources_dir + '/variables-test.yaml', self._use_ordering).parse()
+        model_dictionary['resources'] = {'JDBCSystemResource': {'ds1': {'Target': '@@PROP:bad.variable@@'}}}
+        variable_map = variables.load_variables(self._variables_file)
+        model = Model(model_dictionary, variable_map=variable_map, model_context=self.model_context)
+
+        # the topology section is resolved on access, the resources section is not resolved until accessed
+        topology = model.get_model_topology()
+        self.assertEqual(topology['Server']['s1']['ListenPort'], '1009')
+        self.assertEqual(True, 's3' in topology['Server'])
+        try:
+            model.get_model_resources()
+        except VariableException:
+            pass
+        else:
+            self.fail('Test must raise VariableException when the resources section is accessed')
+
+    def testLazyModelChangedPaths(self):
+        model_dictionary = FileToPython(self._resources_dir + '/variables-test.yaml', self._use_ordering).parse()
+        variable_map = variables.load_variables(self._variables_file)
+        changed_paths = {}
+        variables.substitute_copy(model_dictionary, variable_map, self.model_context, changed_paths)
+
+        # only the recorded paths are resolved, the other tokens are left for the caller to report
+        model_dictionary['topology']['Server']['AdminServer']['ListenAddress'] = '@@PROP:bad.variable@@'
+        model = Model(model_dictionary, variable_map=variable_map, model_context=self.model_context,
+                      changed_paths=changed_paths)
+        topology = model.get_model_topology()
+        self.assertEqual(topology['Name'], 'xyz123')
+        self.assertEqual(topology['Server']['s2']['Cluster'], 'myCluster')
+        self.assertEqual(True, 's3' in topology['Server'])
+        self.assertEqual(topology['Server']['AdminServer']['ListenAddress'], '@@PROP:bad.variable@@')
+
     def testVariableNotFound(self):
         """
         For ${key} substitution, no replacement is done, and no error is reported, if variable not found.
@@ -88,6 +156,93 @@ class VariablesTestCase(unittest.TestCase):
         variables.substitute(model, {}, self.model_context)
         self.assertEqual(model['domainInfo']['AdminUserName'], 'file-variable-value')
 
+    def testFileVariableWithProperty(self):
+        model = {'domainInfo': {'AdminUserName': '@@FILE:@@PROP:variable_dir@@/' + self._file_variable_name + '@@'}}
+        variables.substitute(model, {'variable_dir': self._resources_dir}, self.model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'file-variable-value')
+
+    def testPropertyWithVariable(self):
+        model = {'topology': {'Name': '@@PROP:${prop_name}@@', 'AdminServerName': '@@PROP:${undefined}@@'}}
+        variables.substitute(model, {'prop_name': 'my.port', 'my.port': '1009'}, self.model_context)
+        self.assertEqual(model['topology']['Name'], '1009')
+        self.assertEqual(model['topology']['AdminServerName'], '@@PROP:${undefined}@@')
+
+    def testFileVariableWithVariableConstant(self):
+        model = {'domainInfo': {'AdminUserName': '@@FILE:${variable_dir}/' + self._file_variable_name + '@@'}}
+        variables.substitute(model, {'variable_dir': '@@ORACLE_HOME@@'}, self.model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'file-variable-value')
+
+    def testMultipleTokens(self):
+        model = {'topology': {'Name': '@@PROP:my-abc@@-${my_arf}-@@PROP:my.port@@-@@ORACLE_HOME@@'}}
+        variable_map = variables.load_variables(self._variables_file)
+        variables.substitute(model, variable_map, self.model_context)
+        self.assertEqual(model['topology']['Name'], 'xyz-123-1009-@@ORACLE_HOME@@')
+
+    def testFileVariableCached(self):
+        if not os.path.exists(self._execution_dir):
+            os.makedirs(self._execution_dir)
+        path = self._execution_dir + '/cached-variable.txt'
+        self._write_file(path, 'first-value')
+
+        variables.clear_file_cache()
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@', 'AdminPassword': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, self.model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'first-value')
+        self.assertEqual(model['domainInfo']['AdminPassword'], 'first-value')
+
+        # the cached value is used until the cache is cleared
+        self._write_file(path, 'second-value')
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, self.model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'first-value')
+
+        variables.clear_file_cache()
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, self.model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'second-value')
+
+    def testFileVariableModifiedIsReadAgain(self):
+        if not os.path.exists(self._execution_dir):
+            os.makedirs(self._execution_dir)
+        path = self._execution_dir + '/modified-variable.txt'
+        self._write_file(path, 'first-value')
+        File(path).setLastModified(1000000000000L)
+        model_context = ModelContext('test', {'-oracle_home': self._resources_dir,
+                                              '-check_file_variable_times': True})
+
+        variables.clear_file_cache()
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'first-value')
+
+        # the cached value is read again when the file is modified
+        self._write_file(path, 'second-value')
+        File(path).setLastModified(1000000060000L)
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'second-value')
+
+    def testFileVariableCacheDisabled(self):
+        if not os.path.exists(self._execution_dir):
+            os.makedirs(self._execution_dir)
+        path = self._execution_dir + '/uncached-variable.txt'
+        self._write_file(path, 'first-value')
+        model_context = ModelContext('test', {'-oracle_home': self._resources_dir,
+                                              '-file_variable_cache_size': 0})
+
+        variables.clear_file_cache()
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'first-value')
+
+        self._write_file(path, 'second-value')
+        model = {'domainInfo': {'AdminUserName': '@@FILE:' + path + '@@'}}
+        variables.substitute(model, {}, model_context)
+        self.assertEqual(model['domainInfo']['AdminUserName'], 'second-value')
+
+        # restore the default cache size for the other tests
+        variables.configure_file_cache(max_entries=1000)
+
     def testFileVariableNotFound(self):
         try:
             path = self._resources_dir + '/no-file.txt'
@@ -99,6 +254,11 @@ class VariablesTestCase(unittest.TestCase):
         else:
             self.fail('Test must raise VariableException when variable file is not found')
 
+    def _write_file(self, path, text):
+        output_file = open(path, 'w')
+        output_file.write(text + '\n')
+        output_file.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -49,7 +49,8 @@
 
 usage() {
   echo ""
-  echo "Usage: $1 [-help] [-use_encryption]"
+  echo "Usage: $1 [-help] [-use_encryption] [-skip_unchanged_attributes]"
+  echo "          [-use_checkpoint_journal] [-check_file_variable_times]"
   echo "          -oracle_home <oracle-home>"
   echo "          -domain_home <domain-home>"
   echo "          [-archive_file <archive-file>]"
@@ -58,6 +59,10 @@ usage() {
   echo "          [-variable_file <variable-file>]"
   echo "          [-domain_type <domain-type>]"
   echo "          [-wlst_path <wlst-path>]"
+  echo "          [-max_parallel_deployments <max-parallel>]"
+  echo "          [-activation_chunk_size <chunk-size>]"
+  echo "          [-deployment_state_dir <state-dir>]"
+  echo "          [-file_variable_cache_size <cache-size>]"
   echo "          [-admin_url <admin-url>"
   echo "           -admin_user <admin-user>"
   echo "          ]"
@@ -92,11 +97,44 @@ usage() {
   echo ""
   echo "        admin-user      - the admin username (used for online deploy)"
   echo ""
+  echo "        max-parallel    - the maximum number of application and library"
+  echo "                          operations to run at once during an online"
+  echo "                          deploy, the default is 1"
+  echo ""
+  echo "        chunk-size      - the number of top-level model elements to save"
+  echo "                          and activate at once during an online update,"
+  echo "                          or section to activate after each model section,"
+  echo "                          the default is to activate all changes at once"
+  echo ""
+  echo "        state-dir       - the directory that holds the fingerprints of the"
+  echo "                          deployed applications and libraries, the default"
+  echo "                          is the wlsdeploy directory of the domain home"
+  echo ""
+  echo "        cache-size      - the number of @@FILE values to keep after they are"
+  echo "                          read, 0 to read the file for every token, the"
+  echo "                          default is 1000"
+  echo ""
   echo "    The -use_encryption switch tells the program that one or more of the"
   echo "    passwords in the model or variables files are encrypted.  The program will"
   echo "    prompt for the decryption passphrase to use to decrypt the passwords."
   echo "    Please note that Java 8 or higher is required when using this feature."
   echo ""
+  echo "    The -skip_unchanged_attributes switch tells the program to read the"
+  echo "    existing attribute values in the domain and only set the attributes whose"
+  echo "    model values differ.  Online, attributes that require a restart are always"
+  echo "    compared this way."
+  echo ""
+  echo "    The -use_checkpoint_journal switch tells the program to record the"
+  echo "    completed online work in a journal next to the model file, or next to"
+  echo "    the archive file if the model is in the archive.  If the program fails,"
+  echo "    running it again with the same model, variable and archive files skips"
+  echo "    the work recorded in the journal.  The journal is deleted when the"
+  echo "    program completes."
+  echo ""
+  echo "    The -check_file_variable_times switch tells the program to read a file"
+  echo "    referenced by @@FILE tokens again if it was modified after its value was"
+  echo "    cached, such as a secret file that is updated while the program runs."
+  echo ""
 }
 
 umask 27
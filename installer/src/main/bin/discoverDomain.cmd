@@ -322,6 +322,9 @@ ECHO.
 ECHO Usage: %~nx0 -oracle_home ^<oracle-home^>
 ECHO              -domain_home ^<domain-home^>
 ECHO              -archive_file ^<archive-file^>
+ECHO              [-prev_archive_file ^<prev-archive-file^>]
+ECHO              [-compress_archive_ahead]
+ECHO              [-deduplicate_binaries]
 ECHO              [-model_file ^<model-file^>]
 ECHO              [-domain_type ^<domain-type^>]
 ECHO              [-wlst_path ^<wlst-path^>]
@@ -336,6 +339,10 @@ ECHO         domain-home    - the domain home directory
 ECHO.
 ECHO         archive-file   - the path to the archive file to create
 ECHO.
+ECHO         prev-archive-file - the path to an archive file from an earlier
+ECHO                          discovery whose unchanged binaries are copied
+ECHO                          without being compressed again
+ECHO.
 ECHO         model-file     - the location to write the model file,
 ECHO                          the default is to write it inside the archive
 ECHO.
@@ -349,6 +356,14 @@ ECHO         admin-url      - the admin server URL (used for online discovery)
 ECHO.
 ECHO         admin-user     - the admin username (used for online discovery)
 ECHO.
+ECHO     The -compress_archive_ahead switch tells the program to store binaries
+ECHO     that are already compressed, such as jar, war and ear files, as is and
+ECHO     to deflate the other archive entries in parallel when they are written.
+ECHO.
+ECHO     The -deduplicate_binaries switch tells the program to store a binary
+ECHO     that is referenced from several places in the domain only once in the
+ECHO     archive file.
+ECHO.
 
 :exit_script
 IF DEFINED USE_CMD_EXIT (
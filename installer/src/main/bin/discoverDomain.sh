@@ -50,10 +50,11 @@
 
 usage() {
   echo ""
-  echo "Usage: $1 [-help]"
+  echo "Usage: $1 [-help] [-compress_archive_ahead] [-deduplicate_binaries]"
   echo "          -oracle_home <oracle-home>"
   echo "          -domain_home <domain-home>"
   echo "          -archive_file <archive-file>"
+  echo "          [-prev_archive_file <prev-archive-file>]"
   echo "          [-model_file <model-file>]"
   echo "          [-domain_type <domain-type>]"
   echo "          [-wlst_path <wlst-path>]"
@@ -68,6 +69,10 @@ usage() {
   echo ""
   echo "        archive-file    - the path to the archive file to use"
   echo ""
+  echo "        prev-archive-file - the path to an archive file from an earlier"
+  echo "                          discovery whose unchanged binaries are copied"
+  echo "                          without being compressed again"
+  echo ""
   echo "        model-file      - the location of the model file to use,"
   echo "                          the default is to get the model from the archive"
   echo ""
@@ -81,6 +86,14 @@ usage() {
   echo ""
   echo "        admin-user      - the admin username (used for online deploy)"
   echo ""
+  echo "    The -compress_archive_ahead switch tells the program to store binaries"
+  echo "    that are already compressed, such as jar, war and ear files, as is and"
+  echo "    to deflate the other archive entries in parallel when they are written."
+  echo ""
+  echo "    The -deduplicate_binaries switch tells the program to store a binary"
+  echo "    that is referenced from several places in the domain only once in the"
+  echo "    archive file."
+  echo ""
 }
 
 umask 27
@@ -339,7 +339,8 @@ GOTO exit_script
 
 :usage
 ECHO.
-ECHO Usage: %~nx0 [-help] [-use_encryption]
+ECHO Usage: %~nx0 [-help] [-use_encryption] [-skip_unchanged_attributes]
+ECHO              [-use_checkpoint_journal] [-check_file_variable_times]
 ECHO              -oracle_home ^<oracle-home^>
 ECHO              -domain_home ^<domain-home^>
 ECHO              [-archive_file ^<archive-file^>]
@@ -348,6 +349,10 @@ ECHO              [-prev_model_file ^<prev-model-file^>]
 ECHO              [-variable_file ^<variable-file^>]
 ECHO              [-domain_type ^<domain-type^>]
 ECHO              [-wlst_path ^<wlst-path^>]
+ECHO              [-max_parallel_deployments ^<max-parallel^>]
+ECHO              [-activation_chunk_size ^<chunk-size^>]
+ECHO              [-deployment_state_dir ^<state-dir^>]
+ECHO              [-file_variable_cache_size ^<cache-size^>]
 ECHO              [-admin_url ^<admin-url^>
 ECHO               -admin_user ^<admin-user^>
 ECHO              ]
@@ -382,11 +387,44 @@ ECHO         admin-url       - the admin server URL (used for online deploy)
 ECHO.
 ECHO         admin-user      - the admin username (used for online deploy)
 ECHO.
+ECHO         max-parallel    - the maximum number of application and library
+ECHO                           operations to run at once during an online
+ECHO                           deploy, the default is 1
+ECHO.
+ECHO         chunk-size      - the number of top-level model elements to save
+ECHO                           and activate at once during an online update,
+ECHO                           or section to activate after each model section,
+ECHO                           the default is to activate all changes at once
+ECHO.
+ECHO         state-dir       - the directory that holds the fingerprints of the
+ECHO                           deployed applications and libraries, the default
+ECHO                           is the wlsdeploy directory of the domain home
+ECHO.
+ECHO         cache-size      - the number of @@FILE values to keep after they are
+ECHO                           read, 0 to read the file for every token, the
+ECHO                           default is 1000
+ECHO.
 ECHO    The -use_encryption switch tells the program that one or more of the
 ECHO    passwords in the model or variables files are encrypted.  The program will
 ECHO    prompt for the decryption passphrase to use to decrypt the passwords.
 ECHO    Please note that Java 8 or higher is required when using this feature.
 ECHO.
+ECHO    The -skip_unchanged_attributes switch tells the program to read the
+ECHO    existing attribute values in the domain and only set the attributes whose
+ECHO    model values differ.  Online, attributes that require a restart are always
+ECHO    compared this way.
+ECHO.
+ECHO    The -use_checkpoint_journal switch tells the program to record the
+ECHO    completed online work in a journal next to the model file, or next to
+ECHO    the archive file if the model is in the archive.  If the program fails,
+ECHO    running it again with the same model, variable and archive files skips
+ECHO    the work recorded in the journal.  The journal is deleted when the
+ECHO    program completes.
+ECHO.
+ECHO    The -check_file_variable_times switch tells the program to read a file
+ECHO    referenced by @@FILE tokens again if it was modified after its value was
+ECHO    cached, such as a secret file that is updated while the program runs.
+ECHO.
 
 :exit_script
 IF DEFINED USE_CMD_EXIT (